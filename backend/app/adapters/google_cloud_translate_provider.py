@@ -2,22 +2,37 @@ from __future__ import annotations
 
 import json
 import os
+from collections.abc import Sequence
+from functools import lru_cache
 
+from app.adapters import quota
+from app.adapters.transient_errors import is_transient_google_error
 from app.adapters.translation_provider import (
     TranslationExecutionError,
     TranslationProviderUnavailableError,
 )
 
+# Translate v2 accepts at most 128 text segments per request.
+_MAX_BATCH_SEGMENTS = 128
+
 
 class GoogleCloudTranslateProvider:
     def __init__(self) -> None:
         try:
+            from google.auth.credentials import AnonymousCredentials
             from google.cloud import translate_v2 as translate
             from google.oauth2 import service_account
 
+            emulator_host = os.environ.get("GOOGLE_TRANSLATE_EMULATOR_HOST", "").strip()
             creds_json = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS_JSON")
 
-            if creds_json:
+            if emulator_host:
+                # Local stub server speaking the Translate v2 REST protocol over plain HTTP.
+                self._client = translate.Client(
+                    credentials=AnonymousCredentials(),
+                    client_options={"api_endpoint": f"http://{emulator_host}"},
+                )
+            elif creds_json:
                 normalized_creds_json = creds_json.strip()
                 first, last = normalized_creds_json[:1], normalized_creds_json[-1:]
                 if len(normalized_creds_json) > 2 and first == last and first in {"'", '"'}:
@@ -37,6 +52,10 @@ class GoogleCloudTranslateProvider:
             ) from exc
 
     def translate(self, *, text: str, target_language: str) -> str:
+        try:
+            quota.acquire("google_translate", chars=len(text))
+        except quota.QuotaExceededError as exc:
+            raise TranslationExecutionError(f"Translate client-side quota: {exc}") from exc
         try:
             response = self._client.translate(
                 text,
@@ -53,6 +72,50 @@ class GoogleCloudTranslateProvider:
         except TranslationExecutionError:
             raise
         except Exception as exc:
-            raise TranslationExecutionError(f"Translate API error: {exc}") from exc
+            raise TranslationExecutionError(
+                f"Translate API error: {exc}", retryable=is_transient_google_error(exc)
+            ) from exc
 
         return translated_text.strip()
+
+    def translate_batch(self, *, texts: Sequence[str], target_language: str) -> list[str]:
+        translations: list[str] = []
+        for start in range(0, len(texts), _MAX_BATCH_SEGMENTS):
+            batch = list(texts[start : start + _MAX_BATCH_SEGMENTS])
+            try:
+                quota.acquire("google_translate", chars=sum(len(text) for text in batch))
+            except quota.QuotaExceededError as exc:
+                raise TranslationExecutionError(f"Translate client-side quota: {exc}") from exc
+            try:
+                response = self._client.translate(
+                    batch,
+                    target_language=target_language,
+                    format_="text",
+                )
+                if not isinstance(response, list) or len(response) != len(batch):
+                    raise TranslationExecutionError(
+                        "Translate API returned an unexpected response type"
+                    )
+                for item in response:
+                    translated_text = item.get("translatedText") if isinstance(item, dict) else None
+                    if not isinstance(translated_text, str) or not translated_text.strip():
+                        raise TranslationExecutionError(
+                            "Translate API returned an empty translation"
+                        )
+                    translations.append(translated_text.strip())
+            except TranslationExecutionError:
+                raise
+            except Exception as exc:
+                raise TranslationExecutionError(
+                    f"Translate API error: {exc}", retryable=is_transient_google_error(exc)
+                ) from exc
+        return translations
+
+
+@lru_cache(maxsize=1)
+def get_google_translate_provider() -> GoogleCloudTranslateProvider:
+    """Share one client, and its HTTP session, for the life of the process.
+
+    The client depends only on credentials, which a settings reload does not change.
+    """
+    return GoogleCloudTranslateProvider()
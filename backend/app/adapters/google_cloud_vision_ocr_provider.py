@@ -15,6 +15,10 @@ Environment variables
 OCR_PROVIDER=google_vision              Activates this provider.
 GOOGLE_APPLICATION_CREDENTIALS_JSON    GCP service account JSON embedded as a string value.
 GOOGLE_CLOUD_PROJECT                   Optional; only needed if not encoded in the credentials.
+GCV_EMULATOR_HOST                      Optional host:port of a local Vision stub server (plaintext
+                                       gRPC, no credentials), e.g. for load testing.
+GCV_QUOTA_QPS                          Optional client-side requests/sec limit (see
+                                       app.adapters.quota).
 """
 
 from __future__ import annotations
@@ -23,12 +27,20 @@ import dataclasses
 import json
 import logging
 import os
+from functools import lru_cache
 
 import google.api_core.exceptions
+import grpc
+from google.auth.credentials import AnonymousCredentials
 from google.cloud import vision
+from google.cloud.vision_v1.services.image_annotator.transports import (
+    ImageAnnotatorGrpcTransport,
+)
 from google.oauth2 import service_account
 
+from app.adapters import quota
 from app.adapters.ocr_provider import OcrExecutionError, ProviderUnavailableError, RawOcrSegment
+from app.adapters.transient_errors import is_transient_google_error
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +61,17 @@ def _paragraph_text(paragraph) -> str:
     )
 
 
+def _paragraph_bbox(paragraph) -> tuple[int, int, int, int] | None:
+    """Axis-aligned (left, top, right, bottom) box around the paragraph's vertices."""
+    bounding_box = getattr(paragraph, "bounding_box", None)
+    vertices = list(bounding_box.vertices) if bounding_box is not None else []
+    if not vertices:
+        return None
+    xs = [vertex.x for vertex in vertices]
+    ys = [vertex.y for vertex in vertices]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
 def _gcv_response_to_documents(response) -> list[_OcrDoc]:
     """Iterate TEXT blocks at paragraph granularity and wrap each in an _OcrDoc."""
     docs = []
@@ -70,6 +93,7 @@ def _gcv_response_to_documents(response) -> list[_OcrDoc]:
                             "confidence": paragraph.confidence,
                             "language": language,
                             "line_id": line_id,
+                            "bbox": _paragraph_bbox(paragraph),
                         },
                     )
                 )
@@ -85,6 +109,7 @@ def _documents_to_segments(docs: list[_OcrDoc]) -> list[RawOcrSegment]:
             language=doc.metadata.get("language"),
             confidence=doc.metadata["confidence"],
             line_id=doc.metadata.get("line_id"),
+            bbox=doc.metadata.get("bbox"),
         )
         for doc in docs
     ]
@@ -100,8 +125,15 @@ class GoogleCloudVisionOcrProvider:
 
     def __init__(self) -> None:
         try:
+            emulator_host = os.environ.get("GCV_EMULATOR_HOST", "").strip()
             creds_json = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS_JSON")
-            if creds_json:
+            if emulator_host:
+                transport = ImageAnnotatorGrpcTransport(
+                    credentials=AnonymousCredentials(),
+                    channel=grpc.insecure_channel(emulator_host),
+                )
+                self._client = vision.ImageAnnotatorClient(transport=transport)
+            elif creds_json:
                 normalized_creds_json = creds_json.strip()
                 first, last = normalized_creds_json[:1], normalized_creds_json[-1:]
                 if first == last and first in {"'", '"'}:
@@ -122,14 +154,22 @@ class GoogleCloudVisionOcrProvider:
 
     def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
         """Call GCV DOCUMENT_TEXT_DETECTION and return normalised segments via the chain."""
+        try:
+            quota.acquire("google_vision")
+        except quota.QuotaExceededError as exc:
+            raise OcrExecutionError(f"GCV client-side quota: {exc}") from exc
         try:
             response = self._client.document_text_detection(
                 image=vision.Image(content=image_bytes)
             )
         except google.api_core.exceptions.GoogleAPIError as exc:
-            raise OcrExecutionError(f"GCV API error: {exc}") from exc
+            raise OcrExecutionError(
+                f"GCV API error: {exc}", retryable=is_transient_google_error(exc)
+            ) from exc
         except Exception as exc:
-            raise OcrExecutionError(f"Unexpected GCV error: {exc}") from exc
+            raise OcrExecutionError(
+                f"Unexpected GCV error: {exc}", retryable=is_transient_google_error(exc)
+            ) from exc
 
         paragraphs = sum(
             len(block.paragraphs)
@@ -151,3 +191,12 @@ class GoogleCloudVisionOcrProvider:
             _paragraph_text(first_paragraph)[:40] if first_paragraph else "(none)",
         )
         return _documents_to_segments(_gcv_response_to_documents(response))
+
+
+@lru_cache(maxsize=1)
+def get_google_vision_ocr_provider() -> GoogleCloudVisionOcrProvider:
+    """Share one client, and its gRPC channel, for the life of the process.
+
+    The client depends only on credentials, which a settings reload does not change.
+    """
+    return GoogleCloudVisionOcrProvider()
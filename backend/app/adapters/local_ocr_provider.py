@@ -0,0 +1,191 @@
+"""Local CPU OCR provider backed by RapidOCR (PP-OCR Chinese models on ONNX Runtime).
+
+Runs without network access or per-image cost. Inference is CPU-bound and holds the GIL
+for long stretches, so it runs in a ProcessPoolExecutor. Each worker loads the models
+once in its initializer and runs one warm-up inference. The pool is started (and its
+workers begin loading models) as soon as the provider is built, which the startup warmup
+does in the background.
+
+The provider emits the same RawOcrSegment semantics as the GCV adapter: one segment per
+detected text line in reading order, ``line_id`` numbering those lines from 0,
+``confidence`` in 0-1 and a pixel ``bbox``. ``language`` is "zh" for lines containing
+CJK characters (the engine does not detect languages).
+
+Environment variables
+---------------------
+OCR_PROVIDER=local              Activates this provider. Needs the optional dependency:
+                                ``pip install '.[local-ocr]'`` (rapidocr-onnxruntime).
+LOCAL_OCR_WORKERS               Worker processes (default 2).
+LOCAL_OCR_QUEUE_SIZE            Requests allowed to wait for a free worker (default 8);
+                                beyond that, extraction fails fast.
+LOCAL_OCR_TIMEOUT_SECONDS       How long a request waits for its result (default 30).
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import importlib.util
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from app.adapters.ocr_provider import OcrExecutionError, ProviderUnavailableError, RawOcrSegment
+from app.core.settings import LocalOcrSettings, Settings
+
+logger = logging.getLogger(__name__)
+
+_CJK_CHAR_RE = re.compile(r"[\u3400-\u9fff]")
+
+# An engine takes encoded image bytes and returns RapidOCR's ``(result, elapsed)`` pair,
+# where result is a list of ``[box_points, text, score]`` or None when nothing is found.
+EngineFactory = Callable[[int], Callable[[bytes], tuple[Any, Any]]]
+
+_engine: Callable[[bytes], tuple[Any, Any]] | None = None
+
+
+def _create_rapidocr_engine(threads: int) -> Callable[[bytes], tuple[Any, Any]]:
+    import io
+
+    from PIL import Image
+    from rapidocr_onnxruntime import RapidOCR
+
+    engine = RapidOCR(intra_op_num_threads=threads, inter_op_num_threads=1)
+    buffer = io.BytesIO()
+    Image.new("RGB", (320, 48), "white").save(buffer, format="PNG")
+    engine(buffer.getvalue())  # First inference allocates the ONNX Runtime buffers.
+    return engine
+
+
+def _init_worker(engine_factory: EngineFactory, threads: int) -> None:
+    global _engine
+    _engine = engine_factory(threads)
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+def _box_to_bbox(box: Sequence[Sequence[float]]) -> tuple[int, int, int, int]:
+    xs = [point[0] for point in box]
+    ys = [point[1] for point in box]
+    return (int(min(xs)), int(min(ys)), int(round(max(xs))), int(round(max(ys))))
+
+
+def _result_to_segments(result: Sequence[Sequence[Any]] | None) -> list[RawOcrSegment]:
+    segments = []
+    for box, text, score in result or []:
+        if not str(text).strip():
+            continue
+        segments.append(
+            RawOcrSegment(
+                text=str(text),
+                language="zh" if _CJK_CHAR_RE.search(str(text)) else None,
+                confidence=float(score),
+                line_id=len(segments),
+                bbox=_box_to_bbox(box),
+            )
+        )
+    return segments
+
+
+def _worker_extract(image_bytes: bytes) -> list[RawOcrSegment]:
+    if _engine is None:  # pragma: no cover - the initializer always runs first
+        raise RuntimeError("local OCR worker was not initialised")
+    result, _elapsed = _engine(image_bytes)
+    return _result_to_segments(result)
+
+
+class LocalOcrProvider:
+    """OcrProvider that runs a local OCR engine in a warm, bounded process pool."""
+
+    def __init__(
+        self,
+        config: LocalOcrSettings,
+        *,
+        engine_factory: EngineFactory = _create_rapidocr_engine,
+    ) -> None:
+        if (
+            engine_factory is _create_rapidocr_engine
+            and importlib.util.find_spec("rapidocr_onnxruntime") is None
+        ):
+            raise ProviderUnavailableError(
+                "Local OCR needs the optional dependency: pip install '.[local-ocr]'"
+            )
+        self.config = config
+        self._engine_factory = engine_factory
+        self._threads = max(1, (os.cpu_count() or 1) // config.workers)
+        # Requests being processed plus those allowed to wait for a worker.
+        self._slots = threading.BoundedSemaphore(config.workers + config.queue_size)
+        self._lock = threading.Lock()
+        self._pool = self._start_pool()
+
+    def _start_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.config.workers,
+            # Forking a process that already runs threads (uvicorn, gRPC) is unsafe.
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._engine_factory, self._threads),
+        )
+        # Submitting one job per worker starts them all, so the models load up front.
+        for _ in range(self.config.workers):
+            pool.submit(_worker_ready)
+        return pool
+
+    def _restart_pool(self, broken: concurrent.futures.ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pool is broken:
+                logger.warning("Local OCR worker pool broke; restarting it")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._pool = self._start_pool()
+
+    def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
+        _ = content_type
+        if not self._slots.acquire(blocking=False):
+            raise OcrExecutionError("Local OCR queue is full")
+        pool = self._pool
+        try:
+            future = pool.submit(_worker_extract, image_bytes)
+        except BrokenProcessPool as exc:
+            self._slots.release()
+            self._restart_pool(pool)
+            # The pool was just restarted, so another attempt can succeed.
+            raise OcrExecutionError(
+                "Local OCR worker pool is unavailable", retryable=True
+            ) from exc
+        # The slot is held until the worker finishes, even if this caller times out.
+        future.add_done_callback(lambda _future: self._slots.release())
+        try:
+            return future.result(timeout=self.config.timeout_s)
+        except concurrent.futures.TimeoutError as exc:
+            raise OcrExecutionError(
+                f"Local OCR timed out after {self.config.timeout_s:.0f}s"
+            ) from exc
+        except BrokenProcessPool as exc:
+            self._restart_pool(pool)
+            raise OcrExecutionError("Local OCR worker crashed") from exc
+        except Exception as exc:
+            raise OcrExecutionError(f"Local OCR error: {exc}") from exc
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_provider: LocalOcrProvider | None = None
+_provider_lock = threading.Lock()
+
+
+def get_local_ocr_provider(settings: Settings) -> LocalOcrProvider:
+    """Share one worker pool; it is replaced only when the LOCAL_OCR_* settings change."""
+    global _provider
+    with _provider_lock:
+        if _provider is None or _provider.config != settings.local_ocr:
+            if _provider is not None:
+                _provider.shutdown(wait=False)
+            _provider = LocalOcrProvider(settings.local_ocr)
+        return _provider
@@ -8,6 +8,8 @@ class RawOcrSegment:
     language: str | None = None
     confidence: float | int | None = None
     line_id: int | None = None
+    # (left, top, right, bottom) in image pixels, when the provider reports geometry.
+    bbox: tuple[int, int, int, int] | None = None
 
 
 class OcrProvider(Protocol):
@@ -20,7 +22,10 @@ class ProviderUnavailableError(Exception):
 
 
 class OcrExecutionError(Exception):
-    pass
+    def __init__(self, message: str, *, retryable: bool = False) -> None:
+        super().__init__(message)
+        # Transient failure (e.g. UNAVAILABLE, DEADLINE_EXCEEDED) that a retry may fix.
+        self.retryable = retryable
 
 
 class NoOpOcrProvider:
@@ -29,23 +34,34 @@ class NoOpOcrProvider:
         raise ProviderUnavailableError("OCR provider is not configured")
 
 
-def get_ocr_provider() -> OcrProvider:
-    """Return the active OCR provider based on the OCR_PROVIDER environment variable.
+def get_ocr_provider(name: str | None = None) -> OcrProvider:
+    """Return the OCR provider called ``name``, by default the OCR_PROVIDER setting.
 
     Supported values:
       google_vision  – Google Cloud Vision DOCUMENT_TEXT_DETECTION (production)
       textract       – AWS Textract via LangChain extraction chain (legacy; no Chinese support)
+      local          – Local CPU OCR (RapidOCR / PP-OCR on ONNX Runtime) in a process pool
+      simulated      – Replays recorded GCV responses with injected latency and failures
       (unset)        – NoOpOcrProvider (raises ProviderUnavailableError on use)
     """
-    import os
+    from app.core.settings import get_settings
 
-    provider = os.environ.get("OCR_PROVIDER", "").lower()
+    settings = get_settings()
+    provider = settings.ocr_provider if name is None else name
     if provider == "google_vision":
-        from app.adapters.google_cloud_vision_ocr_provider import GoogleCloudVisionOcrProvider
+        from app.adapters.google_cloud_vision_ocr_provider import get_google_vision_ocr_provider
 
-        return GoogleCloudVisionOcrProvider()
+        return get_google_vision_ocr_provider()
     if provider == "textract":
-        from app.adapters.textract_ocr_provider import TextractOcrProvider
+        from app.adapters.textract_ocr_provider import get_textract_ocr_provider
+
+        return get_textract_ocr_provider()
+    if provider == "local":
+        from app.adapters.local_ocr_provider import get_local_ocr_provider
+
+        return get_local_ocr_provider(settings)
+    if provider == "simulated":
+        from app.adapters.simulated_ocr_provider import get_simulated_ocr_provider
 
-        return TextractOcrProvider()
+        return get_simulated_ocr_provider(settings)
     return NoOpOcrProvider()
@@ -34,9 +34,9 @@ def get_pinyin_provider() -> PinyinProvider:
       pypinyin  – local pypinyin library (default)
       (anything else) – NoOpPinyinProvider
     """
-    import os
+    from app.core.settings import get_settings
 
-    provider = os.environ.get("PINYIN_PROVIDER", "pypinyin").lower()
+    provider = get_settings().pinyin_provider
     if provider == "pypinyin":
         from app.adapters.pypinyin_provider import PyPinyinProvider
 
@@ -0,0 +1,170 @@
+"""Client-side token buckets that keep Google API calls within the project's quotas.
+
+Bursts above the Vision requests-per-second or the Translate requests and
+characters-per-minute quotas come back as 429 errors, which users see as failures.
+With GCV_QUOTA_QPS, TRANSLATE_QUOTA_QPS or TRANSLATE_QUOTA_CHARS_PER_MINUTE set, the
+Google adapters take tokens from their provider's buckets before each call. When the
+buckets are empty the calling worker thread waits for its tokens instead, up to
+QUOTA_MAX_WAIT_MS and never past the request deadline the service set with
+``deadline_scope``. A call that cannot get its tokens in time fails with QuotaExceededError
+without reaching the API.
+
+Token waits are counted in /v1/metrics (``quota_waits_total``, ``quota_wait_ms_total``
+and ``quota_timeouts_total``).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import threading
+import time
+from collections.abc import Callable, Iterator
+from typing import Literal
+
+from app.core.metrics import metrics_store
+from app.core.settings import QuotaSettings, Settings, get_settings
+
+QuotaProvider = Literal["google_vision", "google_translate"]
+
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "quota_deadline", default=None
+)
+
+
+class QuotaExceededError(Exception):
+    pass
+
+
+@contextlib.contextmanager
+def deadline_scope(deadline: float | None) -> Iterator[None]:
+    """Bound token waits by ``deadline`` (a time.monotonic() value) for calls made inside.
+
+    Worker threads see it when started with asyncio.to_thread or a copied context.
+    """
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``capacity``.
+
+    Tokens are reserved rather than waited for: a caller that has to wait takes its
+    tokens straight away (the level may go negative) and sleeps until they would have
+    accrued, so waiting callers are served in arrival order.
+    """
+
+    def __init__(
+        self, rate: float, capacity: float, *, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available."""
+        self._refill()
+        missing = min(amount, self.capacity) - self._tokens
+        return max(missing, 0.0) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._tokens -= min(amount, self.capacity)
+
+
+class ProviderQuota:
+    """The request and character buckets of one provider, reserved together."""
+
+    def __init__(
+        self,
+        *,
+        requests_per_second: float = 0.0,
+        chars_per_minute: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        # One second of requests and one minute of characters may be used in a burst.
+        self._requests = (
+            TokenBucket(requests_per_second, max(requests_per_second, 1.0), clock=clock)
+            if requests_per_second
+            else None
+        )
+        self._chars = (
+            TokenBucket(chars_per_minute / 60, chars_per_minute, clock=clock)
+            if chars_per_minute
+            else None
+        )
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def acquire(self, *, chars: int = 0, max_wait_s: float) -> float:
+        """Take one request (and ``chars`` characters), waiting at most ``max_wait_s``.
+
+        Returns the time waited in seconds; raises QuotaExceededError without taking any
+        tokens when the wait would be longer.
+        """
+        needed = [(self._requests, 1.0), (self._chars, float(chars))]
+        needed = [(bucket, amount) for bucket, amount in needed if bucket and amount]
+        with self._lock:
+            wait_s = max((bucket.wait_for(amount) for bucket, amount in needed), default=0.0)
+            if wait_s > max_wait_s:
+                raise QuotaExceededError(f"quota exhausted; tokens in {wait_s:.2f}s")
+            for bucket, amount in needed:
+                bucket.take(amount)
+        if wait_s > 0:
+            self._sleep(wait_s)
+        return wait_s
+
+
+_quotas: dict[QuotaProvider, tuple[QuotaSettings, ProviderQuota]] = {}
+_quotas_lock = threading.Lock()
+
+
+def _build(provider: QuotaProvider, config: QuotaSettings) -> ProviderQuota:
+    if provider == "google_vision":
+        return ProviderQuota(requests_per_second=config.gcv_requests_per_second)
+    return ProviderQuota(
+        requests_per_second=config.translate_requests_per_second,
+        chars_per_minute=config.translate_chars_per_minute,
+    )
+
+
+def get_quota(provider: QuotaProvider, settings: Settings) -> ProviderQuota:
+    """The shared quota of ``provider``; rebuilt (full buckets) when its settings change."""
+    config = settings.quotas
+    with _quotas_lock:
+        entry = _quotas.get(provider)
+        if entry is None or entry[0] != config:
+            entry = _quotas[provider] = (config, _build(provider, config))
+        return entry[1]
+
+
+def acquire(provider: QuotaProvider, *, chars: int = 0, settings: Settings | None = None) -> None:
+    """Wait for quota before a call to ``provider``; raises QuotaExceededError on timeout."""
+    settings = settings or get_settings()
+    max_wait_s = settings.quotas.max_wait_ms / 1000
+    deadline = _deadline.get()
+    if deadline is not None:
+        max_wait_s = min(max_wait_s, max(deadline - time.monotonic(), 0.0))
+    try:
+        waited_s = get_quota(provider, settings).acquire(chars=chars, max_wait_s=max_wait_s)
+    except QuotaExceededError:
+        metrics_store.record_quota_wait(None)
+        raise
+    if waited_s > 0:
+        metrics_store.record_quota_wait(waited_s * 1000)
+
+
+def reset_quotas() -> None:
+    with _quotas_lock:
+        _quotas.clear()
@@ -0,0 +1,87 @@
+"""Simulated OCR provider for local load testing without GCV credentials.
+
+Replays recorded Google Cloud Vision ``AnnotateImageResponse`` JSON files (as written by
+``vision.AnnotateImageResponse.to_json(response)``) through the same parsing pipeline
+as GoogleCloudVisionOcrProvider, with injected latency, errors and timeouts.
+
+Environment variables
+---------------------
+OCR_PROVIDER=simulated              Activates this provider.
+SIMULATION_FIXTURES_DIR            Directory containing ``gcv/*.json`` recordings
+                                   (default: the bundled simulation_fixtures).
+SIMULATED_OCR_LATENCY              Latency spec, see app.adapters.simulation.
+SIMULATED_OCR_ERROR_RATE           Fraction of calls that fail (0-1).
+SIMULATED_OCR_TIMEOUT_RATE         Fraction of calls that hang, then fail (0-1).
+SIMULATED_OCR_TIMEOUT_SECONDS      How long a timed-out call hangs.
+SIMULATION_SEED                    Seed for reproducible latency and failure draws.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from functools import lru_cache
+from pathlib import Path
+
+from google.cloud import vision
+
+from app.adapters.google_cloud_vision_ocr_provider import (
+    _documents_to_segments,
+    _gcv_response_to_documents,
+)
+from app.adapters.ocr_provider import OcrExecutionError, ProviderUnavailableError, RawOcrSegment
+from app.adapters.simulation import CallSimulator, fixtures_dir
+from app.core.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def _load_recordings(directory: Path) -> tuple[tuple[RawOcrSegment, ...], ...]:
+    recordings = []
+    for path in sorted(directory.glob("*.json")):
+        response = vision.AnnotateImageResponse.from_json(
+            path.read_text(encoding="utf-8"), ignore_unknown_fields=True
+        )
+        recordings.append(tuple(_documents_to_segments(_gcv_response_to_documents(response))))
+    return tuple(recordings)
+
+
+class SimulatedOcrProvider:
+    """OcrProvider that replays recorded GCV responses.
+
+    The recording is chosen from a hash of the image bytes, so the same image always
+    yields the same text while different images spread across the recordings.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        directory = fixtures_dir(settings.simulation_fixtures_dir) / "gcv"
+        try:
+            self._recordings = _load_recordings(directory)
+            self._simulator = CallSimulator(settings.simulated_ocr, seed=settings.simulation_seed)
+        except (OSError, ValueError) as exc:
+            raise ProviderUnavailableError(f"Simulated OCR is misconfigured: {exc}") from exc
+        if not self._recordings:
+            raise ProviderUnavailableError(f"No GCV recordings found in {directory}")
+
+    def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
+        _ = content_type
+        outcome = self._simulator.call()
+        if outcome == "timeout":
+            raise OcrExecutionError(
+                "GCV API error: 504 Deadline Exceeded (simulated)", retryable=True
+            )
+        if outcome == "error":
+            raise OcrExecutionError(
+                "GCV API error: 503 Service Unavailable (simulated)", retryable=True
+            )
+
+        digest = hashlib.blake2b(image_bytes, digest_size=8).digest()
+        recording = self._recordings[int.from_bytes(digest, "big") % len(self._recordings)]
+        logger.debug("Simulated OCR returned %d paragraph(s)", len(recording))
+        return list(recording)
+
+
+@lru_cache(maxsize=4)
+def get_simulated_ocr_provider(settings: Settings) -> SimulatedOcrProvider:
+    """Share one provider (and its seeded RNG) per settings snapshot."""
+    return SimulatedOcrProvider(settings)
@@ -0,0 +1,76 @@
+"""Simulated translation provider for local load testing without Translate credentials.
+
+Replays recorded Google Cloud Translate responses from ``translate.json`` (a list of
+``{"input": ..., "translatedText": ...}`` objects) with injected latency, errors and
+timeouts. Text without a recording gets a deterministic placeholder translation.
+
+Environment variables
+---------------------
+TRANSLATION_ENABLED=true and TRANSLATION_PROVIDER=simulated   Activate this provider.
+SIMULATION_FIXTURES_DIR                Directory containing ``translate.json``.
+SIMULATED_TRANSLATION_LATENCY          Latency spec, see app.adapters.simulation.
+SIMULATED_TRANSLATION_ERROR_RATE       Fraction of calls that fail (0-1).
+SIMULATED_TRANSLATION_TIMEOUT_RATE     Fraction of calls that hang, then fail (0-1).
+SIMULATED_TRANSLATION_TIMEOUT_SECONDS  How long a timed-out call hangs.
+SIMULATION_SEED                        Seed for reproducible latency and failure draws.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from functools import lru_cache
+
+from app.adapters.simulation import CallSimulator, fixtures_dir
+from app.adapters.translation_provider import (
+    TranslationExecutionError,
+    TranslationProviderUnavailableError,
+)
+from app.core.settings import Settings
+
+
+class SimulatedTranslateProvider:
+    def __init__(self, settings: Settings) -> None:
+        path = fixtures_dir(settings.simulation_fixtures_dir) / "translate.json"
+        try:
+            self._recordings = {
+                item["input"]: item["translatedText"]
+                for item in json.loads(path.read_text(encoding="utf-8"))
+            }
+            self._simulator = CallSimulator(
+                settings.simulated_translation, seed=settings.simulation_seed
+            )
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            raise TranslationProviderUnavailableError(
+                f"Simulated translation is misconfigured: {exc}"
+            ) from exc
+
+    def translate(self, *, text: str, target_language: str) -> str:
+        self._simulate_call()
+        return self._translation(text, target_language)
+
+    def translate_batch(self, *, texts: Sequence[str], target_language: str) -> list[str]:
+        # One simulated round trip for the whole batch, like a single API request.
+        self._simulate_call()
+        return [self._translation(text, target_language) for text in texts]
+
+    def _simulate_call(self) -> None:
+        outcome = self._simulator.call()
+        if outcome == "timeout":
+            raise TranslationExecutionError(
+                "Translate API error: Deadline Exceeded (simulated)", retryable=True
+            )
+        if outcome == "error":
+            raise TranslationExecutionError("Translate API error: 503 (simulated)", retryable=True)
+
+    def _translation(self, text: str, target_language: str) -> str:
+        recorded = self._recordings.get(text)
+        if recorded is not None:
+            return recorded
+        return f"[{target_language}] {text}"
+
+
+@lru_cache(maxsize=4)
+def get_simulated_translate_provider(settings: Settings) -> SimulatedTranslateProvider:
+    """Share one provider (and its seeded RNG) per settings snapshot."""
+    return SimulatedTranslateProvider(settings)
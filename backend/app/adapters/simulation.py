@@ -0,0 +1,143 @@
+"""Latency and failure injection shared by the simulated providers.
+
+A latency spec selects the distribution each simulated call sleeps for:
+
+  fixed:<ms>                    constant latency, e.g. ``fixed:250``
+  lognormal:<median_ms>,<sigma> lognormal around a median, e.g. ``lognormal:250,0.6``
+  histogram:<path>              replay a recorded latency histogram (JSON file of
+                                ``{"buckets": [{"le_ms": 250, "count": 540}, ...]}``,
+                                cumulative upper bounds with per-bucket counts)
+
+On top of the latency, each call independently fails with ``error_rate`` probability
+(immediately after its latency) or times out with ``timeout_rate`` probability (after
+sleeping ``timeout_s``), so the service-level error and timeout handling is exercised
+with realistic tail behaviour.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal, Protocol
+
+from app.core.settings import SimulationSettings
+
+FIXTURES_DIR = Path(__file__).parent / "simulation_fixtures"
+
+SimulatedOutcome = Literal["ok", "error", "timeout"]
+
+
+class LatencyModel(Protocol):
+    def sample_s(self, rng: random.Random) -> float:
+        """Return one latency sample in seconds."""
+
+
+@dataclass(frozen=True)
+class FixedLatency:
+    ms: float
+
+    def sample_s(self, rng: random.Random) -> float:
+        _ = rng
+        return self.ms / 1000
+
+
+@dataclass(frozen=True)
+class LognormalLatency:
+    median_ms: float
+    sigma: float
+
+    def sample_s(self, rng: random.Random) -> float:
+        return rng.lognormvariate(math.log(self.median_ms), self.sigma) / 1000
+
+
+@dataclass(frozen=True)
+class HistogramLatency:
+    upper_bounds_ms: tuple[float, ...]
+    cumulative_counts: tuple[int, ...]
+
+    @classmethod
+    def from_file(cls, path: Path) -> HistogramLatency:
+        buckets = json.loads(path.read_text(encoding="utf-8"))["buckets"]
+        upper_bounds: list[float] = []
+        cumulative: list[int] = []
+        total = 0
+        for bucket in sorted(buckets, key=lambda item: float(item["le_ms"])):
+            total += int(bucket["count"])
+            upper_bounds.append(float(bucket["le_ms"]))
+            cumulative.append(total)
+        if total <= 0:
+            raise ValueError(f"Latency histogram {path} has no samples")
+        return cls(tuple(upper_bounds), tuple(cumulative))
+
+    def sample_s(self, rng: random.Random) -> float:
+        # Pick a bucket weighted by its count, then a uniform point inside it.
+        draw = rng.randrange(self.cumulative_counts[-1])
+        index = bisect.bisect_right(self.cumulative_counts, draw)
+        lower_ms = self.upper_bounds_ms[index - 1] if index else 0.0
+        return rng.uniform(lower_ms, self.upper_bounds_ms[index]) / 1000
+
+
+def parse_latency_model(spec: str) -> LatencyModel:
+    """Parse a latency spec (see module docstring). Raises ValueError when invalid."""
+    kind, _, argument = spec.strip().partition(":")
+    kind = kind.lower()
+    if kind == "fixed":
+        ms = float(argument)
+        if not math.isfinite(ms) or ms < 0:
+            raise ValueError(f"Invalid fixed latency {spec!r}")
+        return FixedLatency(ms)
+    if kind == "lognormal":
+        median_text, _, sigma_text = argument.partition(",")
+        median_ms, sigma = float(median_text), float(sigma_text)
+        if not (math.isfinite(median_ms) and median_ms > 0 and math.isfinite(sigma) and sigma >= 0):
+            raise ValueError(f"Invalid lognormal latency {spec!r}")
+        return LognormalLatency(median_ms, sigma)
+    if kind == "histogram":
+        path = Path(argument)
+        if not path.is_absolute() and not path.exists():
+            path = FIXTURES_DIR / path
+        try:
+            return HistogramLatency.from_file(path)
+        except (OSError, KeyError, TypeError) as exc:
+            raise ValueError(f"Could not load latency histogram {spec!r}") from exc
+    raise ValueError(f"Unknown latency spec {spec!r}")
+
+
+class CallSimulator:
+    """Draws latency and an outcome for each simulated provider call, then sleeps."""
+
+    def __init__(self, config: SimulationSettings, *, seed: int | None = None) -> None:
+        self._latency = parse_latency_model(config.latency)
+        self._error_rate = config.error_rate
+        self._timeout_rate = config.timeout_rate
+        self._timeout_s = config.timeout_s
+        self._rng = random.Random(seed)
+        # Providers are shared across executor threads; keep draws reproducible per seed.
+        self._lock = threading.Lock()
+
+    def draw(self) -> tuple[SimulatedOutcome, float]:
+        """Return the next call's outcome and how long it takes, in seconds."""
+        with self._lock:
+            roll = self._rng.random()
+            if roll < self._timeout_rate:
+                return "timeout", self._timeout_s
+            latency_s = self._latency.sample_s(self._rng)
+        if roll < self._timeout_rate + self._error_rate:
+            return "error", latency_s
+        return "ok", latency_s
+
+    def call(self) -> SimulatedOutcome:
+        outcome, duration_s = self.draw()
+        if duration_s > 0:
+            time.sleep(duration_s)
+        return outcome
+
+
+def fixtures_dir(configured: str | None) -> Path:
+    return Path(configured) if configured else FIXTURES_DIR
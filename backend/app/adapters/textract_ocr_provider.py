@@ -25,6 +25,7 @@ from __future__ import annotations
 import dataclasses
 import logging
 import os
+from functools import lru_cache
 from typing import Any
 
 import boto3
@@ -101,3 +102,13 @@ class TextractOcrProvider:
             [(b.get("BlockType"), b.get("Text", "")[:40]) for b in blocks],
         )
         return _documents_to_segments(_textract_response_to_documents(response))
+
+
+@lru_cache(maxsize=1)
+def get_textract_ocr_provider() -> TextractOcrProvider:
+    """Share one boto3 client for the life of the process.
+
+    The client depends only on AWS credentials and region, which a settings reload
+    does not change.
+    """
+    return TextractOcrProvider()
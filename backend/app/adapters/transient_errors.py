@@ -0,0 +1,32 @@
+"""Classify Google API client errors as transient (worth retrying) or permanent.
+
+Only failures that say nothing about the request itself are retried: the service was
+unavailable, overloaded or timed out (UNAVAILABLE, DEADLINE_EXCEEDED, INTERNAL and the
+HTTP 500/502/503/504 equivalents) or the connection dropped. Invalid arguments,
+permission and quota errors fail the same way on every attempt.
+"""
+
+from __future__ import annotations
+
+import google.api_core.exceptions
+
+_TRANSIENT_GOOGLE_ERRORS = (
+    google.api_core.exceptions.DeadlineExceeded,
+    google.api_core.exceptions.ServiceUnavailable,
+    google.api_core.exceptions.InternalServerError,
+    google.api_core.exceptions.BadGateway,
+    google.api_core.exceptions.GatewayTimeout,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+def is_transient_google_error(exc: BaseException) -> bool:
+    if isinstance(exc, _TRANSIENT_GOOGLE_ERRORS):
+        return True
+    try:
+        import requests
+    except ImportError:  # pragma: no cover - installed with the Google client libraries
+        return False
+    # The Translate v2 client talks REST through requests.
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
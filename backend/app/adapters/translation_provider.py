@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from typing import Protocol
 
 
@@ -5,13 +6,19 @@ class TranslationProvider(Protocol):
     def translate(self, *, text: str, target_language: str) -> str:
         """Translate source text into the requested target language."""
 
+    def translate_batch(self, *, texts: Sequence[str], target_language: str) -> list[str]:
+        """Translate several texts in as few API calls as possible, keeping their order."""
+
 
 class TranslationProviderUnavailableError(Exception):
     pass
 
 
 class TranslationExecutionError(Exception):
-    pass
+    def __init__(self, message: str, *, retryable: bool = False) -> None:
+        super().__init__(message)
+        # Transient failure (e.g. 503, deadline exceeded) that a retry may fix.
+        self.retryable = retryable
 
 
 class NoOpTranslationProvider:
@@ -19,13 +26,23 @@ class NoOpTranslationProvider:
         _ = (text, target_language)
         raise TranslationProviderUnavailableError("Translation provider is not configured")
 
+    def translate_batch(self, *, texts: Sequence[str], target_language: str) -> list[str]:
+        _ = (texts, target_language)
+        raise TranslationProviderUnavailableError("Translation provider is not configured")
+
 
 def get_translation_provider() -> TranslationProvider:
-    import os
+    from app.core.settings import get_settings
 
-    if os.environ.get("TRANSLATION_ENABLED", "false").strip().lower() != "true":
+    settings = get_settings()
+    if not settings.translation_enabled:
         return NoOpTranslationProvider()
 
-    from app.adapters.google_cloud_translate_provider import GoogleCloudTranslateProvider
+    if settings.translation_provider == "simulated":
+        from app.adapters.simulated_translate_provider import get_simulated_translate_provider
+
+        return get_simulated_translate_provider(settings)
+
+    from app.adapters.google_cloud_translate_provider import get_google_translate_provider
 
-    return GoogleCloudTranslateProvider()
+    return get_google_translate_provider()
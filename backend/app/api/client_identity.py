@@ -0,0 +1,33 @@
+"""Identify the client a request counts against for per-client limits.
+
+A client sending one of the CLIENT_API_KEYS in its X-API-Key header is identified by a
+hash of the key, so keys are never held in limiter state or logs. Any other key is
+ignored: accepting arbitrary keys would let a client send a fresh key per request and
+get a fresh bucket and quota each time. Without a known key the peer IP address is
+used, or the first X-Forwarded-For entry when CLIENT_LIMIT_TRUST_FORWARDED_FOR is set
+because the app runs behind a proxy that sets it (the header is trivially spoofed
+otherwise).
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from starlette.requests import Request
+
+from app.core.settings import Settings
+
+
+def client_key(request: Request, settings: Settings) -> str:
+    limits = settings.client_limits
+    api_key = request.headers.get("x-api-key", "").strip()
+    if api_key and limits.api_key_digests:
+        digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+        if digest in limits.api_key_digests:
+            return "key:" + digest[:16]
+    if limits.trust_forwarded_for:
+        forwarded = request.headers.get("x-forwarded-for", "").split(",")[0].strip()
+        if forwarded:
+            return f"ip:{forwarded}"
+    host = request.client.host if request.client is not None else "unknown"
+    return f"ip:{host}"
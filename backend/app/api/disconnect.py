@@ -0,0 +1,50 @@
+"""Stop processing a request once its client has gone away.
+
+A user who closes the app mid-request would otherwise still get the full OCR, pinyin and
+translation pipeline run (and billed) for a response nobody reads. ``cancel_on_disconnect``
+runs the pipeline next to a watcher on the ASGI receive channel; when the server reports
+``http.disconnect`` the pipeline task is cancelled. The stage in flight is interrupted at
+its next await (a provider call already sent cannot be recalled, but its result is
+dropped) and later stages never start.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import Awaitable
+from typing import TypeVar
+
+from starlette.requests import Request
+
+T = TypeVar("T")
+
+
+class ClientDisconnectedError(Exception):
+    pass
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    # Only called once the body has been read, so nothing but the disconnect is left.
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def cancel_on_disconnect(request: Request, work: Awaitable[T]) -> T:
+    """Await ``work``; raises ClientDisconnectedError if the client disconnects first."""
+    work_task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait({work_task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not work_task.done():
+            work_task.cancel()
+            # Let the cancelled stages unwind (and release their slots) before returning.
+            with contextlib.suppress(asyncio.CancelledError):
+                await work_task
+    if work_task.cancelled():
+        raise ClientDisconnectedError
+    return work_task.result()
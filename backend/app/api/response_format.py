@@ -0,0 +1,167 @@
+"""Response format negotiation for the process endpoints.
+
+The default format is the ProcessResponse JSON envelope. Clients on slow links can opt
+into the columnar envelope (app.schemas.columnar) with ``?format=columnar`` or
+``Accept: application/vnd.ocr-pinyin.columnar+json``, and into MessagePack-encoded
+columnar output with ``?format=msgpack`` or ``Accept: application/msgpack``.
+MessagePack needs the optional ``msgpack`` package; without it those requests fall back
+to columnar JSON (the Content-Type tells the client which one it got).
+"""
+
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.timing import installed_timer
+from app.schemas.columnar import (
+    ColumnarOcrData,
+    ColumnarPinyinData,
+    ColumnarProcessData,
+    ColumnarProcessResponse,
+    ColumnarReadingData,
+    ColumnarReadingGroups,
+)
+from app.schemas.process import OcrData, PinyinData, ProcessData, ProcessResponse, ReadingData
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    # Optional dependency (the "compact" extra); MessagePack requests fall back to JSON.
+    msgpack = None
+
+ResponseFormat = Literal["json", "columnar", "msgpack"]
+
+JSON_MEDIA_TYPE = "application/json"
+COLUMNAR_JSON_MEDIA_TYPE = "application/vnd.ocr-pinyin.columnar+json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+FORMAT_QUERY_PARAMETER = {
+    "name": "format",
+    "in": "query",
+    "required": False,
+    "description": (
+        "Response format. `columnar` returns segment fields as parallel arrays;"
+        " `msgpack` returns the columnar envelope encoded as MessagePack."
+    ),
+    "schema": {"type": "string", "enum": ["json", "columnar", "msgpack"], "default": "json"},
+}
+
+
+def negotiate_format(request: Request | None) -> ResponseFormat:
+    if request is None:
+        return "json"
+    requested = request.query_params.get("format", "").strip().lower()
+    if requested in ("json", "columnar", "msgpack"):
+        return requested  # type: ignore[return-value]
+
+    accept = request.headers.get("accept", "").lower()
+    if any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES):
+        return "msgpack"
+    if COLUMNAR_JSON_MEDIA_TYPE in accept:
+        return "columnar"
+    return "json"
+
+
+def _columnar_ocr(ocr: OcrData) -> ColumnarOcrData:
+    segments = ocr.segments
+    return ColumnarOcrData.model_construct(
+        text=[segment.text for segment in segments],
+        language=[segment.language for segment in segments],
+        confidence=[segment.confidence for segment in segments],
+        line_id=[segment.line_id for segment in segments],
+    )
+
+
+def _columnar_pinyin(pinyin: PinyinData) -> ColumnarPinyinData:
+    segments = pinyin.segments
+    translations: dict[int, str] = {}
+    for segment in segments:
+        if segment.line_id is not None and segment.translation_text is not None:
+            translations.setdefault(segment.line_id, segment.translation_text)
+    return ColumnarPinyinData.model_construct(
+        source_text=[segment.source_text for segment in segments],
+        pinyin_text=[segment.pinyin_text for segment in segments],
+        alignment_status=[segment.alignment_status for segment in segments],
+        reason_code=[segment.reason_code for segment in segments],
+        line_id=[segment.line_id for segment in segments],
+        translations=translations,
+    )
+
+
+def _columnar_reading(reading: ReadingData) -> ColumnarReadingData:
+    groups = reading.groups
+    return ColumnarReadingData.model_construct(
+        mode=reading.mode,
+        provider=reading.provider,
+        groups=ColumnarReadingGroups.model_construct(
+            group_id=[group.group_id for group in groups],
+            line_id=[group.line_id for group in groups],
+            display_text=[group.display_text for group in groups],
+            playback_text=[
+                None if group.playback_text == group.display_text else group.playback_text
+                for group in groups
+            ],
+            confidence=[group.confidence for group in groups],
+            segment_indexes=[group.segment_indexes for group in groups],
+        ),
+    )
+
+
+def _columnar_data(data: ProcessData) -> ColumnarProcessData:
+    return ColumnarProcessData.model_construct(
+        ocr=_columnar_ocr(data.ocr) if data.ocr is not None else None,
+        pinyin=_columnar_pinyin(data.pinyin) if data.pinyin is not None else None,
+        reading=_columnar_reading(data.reading) if data.reading is not None else None,
+        message=data.message,
+        job_id=data.job_id,
+    )
+
+
+def to_columnar(response: ProcessResponse) -> ColumnarProcessResponse:
+    return ColumnarProcessResponse.model_construct(
+        format="columnar",
+        status=response.status,
+        request_id=response.request_id,
+        data=_columnar_data(response.data) if response.data is not None else None,
+        warnings=response.warnings,
+        error=response.error,
+        diagnostics=response.diagnostics,
+    )
+
+
+def render_model(
+    model: BaseModel, *, request: Request | None, exclude_none: bool
+) -> Response:
+    """Encode a response model in a single pass, honouring the negotiated format."""
+    timer = None if request is None else installed_timer(request)
+    if timer is None:
+        return _render(model, request=request, exclude_none=exclude_none)
+    with timer.span("serialize"):
+        return _render(model, request=request, exclude_none=exclude_none)
+
+
+def _render(model: BaseModel, *, request: Request | None, exclude_none: bool) -> Response:
+    response_format = negotiate_format(request) if isinstance(model, ProcessResponse) else "json"
+    if response_format == "json":
+        return Response(
+            content=model.model_dump_json(exclude_none=exclude_none),
+            media_type=JSON_MEDIA_TYPE,
+        )
+
+    columnar = to_columnar(model)
+    if response_format == "msgpack" and msgpack is not None:
+        return Response(
+            content=msgpack.packb(
+                columnar.model_dump(mode="json", exclude_none=exclude_none),
+                use_bin_type=True,
+            ),
+            media_type=MSGPACK_MEDIA_TYPES[0],
+        )
+    return Response(
+        content=columnar.model_dump_json(exclude_none=exclude_none),
+        media_type=COLUMNAR_JSON_MEDIA_TYPE,
+    )
@@ -0,0 +1,83 @@
+"""Route class that serializes trusted response models in a single pass.
+
+By default FastAPI re-validates an endpoint's return value against ``response_model``,
+dumps it to Python primitives and then encodes those with the stdlib ``json`` module.
+Our process endpoints build their envelopes internally from already-validated data
+(see ``model_construct`` usage in the routes and services), so that work is redundant.
+
+``TrustedModelRoute`` wraps the endpoint so a returned pydantic model is encoded straight
+to bytes by pydantic-core, in the format negotiated for the request (see
+app.api.response_format). ``response_model`` is still used for the OpenAPI schema, and
+calling the endpoint function directly still returns the model.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+from app.api.response_format import render_model
+from app.schemas.process import ProcessResponse
+
+
+def _record_response_details(details: dict[str, Any], response: ProcessResponse) -> None:
+    """Summarise the envelope for the request log (see app.core.request_log)."""
+    details["status"] = response.status
+    if response.error is not None:
+        details["error_code"] = response.error.code
+    if response.warnings:
+        details["warning_codes"] = [warning.code for warning in response.warnings]
+    if response.diagnostics is not None:
+        details["outcomes"] = {step.step: step.status for step in response.diagnostics.trace.steps}
+        if response.diagnostics.ocr is not None:
+            details["ocr_provider"] = response.diagnostics.ocr.provider
+    pinyin = response.data.pinyin if response.data is not None else None
+    if pinyin is not None:
+        segments = pinyin.segments
+        details["segment_count"] = len(segments)
+        details["line_count"] = len({segment.line_id for segment in segments})
+        details["translated_lines"] = len(
+            {segment.line_id for segment in segments if segment.translation_text is not None}
+        )
+
+
+def _serialize_models(
+    endpoint: Callable[..., Awaitable[Any]], *, exclude_none: bool
+) -> Callable[..., Awaitable[Any]]:
+    # include_router() re-creates each route with the already wrapped endpoint; wrap once.
+    if getattr(endpoint, "__trusted_model_route__", False):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        result = await endpoint(*args, **kwargs)
+        if isinstance(result, BaseModel):
+            request = kwargs.get("request")
+            details = getattr(request.state, "details", None) if request is not None else None
+            if details is not None and isinstance(result, ProcessResponse):
+                _record_response_details(details, result)
+            response = render_model(result, request=request, exclude_none=exclude_none)
+            error = result.error if isinstance(result, ProcessResponse) else None
+            if error is not None and error.retry_after_seconds is not None:
+                response.status_code = 429
+                response.headers["Retry-After"] = str(error.retry_after_seconds)
+            return response
+        return result
+
+    wrapper.__trusted_model_route__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+class TrustedModelRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(
+            path,
+            _serialize_models(
+                endpoint, exclude_none=kwargs.get("response_model_exclude_none", False)
+            ),
+            **kwargs,
+        )
@@ -0,0 +1,166 @@
+"""Response envelopes and request bookkeeping shared by the /process routes."""
+
+from fastapi import Request
+
+from app.api.client_identity import client_key
+from app.core import sentry
+from app.core.metrics import metrics_store
+from app.core.settings import Settings
+from app.core.timing import RequestTimer
+from app.schemas.diagnostics import (
+    CostEstimate,
+    DiagnosticsPayload,
+    OcrDiagnostics,
+    OcrTierAttempt,
+    TimingInfo,
+    TimingSpan,
+    TraceInfo,
+    TraceStep,
+    TranslationDiagnostics,
+    UploadContext,
+)
+from app.schemas.process import ProcessError, ProcessResponse
+from app.services.client_limits import ClientRejection, get_client_limiter
+from app.services.diagnostics_service import build_diagnostics
+from app.services.image_validation import ImageValidationError
+from app.services.ocr_service import OcrResult
+from app.services.process_text_service import TextValidationError
+from app.services.retry import RetryStats
+
+
+def make_diagnostics(
+    *,
+    upload_context: UploadContext,
+    timer: RequestTimer,
+    trace_steps: list[TraceStep],
+    cost_estimate: CostEstimate | None,
+    ocr_result: OcrResult | None = None,
+    translation_retry: RetryStats | None = None,
+) -> DiagnosticsPayload:
+    ocr = None
+    if ocr_result is not None:
+        ocr = OcrDiagnostics.model_construct(
+            provider=ocr_result.provider,
+            tiers=[
+                OcrTierAttempt.model_construct(
+                    provider=attempt.provider,
+                    outcome=attempt.outcome,
+                    reason=attempt.reason,
+                    average_confidence=attempt.average_confidence,
+                    hedge_provider=attempt.hedge_provider,
+                    hedge_won=attempt.hedge_won,
+                    hedges=attempt.hedges,
+                    attempts=attempt.attempts,
+                )
+                for attempt in ocr_result.attempts
+            ],
+        )
+    translation = None
+    if translation_retry is not None and translation_retry.attempts:
+        translation = TranslationDiagnostics.model_construct(
+            attempts=translation_retry.attempts, retries=translation_retry.retries
+        )
+    return build_diagnostics(
+        upload_context=upload_context,
+        timing=TimingInfo.model_construct(
+            total_ms=timer.elapsed_ms(),
+            ocr_ms=timer.duration_ms("ocr"),
+            pinyin_ms=timer.duration_ms("pinyin"),
+            spans=[
+                TimingSpan.model_construct(
+                    name=span.name, start_ms=span.start_ms, duration_ms=span.duration_ms
+                )
+                for span in timer.spans
+            ],
+        ),
+        trace=TraceInfo.model_construct(steps=trace_steps),
+        cost_estimate=cost_estimate,
+        ocr=ocr,
+        translation=translation,
+    )
+
+
+def set_sentry_tag(key: str, value: str) -> None:
+    sentry.set_tag(key, value)
+
+
+def set_sentry_request_context(request_id: str) -> None:
+    set_sentry_tag("request_id", request_id)
+
+
+def build_cancelled_response(request_id: str) -> ProcessResponse:
+    """Envelope for a request whose client went away; it is logged but never delivered."""
+    set_sentry_tag("outcome", "cancelled")
+    metrics_store.increment("cancelled")
+    return ProcessResponse(
+        status="error",
+        request_id=request_id,
+        error=ProcessError(
+            category="request",
+            code="client_disconnected",
+            message="The request was cancelled because the client disconnected.",
+        ),
+    )
+
+
+def check_client_limits(
+    request: Request, settings: Settings
+) -> tuple[str | None, ClientRejection | None]:
+    """Return the client the request counts against, and its rejection if over a limit."""
+    limiter = get_client_limiter(settings)
+    if limiter is None:
+        return None, None
+    client = client_key(request, settings)
+    return client, limiter.check(client)
+
+
+def build_client_limit_response(request_id: str, rejection: ClientRejection) -> ProcessResponse:
+    set_sentry_tag("outcome", "error")
+    set_sentry_tag("error_category", "rate_limit")
+    metrics_store.increment("error")
+    if rejection.code == "client_rate_limited":
+        message = "Too many requests. Please wait a moment and try again."
+    else:
+        message = "Your daily processing quota has been reached. Please try again tomorrow."
+    return ProcessResponse(
+        status="error",
+        request_id=request_id,
+        error=ProcessError(
+            category="rate_limit",
+            code=rejection.code,
+            message=message,
+            retry_after_seconds=rejection.retry_after_s,
+        ),
+    )
+
+
+def build_busy_response(request_id: str) -> ProcessResponse:
+    set_sentry_tag("outcome", "error")
+    set_sentry_tag("error_category", "request")
+    metrics_store.increment("error")
+    return ProcessResponse(
+        status="error",
+        request_id=request_id,
+        error=ProcessError(
+            category="request",
+            code="server_busy",
+            message="The server is busy. Please try again in a moment.",
+        ),
+    )
+
+
+def build_validation_error_response(
+    request_id: str, error: ImageValidationError | TextValidationError
+) -> ProcessResponse:
+    set_sentry_tag("outcome", "error")
+    set_sentry_tag("error_category", error.category)
+    metrics_store.increment("error")
+    return ProcessResponse(
+        status="error",
+        request_id=request_id,
+        error=ProcessError(
+            category=error.category,
+            code=error.code,
+            message=error.message,
+        ),
+    )
@@ -0,0 +1,32 @@
+import logging
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException
+
+from app.core.settings import get_settings, reload_settings
+from app.schemas.admin import SettingsReloadResponse
+
+router = APIRouter(prefix="/admin")
+logger = logging.getLogger(__name__)
+
+
+def require_admin_token(x_admin_token: str | None) -> None:
+    """Reject the request unless it carries the configured ADMIN_TOKEN.
+
+    Admin endpoints are hidden (404) when no ADMIN_TOKEN is configured.
+    """
+    expected = get_settings().admin_token
+    if expected is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@router.post("/reload-settings", response_model=SettingsReloadResponse)
+async def reload_settings_endpoint(
+    x_admin_token: str | None = Header(default=None),
+) -> SettingsReloadResponse:
+    require_admin_token(x_admin_token)
+    reload_settings()
+    logger.info("Settings reloaded via admin endpoint")
+    return SettingsReloadResponse(status="reloaded")
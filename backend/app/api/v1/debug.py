@@ -0,0 +1,91 @@
+from typing import Literal
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+from app.api.v1.admin import require_admin_token
+from app.core.profiling import profile_store, to_collapsed, to_speedscope
+from app.core.request_log import RequestRecord, request_log
+from app.schemas.debug import (
+    ProfileListResponse,
+    ProfileSummary,
+    RequestLogEntry,
+    RequestLogSpan,
+    SlowRequestsResponse,
+)
+
+router = APIRouter(prefix="/debug")
+
+
+@router.get("/profiles", response_model=ProfileListResponse)
+async def list_profiles(
+    x_admin_token: str | None = Header(default=None),
+) -> ProfileListResponse:
+    require_admin_token(x_admin_token)
+    return ProfileListResponse(
+        profiles=[
+            ProfileSummary(
+                request_id=profile.request_id,
+                method=profile.method,
+                path=profile.path,
+                started_at=profile.started_at,
+                duration_ms=profile.duration_ms,
+                sample_count=profile.sample_count,
+            )
+            for profile in profile_store.recent()
+        ]
+    )
+
+
+@router.get(
+    "/profiles/{request_id}",
+    responses={
+        200: {
+            "content": {"text/plain": {}, "application/json": {}},
+            "description": "Collapsed stacks (text) or a speedscope document (JSON).",
+        }
+    },
+)
+async def get_profile(
+    request_id: str,
+    format: Literal["collapsed", "speedscope"] = "speedscope",
+    x_admin_token: str | None = Header(default=None),
+) -> Response:
+    require_admin_token(x_admin_token)
+    profile = profile_store.get(request_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "collapsed":
+        return PlainTextResponse(to_collapsed(profile))
+    return JSONResponse(
+        to_speedscope(profile),
+        headers={"content-disposition": f'attachment; filename="{request_id}.speedscope.json"'},
+    )
+
+
+def _log_entry(record: RequestRecord) -> RequestLogEntry:
+    return RequestLogEntry(
+        request_id=record.request_id,
+        method=record.method,
+        path=record.path,
+        started_at=record.started_at,
+        total_ms=record.total_ms,
+        http_status=record.http_status,
+        response_bytes=record.response_bytes,
+        spans=[
+            RequestLogSpan(name=name, duration_ms=duration_ms)
+            for name, duration_ms in record.spans
+        ],
+        **record.details,
+    )
+
+
+@router.get("/slow", response_model=SlowRequestsResponse)
+async def get_slow_requests(
+    x_admin_token: str | None = Header(default=None),
+) -> SlowRequestsResponse:
+    require_admin_token(x_admin_token)
+    return SlowRequestsResponse(
+        slowest=[_log_entry(record) for record in request_log.slowest()],
+        recent=[_log_entry(record) for record in request_log.recent()],
+    )
@@ -1,10 +1,50 @@
-from fastapi import APIRouter
+from dataclasses import asdict
 
-from app.schemas.health import HealthResponse
+from fastapi import APIRouter, Response
+
+from app.core.circuit_breaker import breaker_snapshots
+from app.core.warmup import readiness
+from app.schemas.health import (
+    CircuitBreakerInfo,
+    HealthResponse,
+    ReadinessResponse,
+    WarmupStepInfo,
+)
 
 router = APIRouter()
 
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check() -> HealthResponse:
-    return HealthResponse(status="healthy")
+    breakers = circuit_breaker_infos()
+    degraded = any(breaker.state != "closed" for breaker in breakers.values())
+    return HealthResponse(status="degraded" if degraded else "healthy", circuit_breakers=breakers)
+
+
+def circuit_breaker_infos() -> dict[str, CircuitBreakerInfo]:
+    return {
+        name: CircuitBreakerInfo(**asdict(snapshot))
+        for name, snapshot in breaker_snapshots().items()
+    }
+
+
+@router.get(
+    "/health/ready",
+    response_model=ReadinessResponse,
+    responses={503: {"model": ReadinessResponse, "description": "Warmup still running."}},
+)
+async def readiness_check(response: Response) -> ReadinessResponse:
+    """Report whether background warmup has finished (503 while it is still running)."""
+    if not readiness.is_ready:
+        response.status_code = 503
+    warmup_ms = None
+    if readiness.started_at is not None and readiness.ready_at is not None:
+        warmup_ms = (readiness.ready_at - readiness.started_at) * 1000
+    return ReadinessResponse(
+        status="ready" if readiness.is_ready else "warming",
+        warmup_ms=warmup_ms,
+        steps=[
+            WarmupStepInfo(name=step.name, status=step.status, duration_ms=step.duration_ms)
+            for step in readiness.steps
+        ],
+    )
@@ -1,7 +1,17 @@
+from dataclasses import asdict
+
 from fastapi import APIRouter
 
+from app.api.v1.health import circuit_breaker_infos
+from app.core.concurrency_limit import limiter_snapshots
 from app.core.metrics import metrics_store
-from app.schemas.health import DailyCostEntry, MetricsResponse
+from app.core.scheduling import workload_snapshots
+from app.schemas.health import (
+    ConcurrencyLimitInfo,
+    DailyCostEntry,
+    MetricsResponse,
+    WorkloadClassInfo,
+)
 from app.services import budget_service
 
 router = APIRouter()
@@ -13,4 +23,16 @@ async def get_metrics() -> MetricsResponse:
         date: DailyCostEntry(**entry)
         for date, entry in budget_service.daily_cost_store.snapshot().items()
     }
-    return MetricsResponse(**metrics_store.snapshot(), daily_costs=daily_costs)
+    return MetricsResponse(
+        **metrics_store.snapshot(),
+        circuit_breakers=circuit_breaker_infos(),
+        concurrency_limits={
+            name: ConcurrencyLimitInfo(**asdict(snapshot))
+            for name, snapshot in limiter_snapshots().items()
+        },
+        workload_classes={
+            name: WorkloadClassInfo(**asdict(snapshot))
+            for name, snapshot in workload_snapshots().items()
+        },
+        daily_costs=daily_costs,
+    )
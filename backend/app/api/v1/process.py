@@ -1,40 +1,62 @@
+import asyncio
+import contextlib
 import logging
 import time
+from collections.abc import Awaitable
 from io import BytesIO
 from uuid import uuid4
 
 from fastapi import APIRouter, Request, UploadFile
-
+from starlette.requests import ClientDisconnect
+
+from app.api.disconnect import ClientDisconnectedError, cancel_on_disconnect
+from app.api.response_format import FORMAT_QUERY_PARAMETER
+from app.api.routing import TrustedModelRoute
+from app.api.v1._envelope import (
+    build_busy_response,
+    build_cancelled_response,
+    build_client_limit_response,
+    build_validation_error_response,
+    check_client_limits,
+    make_diagnostics,
+    set_sentry_request_context,
+    set_sentry_tag,
+)
 from app.core.metrics import metrics_store
+from app.core.request_log import request_details
+from app.core.scheduling import SchedulerTimeoutError, admitted
+from app.core.settings import Settings, get_settings
+from app.core.timing import RequestTimer, request_timer
 from app.schemas.diagnostics import (
     CostEstimate,
-    DiagnosticsPayload,
-    TimingInfo,
-    TraceInfo,
     TraceStep,
     UploadContext,
 )
-from app.schemas.process import OcrData, ProcessData, ProcessError, ProcessResponse, ProcessWarning
+from app.schemas.process import ProcessData, ProcessError, ProcessResponse, ProcessWarning
 from app.services import budget_service
-from app.services.diagnostics_service import build_diagnostics
 from app.services.image_validation import (
     ALLOWED_IMAGE_MIME_TYPES,
     ImageValidationError,
-    get_configured_max_upload_bytes,
+    inspect_image_upload,
     validate_image_upload,
+    verify_image_integrity,
+)
+from app.services.ocr_service import (
+    OcrResult,
+    OcrServiceError,
+    OcrTierAttempt,
+    is_low_confidence,
+    providers_called,
+    run_ocr,
 )
-from app.services.ocr_service import OcrServiceError, extract_chinese_segments, is_low_confidence
+from app.services.ocr_tiling import plan_tiles, should_tile
 from app.services.pinyin_service import PinyinServiceError, generate_pinyin
 from app.services.reading_service import build_reading_projection
+from app.services.retry import RetryStats
+from app.services.segments import to_ocr_data, to_pinyin_data
 from app.services.translation_service import enrich_translations
 
-try:
-    import sentry_sdk
-except ImportError:  # pragma: no cover
-    # Dependency should be installed, but requests must still work.
-    sentry_sdk = None
-
-router = APIRouter()
+router = APIRouter(route_class=TrustedModelRoute)
 logger = logging.getLogger(__name__)
 
 
@@ -62,38 +84,54 @@ async def _read_request_body_with_limit(request: Request, *, max_bytes: int) ->
     return b"".join(chunks)
 
 
-def _make_diagnostics(
+async def _verify_integrity(image_bytes: bytes, timer: RequestTimer) -> None:
+    with timer.span("integrity_check"):
+        await asyncio.to_thread(verify_image_integrity, image_bytes)
+
+
+def _record_ocr_cost(
+    attempts: list[OcrTierAttempt],
     *,
-    upload_context: UploadContext,
-    start_time: float,
-    ocr_ms: float,
-    pinyin_ms: float,
-    trace_steps: list[TraceStep],
-    cost_estimate: CostEstimate | None,
-) -> DiagnosticsPayload:
-    return build_diagnostics(
-        upload_context=upload_context,
-        timing=TimingInfo(
-            total_ms=(time.monotonic() - start_time) * 1000,
-            ocr_ms=ocr_ms,
-            pinyin_ms=pinyin_ms,
-        ),
-        trace=TraceInfo(steps=trace_steps),
-        cost_estimate=cost_estimate,
+    ocr_calls: int = 1,
+    client: str | None,
+    settings: Settings,
+) -> CostEstimate:
+    """Charge the OCR tiers that ran (a cascade may stop at a free tier), even on failure."""
+    cost_estimate = budget_service.estimate_ocr_cost(
+        providers_called(attempts), ocr_calls=ocr_calls
     )
+    budget_service.record_request_cost(cost_estimate, client=client, settings=settings)
+    return cost_estimate
 
 
-def _set_sentry_tag(key: str, value: str) -> None:
-    if sentry_sdk is None:
-        return
+async def _run_speculative_ocr(
+    ocr_call: Awaitable[OcrResult],
+    integrity_check: Awaitable[None],
+    *,
+    client: str | None,
+    settings: Settings,
+) -> OcrResult:
+    """Run ``ocr_call`` while ``integrity_check`` decodes the image; a failed decode wins.
+
+    If the image turns out to be corrupt the OCR call is cancelled, or its result
+    discarded when it already arrived (it is still charged: the provider billed it).
+    """
+    ocr_task = asyncio.ensure_future(ocr_call)
     try:
-        sentry_sdk.set_tag(key, value)
-    except Exception:
-        pass
-
-
-def _set_sentry_request_context(request_id: str) -> None:
-    _set_sentry_tag("request_id", request_id)
+        await integrity_check
+    except BaseException:
+        if not ocr_task.done():
+            ocr_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await ocr_task
+        elif not ocr_task.cancelled():
+            error = ocr_task.exception()
+            if error is None:
+                _record_ocr_cost(ocr_task.result().attempts, client=client, settings=settings)
+            elif isinstance(error, OcrServiceError):
+                _record_ocr_cost(error.attempts, client=client, settings=settings)
+        raise
+    return await ocr_task
 
 
 async def _build_process_response(
@@ -101,20 +139,28 @@ async def _build_process_response(
     content_type: str,
     *,
     request_id: str,
-    start_time: float,
+    timer: RequestTimer,
+    settings: Settings | None = None,
+    tile_count: int = 0,
+    client: str | None = None,
+    integrity_check: Awaitable[None] | None = None,
 ) -> ProcessResponse:
+    """Run OCR, pinyin and translation for an uploaded image.
+
+    With ``integrity_check`` (speculative OCR) the image has only passed the header
+    checks; OCR runs while the check completes, and an ImageValidationError from it is
+    raised instead of a response.
+    """
+    settings = settings or get_settings()
     upload_context = UploadContext(
         content_type=content_type,
         file_size_bytes=len(image_bytes) if image_bytes else 0,
     )
-    cost_estimate = budget_service.estimate_request_cost(
-        file_size_bytes=upload_context.file_size_bytes
-    )
     trace_steps: list[TraceStep] = []
 
     if not image_bytes:
-        _set_sentry_tag("outcome", "error")
-        _set_sentry_tag("error_category", "upload")
+        set_sentry_tag("outcome", "error")
+        set_sentry_tag("error_category", "upload")
         metrics_store.increment("error")
         return ProcessResponse(
             status="error",
@@ -126,16 +172,34 @@ async def _build_process_response(
             ),
         )
 
-    ocr_start = time.monotonic()
+    deadline = timer.deadline(settings.request_deadline_s)
     try:
-        segments = await extract_chinese_segments(image_bytes, content_type)
-        ocr_ms = (time.monotonic() - ocr_start) * 1000
-        budget_service.record_request_cost(cost_estimate)
+        with timer.span("ocr"):
+            ocr_call = run_ocr(
+                image_bytes,
+                content_type,
+                tiled=tile_count > 0,
+                settings=settings,
+                deadline=deadline,
+            )
+            if integrity_check is None:
+                ocr_result = await ocr_call
+            else:
+                ocr_result = await _run_speculative_ocr(
+                    ocr_call, integrity_check, client=client, settings=settings
+                )
+        segments = ocr_result.segments
+        cost_estimate = _record_ocr_cost(
+            ocr_result.attempts, ocr_calls=max(tile_count, 1), client=client, settings=settings
+        )
         trace_steps.append(TraceStep(step="ocr", status="ok"))
     except OcrServiceError as error:
+        _record_ocr_cost(
+            error.attempts, ocr_calls=max(tile_count, 1), client=client, settings=settings
+        )
         trace_steps.append(TraceStep(step="ocr", status="failed"))
-        _set_sentry_tag("outcome", "error")
-        _set_sentry_tag("error_category", error.category)
+        set_sentry_tag("outcome", "error")
+        set_sentry_tag("error_category", error.category)
         metrics_store.increment("error")
         return ProcessResponse(
             status="error",
@@ -143,35 +207,38 @@ async def _build_process_response(
             error=ProcessError(category=error.category, code=error.code, message=error.message),
         )
 
-    pinyin_start = time.monotonic()
+    translation_retry = RetryStats()
     try:
-        pinyin_data = await generate_pinyin(segments)
-        pinyin_ms = (time.monotonic() - pinyin_start) * 1000
-        pinyin_data = await enrich_translations(pinyin_data)
-        try:
-            reading_data = build_reading_projection(pinyin_data)
-        except Exception:
-            logger.exception("reading projection failed; falling back to reading=None")
-            reading_data = None
+        with timer.span("pinyin"):
+            pinyin_data = await generate_pinyin(segments)
+        with timer.span("translation"):
+            pinyin_data = await enrich_translations(
+                pinyin_data, settings=settings, deadline=deadline, stats=translation_retry
+            )
+        with timer.span("reading"):
+            try:
+                reading_data = build_reading_projection(pinyin_data)
+            except Exception:
+                logger.exception("reading projection failed; falling back to reading=None")
+                reading_data = None
         trace_steps.append(TraceStep(step="pinyin", status="ok"))
     except PinyinServiceError as error:
-        pinyin_ms = (time.monotonic() - pinyin_start) * 1000
         trace_steps.append(TraceStep(step="pinyin", status="failed"))
-        _set_sentry_tag("outcome", "partial")
-        diagnostics = _make_diagnostics(
+        set_sentry_tag("outcome", "partial")
+        diagnostics = make_diagnostics(
             upload_context=upload_context,
-            start_time=start_time,
-            ocr_ms=ocr_ms,
-            pinyin_ms=pinyin_ms,
+            timer=timer,
             trace_steps=trace_steps,
             cost_estimate=cost_estimate,
+            ocr_result=ocr_result,
+            translation_retry=translation_retry,
         )
         metrics_store.increment("partial")
-        return ProcessResponse(
+        return ProcessResponse.model_construct(
             status="partial",
             request_id=request_id,
-            data=ProcessData(
-                ocr=OcrData(segments=segments),
+            data=ProcessData.model_construct(
+                ocr=to_ocr_data(segments),
                 job_id=None,
             ),
             warnings=[
@@ -184,24 +251,24 @@ async def _build_process_response(
             diagnostics=diagnostics,
         )
 
-    if is_low_confidence(segments):
+    if is_low_confidence(segments, settings):
         trace_steps.append(TraceStep(step="confidence_check", status="failed"))
-        _set_sentry_tag("outcome", "partial")
-        diagnostics = _make_diagnostics(
+        set_sentry_tag("outcome", "partial")
+        diagnostics = make_diagnostics(
             upload_context=upload_context,
-            start_time=start_time,
-            ocr_ms=ocr_ms,
-            pinyin_ms=pinyin_ms,
+            timer=timer,
             trace_steps=trace_steps,
             cost_estimate=cost_estimate,
+            ocr_result=ocr_result,
+            translation_retry=translation_retry,
         )
         metrics_store.increment("partial")
-        return ProcessResponse(
+        return ProcessResponse.model_construct(
             status="partial",
             request_id=request_id,
-            data=ProcessData(
-                ocr=OcrData(segments=segments),
-                pinyin=pinyin_data,
+            data=ProcessData.model_construct(
+                ocr=to_ocr_data(segments),
+                pinyin=to_pinyin_data(pinyin_data),
                 reading=None,
                 job_id=None,
             ),
@@ -218,22 +285,22 @@ async def _build_process_response(
         )
 
     trace_steps.append(TraceStep(step="confidence_check", status="ok"))
-    _set_sentry_tag("outcome", "success")
-    diagnostics = _make_diagnostics(
+    set_sentry_tag("outcome", "success")
+    diagnostics = make_diagnostics(
         upload_context=upload_context,
-        start_time=start_time,
-        ocr_ms=ocr_ms,
-        pinyin_ms=pinyin_ms,
+        timer=timer,
         trace_steps=trace_steps,
         cost_estimate=cost_estimate,
+        ocr_result=ocr_result,
+        translation_retry=translation_retry,
     )
     metrics_store.increment("success")
-    return ProcessResponse(
+    return ProcessResponse.model_construct(
         status="success",
         request_id=request_id,
-        data=ProcessData(
-            ocr=OcrData(segments=segments),
-            pinyin=pinyin_data,
+        data=ProcessData.model_construct(
+            ocr=to_ocr_data(segments),
+            pinyin=to_pinyin_data(pinyin_data),
             reading=reading_data,
             job_id=None,
         ),
@@ -241,47 +308,38 @@ async def _build_process_response(
     )
 
 
-def _build_validation_error_response(
-    request_id: str, error: ImageValidationError
-) -> ProcessResponse:
-    _set_sentry_tag("outcome", "error")
-    _set_sentry_tag("error_category", error.category)
-    metrics_store.increment("error")
-    return ProcessResponse(
-        status="error",
-        request_id=request_id,
-        error=ProcessError(
-            category=error.category,
-            code=error.code,
-            message=error.message,
-        ),
-    )
-
-
 @router.post('/process',
     response_model=ProcessResponse,
     response_model_exclude_none=True,
     openapi_extra={
+        "parameters": [FORMAT_QUERY_PARAMETER],
         "requestBody": {
             "required": True,
             "content": _binary_openapi_content(),
-        }
+        },
     },
 )
 async def process_image(
     request: Request,
 ) -> ProcessResponse:
-    start_time = time.monotonic()
+    timer = request_timer(request)
+    details = request_details(request)
     request_id = getattr(request.state, "request_id", None) or str(uuid4())
-    _set_sentry_request_context(request_id)
-    max_bytes = get_configured_max_upload_bytes()
+    set_sentry_request_context(request_id)
+    settings = get_settings()
+    max_bytes = settings.max_upload_bytes
+
+    # Checked before the upload is read, so a rejected client costs next to nothing.
+    client, rejection = check_client_limits(request, settings)
+    if rejection is not None:
+        return build_client_limit_response(request_id, rejection)
 
     # Guard: check Content-Length before reading the full body into memory (DoS protection).
     content_length = request.headers.get("content-length")
     if content_length is not None:
         try:
             if int(content_length) > max_bytes:
-                return _build_validation_error_response(
+                return build_validation_error_response(
                     request_id=request_id,
                     error=ImageValidationError(
                         code="file_too_large",
@@ -292,14 +350,20 @@ async def process_image(
             pass  # Malformed Content-Length header; let validation handle it after body read.
 
     try:
-        file_bytes = await _read_request_body_with_limit(
-            request,
-            max_bytes=max_bytes,
-        )
+        with timer.span("body_read"):
+            file_bytes = await _read_request_body_with_limit(
+                request,
+                max_bytes=max_bytes,
+            )
     except ImageValidationError as error:
-        return _build_validation_error_response(request_id=request_id, error=error)
+        return build_validation_error_response(request_id=request_id, error=error)
+    except ClientDisconnect:
+        logger.info("client disconnected during upload request_id=%s", request_id)
+        return build_cancelled_response(request_id)
 
     content_type = (request.headers.get("content-type") or "").split(";")[0].strip().lower()
+    details["request_bytes"] = len(file_bytes)
+    details["content_type"] = content_type
     file = None
     if file_bytes:
         file = UploadFile(
@@ -308,10 +372,35 @@ async def process_image(
             headers={"content-type": content_type},
         )
 
+    # Speculative OCR: only the header is checked up front, and the full decode runs
+    # alongside the OCR call instead of before it.
+    speculative = settings.speculative_ocr
     try:
-        validate_image_upload(file)
+        with timer.span("validation"):
+            # Decoding can take tens of milliseconds; keep it off the event loop.
+            validated_image = await asyncio.to_thread(
+                inspect_image_upload if speculative else validate_image_upload,
+                file,
+                settings=settings,
+            )
     except ImageValidationError as error:
-        return _build_validation_error_response(request_id=request_id, error=error)
+        return build_validation_error_response(request_id=request_id, error=error)
+    details["image_width"] = validated_image.width
+    details["image_height"] = validated_image.height
+    tile_count = 0
+    if should_tile(validated_image.width, validated_image.height, settings):
+        tile_count = len(
+            plan_tiles(validated_image.width, validated_image.height, settings.ocr_tiling)
+        )
+        details["ocr_tiles"] = tile_count
+        if speculative:
+            # Tiling crops the decoded image, so it cannot start before the decode.
+            speculative = False
+            try:
+                await _verify_integrity(file_bytes, timer)
+            except ImageValidationError as error:
+                return build_validation_error_response(request_id=request_id, error=error)
+    details["speculative_ocr"] = speculative
 
     logger.info(
         "input_guardrail_pass file_size_bytes=%d content_type=%s",
@@ -319,12 +408,13 @@ async def process_image(
         content_type,
     )
 
-    budget_threshold = budget_service.check_budget_threshold()
-    enforce_mode = budget_service.get_budget_enforce_mode()
+    with timer.span("budget_check"):
+        budget_threshold = budget_service.check_budget_threshold(settings)
+        enforce_mode = budget_service.get_budget_enforce_mode(settings)
 
     if budget_threshold == "exceeded" and enforce_mode == "block":
-        _set_sentry_tag("outcome", "error")
-        _set_sentry_tag("error_category", "budget")
+        set_sentry_tag("outcome", "error")
+        set_sentry_tag("error_category", "budget")
         metrics_store.increment("error")
         return ProcessResponse(
             status="error",
@@ -352,20 +442,37 @@ async def process_image(
             ),
         )
 
-    response = await _build_process_response(
-        file_bytes,
-        content_type,
-        request_id=request_id,
-        start_time=start_time,
-    )
+    async def run_admitted() -> ProcessResponse:
+        # Image requests wait behind their class cap (see app.core.scheduling).
+        queue_timeout = max(timer.deadline(settings.request_deadline_s) - time.monotonic(), 0.0)
+        async with admitted("image", settings, timeout=queue_timeout):
+            return await _build_process_response(
+                file_bytes,
+                content_type,
+                request_id=request_id,
+                timer=timer,
+                settings=settings,
+                tile_count=tile_count,
+                client=client,
+                integrity_check=_verify_integrity(file_bytes, timer) if speculative else None,
+            )
+
+    # Stages not yet run are skipped if the client leaves; costs are recorded per stage
+    # as it completes, so nothing is charged for them.
+    try:
+        response = await cancel_on_disconnect(request, run_admitted())
+    except ClientDisconnectedError:
+        logger.info("client disconnected during processing request_id=%s", request_id)
+        return build_cancelled_response(request_id)
+    except SchedulerTimeoutError:
+        return build_busy_response(request_id)
+    except ImageValidationError as error:
+        logger.info("speculative OCR discarded: %s request_id=%s", error.code, request_id)
+        return build_validation_error_response(request_id=request_id, error=error)
 
     if budget_warn is not None and response.status != "error":
-        return ProcessResponse(
-            status="partial",
-            request_id=response.request_id,
-            data=response.data,
-            warnings=(response.warnings or []) + [budget_warn],
-            diagnostics=response.diagnostics,
+        return response.model_copy(
+            update={"status": "partial", "warnings": (response.warnings or []) + [budget_warn]}
         )
 
     return response
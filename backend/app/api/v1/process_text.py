@@ -1,121 +1,233 @@
+import asyncio
+import codecs
+import heapq
+import io
 import logging
+import tempfile
 import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from typing import IO, Any
 from uuid import uuid4
 
 from fastapi import APIRouter, Request
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
 
-from app.api.v1.process import (
-    _build_validation_error_response,
-    _make_diagnostics,
-    _set_sentry_request_context,
-    _set_sentry_tag,
+from app.api.response_format import FORMAT_QUERY_PARAMETER
+from app.api.routing import TrustedModelRoute
+from app.api.v1._envelope import (
+    build_busy_response,
+    build_cancelled_response,
+    build_client_limit_response,
+    build_validation_error_response,
+    check_client_limits,
+    make_diagnostics,
+    set_sentry_request_context,
+    set_sentry_tag,
 )
 from app.core.metrics import metrics_store
+from app.core.request_log import request_details
+from app.core.scheduling import SchedulerTimeoutError, admitted
+from app.core.settings import Settings, get_settings
+from app.core.timing import RequestTimer, request_timer
 from app.schemas.diagnostics import CostEstimate, TraceStep, UploadContext
 from app.schemas.process import (
-    PinyinData,
-    PinyinSegment,
     ProcessData,
     ProcessError,
     ProcessResponse,
     ProcessWarning,
+    TextDocumentChunk,
+    TextDocumentEnd,
     TextProcessRequest,
 )
 from app.services import budget_service
 from app.services.pinyin_service import PinyinServiceError, generate_pinyin
-from app.services.process_text_service import TextValidationError, build_text_segments
+from app.services.process_text_service import (
+    TextValidationError,
+    build_text_segments,
+    contains_chinese_text,
+    iter_text_chunks,
+)
 from app.services.reading_service import build_reading_projection
+from app.services.retry import RetryStats
+from app.services.segments import AnnotatedSegment, PinyinResult, TextSegment, to_pinyin_data
 from app.services.translation_service import enrich_translations
 
-router = APIRouter()
+router = APIRouter(route_class=TrustedModelRoute)
 logger = logging.getLogger(__name__)
 
 
+def _line_order(segment: AnnotatedSegment) -> float:
+    return segment.line_id if segment.line_id is not None else float("inf")
+
+
+def _merge_passthrough(
+    pinyin_data: PinyinResult, passthrough_segments: list[TextSegment]
+) -> PinyinResult:
+    """Put lines without Chinese text back between the annotated lines, unchanged."""
+    if not passthrough_segments:
+        return pinyin_data
+    return PinyinResult(
+        segments=list(
+            heapq.merge(
+                pinyin_data.segments,
+                (
+                    AnnotatedSegment(
+                        source_text=s.text,
+                        pinyin_text=s.text,
+                        alignment_status="aligned",
+                        line_id=s.line_id,
+                    )
+                    for s in passthrough_segments
+                ),
+                key=_line_order,
+            )
+        )
+    )
+
+
+def _build_budget_blocked_response(request_id: str) -> ProcessResponse:
+    set_sentry_tag("outcome", "error")
+    set_sentry_tag("error_category", "budget")
+    metrics_store.increment("error")
+    return ProcessResponse(
+        status="error",
+        request_id=request_id,
+        error=ProcessError(
+            category="budget",
+            code="budget_daily_limit_exceeded",
+            message="Daily processing budget has been reached. Please try again tomorrow.",
+        ),
+    )
+
+
+def _budget_warning(budget_threshold: str) -> ProcessWarning | None:
+    if budget_threshold not in ("warn", "exceeded"):
+        return None
+    return ProcessWarning(
+        category="budget",
+        code=(
+            "budget_daily_limit_reached"
+            if budget_threshold == "exceeded"
+            else "budget_approaching_daily_limit"
+        ),
+        message=(
+            "Daily processing budget has been reached. Results may be limited soon."
+            if budget_threshold == "exceeded"
+            else "Daily processing budget is nearly reached."
+        ),
+    )
+
+
 @router.post(
     "/process-text",
     response_model=ProcessResponse,
     response_model_exclude_none=True,
+    openapi_extra={"parameters": [FORMAT_QUERY_PARAMETER]},
 )
 async def process_text(payload: TextProcessRequest, request: Request) -> ProcessResponse:
-    start_time = time.monotonic()
+    timer = request_timer(request)
+    # FastAPI has already read and validated the JSON body by the time we get here.
+    timer.record_since_start("body_read")
+    details = request_details(request)
+    source_bytes = len(payload.source_text.encode("utf-8"))
+    details["request_bytes"] = source_bytes
+    details["content_type"] = "text/plain"
     request_id = getattr(request.state, "request_id", None) or str(uuid4())
-    _set_sentry_request_context(request_id)
+    set_sentry_request_context(request_id)
+    settings = get_settings()
+
+    client, rejection = check_client_limits(request, settings)
+    if rejection is not None:
+        return build_client_limit_response(request_id, rejection)
 
-    budget_threshold = budget_service.check_budget_threshold()
-    enforce_mode = budget_service.get_budget_enforce_mode()
+    # Text requests queue separately from image requests, with a larger share of the
+    # request slots (see app.core.scheduling).
+    queue_timeout = max(timer.deadline(settings.request_deadline_s) - time.monotonic(), 0.0)
+    try:
+        async with admitted("text", settings, timeout=queue_timeout):
+            return await _process_admitted_text(
+                payload,
+                request_id=request_id,
+                timer=timer,
+                settings=settings,
+                source_bytes=source_bytes,
+                client=client,
+            )
+    except SchedulerTimeoutError:
+        return build_busy_response(request_id)
+
+
+async def _process_admitted_text(
+    payload: TextProcessRequest,
+    *,
+    request_id: str,
+    timer: RequestTimer,
+    settings: Settings,
+    source_bytes: int,
+    client: str | None,
+) -> ProcessResponse:
+    with timer.span("budget_check"):
+        budget_threshold = budget_service.check_budget_threshold(settings)
+        enforce_mode = budget_service.get_budget_enforce_mode(settings)
     if budget_threshold == "exceeded" and enforce_mode == "block":
-        _set_sentry_tag("outcome", "error")
-        _set_sentry_tag("error_category", "budget")
-        metrics_store.increment("error")
-        return ProcessResponse(
-            status="error",
-            request_id=request_id,
-            error=ProcessError(
-                category="budget",
-                code="budget_daily_limit_exceeded",
-                message="Daily processing budget has been reached. Please try again tomorrow.",
-            ),
-        )
+        return _build_budget_blocked_response(request_id)
 
     try:
-        segments = build_text_segments(payload.source_text)
+        with timer.span("validation"):
+            segments = build_text_segments(payload.source_text, settings=settings)
     except TextValidationError as error:
-        return _build_validation_error_response(request_id=request_id, error=error)
+        return build_validation_error_response(request_id=request_id, error=error)
 
     cjk_segments = [s for s in segments if s.language == "zh"]
     passthrough_segments = [s for s in segments if s.language != "zh"]
 
     upload_context = UploadContext(
         content_type="text/plain",
-        file_size_bytes=len(payload.source_text.encode("utf-8")),
+        file_size_bytes=source_bytes,
     )
     translated_char_count = sum(len(segment.text) for segment in cjk_segments)
     cost_estimate = budget_service.estimate_text_processing_cost(
-        char_count=translated_char_count
+        char_count=translated_char_count, settings=settings
     )
 
-    pinyin_start = time.monotonic()
+    translation_retry = RetryStats()
     try:
-        pinyin_data = await generate_pinyin(cjk_segments)
-        pinyin_ms = (time.monotonic() - pinyin_start) * 1000
-        try:
-            pinyin_data = await enrich_translations(pinyin_data)
-        except Exception:
-            logger.exception("translation enrichment failed; continuing without translations")
-            cost_estimate = CostEstimate(confidence="unavailable")
-        if passthrough_segments:
-            passthrough_pinyin = [
-                PinyinSegment(
-                    source_text=s.text,
-                    pinyin_text=s.text,
-                    alignment_status="aligned",
-                    line_id=s.line_id,
+        with timer.span("pinyin"):
+            pinyin_data = await generate_pinyin(cjk_segments)
+        with timer.span("translation"):
+            try:
+                pinyin_data = await enrich_translations(
+                    pinyin_data,
+                    settings=settings,
+                    deadline=timer.deadline(settings.request_deadline_s),
+                    stats=translation_retry,
                 )
-                for s in passthrough_segments
-            ]
-            merged = pinyin_data.segments + passthrough_pinyin
-            merged.sort(key=lambda seg: seg.line_id if seg.line_id is not None else float("inf"))
-            pinyin_data = PinyinData(segments=merged)
-        budget_service.record_request_cost(cost_estimate)
-        try:
-            reading_data = build_reading_projection(pinyin_data)
-        except Exception:
-            logger.exception(
-                "reading projection failed for pasted text; falling back to reading=None"
-            )
-            reading_data = None
+            except Exception:
+                logger.exception(
+                    "translation enrichment failed; continuing without translations"
+                )
+                cost_estimate = CostEstimate(confidence="unavailable")
+        pinyin_data = _merge_passthrough(pinyin_data, passthrough_segments)
+        budget_service.record_request_cost(cost_estimate, client=client, settings=settings)
+        with timer.span("reading"):
+            try:
+                reading_data = build_reading_projection(pinyin_data)
+            except Exception:
+                logger.exception(
+                    "reading projection failed for pasted text; falling back to reading=None"
+                )
+                reading_data = None
         trace_steps = [
             TraceStep(step="ocr", status="skipped"),
             TraceStep(step="pinyin", status="ok"),
         ]
     except PinyinServiceError as error:
-        pinyin_ms = (time.monotonic() - pinyin_start) * 1000
-        _set_sentry_tag("outcome", "partial")
-        diagnostics = _make_diagnostics(
+        set_sentry_tag("outcome", "partial")
+        diagnostics = make_diagnostics(
             upload_context=upload_context,
-            start_time=start_time,
-            ocr_ms=0.0,
-            pinyin_ms=pinyin_ms,
+            timer=timer,
             trace_steps=[
                 TraceStep(step="ocr", status="skipped"),
                 TraceStep(step="pinyin", status="failed"),
@@ -123,10 +235,10 @@ async def process_text(payload: TextProcessRequest, request: Request) -> Process
             cost_estimate=cost_estimate,
         )
         metrics_store.increment("partial")
-        return ProcessResponse(
+        return ProcessResponse.model_construct(
             status="partial",
             request_id=request_id,
-            data=ProcessData(
+            data=ProcessData.model_construct(
                 message=(
                     "Text was accepted, but pronunciation generation is temporarily"
                     " unavailable."
@@ -143,51 +255,413 @@ async def process_text(payload: TextProcessRequest, request: Request) -> Process
             diagnostics=diagnostics,
         )
 
-    diagnostics = _make_diagnostics(
+    diagnostics = make_diagnostics(
         upload_context=upload_context,
-        start_time=start_time,
-        ocr_ms=0.0,
-        pinyin_ms=pinyin_ms,
+        timer=timer,
         trace_steps=trace_steps,
         cost_estimate=cost_estimate,
+        translation_retry=translation_retry,
     )
 
-    budget_warn: ProcessWarning | None = None
-    if budget_threshold in ("warn", "exceeded"):
-        budget_warn = ProcessWarning(
-            category="budget",
-            code=(
-                "budget_daily_limit_reached"
-                if budget_threshold == "exceeded"
-                else "budget_approaching_daily_limit"
-            ),
-            message=(
-                "Daily processing budget has been reached. Results may be limited soon."
-                if budget_threshold == "exceeded"
-                else "Daily processing budget is nearly reached."
-            ),
-        )
+    budget_warn = _budget_warning(budget_threshold)
 
-    _set_sentry_tag("outcome", "success")
+    set_sentry_tag("outcome", "success")
     metrics_store.increment("success")
-    response = ProcessResponse(
-        status="success",
+    return ProcessResponse.model_construct(
+        status="success" if budget_warn is None else "partial",
         request_id=request_id,
-        data=ProcessData(
-            pinyin=pinyin_data,
+        data=ProcessData.model_construct(
+            pinyin=to_pinyin_data(pinyin_data),
             reading=reading_data,
             job_id=None,
         ),
+        warnings=None if budget_warn is None else [budget_warn],
         diagnostics=diagnostics,
     )
 
-    if budget_warn is not None:
-        return ProcessResponse(
-            status="partial",
-            request_id=response.request_id,
-            data=response.data,
-            warnings=[budget_warn],
-            diagnostics=response.diagnostics,
+
+# Long-document mode. /v1/process-text/document takes the text as a raw UTF-8 request
+# body of up to TEXT_DOCUMENT_MAX_BYTES, spools it to a temporary file, and processes it
+# in chunks of lines (TEXT_DOCUMENT_CHUNK_CHARS characters, TEXT_DOCUMENT_CONCURRENCY
+# chunks at a time; each chunk's lines are translated in one batch call). Results stream
+# back as NDJSON: a TextDocumentChunk per chunk, in document order, then a
+# TextDocumentEnd. Only the chunks in flight are held in memory, whatever the size of
+# the document.
+
+DOCUMENT_MEDIA_TYPE = "application/x-ndjson"
+# Request bodies are spooled in memory up to this size, then moved to a temporary file.
+_DOCUMENT_SPOOL_MEMORY_BYTES = 1024 * 1024
+
+
+def _invalid_encoding() -> TextValidationError:
+    return TextValidationError(
+        code="text_invalid_encoding",
+        message="The text could not be read. Send it as UTF-8 and try again.",
+    )
+
+
+async def _spool_document_body(request: Request, *, max_bytes: int) -> IO[bytes]:
+    """Copy the request body into a spooled temporary file, validating it on the way."""
+    spool = tempfile.SpooledTemporaryFile(max_size=_DOCUMENT_SPOOL_MEMORY_BYTES)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    total_bytes = 0
+    has_text = False
+    has_chinese = False
+    try:
+        async for chunk in request.stream():
+            if not chunk:
+                continue
+            total_bytes += len(chunk)
+            if total_bytes > max_bytes:
+                raise TextValidationError(
+                    code="text_too_long",
+                    message="Text is too long. Shorten it and try again.",
+                )
+            try:
+                text = decoder.decode(chunk)
+            except UnicodeDecodeError:
+                raise _invalid_encoding() from None
+            has_text = has_text or bool(text.strip())
+            has_chinese = has_chinese or contains_chinese_text(text)
+            spool.write(chunk)
+        try:
+            # A body that ends partway through a character fails only here.
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            raise _invalid_encoding() from None
+        if not has_text:
+            raise TextValidationError(
+                code="text_empty",
+                message="Paste some Chinese text to continue.",
+            )
+        if not has_chinese:
+            raise TextValidationError(
+                code="text_no_chinese_text",
+                message="No Chinese text was detected. Paste Chinese text and try again.",
+            )
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def _read_document_lines(spool: IO[bytes], *, max_chars: int) -> Iterator[str]:
+    # readline's limit bounds memory on a huge single line; its pieces become lines.
+    text = io.TextIOWrapper(spool, encoding="utf-8", newline=None)
+    while line := text.readline(max_chars):
+        yield line
+
+
+async def _process_document_chunk(
+    index: int,
+    segments: list[TextSegment],
+    *,
+    settings: Settings,
+    client: str | None,
+    stats: RetryStats,
+) -> tuple[TextDocumentChunk, CostEstimate | None]:
+    """Process one chunk like a pasted text; returns the event and its cost estimate.
+
+    Each chunk is admitted as a text request of its own, so a document holds no request
+    slot while its client is slow to read the stream, and its chunks queue fairly with
+    /v1/process-text calls. Raises SchedulerTimeoutError when no slot frees up in time.
+    """
+    async with admitted("text", settings, timeout=settings.request_deadline_s):
+        return await _annotate_document_chunk(
+            index, segments, settings=settings, client=client, stats=stats
+        )
+
+
+async def _annotate_document_chunk(
+    index: int,
+    segments: list[TextSegment],
+    *,
+    settings: Settings,
+    client: str | None,
+    stats: RetryStats,
+) -> tuple[TextDocumentChunk, CostEstimate | None]:
+    cjk_segments = [s for s in segments if s.language == "zh"]
+    passthrough_segments = [s for s in segments if s.language != "zh"]
+    cost_estimate: CostEstimate | None = None
+    if cjk_segments:
+        cost_estimate = budget_service.estimate_text_processing_cost(
+            char_count=sum(len(segment.text) for segment in cjk_segments), settings=settings
+        )
+
+    try:
+        pinyin_data = await generate_pinyin(cjk_segments)
+    except PinyinServiceError as error:
+        chunk = TextDocumentChunk.model_construct(
+            index=index,
+            data=ProcessData.model_construct(
+                message="Pronunciation generation is temporarily unavailable for these lines.",
+                job_id=None,
+            ),
+            warnings=[
+                ProcessWarning(category=error.category, code=error.code, message=error.message)
+            ],
+        )
+        return chunk, None
+    try:
+        pinyin_data = await enrich_translations(
+            pinyin_data,
+            settings=settings,
+            # Each chunk gets the deadline of a single text request.
+            deadline=time.monotonic() + settings.request_deadline_s,
+            stats=stats,
+            batched=True,
         )
+    except Exception:
+        logger.exception("translation enrichment failed; continuing without translations")
+        cost_estimate = CostEstimate(confidence="unavailable")
+    pinyin_data = _merge_passthrough(pinyin_data, passthrough_segments)
+    if cost_estimate is not None:
+        budget_service.record_request_cost(cost_estimate, client=client, settings=settings)
+    try:
+        reading_data = build_reading_projection(pinyin_data)
+    except Exception:
+        logger.exception("reading projection failed for a document chunk; reading=None")
+        reading_data = None
+    chunk = TextDocumentChunk.model_construct(
+        index=index,
+        data=ProcessData.model_construct(
+            pinyin=to_pinyin_data(pinyin_data), reading=reading_data, job_id=None
+        ),
+    )
+    return chunk, cost_estimate
+
+
+def _budget_blocked(settings: Settings) -> bool:
+    return (
+        budget_service.check_budget_threshold(settings) == "exceeded"
+        and budget_service.get_budget_enforce_mode(settings) == "block"
+    )
+
+
+def _ndjson(event: TextDocumentChunk | TextDocumentEnd) -> bytes:
+    return event.model_dump_json(exclude_none=True).encode() + b"\n"
 
-    return response
+
+async def _cancel_chunks(pending: deque[asyncio.Task[Any]]) -> None:
+    for task in pending:
+        task.cancel()
+    # Let the cancelled chunks unwind (and release their slots) and retrieve their errors.
+    await asyncio.gather(*pending, return_exceptions=True)
+    pending.clear()
+
+
+async def _stream_document(
+    spool: IO[bytes],
+    *,
+    request_id: str,
+    timer: RequestTimer,
+    settings: Settings,
+    client: str | None,
+    source_bytes: int,
+    budget_warn: ProcessWarning | None,
+    details: dict[str, object],
+) -> AsyncIterator[bytes]:
+    config = settings.text_documents
+    stats = RetryStats()
+    pending: deque[asyncio.Task[tuple[TextDocumentChunk, CostEstimate | None]]] = deque()
+    warnings: list[ProcessWarning] = [] if budget_warn is None else [budget_warn]
+    error: ProcessError | None = None
+    chunk_count = 0
+    line_count = 0
+    pinyin_failed = False
+    # Running cost total: the estimate is only "full" if every chunk's was.
+    cost_usd = cost_sgd = 0.0
+    cost_known = True
+    finished = False
+
+    async def next_event() -> bytes:
+        nonlocal chunk_count, line_count, pinyin_failed, cost_usd, cost_sgd, cost_known
+        chunk, cost_estimate = await pending.popleft()
+        chunk_count += 1
+        if chunk.data.pinyin is not None:
+            line_count += len({segment.line_id for segment in chunk.data.pinyin.segments})
+        if chunk.warnings and not pinyin_failed:
+            pinyin_failed = True
+            warnings.extend(chunk.warnings)
+        if cost_estimate is not None:
+            if cost_estimate.confidence == "full":
+                cost_usd += cost_estimate.estimated_usd or 0.0
+                cost_sgd += cost_estimate.estimated_sgd or 0.0
+            else:
+                cost_known = False
+        return _ndjson(chunk)
+
+    try:
+        try:
+            with timer.span("document"):
+                lines = _read_document_lines(spool, max_chars=config.chunk_chars)
+                for index, segments in enumerate(
+                    iter_text_chunks(lines, max_chars=config.chunk_chars)
+                ):
+                    if _budget_blocked(settings):
+                        warnings.append(
+                            ProcessWarning(
+                                category="budget",
+                                code="budget_daily_limit_exceeded",
+                                message=(
+                                    "Daily processing budget has been reached. The rest"
+                                    " of the document was not processed."
+                                ),
+                            )
+                        )
+                        break
+                    pending.append(
+                        asyncio.ensure_future(
+                            _process_document_chunk(
+                                index, segments, settings=settings, client=client, stats=stats
+                            )
+                        )
+                    )
+                    if len(pending) >= config.concurrency:
+                        yield await next_event()
+                while pending:
+                    yield await next_event()
+        except SchedulerTimeoutError:
+            error = ProcessError(
+                category="request",
+                code="server_busy",
+                message="The server is busy. Please try again in a moment.",
+            )
+        except Exception:
+            logger.exception("document chunk failed request_id=%s", request_id)
+            error = ProcessError(
+                category="system",
+                code="document_processing_failed",
+                message="The document could not be processed. Please try again.",
+            )
+        # Chunks still in flight after an error are not streamed.
+        await _cancel_chunks(pending)
+
+        if error is not None:
+            status = "error"
+        elif warnings:
+            status = "partial"
+        else:
+            status = "success"
+        diagnostics = None
+        if error is None:
+            if cost_known and cost_sgd > 0:
+                cost_estimate = CostEstimate(
+                    estimated_usd=round(cost_usd, 8),
+                    estimated_sgd=round(cost_sgd, 6),
+                    confidence="full",
+                )
+            else:
+                cost_estimate = CostEstimate(confidence="unavailable")
+            diagnostics = make_diagnostics(
+                upload_context=UploadContext(
+                    content_type="text/plain", file_size_bytes=source_bytes
+                ),
+                timer=timer,
+                trace_steps=[
+                    TraceStep(step="ocr", status="skipped"),
+                    TraceStep(step="pinyin", status="failed" if pinyin_failed else "ok"),
+                ],
+                cost_estimate=cost_estimate,
+                translation_retry=stats,
+            )
+        set_sentry_tag("outcome", status)
+        metrics_store.increment(status)
+        details["status"] = status
+        details["chunk_count"] = chunk_count
+        details["line_count"] = line_count
+        finished = True
+        yield _ndjson(
+            TextDocumentEnd.model_construct(
+                status=status,
+                request_id=request_id,
+                chunk_count=chunk_count,
+                line_count=line_count,
+                warnings=None if error is not None or not warnings else warnings,
+                error=error,
+                diagnostics=diagnostics,
+            )
+        )
+    finally:
+        await _cancel_chunks(pending)
+        spool.close()
+        if not finished:
+            # The client went away mid-stream; the chunks in flight were cancelled.
+            set_sentry_tag("outcome", "cancelled")
+            metrics_store.increment("cancelled")
+
+
+@router.post(
+    "/process-text/document",
+    response_model=None,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"text/plain": {"schema": {"type": "string"}}},
+        },
+        "responses": {
+            "200": {
+                "description": (
+                    "One JSON object per line: a TextDocumentChunk for each chunk of lines,"
+                    " then a TextDocumentEnd. Errors before processing starts are returned"
+                    " as a ProcessResponse."
+                ),
+                "content": {DOCUMENT_MEDIA_TYPE: {"schema": {"type": "string"}}},
+            }
+        },
+    },
+)
+async def process_text_document(request: Request) -> ProcessResponse | StreamingResponse:
+    timer = request_timer(request)
+    details = request_details(request)
+    details["content_type"] = "text/plain"
+    request_id = getattr(request.state, "request_id", None) or str(uuid4())
+    set_sentry_request_context(request_id)
+    settings = get_settings()
+    max_bytes = settings.text_documents.max_bytes
+
+    client, rejection = check_client_limits(request, settings)
+    if rejection is not None:
+        return build_client_limit_response(request_id, rejection)
+
+    with timer.span("budget_check"):
+        budget_threshold = budget_service.check_budget_threshold(settings)
+        enforce_mode = budget_service.get_budget_enforce_mode(settings)
+    if budget_threshold == "exceeded" and enforce_mode == "block":
+        return _build_budget_blocked_response(request_id)
+
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+        return build_validation_error_response(
+            request_id=request_id,
+            error=TextValidationError(
+                code="text_too_long", message="Text is too long. Shorten it and try again."
+            ),
+        )
+
+    try:
+        with timer.span("body_read"):
+            spool = await _spool_document_body(request, max_bytes=max_bytes)
+    except TextValidationError as error:
+        return build_validation_error_response(request_id=request_id, error=error)
+    except ClientDisconnect:
+        logger.info("client disconnected during upload request_id=%s", request_id)
+        return build_cancelled_response(request_id)
+    source_bytes = spool.seek(0, io.SEEK_END)
+    spool.seek(0)
+    details["request_bytes"] = source_bytes
+
+    return StreamingResponse(
+        _stream_document(
+            spool,
+            request_id=request_id,
+            timer=timer,
+            settings=settings,
+            client=client,
+            source_bytes=source_bytes,
+            budget_warn=_budget_warning(budget_threshold),
+            details=details,
+        ),
+        media_type=DOCUMENT_MEDIA_TYPE,
+    )
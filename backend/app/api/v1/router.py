@@ -1,5 +1,7 @@
 from fastapi import APIRouter
 
+from app.api.v1.admin import router as admin_router
+from app.api.v1.debug import router as debug_router
 from app.api.v1.health import router as health_router
 from app.api.v1.metrics import router as metrics_router
 from app.api.v1.process import router as process_router
@@ -10,3 +12,5 @@ api_v1_router.include_router(process_router)
 api_v1_router.include_router(process_text_router)
 api_v1_router.include_router(health_router)
 api_v1_router.include_router(metrics_router)
+api_v1_router.include_router(admin_router)
+api_v1_router.include_router(debug_router)
@@ -0,0 +1,169 @@
+"""Per-provider circuit breakers for the OCR and translation providers.
+
+When a provider degrades, every request would otherwise wait out its full call (up to
+the 5 s translation timeout per line) before giving up. Each provider gets a breaker:
+
+closed     Calls go through. The outcome and latency of the last CIRCUIT_BREAKER_WINDOW
+           calls are kept; once at least CIRCUIT_BREAKER_MIN_CALLS are known and the
+           share of failed or slow calls reaches CIRCUIT_BREAKER_FAILURE_RATE, it opens.
+open       Calls are rejected immediately; the services treat that like an unavailable
+           provider (``ocr_provider_unavailable``, or the line is left untranslated).
+half_open  After CIRCUIT_BREAKER_OPEN_SECONDS one probe call is let through. If it
+           succeeds in time the breaker closes with a fresh window; otherwise it opens
+           again for another period.
+
+Breakers are keyed ``<kind>:<provider>`` (e.g. ``ocr:google_vision``) and shared by all
+requests. Their state is reported by /v1/health and /v1/metrics.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Literal
+
+from app.core.settings import CircuitBreakerSettings, Settings
+
+BreakerState = Literal["closed", "open", "half_open"]
+ProviderKind = Literal["ocr", "translation"]
+
+
+@dataclass(frozen=True, slots=True)
+class BreakerSnapshot:
+    state: BreakerState
+    calls: int
+    failure_rate: float
+    opened_total: int
+    rejected_total: int
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        config: CircuitBreakerSettings,
+        slow_call_ms: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.config = config
+        self.slow_call_ms = slow_call_ms
+        self._clock = clock
+        self._state: BreakerState = "closed"
+        # True for each failed or slow call among the recent ones.
+        self._outcomes: deque[bool] = deque(maxlen=config.window)
+        self._opened_at = 0.0
+        self._probe_started_at: float | None = None
+        self._opened_total = 0
+        self._rejected_total = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> BreakerState:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> BreakerState:
+        if self._state == "open" and self._clock() - self._opened_at >= self.config.open_seconds:
+            self._state = "half_open"
+            self._probe_started_at = None
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now; a rejected call costs no provider time."""
+        with self._lock:
+            state = self._current_state()
+            if state == "closed":
+                return True
+            now = self._clock()
+            # One probe at a time; a probe that never reported back is replaced.
+            if state == "half_open" and (
+                self._probe_started_at is None
+                or now - self._probe_started_at >= self.config.open_seconds
+            ):
+                self._probe_started_at = now
+                return True
+            self._rejected_total += 1
+            return False
+
+    def record(self, *, ok: bool, latency_ms: float) -> None:
+        failed = not ok or latency_ms > self.slow_call_ms
+        with self._lock:
+            state = self._current_state()
+            if state == "half_open":
+                if failed:
+                    self._open()
+                else:
+                    self._state = "closed"
+                    self._outcomes.clear()
+                return
+            if state == "open":
+                # A call admitted before the breaker opened; it does not change the verdict.
+                return
+            self._outcomes.append(failed)
+            if (
+                len(self._outcomes) >= self.config.min_calls
+                and self._failure_rate() >= self.config.failure_rate
+            ):
+                self._open()
+
+    def _open(self) -> None:
+        self._state = "open"
+        self._opened_at = self._clock()
+        self._opened_total += 1
+        self._outcomes.clear()
+
+    def _failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def snapshot(self) -> BreakerSnapshot:
+        with self._lock:
+            return BreakerSnapshot(
+                state=self._current_state(),
+                calls=len(self._outcomes),
+                failure_rate=round(self._failure_rate(), 4),
+                opened_total=self._opened_total,
+                rejected_total=self._rejected_total,
+            )
+
+
+def record_call(breaker: CircuitBreaker | None, started: float, *, ok: bool) -> None:
+    """Record a call that began at ``started`` (a time.perf_counter() value)."""
+    if breaker is not None:
+        breaker.record(ok=ok, latency_ms=(time.perf_counter() - started) * 1000)
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(kind: ProviderKind, provider: str, settings: Settings) -> CircuitBreaker | None:
+    """Return the breaker for ``provider``, or None when CIRCUIT_BREAKER_ENABLED is false.
+
+    A breaker is rebuilt (closed, empty window) when the CIRCUIT_BREAKER_* settings change.
+    """
+    config = settings.circuit_breakers
+    if not config.enabled:
+        return None
+    name = f"{kind}:{provider or 'none'}"
+    slow_call_ms = config.ocr_slow_ms if kind == "ocr" else config.translation_slow_ms
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None or breaker.config != config:
+            breaker = _breakers[name] = CircuitBreaker(config, slow_call_ms)
+        return breaker
+
+
+def breaker_snapshots() -> dict[str, BreakerSnapshot]:
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {name: breaker.snapshot() for name, breaker in sorted(breakers.items())}
+
+
+def reset_breakers() -> None:
+    with _breakers_lock:
+        _breakers.clear()
@@ -0,0 +1,208 @@
+"""Adaptive limits on concurrent OCR and translation calls.
+
+A fixed number of calls in flight is too low while the provider is fast and too high
+once it slows down, when extra calls only queue up upstream. Each provider gets an AIMD
+limiter instead:
+
+- a call finishing within ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE times the provider's
+  usual latency (a slow moving average of past calls), while the limit was in use,
+  grows the limit by 1/limit, i.e. by one per limit's worth of calls;
+- a slower call, or one that failed transiently, multiplies the limit by
+  ADAPTIVE_CONCURRENCY_BACKOFF_RATIO. Calls that were already running when the limit
+  was lowered do not lower it again. A call cut off by a timeout or a disconnected
+  client only lowers the limit if it had already run too long.
+
+Calls over the limit wait for a free slot in arrival order. Limiters are keyed like the
+circuit breakers (``ocr:google_vision``) and reported by /v1/metrics.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from app.core.circuit_breaker import ProviderKind
+from app.core.settings import ConcurrencyLimitSettings, Settings
+
+# Weight of each call in the usual-latency average; about the last 100 calls count.
+_BASELINE_ALPHA = 0.01
+
+
+class ConcurrencyLimitTimeoutError(TimeoutError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class LimiterSnapshot:
+    limit: int
+    in_flight: int
+    queued: int
+    baseline_latency_ms: float
+    increases_total: int
+    decreases_total: int
+
+
+class AdaptiveLimiter:
+    def __init__(self, config: ConcurrencyLimitSettings) -> None:
+        self.config = config
+        self._limit = float(config.initial_limit)
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._baseline_ms: float | None = None
+        self._decreased_at = 0.0
+        self._increases_total = 0
+        self._decreases_total = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    async def acquire(self, timeout: float | None = None) -> None:
+        """Wait for a free slot; raises ConcurrencyLimitTimeoutError after ``timeout`` s."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and self._in_flight < int(self._limit):
+                self._in_flight += 1
+                return
+            waiter: asyncio.Future[None] = loop.create_future()
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except BaseException as exc:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.done() and not waiter.cancelled():
+                    # The slot was handed over just as the wait ended; give it back.
+                    self._release_slot()
+            if isinstance(exc, TimeoutError):
+                raise ConcurrencyLimitTimeoutError("no free provider call slot") from exc
+            raise
+
+    def release(
+        self, *, started: float, latency_ms: float, dropped: bool, finished: bool = True
+    ) -> None:
+        """Free a slot taken at ``started`` (time.monotonic()) and adjust the limit.
+
+        ``finished`` is False for a call that was cancelled; its latency is then only a
+        lower bound.
+        """
+        config = self.config
+        with self._lock:
+            baseline = self._baseline_ms
+            climbing = baseline is not None and latency_ms > baseline * config.latency_tolerance
+            if dropped or climbing:
+                if started >= self._decreased_at:
+                    self._limit = max(self._limit * config.backoff_ratio, config.min_limit)
+                    self._decreased_at = time.monotonic()
+                    self._decreases_total += 1
+            elif not finished:
+                self._release_slot()
+                return
+            elif self._in_flight * 2 >= self._limit and self._limit < config.max_limit:
+                # Only grow while at least half the limit is in use.
+                self._limit = min(self._limit + 1 / self._limit, config.max_limit)
+                self._increases_total += 1
+            if not dropped:
+                self._baseline_ms = (
+                    latency_ms
+                    if baseline is None
+                    else baseline + _BASELINE_ALPHA * (latency_ms - baseline)
+                )
+            self._release_slot()
+
+    def _release_slot(self) -> None:
+        self._in_flight -= 1
+        while self._waiters and self._in_flight < int(self._limit):
+            waiter = self._waiters.popleft()
+            self._in_flight += 1
+            try:
+                waiter.get_loop().call_soon_threadsafe(self._hand_over, waiter)
+            except RuntimeError:
+                # The waiter's event loop is gone.
+                self._in_flight -= 1
+
+    def _hand_over(self, waiter: asyncio.Future[None]) -> None:
+        if waiter.cancelled():
+            with self._lock:
+                self._release_slot()
+        else:
+            waiter.set_result(None)
+
+    def snapshot(self) -> LimiterSnapshot:
+        with self._lock:
+            return LimiterSnapshot(
+                limit=int(self._limit),
+                in_flight=self._in_flight,
+                queued=len(self._waiters),
+                baseline_latency_ms=round(self._baseline_ms or 0.0, 1),
+                increases_total=self._increases_total,
+                decreases_total=self._decreases_total,
+            )
+
+
+@contextlib.asynccontextmanager
+async def limited(
+    limiter: AdaptiveLimiter | None, *, timeout: float | None = None
+) -> AsyncIterator[None]:
+    """Run the body in one of ``limiter``'s slots (no limit when it is None).
+
+    Only transient errors (``retryable``) count as overload; a call rejected for its
+    input says nothing about the provider's load.
+    """
+    if limiter is None:
+        yield
+        return
+    await limiter.acquire(timeout)
+    started = time.monotonic()
+    dropped = False
+    finished = False
+    try:
+        yield
+        finished = True
+    except Exception as exc:
+        dropped = bool(getattr(exc, "retryable", False))
+        finished = True
+        raise
+    finally:
+        latency_ms = (time.monotonic() - started) * 1000
+        limiter.release(
+            started=started, latency_ms=latency_ms, dropped=dropped, finished=finished
+        )
+
+
+_limiters: dict[str, AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(kind: ProviderKind, provider: str, settings: Settings) -> AdaptiveLimiter | None:
+    """Return the limiter for ``provider``, or None when ADAPTIVE_CONCURRENCY_ENABLED is false.
+
+    A limiter is rebuilt at its initial limit when the ADAPTIVE_CONCURRENCY_* settings change.
+    """
+    config = settings.concurrency_limits
+    if not config.enabled:
+        return None
+    name = f"{kind}:{provider or 'none'}"
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None or limiter.config != config:
+            limiter = _limiters[name] = AdaptiveLimiter(config)
+        return limiter
+
+
+def limiter_snapshots() -> dict[str, LimiterSnapshot]:
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {name: limiter.snapshot() for name, limiter in sorted(limiters.items())}
+
+
+def reset_limiters() -> None:
+    with _limiters_lock:
+        _limiters.clear()
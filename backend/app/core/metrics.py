@@ -7,24 +7,63 @@ class MetricsStore:
         self.process_requests_success = 0
         self.process_requests_partial = 0
         self.process_requests_error = 0
+        # Requests abandoned because the client disconnected (see app.api.disconnect).
+        self.process_requests_cancelled = 0
+        self.ocr_calls_total = 0
+        self.ocr_hedges_total = 0
+        self.ocr_hedge_wins_total = 0
+        self.quota_waits_total = 0
+        self.quota_wait_ms_total = 0.0
+        self.quota_timeouts_total = 0
 
-    def increment(self, outcome: Literal["success", "partial", "error"]) -> None:
+    def increment(self, outcome: Literal["success", "partial", "error", "cancelled"]) -> None:
         self.process_requests_total += 1
 
         if outcome == "success":
             self.process_requests_success += 1
         elif outcome == "partial":
             self.process_requests_partial += 1
+        elif outcome == "cancelled":
+            self.process_requests_cancelled += 1
         else:
             self.process_requests_error += 1
 
-    def snapshot(self) -> dict[str, int]:
+    def record_ocr_call(self, *, hedged: bool, hedge_won: bool) -> None:
+        """Count a hedging-eligible OCR call (see app.services.ocr_hedging)."""
+        self.ocr_calls_total += 1
+        if hedged:
+            self.ocr_hedges_total += 1
+        if hedge_won:
+            self.ocr_hedge_wins_total += 1
+
+    def record_quota_wait(self, wait_ms: float | None) -> None:
+        """Count a wait for provider quota tokens; None when the wait timed out."""
+        if wait_ms is None:
+            self.quota_timeouts_total += 1
+            return
+        self.quota_waits_total += 1
+        self.quota_wait_ms_total += wait_ms
+
+    def snapshot(self) -> dict[str, int | float]:
         return {
             "process_requests_total": self.process_requests_total,
             "process_requests_success": self.process_requests_success,
             "process_requests_partial": self.process_requests_partial,
             "process_requests_error": self.process_requests_error,
+            "process_requests_cancelled": self.process_requests_cancelled,
+            "ocr_calls_total": self.ocr_calls_total,
+            "ocr_hedges_total": self.ocr_hedges_total,
+            "ocr_hedge_wins_total": self.ocr_hedge_wins_total,
+            "ocr_hedge_rate": _ratio(self.ocr_hedges_total, self.ocr_calls_total),
+            "ocr_hedge_win_rate": _ratio(self.ocr_hedge_wins_total, self.ocr_hedges_total),
+            "quota_waits_total": self.quota_waits_total,
+            "quota_wait_ms_total": round(self.quota_wait_ms_total, 1),
+            "quota_timeouts_total": self.quota_timeouts_total,
         }
 
 
+def _ratio(part: int, whole: int) -> float:
+    return round(part / whole, 4) if whole else 0.0
+
+
 metrics_store = MetricsStore()
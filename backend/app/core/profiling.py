@@ -0,0 +1,179 @@
+"""In-process sampling profiler for individual requests.
+
+A StackSampler thread snapshots the Python stacks of every other thread
+(sys._current_frames) at a fixed interval while a profiled request runs, so work the
+request hands to executor threads (OCR, pinyin, translation) is captured along with the
+event loop. Stacks are aggregated per thread and kept, keyed by request_id, in a bounded
+ProfileStore. They are rendered on retrieval either as collapsed stacks (one
+``thread;outer;...;inner count`` line per stack, for flamegraph.pl / speedscope) or as a
+speedscope JSON document.
+
+Samples cover the whole process, so other requests running concurrently show up too;
+they are usually distinguishable by thread and call path.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+
+DEFAULT_SAMPLE_INTERVAL_S = 0.002
+DEFAULT_MAX_STORED_PROFILES = 50
+MAX_CONCURRENT_PROFILES = 2
+
+# (function, file, first line) of one frame.
+Frame = tuple[str, str, int]
+Stack = tuple[Frame, ...]
+
+# Leaf frames of threads that are parked waiting for work rather than running it.
+_IDLE_LEAVES = {
+    ("select", "selectors.py"),
+    ("_worker", "thread.py"),
+    ("wait", "threading.py"),
+}
+
+
+class StackSampler:
+    def __init__(self, interval_s: float = DEFAULT_SAMPLE_INTERVAL_S) -> None:
+        self.interval_s = interval_s
+        self.samples: Counter[Stack] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = _frame_stack(frame)
+                if not stack or (stack[-1][0], os.path.basename(stack[-1][1])) in _IDLE_LEAVES:
+                    continue
+                thread_frame = (thread_names.get(ident, f"thread-{ident}"), "", 0)
+                self.samples[(thread_frame, *stack)] += 1
+
+
+def _frame_stack(frame) -> Stack:
+    frames: list[Frame] = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    frames.reverse()
+    return tuple(frames)
+
+
+@dataclass
+class RequestProfile:
+    request_id: str
+    method: str
+    path: str
+    started_at: float
+    duration_ms: float
+    interval_ms: float
+    samples: Counter[Stack] = field(default_factory=Counter)
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.samples.values())
+
+
+def _frame_label(frame: Frame) -> str:
+    name, filename, line = frame
+    if not filename:
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def to_collapsed(profile: RequestProfile) -> str:
+    lines = [
+        f"{';'.join(_frame_label(frame) for frame in stack)} {count}"
+        for stack, count in sorted(profile.samples.items(), key=lambda item: -item[1])
+    ]
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+def to_speedscope(profile: RequestProfile) -> dict[str, object]:
+    frame_index: dict[Frame, int] = {}
+    frames: list[dict[str, object]] = []
+    samples: list[list[int]] = []
+    weights: list[float] = []
+    for stack, count in profile.samples.items():
+        indexes = []
+        for frame in stack:
+            index = frame_index.get(frame)
+            if index is None:
+                index = frame_index[frame] = len(frames)
+                name, filename, line = frame
+                frames.append(
+                    {"name": name, "file": filename, "line": line} if filename else {"name": name}
+                )
+            indexes.append(index)
+        samples.append(indexes)
+        weights.append(count * profile.interval_ms)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": f"{profile.method} {profile.path} {profile.request_id}",
+        "exporter": "ocr-pinyin-api",
+        "activeProfileIndex": 0,
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": profile.request_id,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+        ],
+    }
+
+
+class ProfileStore:
+    def __init__(self, max_profiles: int = DEFAULT_MAX_STORED_PROFILES) -> None:
+        self.max_profiles = max_profiles
+        self._profiles: OrderedDict[str, RequestProfile] = OrderedDict()
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def try_acquire_slot(self) -> bool:
+        """Reserve one of the MAX_CONCURRENT_PROFILES sampler slots."""
+        with self._lock:
+            if self._active >= MAX_CONCURRENT_PROFILES:
+                return False
+            self._active += 1
+            return True
+
+    def release_slot(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles[profile.request_id] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get(self, request_id: str) -> RequestProfile | None:
+        return self._profiles.get(request_id)
+
+    def recent(self) -> list[RequestProfile]:
+        """Stored profiles, newest first."""
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+
+profile_store = ProfileStore()
@@ -0,0 +1,78 @@
+"""Bounded in-memory log of the slowest and the most recent process requests.
+
+Routes opt in by filling ``request_details(request)`` with what they learn while
+handling the request (payload size, image dimensions, segment and line counts, provider
+outcomes). RequestLogMiddleware turns that, the request's timing spans and the response
+size into a RequestRecord once the response is sent. Keeping the log costs one deque
+append and one push onto a small heap per request, so it is always on.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from starlette.requests import Request
+
+DEFAULT_RECENT_SIZE = 100
+DEFAULT_SLOWEST_SIZE = 20
+
+
+@dataclass(slots=True)
+class RequestRecord:
+    request_id: str
+    method: str
+    path: str
+    started_at: float
+    total_ms: float
+    http_status: int
+    response_bytes: int
+    spans: list[tuple[str, float]] = field(default_factory=list)
+    details: dict[str, Any] = field(default_factory=dict)
+
+
+def request_details(request: Request) -> dict[str, Any]:
+    """Return the request's detail dict, opting the request into the request log."""
+    details = getattr(request.state, "details", None)
+    if details is None:
+        details = {}
+        request.state.details = details
+    return details
+
+
+class RequestLog:
+    def __init__(
+        self, recent_size: int = DEFAULT_RECENT_SIZE, slowest_size: int = DEFAULT_SLOWEST_SIZE
+    ) -> None:
+        self.slowest_size = slowest_size
+        self._recent: deque[RequestRecord] = deque(maxlen=recent_size)
+        # Min-heap on total_ms: the root is the fastest of the retained slow requests.
+        self._slowest: list[tuple[float, int, RequestRecord]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def add(self, record: RequestRecord) -> None:
+        entry = (record.total_ms, next(self._sequence), record)
+        with self._lock:
+            self._recent.append(record)
+            if len(self._slowest) < self.slowest_size:
+                heapq.heappush(self._slowest, entry)
+            elif record.total_ms > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def recent(self) -> list[RequestRecord]:
+        """Most recent requests, newest first."""
+        with self._lock:
+            return list(reversed(self._recent))
+
+    def slowest(self) -> list[RequestRecord]:
+        """Slowest requests seen since startup, slowest first."""
+        with self._lock:
+            return [record for _, _, record in sorted(self._slowest, reverse=True)]
+
+
+request_log = RequestLog()
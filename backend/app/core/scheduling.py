@@ -0,0 +1,212 @@
+"""Class-based admission of text and image requests.
+
+/v1/process-text needs milliseconds of local pinyin work, /v1/process an image decode
+and seconds of OCR. Admitted first-come first-served, a burst of image requests leaves
+text requests queued behind them. Each request is instead admitted as its workload
+class (``text`` or ``image``):
+
+- at most SCHEDULER_MAX_CONCURRENT requests are processed at once, and at most
+  SCHEDULER_<CLASS>_MAX_CONCURRENT of one class, so the default image cap leaves room
+  for text requests even when image traffic saturates;
+- requests over those limits wait in their class's queue. When a slot frees up the
+  queues are served by stride scheduling in the ratio of SCHEDULER_<CLASS>_WEIGHT; a
+  class that was idle does not save up a share for later.
+
+Queue lengths, admissions and queueing time per class are reported by /v1/metrics.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Literal
+
+from app.core.settings import SchedulerSettings, Settings
+
+WorkloadClass = Literal["text", "image"]
+
+
+class SchedulerTimeoutError(TimeoutError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class WorkloadClassSnapshot:
+    in_flight: int
+    queued: int
+    admitted_total: int
+    rejected_total: int
+    queue_wait_ms_total: float
+
+
+class _ClassQueue:
+    def __init__(self, cap: int, weight: int) -> None:
+        self.cap = cap
+        self.stride = 1 / weight
+        self.pass_value = 0.0
+        self.in_flight = 0
+        self.waiters: deque[asyncio.Future[None]] = deque()
+        self.admitted_total = 0
+        self.rejected_total = 0
+        self.queue_wait_ms_total = 0.0
+
+
+class WorkloadScheduler:
+    def __init__(self, config: SchedulerSettings) -> None:
+        self.config = config
+        self._classes: dict[WorkloadClass, _ClassQueue] = {
+            "text": _ClassQueue(config.text_max_concurrent, config.text_weight),
+            "image": _ClassQueue(config.image_max_concurrent, config.image_weight),
+        }
+        self._in_flight = 0
+        # Pass value of the last admission; idle classes rejoin from here.
+        self._virtual_time = 0.0
+        self._lock = threading.Lock()
+
+    def _admit(self, queue: _ClassQueue) -> None:
+        self._virtual_time = max(self._virtual_time, queue.pass_value)
+        queue.pass_value = self._virtual_time + queue.stride
+        queue.in_flight += 1
+        queue.admitted_total += 1
+        self._in_flight += 1
+
+    async def acquire(self, workload: WorkloadClass, timeout: float | None = None) -> None:
+        """Wait for a slot; raises SchedulerTimeoutError after ``timeout`` seconds."""
+        queue = self._classes[workload]
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if (
+                not queue.waiters
+                and queue.in_flight < queue.cap
+                and self._in_flight < self.config.max_concurrent
+            ):
+                self._admit(queue)
+                return
+            waiter: asyncio.Future[None] = loop.create_future()
+            queue.waiters.append(waiter)
+        queued_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except BaseException as exc:
+            with self._lock:
+                if waiter in queue.waiters:
+                    queue.waiters.remove(waiter)
+                elif waiter.done() and not waiter.cancelled():
+                    # Admitted just as the wait ended; give the slot back.
+                    self._release(queue)
+                if isinstance(exc, TimeoutError):
+                    queue.rejected_total += 1
+            if isinstance(exc, TimeoutError):
+                raise SchedulerTimeoutError(f"no {workload} request slot") from exc
+            raise
+        finally:
+            with self._lock:
+                queue.queue_wait_ms_total += (time.perf_counter() - queued_at) * 1000
+
+    def release(self, workload: WorkloadClass) -> None:
+        with self._lock:
+            self._release(self._classes[workload])
+
+    def _release(self, queue: _ClassQueue) -> None:
+        queue.in_flight -= 1
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._in_flight < self.config.max_concurrent:
+            eligible = [
+                queue
+                for queue in self._classes.values()
+                if queue.waiters and queue.in_flight < queue.cap
+            ]
+            if not eligible:
+                return
+            queue = min(eligible, key=lambda queue: queue.pass_value)
+            waiter = queue.waiters.popleft()
+            self._admit(queue)
+            try:
+                waiter.get_loop().call_soon_threadsafe(self._hand_over, queue, waiter)
+            except RuntimeError:
+                # The waiter's event loop is gone.
+                queue.in_flight -= 1
+                self._in_flight -= 1
+
+    def _hand_over(self, queue: _ClassQueue, waiter: asyncio.Future[None]) -> None:
+        if waiter.cancelled():
+            with self._lock:
+                self._release(queue)
+        else:
+            waiter.set_result(None)
+
+    @contextlib.asynccontextmanager
+    async def admit(
+        self, workload: WorkloadClass, *, timeout: float | None = None
+    ) -> AsyncIterator[None]:
+        await self.acquire(workload, timeout)
+        try:
+            yield
+        finally:
+            self.release(workload)
+
+    def snapshot(self) -> dict[str, WorkloadClassSnapshot]:
+        with self._lock:
+            return {
+                name: WorkloadClassSnapshot(
+                    in_flight=queue.in_flight,
+                    queued=len(queue.waiters),
+                    admitted_total=queue.admitted_total,
+                    rejected_total=queue.rejected_total,
+                    queue_wait_ms_total=round(queue.queue_wait_ms_total, 1),
+                )
+                for name, queue in self._classes.items()
+            }
+
+
+_scheduler: WorkloadScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler(settings: Settings) -> WorkloadScheduler | None:
+    """The shared scheduler, or None when SCHEDULER_ENABLED is false.
+
+    It is rebuilt (empty) when the SCHEDULER_* settings change; requests admitted by the
+    previous one release their slots there.
+    """
+    global _scheduler
+    config = settings.scheduler
+    if not config.enabled:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None or _scheduler.config != config:
+            _scheduler = WorkloadScheduler(config)
+        return _scheduler
+
+
+@contextlib.asynccontextmanager
+async def admitted(
+    workload: WorkloadClass, settings: Settings, *, timeout: float | None = None
+) -> AsyncIterator[None]:
+    """Hold a ``workload`` slot for the body (no-op when scheduling is disabled)."""
+    scheduler = get_scheduler(settings)
+    if scheduler is None:
+        yield
+        return
+    async with scheduler.admit(workload, timeout=timeout):
+        yield
+
+
+def workload_snapshots() -> dict[str, WorkloadClassSnapshot]:
+    with _scheduler_lock:
+        scheduler = _scheduler
+    return scheduler.snapshot() if scheduler is not None else {}
+
+
+def reset_scheduler() -> None:
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = None
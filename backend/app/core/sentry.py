@@ -1,11 +1,15 @@
 import logging
 import os
+import sys
 
 logger = logging.getLogger(__name__)
 
+_initialized = False
+
 
 def init_sentry() -> None:
     """Initialize Sentry if configured, without affecting app startup on failure."""
+    global _initialized
     dsn = os.getenv("SENTRY_DSN", "").strip()
     if not dsn:
         return
@@ -27,6 +31,24 @@ def init_sentry() -> None:
             ],
             send_default_pii=False,
         )
+        _initialized = True
         logger.info("Sentry initialized (env=%s)", os.getenv("APP_ENV", "development"))
     except Exception:
         logger.warning("Sentry initialization failed; monitoring disabled.", exc_info=True)
+
+
+def set_tag(key: str, value: str) -> None:
+    """Set a Sentry tag on the current scope; a no-op when Sentry is not initialized.
+
+    sentry_sdk is only imported by init_sentry(), so deployments without a DSN never pay
+    for importing it.
+    """
+    if not _initialized:
+        return
+    sentry_sdk = sys.modules.get("sentry_sdk")
+    if sentry_sdk is None:
+        return
+    try:
+        sentry_sdk.set_tag(key, value)
+    except Exception:
+        pass
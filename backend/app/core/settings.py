@@ -0,0 +1,718 @@
+"""Typed application settings.
+
+Configuration is parsed and validated once from the environment into an immutable
+Settings object. Request handlers fetch the current object once via get_settings() and
+pass it down, so a request always sees a single consistent snapshot.
+
+The process environment cannot change from outside the process, so settings that should
+change without a restart go in the env file named by SETTINGS_FILE (KEY=VALUE lines, as
+in .env.example), whose values override the environment. reload_settings() re-reads that
+file, builds a fresh object and swaps the module-level reference in one assignment, which
+is atomic for concurrent readers; it is triggered by SIGHUP or the admin reload endpoint.
+Provider credentials are read by the adapters from the process environment and are not
+reloaded.
+
+Invalid values never prevent startup: each field falls back to its default, matching the
+lenient behaviour the services had when they parsed the environment themselves.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import os
+import signal
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Literal
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_UPLOAD_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_IMAGE_PIXELS = 25_000_000
+DEFAULT_TEXT_INPUT_MAX_CHARS = 5000
+DEFAULT_OCR_LOW_CONFIDENCE_THRESHOLD = 0.7
+DEFAULT_DAILY_BUDGET_SGD = 1.0
+DEFAULT_BUDGET_HISTORY_RETENTION_DAYS = 30
+DEFAULT_GOOGLE_TRANSLATE_USD_PER_MILLION_CHARS = 20.0
+BUDGET_WARN_FRACTION = 0.8
+DEFAULT_SIMULATED_TIMEOUT_SECONDS = 30.0
+DEFAULT_OCR_TILE_SIZE = 2048
+DEFAULT_OCR_TILE_OVERLAP = 256
+DEFAULT_OCR_TILING_MIN_PIXELS = 16_000_000
+DEFAULT_OCR_TILING_MAX_PIXELS = 100_000_000
+DEFAULT_OCR_TILE_CONCURRENCY = 4
+DEFAULT_LOCAL_OCR_WORKERS = 2
+DEFAULT_LOCAL_OCR_QUEUE_SIZE = 8
+DEFAULT_LOCAL_OCR_TIMEOUT_SECONDS = 30.0
+DEFAULT_OCR_HEDGE_PERCENTILE = 95.0
+DEFAULT_OCR_HEDGE_MIN_DELAY_MS = 200.0
+DEFAULT_OCR_HEDGE_BUDGET = 0.05
+DEFAULT_OCR_HEDGE_MIN_SAMPLES = 20
+DEFAULT_BREAKER_FAILURE_RATE = 0.5
+DEFAULT_BREAKER_WINDOW = 20
+DEFAULT_BREAKER_MIN_CALLS = 10
+DEFAULT_BREAKER_OPEN_SECONDS = 30.0
+DEFAULT_BREAKER_OCR_SLOW_MS = 10_000.0
+DEFAULT_BREAKER_TRANSLATION_SLOW_MS = 2_500.0
+DEFAULT_RETRY_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_BASE_DELAY_MS = 100.0
+DEFAULT_RETRY_MAX_DELAY_MS = 1_000.0
+DEFAULT_RETRY_BUDGET_RATIO = 0.1
+DEFAULT_REQUEST_DEADLINE_SECONDS = 30.0
+DEFAULT_QUOTA_MAX_WAIT_MS = 1_000.0
+DEFAULT_CONCURRENCY_INITIAL_LIMIT = 8
+DEFAULT_CONCURRENCY_MIN_LIMIT = 1
+DEFAULT_CONCURRENCY_MAX_LIMIT = 32
+DEFAULT_CONCURRENCY_LATENCY_TOLERANCE = 2.0
+DEFAULT_CONCURRENCY_BACKOFF_RATIO = 0.9
+DEFAULT_SCHEDULER_MAX_CONCURRENT = 32
+DEFAULT_SCHEDULER_TEXT_MAX_CONCURRENT = 32
+DEFAULT_SCHEDULER_IMAGE_MAX_CONCURRENT = 16
+DEFAULT_SCHEDULER_TEXT_WEIGHT = 4
+DEFAULT_SCHEDULER_IMAGE_WEIGHT = 1
+DEFAULT_CLIENT_RATE_LIMIT_BURST = 10
+DEFAULT_CLIENT_LIMIT_MAX_CLIENTS = 10_000
+DEFAULT_TEXT_DOCUMENT_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_TEXT_DOCUMENT_CHUNK_CHARS = 2000
+DEFAULT_TEXT_DOCUMENT_CONCURRENCY = 4
+
+
+def _positive_int(environ: Mapping[str, str], name: str, default: int) -> int:
+    try:
+        value = int(environ.get(name, ""))
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+def _positive_finite_float(environ: Mapping[str, str], name: str, default: float) -> float:
+    try:
+        value = float(environ.get(name, str(default)))
+    except (TypeError, ValueError):
+        return default
+    if not math.isfinite(value) or value <= 0:
+        return default
+    return value
+
+
+def _low_confidence_threshold(environ: Mapping[str, str]) -> float:
+    raw_value = environ.get(
+        "OCR_LOW_CONFIDENCE_THRESHOLD", str(DEFAULT_OCR_LOW_CONFIDENCE_THRESHOLD)
+    )
+    try:
+        return float(raw_value)
+    except (TypeError, ValueError):
+        logger.warning(
+            "Invalid OCR_LOW_CONFIDENCE_THRESHOLD %r; falling back to default %s",
+            raw_value,
+            DEFAULT_OCR_LOW_CONFIDENCE_THRESHOLD,
+        )
+        return DEFAULT_OCR_LOW_CONFIDENCE_THRESHOLD
+
+
+def _fraction(environ: Mapping[str, str], name: str) -> float:
+    try:
+        value = float(environ.get(name, "0"))
+    except (TypeError, ValueError):
+        return 0.0
+    return value if 0.0 <= value <= 1.0 else 0.0
+
+
+def _optional_int(environ: Mapping[str, str], name: str) -> int | None:
+    try:
+        return int(environ.get(name, ""))
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class SimulationSettings:
+    """Latency and failure injection for one simulated provider.
+
+    ``latency`` is a spec parsed by app.adapters.simulation.parse_latency_model
+    (``fixed:<ms>``, ``lognormal:<median_ms>,<sigma>`` or ``histogram:<path>``).
+    """
+
+    latency: str = "fixed:0"
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    timeout_s: float = DEFAULT_SIMULATED_TIMEOUT_SECONDS
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str], prefix: str) -> SimulationSettings:
+        return cls(
+            latency=environ.get(f"{prefix}_LATENCY", "fixed:0").strip() or "fixed:0",
+            error_rate=_fraction(environ, f"{prefix}_ERROR_RATE"),
+            timeout_rate=_fraction(environ, f"{prefix}_TIMEOUT_RATE"),
+            timeout_s=_positive_finite_float(
+                environ, f"{prefix}_TIMEOUT_SECONDS", DEFAULT_SIMULATED_TIMEOUT_SECONDS
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class TilingSettings:
+    """Tiled OCR for very large or dense images (see app.services.ocr_tiling).
+
+    When enabled, images above ``min_pixels`` are split into overlapping square tiles of
+    ``tile_size`` pixels and each tile is OCR'd separately. Images above
+    MAX_UPLOAD_PIXELS are accepted up to ``max_pixels`` and are always tiled.
+    """
+
+    enabled: bool = False
+    tile_size: int = DEFAULT_OCR_TILE_SIZE
+    overlap: int = DEFAULT_OCR_TILE_OVERLAP
+    min_pixels: int = DEFAULT_OCR_TILING_MIN_PIXELS
+    max_pixels: int = DEFAULT_OCR_TILING_MAX_PIXELS
+    concurrency: int = DEFAULT_OCR_TILE_CONCURRENCY
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str]) -> TilingSettings:
+        tile_size = _positive_int(environ, "OCR_TILE_SIZE", DEFAULT_OCR_TILE_SIZE)
+        overlap = _positive_int(environ, "OCR_TILE_OVERLAP", DEFAULT_OCR_TILE_OVERLAP)
+        return cls(
+            enabled=environ.get("OCR_TILING_ENABLED", "false").strip().lower() == "true",
+            tile_size=tile_size,
+            # Tiles must advance by at least half their size.
+            overlap=min(overlap, tile_size // 2),
+            min_pixels=_positive_int(
+                environ, "OCR_TILING_MIN_PIXELS", DEFAULT_OCR_TILING_MIN_PIXELS
+            ),
+            max_pixels=_positive_int(
+                environ, "OCR_TILING_MAX_PIXELS", DEFAULT_OCR_TILING_MAX_PIXELS
+            ),
+            concurrency=_positive_int(
+                environ, "OCR_TILE_CONCURRENCY", DEFAULT_OCR_TILE_CONCURRENCY
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class LocalOcrSettings:
+    """Process pool for the local CPU OCR provider (see app.adapters.local_ocr_provider).
+
+    ``queue_size`` requests may wait on top of the ``workers`` being processed; further
+    requests fail fast instead of queueing without bound.
+    """
+
+    workers: int = DEFAULT_LOCAL_OCR_WORKERS
+    queue_size: int = DEFAULT_LOCAL_OCR_QUEUE_SIZE
+    timeout_s: float = DEFAULT_LOCAL_OCR_TIMEOUT_SECONDS
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str]) -> LocalOcrSettings:
+        queue_size = _optional_int(environ, "LOCAL_OCR_QUEUE_SIZE")
+        return cls(
+            workers=_positive_int(environ, "LOCAL_OCR_WORKERS", DEFAULT_LOCAL_OCR_WORKERS),
+            queue_size=(
+                queue_size
+                if queue_size is not None and queue_size >= 0
+                else DEFAULT_LOCAL_OCR_QUEUE_SIZE
+            ),
+            timeout_s=_positive_finite_float(
+                environ, "LOCAL_OCR_TIMEOUT_SECONDS", DEFAULT_LOCAL_OCR_TIMEOUT_SECONDS
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class HedgingSettings:
+    """Hedged OCR calls (see app.services.ocr_hedging).
+
+    A call that has not returned after the ``percentile`` of the provider's recent
+    latencies (never sooner than ``min_delay_ms``) is duplicated to ``provider`` (empty:
+    the same provider) and the first result wins. ``budget`` caps hedges at that fraction
+    of OCR calls. Nothing is hedged until ``min_samples`` latencies have been seen.
+    """
+
+    enabled: bool = False
+    percentile: float = DEFAULT_OCR_HEDGE_PERCENTILE
+    min_delay_ms: float = DEFAULT_OCR_HEDGE_MIN_DELAY_MS
+    budget: float = DEFAULT_OCR_HEDGE_BUDGET
+    provider: str = ""
+    min_samples: int = DEFAULT_OCR_HEDGE_MIN_SAMPLES
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str]) -> HedgingSettings:
+        percentile = _positive_finite_float(
+            environ, "OCR_HEDGE_PERCENTILE", DEFAULT_OCR_HEDGE_PERCENTILE
+        )
+        return cls(
+            enabled=environ.get("OCR_HEDGE_ENABLED", "false").strip().lower() == "true",
+            percentile=percentile if percentile < 100 else DEFAULT_OCR_HEDGE_PERCENTILE,
+            min_delay_ms=_positive_finite_float(
+                environ, "OCR_HEDGE_MIN_DELAY_MS", DEFAULT_OCR_HEDGE_MIN_DELAY_MS
+            ),
+            budget=_fraction(environ, "OCR_HEDGE_BUDGET")
+            if "OCR_HEDGE_BUDGET" in environ
+            else DEFAULT_OCR_HEDGE_BUDGET,
+            provider=environ.get("OCR_HEDGE_PROVIDER", "").strip().lower(),
+            min_samples=_positive_int(
+                environ, "OCR_HEDGE_MIN_SAMPLES", DEFAULT_OCR_HEDGE_MIN_SAMPLES
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class CircuitBreakerSettings:
+    """Per-provider circuit breakers (see app.core.circuit_breaker).
+
+    A breaker opens when, over its last ``window`` calls (and at least ``min_calls``),
+    the share of failed or slow calls reaches ``failure_rate``. Calls slower than the
+    ``*_slow_ms`` threshold for their provider kind count as failed. After
+    ``open_seconds`` a single probe call is let through to test for recovery.
+    """
+
+    enabled: bool = True
+    failure_rate: float = DEFAULT_BREAKER_FAILURE_RATE
+    window: int = DEFAULT_BREAKER_WINDOW
+    min_calls: int = DEFAULT_BREAKER_MIN_CALLS
+    open_seconds: float = DEFAULT_BREAKER_OPEN_SECONDS
+    ocr_slow_ms: float = DEFAULT_BREAKER_OCR_SLOW_MS
+    translation_slow_ms: float = DEFAULT_BREAKER_TRANSLATION_SLOW_MS
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str]) -> CircuitBreakerSettings:
+        failure_rate = _fraction(environ, "CIRCUIT_BREAKER_FAILURE_RATE")
+        window = _positive_int(environ, "CIRCUIT_BREAKER_WINDOW", DEFAULT_BREAKER_WINDOW)
+        return cls(
+            enabled=environ.get("CIRCUIT_BREAKER_ENABLED", "true").strip().lower() != "false",
+            failure_rate=failure_rate or DEFAULT_BREAKER_FAILURE_RATE,
+            window=window,
+            min_calls=min(
+                _positive_int(environ, "CIRCUIT_BREAKER_MIN_CALLS", DEFAULT_BREAKER_MIN_CALLS),
+                window,
+            ),
+            open_seconds=_positive_finite_float(
+                environ, "CIRCUIT_BREAKER_OPEN_SECONDS", DEFAULT_BREAKER_OPEN_SECONDS
+            ),
+            ocr_slow_ms=_positive_finite_float(
+                environ, "CIRCUIT_BREAKER_OCR_SLOW_MS", DEFAULT_BREAKER_OCR_SLOW_MS
+            ),
+            translation_slow_ms=_positive_finite_float(
+                environ, "CIRCUIT_BREAKER_TRANSLATION_SLOW_MS", DEFAULT_BREAKER_TRANSLATION_SLOW_MS
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class RetrySettings:
+    """Retries of transient provider errors (see app.services.retry).
+
+    A call is tried at most ``max_attempts`` times, sleeping a random delay of up to
+    ``base_delay_ms * 2**(attempt - 1)`` (capped at ``max_delay_ms``) in between. Each
+    success earns ``budget_ratio`` of a retry token per provider; retries stop while
+    fewer than half the tokens are left, so a failing provider is not hammered.
+    """
+
+    max_attempts: int = DEFAULT_RETRY_MAX_ATTEMPTS
+    base_delay_ms: float = DEFAULT_RETRY_BASE_DELAY_MS
+    max_delay_ms: float = DEFAULT_RETRY_MAX_DELAY_MS
+    budget_ratio: float = DEFAULT_RETRY_BUDGET_RATIO
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str]) -> RetrySettings:
+        return cls(
+            max_attempts=_positive_int(
+                environ, "RETRY_MAX_ATTEMPTS", DEFAULT_RETRY_MAX_ATTEMPTS
+            ),
+            base_delay_ms=_positive_finite_float(
+                environ, "RETRY_BASE_DELAY_MS", DEFAULT_RETRY_BASE_DELAY_MS
+            ),
+            max_delay_ms=_positive_finite_float(
+                environ, "RETRY_MAX_DELAY_MS", DEFAULT_RETRY_MAX_DELAY_MS
+            ),
+            budget_ratio=_fraction(environ, "RETRY_BUDGET_RATIO") or DEFAULT_RETRY_BUDGET_RATIO,
+        )
+
+
+def _non_negative_float(environ: Mapping[str, str], name: str) -> float:
+    try:
+        value = float(environ.get(name, "0"))
+    except (TypeError, ValueError):
+        return 0.0
+    return value if math.isfinite(value) and value > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class QuotaSettings:
+    """Client-side Google API quotas (see app.adapters.quota); 0 leaves a limit off.
+
+    Set them at or just below the project's quotas in the Cloud console (by default
+    Vision allows 1800 requests per minute).
+    """
+
+    gcv_requests_per_second: float = 0.0
+    translate_requests_per_second: float = 0.0
+    translate_chars_per_minute: float = 0.0
+    max_wait_ms: float = DEFAULT_QUOTA_MAX_WAIT_MS
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str]) -> QuotaSettings:
+        return cls(
+            gcv_requests_per_second=_non_negative_float(environ, "GCV_QUOTA_QPS"),
+            translate_requests_per_second=_non_negative_float(environ, "TRANSLATE_QUOTA_QPS"),
+            translate_chars_per_minute=_non_negative_float(
+                environ, "TRANSLATE_QUOTA_CHARS_PER_MINUTE"
+            ),
+            max_wait_ms=_positive_finite_float(
+                environ, "QUOTA_MAX_WAIT_MS", DEFAULT_QUOTA_MAX_WAIT_MS
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class ConcurrencyLimitSettings:
+    """Adaptive (AIMD) limits on concurrent provider calls (see app.core.concurrency_limit).
+
+    Each provider starts at ``initial_limit`` calls in flight. The limit grows by one per
+    ``limit`` calls that finish within ``latency_tolerance`` times the usual latency and
+    is multiplied by ``backoff_ratio`` when latency climbs past that or a call fails
+    transiently, staying within ``min_limit``..``max_limit``.
+    """
+
+    enabled: bool = True
+    initial_limit: int = DEFAULT_CONCURRENCY_INITIAL_LIMIT
+    min_limit: int = DEFAULT_CONCURRENCY_MIN_LIMIT
+    max_limit: int = DEFAULT_CONCURRENCY_MAX_LIMIT
+    latency_tolerance: float = DEFAULT_CONCURRENCY_LATENCY_TOLERANCE
+    backoff_ratio: float = DEFAULT_CONCURRENCY_BACKOFF_RATIO
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str]) -> ConcurrencyLimitSettings:
+        max_limit = _positive_int(
+            environ, "ADAPTIVE_CONCURRENCY_MAX_LIMIT", DEFAULT_CONCURRENCY_MAX_LIMIT
+        )
+        min_limit = min(
+            _positive_int(environ, "ADAPTIVE_CONCURRENCY_MIN_LIMIT", DEFAULT_CONCURRENCY_MIN_LIMIT),
+            max_limit,
+        )
+        initial_limit = _positive_int(
+            environ, "ADAPTIVE_CONCURRENCY_INITIAL_LIMIT", DEFAULT_CONCURRENCY_INITIAL_LIMIT
+        )
+        tolerance = _positive_finite_float(
+            environ, "ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE", DEFAULT_CONCURRENCY_LATENCY_TOLERANCE
+        )
+        backoff_ratio = _fraction(environ, "ADAPTIVE_CONCURRENCY_BACKOFF_RATIO")
+        return cls(
+            enabled=environ.get("ADAPTIVE_CONCURRENCY_ENABLED", "true").strip().lower()
+            != "false",
+            initial_limit=min(max(initial_limit, min_limit), max_limit),
+            min_limit=min_limit,
+            max_limit=max_limit,
+            # Latency at or below the usual level must never count as climbing.
+            latency_tolerance=(
+                tolerance if tolerance > 1 else DEFAULT_CONCURRENCY_LATENCY_TOLERANCE
+            ),
+            backoff_ratio=(
+                backoff_ratio if 0 < backoff_ratio < 1 else DEFAULT_CONCURRENCY_BACKOFF_RATIO
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class SchedulerSettings:
+    """Admission of text and image requests (see app.core.scheduling).
+
+    At most ``max_concurrent`` requests are processed at once, and at most the class cap
+    of each kind. When requests of both kinds are waiting, free slots are shared in the
+    ratio of the class weights.
+    """
+
+    enabled: bool = True
+    max_concurrent: int = DEFAULT_SCHEDULER_MAX_CONCURRENT
+    text_max_concurrent: int = DEFAULT_SCHEDULER_TEXT_MAX_CONCURRENT
+    image_max_concurrent: int = DEFAULT_SCHEDULER_IMAGE_MAX_CONCURRENT
+    text_weight: int = DEFAULT_SCHEDULER_TEXT_WEIGHT
+    image_weight: int = DEFAULT_SCHEDULER_IMAGE_WEIGHT
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str]) -> SchedulerSettings:
+        max_concurrent = _positive_int(
+            environ, "SCHEDULER_MAX_CONCURRENT", DEFAULT_SCHEDULER_MAX_CONCURRENT
+        )
+        return cls(
+            enabled=environ.get("SCHEDULER_ENABLED", "true").strip().lower() != "false",
+            max_concurrent=max_concurrent,
+            text_max_concurrent=min(
+                _positive_int(
+                    environ, "SCHEDULER_TEXT_MAX_CONCURRENT", DEFAULT_SCHEDULER_TEXT_MAX_CONCURRENT
+                ),
+                max_concurrent,
+            ),
+            image_max_concurrent=min(
+                _positive_int(
+                    environ,
+                    "SCHEDULER_IMAGE_MAX_CONCURRENT",
+                    DEFAULT_SCHEDULER_IMAGE_MAX_CONCURRENT,
+                ),
+                max_concurrent,
+            ),
+            text_weight=_positive_int(
+                environ, "SCHEDULER_TEXT_WEIGHT", DEFAULT_SCHEDULER_TEXT_WEIGHT
+            ),
+            image_weight=_positive_int(
+                environ, "SCHEDULER_IMAGE_WEIGHT", DEFAULT_SCHEDULER_IMAGE_WEIGHT
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class ClientLimitSettings:
+    """Per-client limits (see app.services.client_limits); 0 leaves a limit off.
+
+    Clients are identified by their X-API-Key header when it is one of CLIENT_API_KEYS
+    (held here as SHA-256 digests), or else their IP address (the first X-Forwarded-For
+    entry when ``trust_forwarded_for`` is set behind a proxy).
+
+    The counters live in process memory, so each worker process enforces the limits
+    separately: with N workers a client can make up to N times the configured rate and
+    spend up to N times its daily budget. Divide the limits by the worker count.
+    """
+
+    requests_per_minute: float = 0.0
+    burst: int = DEFAULT_CLIENT_RATE_LIMIT_BURST
+    daily_budget_sgd: float = 0.0
+    max_clients: int = DEFAULT_CLIENT_LIMIT_MAX_CLIENTS
+    trust_forwarded_for: bool = False
+    api_key_digests: frozenset[str] = frozenset()
+
+    @property
+    def enabled(self) -> bool:
+        return self.requests_per_minute > 0 or self.daily_budget_sgd > 0
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str]) -> ClientLimitSettings:
+        return cls(
+            requests_per_minute=_non_negative_float(environ, "CLIENT_RATE_LIMIT_PER_MINUTE"),
+            burst=_positive_int(
+                environ, "CLIENT_RATE_LIMIT_BURST", DEFAULT_CLIENT_RATE_LIMIT_BURST
+            ),
+            daily_budget_sgd=_non_negative_float(environ, "CLIENT_DAILY_BUDGET_SGD"),
+            max_clients=_positive_int(
+                environ, "CLIENT_LIMIT_MAX_CLIENTS", DEFAULT_CLIENT_LIMIT_MAX_CLIENTS
+            ),
+            trust_forwarded_for=environ.get("CLIENT_LIMIT_TRUST_FORWARDED_FOR", "false")
+            .strip()
+            .lower()
+            == "true",
+            api_key_digests=frozenset(
+                hashlib.sha256(key.strip().encode("utf-8")).hexdigest()
+                for key in environ.get("CLIENT_API_KEYS", "").split(",")
+                if key.strip()
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class TextDocumentSettings:
+    """Long-document mode of /v1/process-text (see app.api.v1.process_text).
+
+    Documents of up to ``max_bytes`` of UTF-8 are processed in chunks of whole lines of
+    at most ``chunk_chars`` characters, ``concurrency`` chunks at a time.
+    """
+
+    max_bytes: int = DEFAULT_TEXT_DOCUMENT_MAX_BYTES
+    chunk_chars: int = DEFAULT_TEXT_DOCUMENT_CHUNK_CHARS
+    concurrency: int = DEFAULT_TEXT_DOCUMENT_CONCURRENCY
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str]) -> TextDocumentSettings:
+        return cls(
+            max_bytes=_positive_int(
+                environ, "TEXT_DOCUMENT_MAX_BYTES", DEFAULT_TEXT_DOCUMENT_MAX_BYTES
+            ),
+            chunk_chars=_positive_int(
+                environ, "TEXT_DOCUMENT_CHUNK_CHARS", DEFAULT_TEXT_DOCUMENT_CHUNK_CHARS
+            ),
+            concurrency=_positive_int(
+                environ, "TEXT_DOCUMENT_CONCURRENCY", DEFAULT_TEXT_DOCUMENT_CONCURRENCY
+            ),
+        )
+
+
+def _translate_price(environ: Mapping[str, str]) -> float | None:
+    """Return the configured Translate price, or None when it cannot be used for estimates."""
+    raw_price = environ.get(
+        "GOOGLE_TRANSLATE_USD_PER_MILLION_CHARS",
+        str(DEFAULT_GOOGLE_TRANSLATE_USD_PER_MILLION_CHARS),
+    )
+    try:
+        price = float(raw_price)
+    except ValueError:
+        return None
+    if not math.isfinite(price) or price <= 0:
+        return None
+    return price
+
+
+@dataclass(frozen=True)
+class Settings:
+    ocr_provider: str = ""
+    # OCR tiers tried in order, escalating on low confidence (see app.services.ocr_service).
+    ocr_cascade: tuple[str, ...] = ()
+    pinyin_provider: str = "pypinyin"
+    translation_enabled: bool = False
+    max_upload_bytes: int = DEFAULT_MAX_UPLOAD_BYTES
+    max_image_pixels: int = DEFAULT_MAX_IMAGE_PIXELS
+    text_input_max_chars: int = DEFAULT_TEXT_INPUT_MAX_CHARS
+    ocr_low_confidence_threshold: float = DEFAULT_OCR_LOW_CONFIDENCE_THRESHOLD
+    daily_budget_sgd: float = DEFAULT_DAILY_BUDGET_SGD
+    budget_warn_threshold_sgd: float = DEFAULT_DAILY_BUDGET_SGD * BUDGET_WARN_FRACTION
+    budget_history_retention_days: int = DEFAULT_BUDGET_HISTORY_RETENTION_DAYS
+    budget_enforce_mode: Literal["warn", "block"] = "warn"
+    google_translate_usd_per_million_chars: float | None = (
+        DEFAULT_GOOGLE_TRANSLATE_USD_PER_MILLION_CHARS
+    )
+    admin_token: str | None = None
+    translation_provider: str = "google"
+    simulated_ocr: SimulationSettings = SimulationSettings()
+    simulated_translation: SimulationSettings = SimulationSettings()
+    simulation_fixtures_dir: str | None = None
+    simulation_seed: int | None = None
+    profile_sample_rate: float = 0.0
+    warmup_enabled: bool = True
+    # Start OCR once the image header checks pass, while the full decode runs alongside.
+    speculative_ocr: bool = False
+    ocr_tiling: TilingSettings = TilingSettings()
+    local_ocr: LocalOcrSettings = LocalOcrSettings()
+    ocr_hedging: HedgingSettings = HedgingSettings()
+    circuit_breakers: CircuitBreakerSettings = CircuitBreakerSettings()
+    retry: RetrySettings = RetrySettings()
+    quotas: QuotaSettings = QuotaSettings()
+    concurrency_limits: ConcurrencyLimitSettings = ConcurrencyLimitSettings()
+    scheduler: SchedulerSettings = SchedulerSettings()
+    client_limits: ClientLimitSettings = ClientLimitSettings()
+    text_documents: TextDocumentSettings = TextDocumentSettings()
+    # Time a request may spend on provider calls; retries stop once it would be exceeded.
+    request_deadline_s: float = DEFAULT_REQUEST_DEADLINE_SECONDS
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] | None = None) -> Settings:
+        env = os.environ if environ is None else environ
+        daily_budget_sgd = _positive_finite_float(
+            env, "DAILY_BUDGET_SGD", DEFAULT_DAILY_BUDGET_SGD
+        )
+        enforce_mode = env.get("BUDGET_ENFORCE_MODE", "warn").strip().lower()
+        return cls(
+            ocr_provider=env.get("OCR_PROVIDER", "").strip().lower(),
+            ocr_cascade=tuple(
+                name.strip().lower()
+                for name in env.get("OCR_CASCADE", "").split(",")
+                if name.strip()
+            ),
+            pinyin_provider=env.get("PINYIN_PROVIDER", "pypinyin").strip().lower(),
+            translation_enabled=env.get("TRANSLATION_ENABLED", "false").strip().lower()
+            == "true",
+            max_upload_bytes=_positive_int(env, "MAX_UPLOAD_BYTES", DEFAULT_MAX_UPLOAD_BYTES),
+            max_image_pixels=_positive_int(env, "MAX_UPLOAD_PIXELS", DEFAULT_MAX_IMAGE_PIXELS),
+            text_input_max_chars=_positive_int(
+                env, "TEXT_INPUT_MAX_CHARS", DEFAULT_TEXT_INPUT_MAX_CHARS
+            ),
+            ocr_low_confidence_threshold=_low_confidence_threshold(env),
+            daily_budget_sgd=daily_budget_sgd,
+            budget_warn_threshold_sgd=daily_budget_sgd * BUDGET_WARN_FRACTION,
+            budget_history_retention_days=_positive_int(
+                env, "BUDGET_HISTORY_RETENTION_DAYS", DEFAULT_BUDGET_HISTORY_RETENTION_DAYS
+            ),
+            budget_enforce_mode="block" if enforce_mode == "block" else "warn",
+            google_translate_usd_per_million_chars=_translate_price(env),
+            admin_token=env.get("ADMIN_TOKEN", "").strip() or None,
+            translation_provider=env.get("TRANSLATION_PROVIDER", "google").strip().lower(),
+            simulated_ocr=SimulationSettings.from_env(env, "SIMULATED_OCR"),
+            simulated_translation=SimulationSettings.from_env(env, "SIMULATED_TRANSLATION"),
+            simulation_fixtures_dir=env.get("SIMULATION_FIXTURES_DIR", "").strip() or None,
+            simulation_seed=_optional_int(env, "SIMULATION_SEED"),
+            profile_sample_rate=_fraction(env, "PROFILE_SAMPLE_RATE"),
+            warmup_enabled=env.get("WARMUP_ENABLED", "true").strip().lower() != "false",
+            speculative_ocr=env.get("SPECULATIVE_OCR_ENABLED", "false").strip().lower()
+            == "true",
+            ocr_tiling=TilingSettings.from_env(env),
+            local_ocr=LocalOcrSettings.from_env(env),
+            ocr_hedging=HedgingSettings.from_env(env),
+            circuit_breakers=CircuitBreakerSettings.from_env(env),
+            retry=RetrySettings.from_env(env),
+            quotas=QuotaSettings.from_env(env),
+            concurrency_limits=ConcurrencyLimitSettings.from_env(env),
+            scheduler=SchedulerSettings.from_env(env),
+            client_limits=ClientLimitSettings.from_env(env),
+            text_documents=TextDocumentSettings.from_env(env),
+            request_deadline_s=_positive_finite_float(
+                env, "REQUEST_DEADLINE_SECONDS", DEFAULT_REQUEST_DEADLINE_SECONDS
+            ),
+        )
+
+    @property
+    def ocr_tiers(self) -> tuple[str, ...]:
+        """OCR providers in the order they are tried; just OCR_PROVIDER without a cascade."""
+        return self.ocr_cascade or (self.ocr_provider,)
+
+    @property
+    def upload_pixel_limit(self) -> int:
+        """Largest accepted image, in pixels; tiled OCR raises the MAX_UPLOAD_PIXELS ceiling."""
+        if self.ocr_tiling.enabled:
+            return max(self.max_image_pixels, self.ocr_tiling.max_pixels)
+        return self.max_image_pixels
+
+
+def read_env_file(path: str) -> dict[str, str]:
+    """Parse KEY=VALUE lines; blank lines, ``#`` comments and ``export`` prefixes are skipped."""
+    values: dict[str, str] = {}
+    with open(path, encoding="utf-8") as file:
+        for raw_line in file:
+            line = raw_line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, _, value = line.removeprefix("export ").partition("=")
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in {"'", '"'}:
+                value = value[1:-1]
+            values[key.strip()] = value
+    return values
+
+
+def _settings_environ() -> Mapping[str, str]:
+    """The process environment, overridden by SETTINGS_FILE when one is named."""
+    path = os.environ.get("SETTINGS_FILE", "").strip()
+    if not path:
+        return os.environ
+    try:
+        return {**os.environ, **read_env_file(path)}
+    except OSError:
+        logger.warning("Could not read SETTINGS_FILE %s; using the environment only", path)
+        return os.environ
+
+
+_settings: Settings = Settings.from_env(_settings_environ())
+
+
+def get_settings() -> Settings:
+    """Return the current settings snapshot."""
+    return _settings
+
+
+def reload_settings() -> Settings:
+    """Re-read the environment and SETTINGS_FILE and atomically replace the settings."""
+    global _settings
+    _settings = Settings.from_env(_settings_environ())
+    return _settings
+
+
+def install_reload_signal_handler() -> bool:
+    """Reload settings on SIGHUP. Returns False where signal handlers are unsupported."""
+    sighup = getattr(signal, "SIGHUP", None)
+    if sighup is None:
+        return False
+    try:
+        signal.signal(sighup, lambda _signum, _frame: _reload_from_signal())
+    except ValueError:
+        # Not running in the main thread (e.g. under a test client).
+        return False
+    return True
+
+
+def _reload_from_signal() -> None:
+    reload_settings()
+    logger.info("Settings reloaded on SIGHUP")
@@ -0,0 +1,76 @@
+"""Request-scoped stage timing.
+
+ServerTimingMiddleware puts a RequestTimer on ``request.state.timer``; routes and the
+response renderer record each stage with ``timer.span(name)``. The spans end up in
+``diagnostics.timing.spans`` and, together with serialization (which finishes after the
+body is built), in the ``Server-Timing`` response header.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from starlette.requests import Request
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    start_ms: float
+    duration_ms: float
+
+
+class RequestTimer:
+    __slots__ = ("_start", "spans")
+
+    def __init__(self) -> None:
+        self._start = time.perf_counter()
+        self.spans: list[Span] = []
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.spans.append(
+                Span(name, (start - self._start) * 1000, (end - start) * 1000)
+            )
+
+    def record_since_start(self, name: str) -> None:
+        """Record a span covering everything from the start of the request until now."""
+        self.spans.append(Span(name, 0.0, self.elapsed_ms()))
+
+    def deadline(self, budget_s: float) -> float:
+        """time.monotonic() value at which ``budget_s`` seconds since the start run out."""
+        return time.monotonic() + budget_s - (time.perf_counter() - self._start)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def duration_ms(self, name: str) -> float:
+        return sum(span.duration_ms for span in self.spans if span.name == name)
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: one metric per span, then the total."""
+        metrics = [f"{span.name};dur={span.duration_ms:.1f}" for span in self.spans]
+        metrics.append(f"total;dur={self.elapsed_ms():.1f}")
+        return ", ".join(metrics)
+
+
+def request_timer(request: Request) -> RequestTimer:
+    """Return the request's timer, creating one when no middleware installed it."""
+    timer = getattr(request.state, "timer", None)
+    if timer is None:
+        timer = RequestTimer()
+        request.state.timer = timer
+    return timer
+
+
+def installed_timer(request: Request) -> RequestTimer | None:
+    """Return the request's timer, or None when nothing has started timing the request."""
+    return getattr(request.state, "timer", None)
@@ -0,0 +1,118 @@
+"""Background warmup of providers and dictionaries after startup.
+
+The lifespan hook starts warm_up() as a task and returns immediately, so uvicorn binds
+the port without waiting for it. Warmup then pays, off the request path, the one-off
+costs the first requests would otherwise see: importing the OCR and translation client
+libraries and building their clients (the provider factories keep them for the requests
+that follow), loading the pypinyin dictionaries and registering Pillow's image plugins.
+Each step is timed; a failing step is logged and skipped, never fatal. ``readiness``
+reports progress for GET /v1/health/ready.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Literal
+
+from app.core.settings import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+# Exercises common and polyphonic characters so pypinyin loads its phrase dictionaries.
+_WARMUP_TEXT = "预热拼音词典：银行行长在长城上重新发言。"
+
+
+@dataclass
+class WarmupStep:
+    name: str
+    status: Literal["ok", "failed", "skipped"]
+    duration_ms: float
+
+
+@dataclass
+class Readiness:
+    state: Literal["pending", "warming", "ready"] = "pending"
+    started_at: float | None = None
+    ready_at: float | None = None
+    steps: list[WarmupStep] = field(default_factory=list)
+
+    @property
+    def is_ready(self) -> bool:
+        return self.state == "ready"
+
+
+readiness = Readiness()
+
+
+def _warm_images() -> None:
+    from PIL import Image
+
+    Image.init()
+
+
+def _warm_pinyin() -> None:
+    from app.adapters.pinyin_provider import get_pinyin_provider
+
+    get_pinyin_provider().generate(text=_WARMUP_TEXT)
+
+
+def _warm_ocr() -> None:
+    from app.adapters.ocr_provider import get_ocr_provider
+
+    for name in get_settings().ocr_tiers:
+        get_ocr_provider(name)
+
+
+def _warm_translation() -> None:
+    from app.adapters.translation_provider import get_translation_provider
+
+    get_translation_provider()
+
+
+def warmup_steps(settings: Settings) -> list[tuple[str, Callable[[], None] | None]]:
+    """Steps to run for this configuration; None marks a step that does not apply."""
+    return [
+        ("images", _warm_images),
+        ("pinyin", _warm_pinyin),
+        ("ocr", _warm_ocr if any(settings.ocr_tiers) else None),
+        ("translation", _warm_translation if settings.translation_enabled else None),
+    ]
+
+
+def _run_step(name: str, step: Callable[[], None] | None) -> WarmupStep:
+    if step is None:
+        return WarmupStep(name=name, status="skipped", duration_ms=0.0)
+    start = time.perf_counter()
+    try:
+        step()
+        status: Literal["ok", "failed"] = "ok"
+    except Exception:
+        logger.warning("Warmup step %s failed", name, exc_info=True)
+        status = "failed"
+    return WarmupStep(name=name, status=status, duration_ms=(time.perf_counter() - start) * 1000)
+
+
+async def warm_up(settings: Settings | None = None, state: Readiness = readiness) -> None:
+    settings = settings or get_settings()
+    state.state = "warming"
+    state.started_at = time.time()
+    state.steps = []
+    for name, step in warmup_steps(settings):
+        # Imports and dictionary loads block; keep them off the event loop.
+        state.steps.append(await asyncio.to_thread(_run_step, name, step))
+    state.state = "ready"
+    state.ready_at = time.time()
+    logger.info(
+        "Warmup complete in %.0f ms (%s)",
+        (state.ready_at - state.started_at) * 1000,
+        ", ".join(f"{step.name}={step.status}" for step in state.steps),
+    )
+
+
+def mark_ready_without_warmup(state: Readiness = readiness) -> None:
+    state.state = "ready"
+    state.ready_at = time.time()
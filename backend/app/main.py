@@ -1,12 +1,21 @@
+import asyncio
+import contextlib
 import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import api_v1_router
 from app.core.sentry import init_sentry
+from app.core.settings import get_settings, install_reload_signal_handler
+from app.core.warmup import mark_ready_without_warmup, warm_up
+from app.middleware.profiling import ProfilingMiddleware
 from app.middleware.request_id import RequestIdMiddleware
+from app.middleware.request_log import RequestLogMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware
 
 logging.basicConfig(
     level=logging.INFO,
@@ -15,8 +24,27 @@ logging.basicConfig(
 
 init_sentry()
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    install_reload_signal_handler()
+    # Warm up in the background so the server binds its port straight away;
+    # GET /v1/health/ready reports when warmup has finished.
+    warmup_task = None
+    if get_settings().warmup_enabled:
+        warmup_task = asyncio.create_task(warm_up())
+    else:
+        mark_ready_without_warmup()
+    yield
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await warmup_task
+
+
 app = FastAPI(
     title="OCR Pinyin API",
+    lifespan=lifespan,
     version="0.1.0",
     servers=[
         {
@@ -39,12 +67,17 @@ def _get_cors_origins() -> list[str]:
     ]
 
 
+# Innermost: needs the request id assigned by RequestIdMiddleware.
+app.add_middleware(ProfilingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=_get_cors_origins(),
     allow_methods=["GET", "POST", "OPTIONS"],
     allow_headers=["*"],
 )
+# Inside ServerTimingMiddleware, whose timer it reads.
+app.add_middleware(RequestLogMiddleware)
+app.add_middleware(ServerTimingMiddleware, allow_origins=_get_cors_origins())
 app.add_middleware(RequestIdMiddleware)
 
 app.include_router(api_v1_router)
@@ -0,0 +1,65 @@
+import logging
+import random
+import secrets
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.profiling import RequestProfile, StackSampler, profile_store
+from app.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def _should_profile(scope: Scope) -> bool:
+    settings = get_settings()
+    if settings.admin_token is not None:
+        for name, value in scope.get("headers", ()):
+            if name == b"x-profile":
+                # Only holders of ADMIN_TOKEN may force profiling.
+                return secrets.compare_digest(value, settings.admin_token.encode("utf-8"))
+    return settings.profile_sample_rate > 0 and random.random() < settings.profile_sample_rate
+
+
+class ProfilingMiddleware:
+    """Run a request under the sampling profiler when asked to (see app.core.profiling).
+
+    A request is profiled when it carries ``X-Profile: <ADMIN_TOKEN>`` or falls within
+    PROFILE_SAMPLE_RATE. Must run inside RequestIdMiddleware, which assigns the id the
+    profile is stored under. Other requests only pay for the header check.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope.get("type") != "http"
+            or not _should_profile(scope)
+            or not profile_store.try_acquire_slot()
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = StackSampler()
+        started_at = time.time()
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            sampler.stop()
+            profile_store.release_slot()
+            request_id = scope.get("state", {}).get("request_id", "")
+            profile_store.add(
+                RequestProfile(
+                    request_id=request_id,
+                    method=scope.get("method", ""),
+                    path=scope.get("path", ""),
+                    started_at=started_at,
+                    duration_ms=(time.perf_counter() - start) * 1000,
+                    interval_ms=sampler.interval_s * 1000,
+                    samples=sampler.samples,
+                )
+            )
+            logger.info("Stored request profile request_id=%s", request_id)
@@ -0,0 +1,55 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.request_log import RequestLog, RequestRecord, request_log
+from app.core.timing import RequestTimer
+
+
+class RequestLogMiddleware:
+    """Add each opted-in request (see app.core.request_log) to the request log.
+
+    Must run inside ServerTimingMiddleware, whose timer supplies the stage spans.
+    """
+
+    def __init__(self, app: ASGIApp, log: RequestLog = request_log) -> None:
+        self.app = app
+        self.log = log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope.get("type") != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.time()
+        http_status = 500
+        response_bytes = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal http_status, response_bytes
+            if message["type"] == "http.response.start":
+                http_status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            state = scope.get("state", {})
+            details = state.get("details")
+            timer: RequestTimer | None = state.get("timer")
+            if details is not None and timer is not None:
+                self.log.add(
+                    RequestRecord(
+                        request_id=state.get("request_id", ""),
+                        method=scope.get("method", ""),
+                        path=scope.get("path", ""),
+                        started_at=started_at,
+                        total_ms=timer.elapsed_ms(),
+                        http_status=http_status,
+                        response_bytes=response_bytes,
+                        spans=[(span.name, span.duration_ms) for span in timer.spans],
+                        details=details,
+                    )
+                )
@@ -0,0 +1,37 @@
+from collections.abc import Sequence
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.timing import RequestTimer
+
+
+class ServerTimingMiddleware:
+    """Time each request and report its stage spans in a ``Server-Timing`` header.
+
+    ``Timing-Allow-Origin`` lets the configured frontend origins read the header through
+    the Resource Timing API, not just in devtools.
+    """
+
+    def __init__(self, app: ASGIApp, allow_origins: Sequence[str] = ()) -> None:
+        self.app = app
+        self._timing_allow_origin = ", ".join(allow_origins).encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope.get("type") != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer = RequestTimer()
+        scope.setdefault("state", {})
+        scope["state"]["timer"] = timer
+
+        async def send_wrapper(message: dict) -> None:
+            if message.get("type") == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timer.server_timing().encode("latin-1")))
+                if self._timing_allow_origin:
+                    headers.append((b"timing-allow-origin", self._timing_allow_origin))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,7 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class SettingsReloadResponse(BaseModel):
+    status: Literal["reloaded"]
@@ -0,0 +1,71 @@
+"""Columnar variant of the process response envelope.
+
+Selected with ``?format=columnar`` (JSON) or ``?format=msgpack`` (MessagePack), or via the
+Accept header (see app.api.response_format). The envelope mirrors ProcessResponse;
+only ``data`` differs:
+
+* segment lists become one array per field, index-aligned (``source_text[i]`` and
+  ``pinyin_text[i]`` describe the same segment);
+* the per-line translation, repeated on every segment of a line in the default format,
+  is sent once per line in ``translations`` keyed by ``line_id``;
+* reading groups omit ``raw_text`` (the concatenated ``source_text`` of their
+  ``segment_indexes``), and ``playback_text`` is null when it equals ``display_text``.
+"""
+
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict
+
+from app.schemas.diagnostics import DiagnosticsPayload
+from app.schemas.process import ProcessError, ProcessWarning, ReadingProviderInfo
+
+
+class ColumnarOcrData(BaseModel):
+    text: list[str]
+    language: list[str]
+    confidence: list[float]
+    line_id: list[int | None]
+
+
+class ColumnarPinyinData(BaseModel):
+    source_text: list[str]
+    pinyin_text: list[str]
+    alignment_status: list[Literal["aligned", "uncertain"]]
+    reason_code: list[str | None]
+    line_id: list[int | None]
+    translations: dict[int, str]
+
+
+class ColumnarReadingGroups(BaseModel):
+    group_id: list[str]
+    line_id: list[int]
+    display_text: list[str]
+    playback_text: list[str | None]
+    confidence: list[float | None]
+    segment_indexes: list[list[int]]
+
+
+class ColumnarReadingData(BaseModel):
+    mode: Literal["derived"]
+    provider: ReadingProviderInfo
+    groups: ColumnarReadingGroups
+
+
+class ColumnarProcessData(BaseModel):
+    ocr: ColumnarOcrData | None = None
+    pinyin: ColumnarPinyinData | None = None
+    reading: ColumnarReadingData | None = None
+    message: str | None = None
+    job_id: str | None = None
+
+
+class ColumnarProcessResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    format: Literal["columnar"] = "columnar"
+    status: Literal["success", "partial", "error"]
+    request_id: str
+    data: ColumnarProcessData | None = None
+    warnings: list[ProcessWarning] | None = None
+    error: ProcessError | None = None
+    diagnostics: DiagnosticsPayload | None = None
@@ -0,0 +1,52 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class ProfileSummary(BaseModel):
+    request_id: str
+    method: str
+    path: str
+    started_at: float
+    duration_ms: float
+    sample_count: int
+
+
+class ProfileListResponse(BaseModel):
+    profiles: list[ProfileSummary]
+
+
+class RequestLogSpan(BaseModel):
+    name: str
+    duration_ms: float
+
+
+class RequestLogEntry(BaseModel):
+    request_id: str
+    method: str
+    path: str
+    started_at: float
+    total_ms: float
+    http_status: int
+    response_bytes: int
+    spans: list[RequestLogSpan]
+    status: Literal["success", "partial", "error"] | None = None
+    error_code: str | None = None
+    warning_codes: list[str] = Field(default_factory=list)
+    outcomes: dict[str, str] = Field(default_factory=dict)
+    request_bytes: int | None = None
+    content_type: str | None = None
+    image_width: int | None = None
+    image_height: int | None = None
+    ocr_provider: str | None = None
+    ocr_tiles: int | None = None
+    speculative_ocr: bool | None = None
+    chunk_count: int | None = None
+    segment_count: int | None = None
+    line_count: int | None = None
+    translated_lines: int | None = None
+
+
+class SlowRequestsResponse(BaseModel):
+    slowest: list[RequestLogEntry]
+    recent: list[RequestLogEntry]
@@ -8,10 +8,18 @@ class UploadContext(BaseModel):
     file_size_bytes: int = Field(..., ge=0)
 
 
+class TimingSpan(BaseModel):
+    name: str
+    start_ms: float = Field(..., ge=0)
+    duration_ms: float = Field(..., ge=0)
+
+
 class TimingInfo(BaseModel):
     total_ms: float = Field(..., ge=0)
     ocr_ms: float = Field(..., ge=0)
     pinyin_ms: float = Field(..., ge=0)
+    # Every recorded stage in order, offsets relative to the start of the request.
+    spans: list[TimingSpan] = Field(default_factory=list)
 
 
 class TraceStep(BaseModel):
@@ -38,8 +46,38 @@ class CostEstimate(BaseModel):
         return self
 
 
+class OcrTierAttempt(BaseModel):
+    provider: str
+    outcome: Literal["served", "escalated", "failed"]
+    reason: Literal["low_confidence", "no_chinese_text", "no_text", "provider_error"] | None = (
+        None
+    )
+    average_confidence: float | None = None
+    # Set when the call was hedged; the hedge is charged whether or not it won.
+    hedge_provider: str | None = None
+    hedge_won: bool = False
+    # Hedges sent, one per hedged retry; each is charged.
+    hedges: int = 0
+    # Provider calls made for this tier, counting retries of transient errors.
+    attempts: int = 1
+
+
+class OcrDiagnostics(BaseModel):
+    # The OCR tier whose segments are in the response.
+    provider: str
+    tiers: list[OcrTierAttempt]
+
+
+class TranslationDiagnostics(BaseModel):
+    # Translate calls made across all lines, and how many of them were retries.
+    attempts: int
+    retries: int
+
+
 class DiagnosticsPayload(BaseModel):
     upload_context: UploadContext
     timing: TimingInfo
     trace: TraceInfo
     cost_estimate: CostEstimate | None = None
+    ocr: OcrDiagnostics | None = None
+    translation: TranslationDiagnostics | None = None
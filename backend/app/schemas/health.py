@@ -3,8 +3,50 @@ from typing import Literal
 from pydantic import BaseModel, Field
 
 
+class CircuitBreakerInfo(BaseModel):
+    state: Literal["closed", "open", "half_open"]
+    # Recent calls in the breaker's window and the share of them that failed or were slow.
+    calls: int
+    failure_rate: float
+    opened_total: int
+    rejected_total: int
+
+
+class ConcurrencyLimitInfo(BaseModel):
+    # Adaptive limit on concurrent calls to the provider and the calls running or waiting.
+    limit: int
+    in_flight: int
+    queued: int
+    baseline_latency_ms: float
+    increases_total: int
+    decreases_total: int
+
+
+class WorkloadClassInfo(BaseModel):
+    # Requests of one class (text or image) being processed or waiting for a slot.
+    in_flight: int
+    queued: int
+    admitted_total: int
+    rejected_total: int
+    queue_wait_ms_total: float
+
+
 class HealthResponse(BaseModel):
+    # "degraded" while a provider's circuit breaker is not closed.
     status: Literal["healthy", "degraded"]
+    circuit_breakers: dict[str, CircuitBreakerInfo] = Field(default_factory=dict)
+
+
+class WarmupStepInfo(BaseModel):
+    name: str
+    status: Literal["ok", "failed", "skipped"]
+    duration_ms: float
+
+
+class ReadinessResponse(BaseModel):
+    status: Literal["ready", "warming"]
+    warmup_ms: float | None = None
+    steps: list[WarmupStepInfo] = Field(default_factory=list)
 
 
 class DailyCostEntry(BaseModel):
@@ -18,4 +60,18 @@ class MetricsResponse(BaseModel):
     process_requests_success: int
     process_requests_partial: int
     process_requests_error: int
+    process_requests_cancelled: int = 0
+    # Hedged OCR (OCR_HEDGE_ENABLED): calls eligible for a hedge, hedges sent, hedges that
+    # returned first, and the hedge and win rates derived from them.
+    ocr_calls_total: int = 0
+    ocr_hedges_total: int = 0
+    ocr_hedge_wins_total: int = 0
+    ocr_hedge_rate: float = 0.0
+    ocr_hedge_win_rate: float = 0.0
+    quota_waits_total: int = 0
+    quota_wait_ms_total: float = 0.0
+    quota_timeouts_total: int = 0
+    circuit_breakers: dict[str, CircuitBreakerInfo] = Field(default_factory=dict)
+    concurrency_limits: dict[str, ConcurrencyLimitInfo] = Field(default_factory=dict)
+    workload_classes: dict[str, WorkloadClassInfo] = Field(default_factory=dict)
     daily_costs: dict[str, DailyCostEntry] = Field(default_factory=dict)
@@ -78,6 +78,8 @@ class ProcessError(BaseModel):
     category: str = "processing"
     code: str
     message: str
+    # Set on rate-limit rejections; also sent as the Retry-After header.
+    retry_after_seconds: int | None = None
 
 
 class ProcessResponse(BaseModel):
@@ -118,3 +120,25 @@ class ProcessResponse(BaseModel):
 
 class TextProcessRequest(BaseModel):
     source_text: str = Field(max_length=5000)
+
+
+class TextDocumentChunk(BaseModel):
+    """A processed chunk of lines in the /v1/process-text/document stream."""
+
+    event: Literal["chunk"] = "chunk"
+    index: int = Field(ge=0)
+    data: ProcessData
+    warnings: list[ProcessWarning] | None = None
+
+
+class TextDocumentEnd(BaseModel):
+    """Last event of the /v1/process-text/document stream."""
+
+    event: Literal["end"] = "end"
+    status: Literal["success", "partial", "error"]
+    request_id: str
+    chunk_count: int = Field(ge=0)
+    line_count: int = Field(ge=0)
+    warnings: list[ProcessWarning] | None = None
+    error: ProcessError | None = None
+    diagnostics: DiagnosticsPayload | None = None
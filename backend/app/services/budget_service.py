@@ -1,50 +1,78 @@
 import datetime
-import math
-import os
+from collections import deque
+from collections.abc import Sequence
 from typing import Literal
 
+from app.core.settings import Settings, get_settings
 from app.schemas.diagnostics import CostEstimate
+from app.services.client_limits import get_client_limiter
 
 _GCV_USD_PER_IMAGE = 0.0015
-_GOOGLE_TRANSLATE_USD_PER_MILLION_CHARS = 20.0
 _USD_TO_SGD = 1.35
-_BUDGET_WARN_FRACTION = 0.8
 
 
-def estimate_request_cost(*, file_size_bytes: int) -> CostEstimate:  # noqa: ARG001
+def estimate_request_cost(
+    *,
+    file_size_bytes: int,
+    settings: Settings | None = None,
+    ocr_calls: int = 1,
+) -> CostEstimate:
     """Estimate the processing cost for a single request.
 
-    Provider is determined from the OCR_PROVIDER environment variable.
+    Provider is determined from the OCR_PROVIDER setting.
     file_size_bytes is accepted for future per-size cost models; not used by GCV.
+    ocr_calls is the number of images sent to the provider (one per tile for tiled OCR).
     """
-    provider = os.environ.get("OCR_PROVIDER", "").strip().lower()
+    settings = settings or get_settings()
+    return _ocr_provider_cost(settings.ocr_provider, ocr_calls)
 
+
+def estimate_ocr_cost(providers: Sequence[str], *, ocr_calls: int = 1) -> CostEstimate:
+    """Estimate the cost of the OCR tiers that actually ran for a request.
+
+    A cascade that stops at a free tier is charged nothing for the tiers it skipped.
+    When some tier's price is unknown it counts as zero: the estimate covers the priced
+    tiers and is marked ``fallback``.
+    """
+    estimates = [_ocr_provider_cost(provider, ocr_calls) for provider in providers]
+    priced = [estimate for estimate in estimates if estimate.confidence == "full"]
+    if not priced:
+        return CostEstimate(confidence="unavailable")
+    estimated_usd = round(sum(estimate.estimated_usd for estimate in priced), 6)
+    return CostEstimate(
+        estimated_usd=estimated_usd,
+        estimated_sgd=round(estimated_usd * _USD_TO_SGD, 6),
+        confidence="full" if len(priced) == len(estimates) else "fallback",
+    )
+
+
+def _ocr_provider_cost(provider: str, ocr_calls: int) -> CostEstimate:
     if provider == "google_vision":
-        estimated_sgd = round(_GCV_USD_PER_IMAGE * _USD_TO_SGD, 6)
+        estimated_usd = round(_GCV_USD_PER_IMAGE * ocr_calls, 6)
+        estimated_sgd = round(estimated_usd * _USD_TO_SGD, 6)
         return CostEstimate(
-            estimated_usd=_GCV_USD_PER_IMAGE,
+            estimated_usd=estimated_usd,
             estimated_sgd=estimated_sgd,
             confidence="full",
         )
 
+    if provider == "local":
+        # Local CPU OCR has no per-image charge.
+        return CostEstimate(estimated_usd=0.0, estimated_sgd=0.0, confidence="full")
+
     return CostEstimate(confidence="unavailable")
 
 
-def estimate_text_processing_cost(*, char_count: int) -> CostEstimate:
+def estimate_text_processing_cost(
+    *, char_count: int, settings: Settings | None = None
+) -> CostEstimate:
     """Estimate Google Translate spend for an accepted pasted-text request."""
-    if os.environ.get("TRANSLATION_ENABLED", "false").strip().lower() != "true":
+    settings = settings or get_settings()
+    if not settings.translation_enabled:
         return CostEstimate(confidence="unavailable")
 
-    raw_price = os.environ.get(
-        "GOOGLE_TRANSLATE_USD_PER_MILLION_CHARS",
-        str(_GOOGLE_TRANSLATE_USD_PER_MILLION_CHARS),
-    )
-    try:
-        usd_per_million_chars = float(raw_price)
-    except ValueError:
-        return CostEstimate(confidence="unavailable")
-
-    if not math.isfinite(usd_per_million_chars) or usd_per_million_chars <= 0 or char_count <= 0:
+    usd_per_million_chars = settings.google_translate_usd_per_million_chars
+    if usd_per_million_chars is None or char_count <= 0:
         return CostEstimate(confidence="unavailable")
 
     estimated_usd = round((char_count / 1_000_000) * usd_per_million_chars, 8)
@@ -57,22 +85,58 @@ def estimate_text_processing_cost(*, char_count: int) -> CostEstimate:
 
 
 class DailyCostStore:
-    def __init__(self) -> None:
+    """In-memory daily spend ledger with an O(1) counter for the current day.
+
+    Today's entry is held by reference so recording and threshold checks never copy
+    history. Entries older than ``retention_days`` (defaulting to the
+    BUDGET_HISTORY_RETENTION_DAYS setting) are pruned when the date rolls over.
+    """
+
+    def __init__(self, *, retention_days: int | None = None) -> None:
         self._data: dict[str, dict[str, float | int]] = {}
+        # (date ordinal, iso key) in recording order; oldest entries are pruned first.
+        self._history: deque[tuple[int, str]] = deque()
+        self._today: datetime.date | None = None
+        self._today_entry: dict[str, float | int] | None = None
+        self.retention_days = retention_days
+
+    def _roll_to(self, today: datetime.date) -> None:
+        self._today = today
+        self._today_entry = self._data.get(today.isoformat())
+        retention_days = self.retention_days or get_settings().budget_history_retention_days
+        cutoff = today.toordinal() - retention_days
+        while self._history and self._history[0][0] <= cutoff:
+            _, expired_key = self._history.popleft()
+            self._data.pop(expired_key, None)
 
     def record(self, cost_estimate: CostEstimate) -> None:
-        if cost_estimate.confidence != "full":
+        """Add the priced portion of ``cost_estimate``; a ``fallback`` estimate counts too."""
+        if cost_estimate.estimated_usd is None or cost_estimate.estimated_sgd is None:
             return
 
-        today = datetime.date.today().isoformat()
-        entry = self._data.setdefault(
-            today,
-            {"total_usd": 0.0, "total_sgd": 0.0, "request_count": 0},
-        )
+        today = datetime.date.today()
+        if today != self._today:
+            self._roll_to(today)
+
+        entry = self._today_entry
+        if entry is None:
+            entry = {"total_usd": 0.0, "total_sgd": 0.0, "request_count": 0}
+            key = today.isoformat()
+            self._data[key] = entry
+            self._history.append((today.toordinal(), key))
+            self._today_entry = entry
         entry["total_usd"] += cost_estimate.estimated_usd
         entry["total_sgd"] += cost_estimate.estimated_sgd
         entry["request_count"] += 1
 
+    def today_total_sgd(self) -> float:
+        """Return today's recorded spend without copying any history."""
+        today = datetime.date.today()
+        if today != self._today:
+            self._roll_to(today)
+        entry = self._today_entry
+        return 0.0 if entry is None else entry["total_sgd"]
+
     def snapshot(self) -> dict[str, dict[str, float | int]]:
         return {date: dict(entry) for date, entry in self._data.items()}
 
@@ -80,32 +144,34 @@ class DailyCostStore:
 daily_cost_store = DailyCostStore()
 
 
-def record_request_cost(cost_estimate: CostEstimate) -> None:
-    """Record the cost of a request that is about to attempt OCR (GCV will be billed)."""
+def record_request_cost(
+    cost_estimate: CostEstimate, *, client: str | None = None, settings: Settings | None = None
+) -> None:
+    """Record the priced portion of a request's provider spend, whatever its confidence.
+
+    With ``client`` the cost also counts toward that client's daily quota, if one is set
+    (see app.services.client_limits).
+    """
     daily_cost_store.record(cost_estimate)
+    if client is None or cost_estimate.estimated_sgd is None:
+        return
+    limiter = get_client_limiter(settings or get_settings())
+    if limiter is not None:
+        limiter.record_cost(client, cost_estimate.estimated_sgd)
 
 
-def check_budget_threshold() -> Literal["ok", "warn", "exceeded"]:
+def check_budget_threshold(settings: Settings | None = None) -> Literal["ok", "warn", "exceeded"]:
     """Check today's spend against the configured daily budget."""
-    try:
-        budget_sgd = float(os.environ.get("DAILY_BUDGET_SGD", "1.0"))
-    except ValueError:
-        budget_sgd = 1.0
-    if not math.isfinite(budget_sgd) or budget_sgd <= 0:
-        budget_sgd = 1.0
-
-    today = datetime.date.today().isoformat()
-    snapshot = daily_cost_store.snapshot()
-    today_sgd = float(snapshot.get(today, {}).get("total_sgd", 0.0))
-
-    if today_sgd >= budget_sgd:
+    settings = settings or get_settings()
+    today_sgd = daily_cost_store.today_total_sgd()
+
+    if today_sgd >= settings.daily_budget_sgd:
         return "exceeded"
-    if today_sgd >= budget_sgd * _BUDGET_WARN_FRACTION:
+    if today_sgd >= settings.budget_warn_threshold_sgd:
         return "warn"
     return "ok"
 
 
-def get_budget_enforce_mode() -> Literal["warn", "block"]:
-    """Read the budget enforcement mode from the environment."""
-    mode = os.environ.get("BUDGET_ENFORCE_MODE", "warn").strip().lower()
-    return "block" if mode == "block" else "warn"
+def get_budget_enforce_mode(settings: Settings | None = None) -> Literal["warn", "block"]:
+    """Return the configured budget enforcement mode."""
+    return (settings or get_settings()).budget_enforce_mode
@@ -0,0 +1,129 @@
+"""Per-client request rate limits and daily cost quotas.
+
+Without them one heavy or scripted client can take most of the throughput and spend the
+shared daily budget (see app.services.budget_service). With CLIENT_RATE_LIMIT_PER_MINUTE
+set each client gets a token bucket of CLIENT_RATE_LIMIT_BURST requests refilled at that
+rate; with CLIENT_DAILY_BUDGET_SGD set the estimated cost of its requests is also summed
+per day. A client over either limit is rejected before any work is done, with the
+number of seconds until it may try again.
+
+State is one small record per client, kept in LRU order: beyond CLIENT_LIMIT_MAX_CLIENTS
+the least recently seen client is forgotten (and starts afresh if it returns). Like the
+daily cost ledger the state lives in process memory, so each worker process enforces the
+limits on its own share of the traffic.
+"""
+
+from __future__ import annotations
+
+import datetime
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Literal
+
+from app.core.settings import ClientLimitSettings, Settings
+
+
+@dataclass(frozen=True, slots=True)
+class ClientRejection:
+    code: Literal["client_rate_limited", "client_daily_quota_exceeded"]
+    retry_after_s: int
+
+
+@dataclass(slots=True)
+class _ClientState:
+    tokens: float
+    updated: float
+    day: int
+    cost_sgd: float = 0.0
+
+
+def _seconds_until_midnight(now: datetime.datetime) -> int:
+    midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time())
+    return max(math.ceil((midnight - now).total_seconds()), 1)
+
+
+class ClientLimiter:
+    def __init__(
+        self,
+        config: ClientLimitSettings,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        now: Callable[[], datetime.datetime] = datetime.datetime.now,
+    ) -> None:
+        self.config = config
+        self._clock = clock
+        self._now = now
+        self._clients: OrderedDict[str, _ClientState] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def _state(self, client: str, today: int) -> _ClientState:
+        state = self._clients.get(client)
+        if state is None:
+            state = _ClientState(tokens=float(self.config.burst), updated=self._clock(), day=today)
+            self._clients[client] = state
+            if len(self._clients) > self.config.max_clients:
+                self._clients.popitem(last=False)
+        else:
+            self._clients.move_to_end(client)
+        if state.day != today:
+            state.day = today
+            state.cost_sgd = 0.0
+        return state
+
+    def check(self, client: str) -> ClientRejection | None:
+        """Take one request token for ``client``, or say why and for how long it must wait."""
+        config = self.config
+        now = self._now()
+        with self._lock:
+            state = self._state(client, now.date().toordinal())
+            if config.daily_budget_sgd and state.cost_sgd >= config.daily_budget_sgd:
+                return ClientRejection("client_daily_quota_exceeded", _seconds_until_midnight(now))
+            if not config.requests_per_minute:
+                return None
+            rate = config.requests_per_minute / 60
+            clock = self._clock()
+            state.tokens = min(state.tokens + (clock - state.updated) * rate, config.burst)
+            state.updated = clock
+            if state.tokens < 1:
+                return ClientRejection(
+                    "client_rate_limited", max(math.ceil((1 - state.tokens) / rate), 1)
+                )
+            state.tokens -= 1
+            return None
+
+    def record_cost(self, client: str, cost_sgd: float) -> None:
+        with self._lock:
+            state = self._state(client, self._now().date().toordinal())
+            state.cost_sgd += cost_sgd
+
+
+_limiter: ClientLimiter | None = None
+_limiter_lock = threading.Lock()
+
+
+def get_client_limiter(settings: Settings) -> ClientLimiter | None:
+    """The shared limiter, or None while no CLIENT_* limit is set.
+
+    It is rebuilt (forgetting every client) when the CLIENT_* settings change.
+    """
+    global _limiter
+    config = settings.client_limits
+    if not config.enabled:
+        return None
+    with _limiter_lock:
+        if _limiter is None or _limiter.config != config:
+            _limiter = ClientLimiter(config)
+        return _limiter
+
+
+def reset_client_limiter() -> None:
+    global _limiter
+    with _limiter_lock:
+        _limiter = None
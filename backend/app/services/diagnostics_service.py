@@ -1,8 +1,10 @@
 from app.schemas.diagnostics import (
     CostEstimate,
     DiagnosticsPayload,
+    OcrDiagnostics,
     TimingInfo,
     TraceInfo,
+    TranslationDiagnostics,
     UploadContext,
 )
 
@@ -13,10 +15,14 @@ def build_diagnostics(
     timing: TimingInfo,
     trace: TraceInfo,
     cost_estimate: CostEstimate | None = None,
+    ocr: OcrDiagnostics | None = None,
+    translation: TranslationDiagnostics | None = None,
 ) -> DiagnosticsPayload:
-    return DiagnosticsPayload(
+    return DiagnosticsPayload.model_construct(
         upload_context=upload_context,
         timing=timing,
         trace=trace,
         cost_estimate=cost_estimate,
+        ocr=ocr,
+        translation=translation,
     )
@@ -1,17 +1,26 @@
 import io
-import os
 
 from fastapi import UploadFile
-from PIL import Image, UnidentifiedImageError
+from PIL import ExifTags, Image, UnidentifiedImageError
+
+from app.core.settings import (
+    DEFAULT_MAX_IMAGE_PIXELS,
+    DEFAULT_MAX_UPLOAD_BYTES,
+    Settings,
+    get_settings,
+)
 
 VALIDATION_ERROR_CATEGORY = "validation"
 ALLOWED_IMAGE_MIME_TYPES = {"image/jpeg", "image/png", "image/webp"}
-MAX_FILE_SIZE_BYTES = 8 * 1024 * 1024
-MAX_IMAGE_PIXELS = 25_000_000
+MAX_FILE_SIZE_BYTES = DEFAULT_MAX_UPLOAD_BYTES
+MAX_IMAGE_PIXELS = DEFAULT_MAX_IMAGE_PIXELS
 
 # Disable Pillow's built-in decompression-bomb limit; we enforce MAX_IMAGE_PIXELS explicitly below.
 Image.MAX_IMAGE_PIXELS = None
 
+# EXIF orientations that turn the image a quarter turn, swapping width and height.
+_TRANSPOSING_ORIENTATIONS = {5, 6, 7, 8}
+
 
 class ValidatedImage:
     __slots__ = ("content_type", "size_bytes", "width", "height")
@@ -33,35 +42,50 @@ class ImageValidationError(Exception):
         self.category = category
 
 
-def get_configured_max_upload_bytes() -> int:
-    """Return the effective file-size ceiling, preferring MAX_UPLOAD_BYTES env var."""
+def _exif_orientation(image: Image.Image) -> int | None:
     try:
-        value = int(os.environ.get("MAX_UPLOAD_BYTES", ""))
-        if value > 0:
-            return value
-    except (ValueError, TypeError):
-        pass
-    return MAX_FILE_SIZE_BYTES
+        return image.getexif().get(ExifTags.Base.Orientation)
+    except (OSError, ValueError, SyntaxError):
+        # Unreadable metadata is left to the full decode to reject.
+        return None
 
 
-def get_configured_max_image_pixels() -> int:
-    """Return the effective pixel-count ceiling, preferring MAX_UPLOAD_PIXELS env var."""
-    try:
-        value = int(os.environ.get("MAX_UPLOAD_PIXELS", ""))
-        if value > 0:
-            return value
-    except (ValueError, TypeError):
-        pass
-    return MAX_IMAGE_PIXELS
+def _missing_file() -> ImageValidationError:
+    return ImageValidationError(
+        code="missing_file",
+        message="No image was uploaded. Please take a photo or upload an image file.",
+    )
+
+
+def _decode_failed() -> ImageValidationError:
+    return ImageValidationError(
+        code="image_decode_failed",
+        message="The uploaded file could not be read as an image. Please retake the photo.",
+    )
 
 
-def validate_image_upload(file: UploadFile | None) -> ValidatedImage:
+def get_configured_max_upload_bytes(settings: Settings | None = None) -> int:
+    """Return the effective file-size ceiling (MAX_UPLOAD_BYTES setting)."""
+    return (settings or get_settings()).max_upload_bytes
+
+
+def get_configured_max_image_pixels(settings: Settings | None = None) -> int:
+    """Return the effective pixel-count ceiling (MAX_UPLOAD_PIXELS setting)."""
+    return (settings or get_settings()).max_image_pixels
+
+
+def inspect_image_upload(
+    file: UploadFile | None, *, settings: Settings | None = None
+) -> ValidatedImage:
+    """Check MIME type, size and dimensions from the image header, without decoding pixels.
+
+    An image that passes may still be truncated or corrupt; ``verify_image_integrity``
+    decodes it in full.
+    """
     if file is None:
-        raise ImageValidationError(
-            code="missing_file",
-            message="No image was uploaded. Please take a photo or upload an image file.",
-        )
+        raise _missing_file()
 
+    settings = settings or get_settings()
     content_type = (file.content_type or "").lower().strip()
     if content_type not in ALLOWED_IMAGE_MIME_TYPES:
         raise ImageValidationError(
@@ -72,7 +96,7 @@ def validate_image_upload(file: UploadFile | None) -> ValidatedImage:
     file.file.seek(0, 2)
     size_bytes = file.file.tell()
     file.file.seek(0)
-    if size_bytes > get_configured_max_upload_bytes():
+    if size_bytes > settings.max_upload_bytes:
         raise ImageValidationError(
             code="file_too_large",
             message="Image is too large. Please upload a smaller file and try again.",
@@ -81,23 +105,18 @@ def validate_image_upload(file: UploadFile | None) -> ValidatedImage:
     image_bytes = file.file.read()
     file.file.seek(0)
     if not image_bytes:
-        raise ImageValidationError(
-            code="image_decode_failed",
-            message="The uploaded file could not be read as an image. Please retake the photo.",
-        )
+        raise _decode_failed()
 
     try:
         with Image.open(io.BytesIO(image_bytes)) as img:
             width, height = img.size  # Header-only: no pixel decode yet.
-            if width * height <= get_configured_max_image_pixels():
-                img.load()  # Full decode only within safe bounds; validates integrity.
+            # Report the upright size, which is what tiling crops (see ocr_tiling._decode).
+            if _exif_orientation(img) in _TRANSPOSING_ORIENTATIONS:
+                width, height = height, width
     except (UnidentifiedImageError, OSError, ValueError, SyntaxError):
-        raise ImageValidationError(
-            code="image_decode_failed",
-            message="The uploaded file could not be read as an image. Please retake the photo.",
-        ) from None
+        raise _decode_failed() from None
 
-    if width * height > get_configured_max_image_pixels():
+    if width * height > settings.upload_pixel_limit:
         raise ImageValidationError(
             code="image_too_large_pixels",
             message="Image dimensions are too large. Please capture a lower-resolution image.",
@@ -110,3 +129,23 @@ def validate_image_upload(file: UploadFile | None) -> ValidatedImage:
         height=height,
     )
 
+
+def verify_image_integrity(image_bytes: bytes) -> None:
+    """Decode every pixel of an image that passed ``inspect_image_upload``."""
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            img.load()
+    except (UnidentifiedImageError, OSError, ValueError, SyntaxError):
+        raise _decode_failed() from None
+
+
+def validate_image_upload(
+    file: UploadFile | None, *, settings: Settings | None = None
+) -> ValidatedImage:
+    """Run both the header checks and the full decode."""
+    if file is None:
+        raise _missing_file()
+    validated = inspect_image_upload(file, settings=settings)
+    verify_image_integrity(file.file.read())
+    file.file.seek(0)
+    return validated
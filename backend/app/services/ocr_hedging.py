@@ -0,0 +1,162 @@
+"""Hedged OCR calls to cut tail latency.
+
+Provider latency has a long tail: most GCV calls return quickly, but a few stall for
+seconds and hold up the whole response. With OCR_HEDGE_ENABLED, a call that has not
+returned after the OCR_HEDGE_PERCENTILE of that provider's recent latencies is sent a
+second time (to OCR_HEDGE_PROVIDER, or the same provider) and whichever succeeds first
+wins. The other call is cancelled: its task is dropped, but a blocking provider call
+already running in a worker thread finishes there and its result is discarded, so a
+hedge is always paid for. A hedge that cannot be sent (its provider fails to build, or
+its circuit breaker is open) is skipped and the primary call is awaited alone.
+
+OCR_HEDGE_BUDGET caps that extra spend. Every OCR call earns the budget fraction of a
+hedge token and every hedge spends a whole one, so hedges stay below that share of
+calls over time. Nothing is hedged until OCR_HEDGE_MIN_SAMPLES latencies have been seen
+for the provider, and the CPU-bound local provider is never hedged against itself.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from app.adapters.ocr_provider import RawOcrSegment
+from app.core.metrics import metrics_store
+from app.core.settings import HedgingSettings
+
+# Recent latencies kept per provider for the hedge delay.
+_LATENCY_WINDOW = 200
+# Unused hedge tokens saved up for bursts of slow calls.
+_MAX_HEDGE_TOKENS = 5.0
+
+logger = logging.getLogger(__name__)
+
+OcrCall = Callable[[], list[RawOcrSegment]]
+# Starts a hedge; raises when the hedge cannot be sent.
+HedgeCall = Callable[[], Awaitable[list[RawOcrSegment]]]
+
+
+@dataclass(slots=True)
+class HedgeOutcome:
+    # Provider the hedges were sent to, when any were sent.
+    provider: str | None = None
+    won: bool = False
+    # Hedges sent; one outcome is shared by the retries of a call, each of which may hedge.
+    hedges: int = 0
+
+
+class OcrHedger:
+    """Per-provider latency windows and the hedge budget, shared across requests."""
+
+    def __init__(self) -> None:
+        self._latencies: dict[str, deque[float]] = {}
+        self._tokens = 0.0
+
+    def record_latency(self, provider: str, latency_ms: float) -> None:
+        self._latencies.setdefault(provider, deque(maxlen=_LATENCY_WINDOW)).append(latency_ms)
+
+    def hedge_delay_ms(self, provider: str, config: HedgingSettings) -> float | None:
+        """How long to wait before hedging a call to ``provider``; None to never hedge."""
+        samples = self._latencies.get(provider)
+        if samples is None or len(samples) < config.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, math.ceil(config.percentile / 100 * len(ordered)) - 1)
+        return max(ordered[max(index, 0)], config.min_delay_ms)
+
+    def _earn(self, config: HedgingSettings) -> None:
+        self._tokens = min(self._tokens + config.budget, _MAX_HEDGE_TOKENS)
+
+    def _spend(self) -> bool:
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    async def extract(
+        self,
+        provider: str,
+        call: OcrCall,
+        *,
+        config: HedgingSettings,
+        hedge_provider: str,
+        hedge_call: HedgeCall,
+        outcome: HedgeOutcome,
+    ) -> list[RawOcrSegment]:
+        """Run ``call``, hedging it with ``hedge_call()`` if it is slow and budget allows.
+
+        ``hedge_call`` is only invoked when a hedge is sent, so building the secondary
+        provider costs nothing for the common fast call. If it raises, the hedge is not
+        sent and ``call`` is awaited alone. ``outcome`` records the hedge, also when both
+        calls fail.
+        """
+        self._earn(config)
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(asyncio.to_thread(call))
+        delay_ms = self.hedge_delay_ms(provider, config) if provider != "local" else None
+        hedged = False
+        try:
+            if delay_ms is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay_ms / 1000)
+                if not done and self._spend():
+                    try:
+                        hedge = hedge_call()
+                    except Exception:
+                        logger.warning(
+                            "Could not hedge OCR call to %s", hedge_provider, exc_info=True
+                        )
+                        self._tokens += 1.0  # Nothing was sent; keep the token.
+                    else:
+                        hedged = True
+                        return await self._race(
+                            provider, primary, started, hedge_provider, hedge, outcome
+                        )
+            segments = await primary
+        finally:
+            primary.cancel()
+            if not hedged:
+                metrics_store.record_ocr_call(hedged=False, hedge_won=False)
+        self.record_latency(provider, (time.perf_counter() - started) * 1000)
+        return segments
+
+    async def _race(
+        self,
+        provider: str,
+        primary: asyncio.Future[list[RawOcrSegment]],
+        started: float,
+        hedge_provider: str,
+        hedge_call: Awaitable[list[RawOcrSegment]],
+        outcome: HedgeOutcome,
+    ) -> list[RawOcrSegment]:
+        outcome.provider = hedge_provider
+        outcome.hedges += 1
+        hedge_started = time.perf_counter()
+        hedge = asyncio.ensure_future(hedge_call)
+        pending: set[asyncio.Future[list[RawOcrSegment]]] = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer the primary when both finish together.
+                for future in sorted(done, key=lambda future: future is not primary):
+                    if future.exception() is None:
+                        outcome.won = future is hedge
+                        return future.result()
+            # Both failed: surface the primary's error.
+            return primary.result()
+        finally:
+            for future in (primary, hedge):
+                future.cancel()
+            now = time.perf_counter()
+            # A cancelled primary took at least this long, which keeps the window honest.
+            self.record_latency(provider, (now - started) * 1000)
+            if hedge.done() and not hedge.cancelled() and hedge.exception() is None:
+                self.record_latency(hedge_provider, (now - hedge_started) * 1000)
+            metrics_store.record_ocr_call(hedged=True, hedge_won=outcome.won)
+
+
+ocr_hedger = OcrHedger()
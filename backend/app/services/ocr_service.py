@@ -1,42 +1,51 @@
 import asyncio
+import functools
 import logging
-import os
 import re
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Literal
 
+from app.adapters import quota
 from app.adapters.ocr_provider import (
     OcrExecutionError,
+    OcrProvider,
     ProviderUnavailableError,
     RawOcrSegment,
     get_ocr_provider,
 )
-from app.schemas.process import OcrSegment
+from app.core.circuit_breaker import CircuitBreaker, get_breaker, record_call
+from app.core.concurrency_limit import (
+    AdaptiveLimiter,
+    ConcurrencyLimitTimeoutError,
+    get_limiter,
+    limited,
+)
+from app.core.settings import Settings, get_settings
+from app.services.ocr_hedging import HedgeOutcome, ocr_hedger
+from app.services.ocr_tiling import extract_tiled
+from app.services.retry import RetryStats, call_with_retry, get_retry_budget
+from app.services.segments import TextSegment
 
 OCR_ERROR_CATEGORY = "ocr"
 
 logger = logging.getLogger(__name__)
 
 
-def _resolve_low_confidence_threshold() -> float:
-    raw_value = os.getenv("OCR_LOW_CONFIDENCE_THRESHOLD", "0.7")
-    try:
-        return float(raw_value)
-    except (TypeError, ValueError):
-        logger.warning(
-            "Invalid OCR_LOW_CONFIDENCE_THRESHOLD %r; falling back to default 0.7",
-            raw_value,
-        )
-        return 0.7
-
-
-LOW_CONFIDENCE_THRESHOLD: float = _resolve_low_confidence_threshold()
+def average_confidence(segments: list[TextSegment]) -> float | None:
+    if not segments:
+        return None
+    return sum(s.confidence for s in segments) / len(segments)
 
 
-def is_low_confidence(segments: list[OcrSegment]) -> bool:
-    """Return True if average OCR confidence is below LOW_CONFIDENCE_THRESHOLD."""
-    if not segments:
+def is_low_confidence(segments: list[TextSegment], settings: Settings | None = None) -> bool:
+    """Return True if average OCR confidence is below OCR_LOW_CONFIDENCE_THRESHOLD."""
+    avg_confidence = average_confidence(segments)
+    if avg_confidence is None:
         return False
-    avg_confidence = sum(s.confidence for s in segments) / len(segments)
-    return avg_confidence < LOW_CONFIDENCE_THRESHOLD
+    threshold = (settings or get_settings()).ocr_low_confidence_threshold
+    return avg_confidence < threshold
 
 
 class OcrServiceError(Exception):
@@ -45,19 +54,246 @@ class OcrServiceError(Exception):
         self.code = code
         self.message = message
         self.category = category
+        # Tiers tried before the request failed; set by run_ocr().
+        self.attempts: list[OcrTierAttempt] = []
 
 
 _CJK_CHAR_RE = re.compile(r"[\u3400-\u9fff]")
 
 
-async def extract_chinese_segments(image_bytes: bytes, content_type: str) -> list[OcrSegment]:
-    provider = get_ocr_provider()
-    loop = asyncio.get_running_loop()
-    try:
-        raw_segments = await loop.run_in_executor(
-            None,
-            lambda: provider.extract(image_bytes=image_bytes, content_type=content_type),
+EscalationReason = Literal["low_confidence", "no_chinese_text", "no_text", "provider_error"]
+
+_ESCALATION_REASONS: dict[str, EscalationReason] = {
+    "ocr_no_chinese_text": "no_chinese_text",
+    "ocr_no_text_detected": "no_text",
+}
+
+
+@dataclass(slots=True)
+class OcrTierAttempt:
+    provider: str
+    outcome: Literal["served", "escalated", "failed"]
+    reason: EscalationReason | None = None
+    average_confidence: float | None = None
+    # Provider a hedged duplicate of this tier's call went to (see app.services.ocr_hedging).
+    hedge_provider: str | None = None
+    hedge_won: bool = False
+    # Hedges sent for this tier, counting one per hedged retry.
+    hedges: int = 0
+    # Provider calls made for this tier, counting retries of transient errors.
+    attempts: int = 1
+    # False when the tier failed as unavailable (open breaker, no call slot, provider
+    # not configured), so no billable call was made.
+    billed: bool = True
+
+
+@dataclass(slots=True)
+class OcrResult:
+    segments: list[TextSegment]
+    provider: str
+    attempts: list[OcrTierAttempt] = field(default_factory=list)
+
+    @property
+    def providers_run(self) -> list[str]:
+        return providers_called(self.attempts)
+
+
+def providers_called(attempts: Sequence[OcrTierAttempt]) -> list[str]:
+    """Every provider billed, including hedges, which are paid for even when they lose."""
+    providers = []
+    for attempt in attempts:
+        if not attempt.billed:
+            continue
+        providers.append(attempt.provider)
+        if attempt.hedge_provider is not None:
+            providers.extend([attempt.hedge_provider] * attempt.hedges)
+    return providers
+
+
+async def run_ocr(
+    image_bytes: bytes,
+    content_type: str,
+    *,
+    tiled: bool = False,
+    settings: Settings | None = None,
+    deadline: float | None = None,
+) -> OcrResult:
+    """OCR the image with the configured tiers and report which tier served it.
+
+    Without OCR_CASCADE this is a single call to OCR_PROVIDER. With a cascade such as
+    ``local,google_vision`` the cheaper tiers go first. A tier's result is used unless
+    its average confidence is below OCR_LOW_CONFIDENCE_THRESHOLD, or it found no Chinese
+    text or failed, in which case the next tier runs. If the last tier fails, the best
+    low-confidence result from an earlier tier is used instead of an error.
+
+    ``deadline`` (a time.monotonic() value) stops retries of transient errors.
+    """
+    settings = settings or get_settings()
+    tiers = settings.ocr_tiers
+    attempts: list[OcrTierAttempt] = []
+    fallback: tuple[int, list[TextSegment]] | None = None
+    for index, name in enumerate(tiers):
+        last = index == len(tiers) - 1
+        provider = get_ocr_provider(name)
+        hedge = HedgeOutcome()
+        retry = RetryStats()
+        try:
+            segments = await _extract_chinese_segments(
+                provider,
+                image_bytes,
+                content_type,
+                tiled=tiled,
+                settings=settings,
+                name=name,
+                hedge=hedge,
+                retry=retry,
+                deadline=deadline,
+            )
+        except OcrServiceError as error:
+            reason = _ESCALATION_REASONS.get(error.code, "provider_error")
+            outcome = "failed" if last else "escalated"
+            attempts.append(
+                OcrTierAttempt(
+                    provider=name,
+                    outcome=outcome,
+                    reason=reason,
+                    hedge_provider=hedge.provider,
+                    hedge_won=hedge.won,
+                    hedges=hedge.hedges,
+                    attempts=retry.attempts,
+                    billed=error.code != "ocr_provider_unavailable",
+                )
+            )
+            if not last:
+                logger.info("OCR tier %s escalated: %s", name, reason)
+                continue
+            if fallback is None:
+                error.attempts = attempts
+                raise
+            served, segments = fallback
+            attempts[served].outcome = "served"
+            return OcrResult(segments=segments, provider=tiers[served], attempts=attempts)
+
+        confidence = average_confidence(segments)
+        if not last and is_low_confidence(segments, settings):
+            logger.info("OCR tier %s escalated: low_confidence (%.2f)", name, confidence)
+            attempts.append(
+                OcrTierAttempt(
+                    provider=name,
+                    outcome="escalated",
+                    reason="low_confidence",
+                    average_confidence=confidence,
+                    hedge_provider=hedge.provider,
+                    hedge_won=hedge.won,
+                    hedges=hedge.hedges,
+                    attempts=retry.attempts,
+                )
+            )
+            if fallback is None:
+                fallback = (index, segments)
+            continue
+        attempts.append(
+            OcrTierAttempt(
+                provider=name,
+                outcome="served",
+                average_confidence=confidence,
+                hedge_provider=hedge.provider,
+                hedge_won=hedge.won,
+                hedges=hedge.hedges,
+                attempts=retry.attempts,
+            )
+        )
+        return OcrResult(segments=segments, provider=name, attempts=attempts)
+    raise AssertionError("settings.ocr_tiers is never empty")  # pragma: no cover
+
+
+async def extract_chinese_segments(
+    image_bytes: bytes,
+    content_type: str,
+    *,
+    tiled: bool = False,
+    settings: Settings | None = None,
+) -> list[TextSegment]:
+    """OCR the image and keep its Chinese segments (see run_ocr)."""
+    result = await run_ocr(image_bytes, content_type, tiled=tiled, settings=settings)
+    return result.segments
+
+
+async def _extract_chinese_segments(
+    provider: OcrProvider,
+    image_bytes: bytes,
+    content_type: str,
+    *,
+    tiled: bool,
+    settings: Settings,
+    name: str,
+    hedge: HedgeOutcome,
+    retry: RetryStats,
+    deadline: float | None,
+) -> list[TextSegment]:
+    """Run one provider and keep its Chinese segments.
+
+    With ``tiled`` the image is OCR'd as overlapping tiles (see app.services.ocr_tiling).
+    Otherwise transient errors are retried until ``deadline`` (see app.services.retry),
+    ``retry`` counting the calls, and with OCR_HEDGE_ENABLED a slow call is hedged and
+    ``hedge`` records it. While the provider's circuit breaker is open the call fails
+    fast as unavailable; calls beyond the provider's adaptive concurrency limit wait for
+    a slot until ``deadline``.
+    """
+    breaker = get_breaker("ocr", name, settings)
+    if breaker is not None and not breaker.allow():
+        logger.warning("OCR circuit breaker for %s is open; failing fast", name or "none")
+        raise OcrServiceError(
+            code="ocr_provider_unavailable",
+            message="Text extraction is temporarily unavailable. Please try again.",
         )
+
+    # Tiles already run under OCR_TILE_CONCURRENCY, and a tiled call's latency would
+    # skew the limiter's view of the provider. For the same reason each tile is recorded
+    # on the breaker separately (see extract_tiled) instead of the call as a whole.
+    limiter = None if tiled else get_limiter("ocr", name, settings)
+    call_breaker = None if tiled else breaker
+
+    async def attempt() -> list[RawOcrSegment]:
+        return await _guarded_call(
+            functools.partial(
+                _call_provider,
+                provider,
+                image_bytes,
+                content_type,
+                tiled=tiled,
+                settings=settings,
+                name=name,
+                hedge=hedge,
+                breaker=breaker,
+                deadline=deadline,
+            ),
+            breaker=call_breaker,
+            limiter=limiter,
+            deadline=deadline,
+        )
+
+    try:
+        # Provider threads inherit the deadline, bounding their waits for quota tokens.
+        with quota.deadline_scope(deadline):
+            if tiled:
+                # Retrying would re-OCR every tile; a tiled call is made once.
+                retry.attempts += 1
+                raw_segments = await attempt()
+            else:
+                raw_segments = await call_with_retry(
+                    attempt,
+                    config=settings.retry,
+                    budget=get_retry_budget(f"ocr:{name}"),
+                    deadline=deadline,
+                    stats=retry,
+                )
+    except ConcurrencyLimitTimeoutError as exc:
+        logger.warning("No OCR call slot for %s before the deadline", name or "none")
+        raise OcrServiceError(
+            code="ocr_provider_unavailable",
+            message="Text extraction is temporarily unavailable. Please try again.",
+        ) from exc
     except ProviderUnavailableError as exc:
         logger.exception("OCR provider unavailable: %s", exc)
         raise OcrServiceError(
@@ -97,8 +333,79 @@ async def extract_chinese_segments(image_bytes: bytes, content_type: str) -> lis
     return usable_segments
 
 
-def _normalize_segment(segment: RawOcrSegment) -> OcrSegment:
-    return OcrSegment(
+async def _guarded_call(
+    call: Callable[[], Awaitable[list[RawOcrSegment]]],
+    *,
+    breaker: CircuitBreaker | None,
+    limiter: AdaptiveLimiter | None,
+    deadline: float | None,
+) -> list[RawOcrSegment]:
+    """Run ``call`` in one of ``limiter``'s slots and record its outcome on ``breaker``."""
+    timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+    async with limited(limiter, timeout=timeout):
+        started = time.perf_counter()
+        try:
+            raw = await call()
+        except Exception:
+            record_call(breaker, started, ok=False)
+            raise
+        record_call(breaker, started, ok=True)
+        return raw
+
+
+async def _call_provider(
+    provider: OcrProvider,
+    image_bytes: bytes,
+    content_type: str,
+    *,
+    tiled: bool,
+    settings: Settings,
+    name: str,
+    hedge: HedgeOutcome,
+    breaker: CircuitBreaker | None,
+    deadline: float | None,
+) -> list[RawOcrSegment]:
+    if tiled:
+        return await extract_tiled(
+            provider, image_bytes, content_type, settings.ocr_tiling, breaker=breaker
+        )
+    hedging = settings.ocr_hedging
+    if hedging.enabled:
+        hedge_name = hedging.provider or name
+
+        def hedge_call() -> Awaitable[list[RawOcrSegment]]:
+            # The hedge goes through its provider's breaker and limiter like any other call.
+            hedge_provider = provider if hedge_name == name else get_ocr_provider(hedge_name)
+            hedge_breaker = get_breaker("ocr", hedge_name, settings)
+            if hedge_breaker is not None and not hedge_breaker.allow():
+                raise ProviderUnavailableError(f"OCR circuit breaker for {hedge_name} is open")
+            return _guarded_call(
+                functools.partial(
+                    asyncio.to_thread,
+                    hedge_provider.extract,
+                    image_bytes=image_bytes,
+                    content_type=content_type,
+                ),
+                breaker=hedge_breaker,
+                limiter=get_limiter("ocr", hedge_name, settings),
+                deadline=deadline,
+            )
+
+        return await ocr_hedger.extract(
+            name,
+            functools.partial(provider.extract, image_bytes=image_bytes, content_type=content_type),
+            config=hedging,
+            hedge_provider=hedge_name,
+            hedge_call=hedge_call,
+            outcome=hedge,
+        )
+    return await asyncio.to_thread(
+        provider.extract, image_bytes=image_bytes, content_type=content_type
+    )
+
+
+def _normalize_segment(segment: RawOcrSegment) -> TextSegment:
+    return TextSegment(
         text=(segment.text or "").strip(),
         language=_normalize_language(segment.language),
         confidence=_normalize_confidence(segment.confidence),
@@ -122,7 +429,7 @@ def _normalize_confidence(confidence: float | int | None) -> float:
     return max(0.0, min(normalized, 1.0))
 
 
-def _is_usable_chinese_segment(segment: OcrSegment) -> bool:
+def _is_usable_chinese_segment(segment: TextSegment) -> bool:
     if not segment.text:
         return False
     has_cjk_text = _CJK_CHAR_RE.search(segment.text) is not None
@@ -0,0 +1,271 @@
+"""Tiled OCR for very large or dense images.
+
+Full-page newspaper and poster photos either exceed MAX_UPLOAD_PIXELS or lose their small
+characters when the OCR provider downscales them. With OCR_TILING_ENABLED such images are
+split into overlapping square tiles that are OCR'd concurrently, and the per-tile results
+are merged back into one list of segments:
+
+1. every tile's boxes are shifted into full-image coordinates;
+2. lines seen by two tiles (they lie in an overlap region) are deduplicated, and lines cut
+   by a tile edge are stitched back together from their two halves;
+3. the surviving lines are sorted into reading order (rows top to bottom, left to right
+   within a row) and their ``line_id``s renumbered from 0.
+
+Deduplication relies on the bounding boxes providers report (RawOcrSegment.bbox). Lines
+without a box can only be deduplicated by identical text.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import math
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from difflib import SequenceMatcher
+
+from PIL import Image, ImageOps
+
+from app.adapters.ocr_provider import OcrProvider, RawOcrSegment
+from app.core.circuit_breaker import CircuitBreaker, record_call
+from app.core.settings import Settings, TilingSettings
+
+# Boxes are on the same row when they share this much of the shorter one's height.
+_SAME_ROW = 0.5
+# Texts this similar are two readings of the same line rather than different lines.
+_SAME_TEXT_RATIO = 0.6
+
+BBox = tuple[int, int, int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class Tile:
+    left: int
+    top: int
+    right: int
+    bottom: int
+
+
+@dataclass(slots=True)
+class _Line:
+    tile_index: int
+    segments: list[RawOcrSegment]
+    bbox: BBox | None
+    text: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.text = "".join(segment.text for segment in self.segments)
+
+
+def should_tile(width: int, height: int, settings: Settings) -> bool:
+    tiling = settings.ocr_tiling
+    if not tiling.enabled or max(width, height) <= tiling.tile_size:
+        return False
+    pixels = width * height
+    return pixels > tiling.min_pixels or pixels > settings.max_image_pixels
+
+
+def _axis_starts(length: int, tile_size: int, overlap: int) -> list[int]:
+    if length <= tile_size:
+        return [0]
+    count = math.ceil((length - overlap) / (tile_size - overlap))
+    # Spread the tiles evenly so every overlap is at least the configured one.
+    return [round(index * (length - tile_size) / (count - 1)) for index in range(count)]
+
+
+def plan_tiles(width: int, height: int, tiling: TilingSettings) -> list[Tile]:
+    """Overlapping tiles covering the image, in row-major order."""
+    return [
+        Tile(left, top, min(left + tiling.tile_size, width), min(top + tiling.tile_size, height))
+        for top in _axis_starts(height, tiling.tile_size, tiling.overlap)
+        for left in _axis_starts(width, tiling.tile_size, tiling.overlap)
+    ]
+
+
+def _encode_tile(image: Image.Image, tile: Tile, content_type: str) -> tuple[bytes, str]:
+    crop = image.crop((tile.left, tile.top, tile.right, tile.bottom))
+    buffer = io.BytesIO()
+    if content_type == "image/png":
+        crop.save(buffer, format="PNG")
+        return buffer.getvalue(), "image/png"
+    crop.convert("RGB").save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue(), "image/jpeg"
+
+
+def _decode(image_bytes: bytes) -> Image.Image:
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        # Tiles carry no EXIF, so bake the orientation in before cropping.
+        return ImageOps.exif_transpose(image)
+
+
+async def extract_tiled(
+    provider: OcrProvider,
+    image_bytes: bytes,
+    content_type: str,
+    tiling: TilingSettings,
+    *,
+    breaker: CircuitBreaker | None = None,
+) -> list[RawOcrSegment]:
+    """OCR the image tile by tile and merge the results into full-image segments.
+
+    Each tile call is recorded on ``breaker`` as a call of its own: the wall time of the
+    whole image grows with its tile count and says nothing about the provider's health.
+    """
+    image = await asyncio.to_thread(_decode, image_bytes)
+    tiles = plan_tiles(image.width, image.height, tiling)
+    semaphore = asyncio.Semaphore(tiling.concurrency)
+
+    def ocr_tile(tile: Tile) -> list[RawOcrSegment]:
+        tile_bytes, tile_content_type = _encode_tile(image, tile, content_type)
+        started = time.perf_counter()
+        try:
+            segments = provider.extract(image_bytes=tile_bytes, content_type=tile_content_type)
+        except Exception:
+            record_call(breaker, started, ok=False)
+            raise
+        record_call(breaker, started, ok=True)
+        return segments
+
+    async def run(tile: Tile) -> list[RawOcrSegment]:
+        async with semaphore:
+            return await asyncio.to_thread(ocr_tile, tile)
+
+    results = await asyncio.gather(*(run(tile) for tile in tiles))
+    return merge_tile_segments(list(zip(tiles, results, strict=True)))
+
+
+def _offset(bbox: BBox | None, tile: Tile) -> BBox | None:
+    if bbox is None:
+        return None
+    left, top, right, bottom = bbox
+    return (left + tile.left, top + tile.top, right + tile.left, bottom + tile.top)
+
+
+def _union(first: BBox | None, second: BBox | None) -> BBox | None:
+    if first is None or second is None:
+        return first or second
+    return (
+        min(first[0], second[0]),
+        min(first[1], second[1]),
+        max(first[2], second[2]),
+        max(first[3], second[3]),
+    )
+
+
+def _same_line(first: BBox, second: BBox) -> bool:
+    """Boxes on the same row that touch horizontally (a line and its copy or other half)."""
+    horizontal = min(first[2], second[2]) - max(first[0], second[0])
+    vertical = min(first[3], second[3]) - max(first[1], second[1])
+    smaller_height = min(first[3] - first[1], second[3] - second[1])
+    return horizontal > 0 and smaller_height > 0 and vertical >= smaller_height * _SAME_ROW
+
+
+def _stitch(left_text: str, right_text: str) -> str | None:
+    """Join two halves of a line that overlap by at least one character."""
+    for size in range(min(len(left_text), len(right_text)), 0, -1):
+        if left_text.endswith(right_text[:size]):
+            return left_text + right_text[size:]
+    return None
+
+
+def _lines_of(tile_index: int, tile: Tile, segments: list[RawOcrSegment]) -> list[_Line]:
+    grouped: dict[int, list[RawOcrSegment]] = {}
+    lines: list[_Line] = []
+    for segment in segments:
+        segment = replace(segment, bbox=_offset(segment.bbox, tile))
+        if segment.line_id is None:
+            lines.append(_Line(tile_index, [segment], segment.bbox))
+            continue
+        grouped.setdefault(segment.line_id, []).append(segment)
+    for line_segments in grouped.values():
+        bbox = None
+        for segment in line_segments:
+            bbox = _union(bbox, segment.bbox)
+        lines.append(_Line(tile_index, line_segments, bbox))
+    return lines
+
+
+def _merge_into(kept: _Line, candidate: _Line) -> bool:
+    """Fold ``candidate`` into ``kept`` if both are (parts of) the same line."""
+    if candidate.text in kept.text:
+        return True
+    if kept.bbox is None or candidate.bbox is None:
+        return False
+    left, right = (candidate, kept) if candidate.bbox[0] < kept.bbox[0] else (kept, candidate)
+    stitched = _stitch(left.text, right.text)
+    if stitched is not None:
+        first = left.segments[0]
+        weights = [len(segment.text) for segment in left.segments + right.segments]
+        confidences = [
+            float(segment.confidence or 0.0) for segment in left.segments + right.segments
+        ]
+        kept.segments = [
+            RawOcrSegment(
+                text=stitched,
+                language=first.language,
+                confidence=sum(w * c for w, c in zip(weights, confidences, strict=True))
+                / max(sum(weights), 1),
+                line_id=first.line_id,
+                bbox=_union(left.bbox, right.bbox),
+            )
+        ]
+        kept.text = stitched
+        kept.bbox = _union(left.bbox, right.bbox)
+        return True
+    return SequenceMatcher(None, kept.text, candidate.text).ratio() >= _SAME_TEXT_RATIO
+
+
+def _deduplicate(lines: list[_Line]) -> list[_Line]:
+    # Longest first, so a complete line absorbs the fragments other tiles saw of it.
+    ordered = sorted(lines, key=lambda line: len(line.text), reverse=True)
+    kept: list[_Line] = []
+    for candidate in ordered:
+        duplicate = False
+        for line in kept:
+            if line.tile_index == candidate.tile_index:
+                continue
+            if line.bbox is None or candidate.bbox is None:
+                same = line.bbox is None and candidate.bbox is None and line.text == candidate.text
+            else:
+                same = _same_line(line.bbox, candidate.bbox)
+            if same and _merge_into(line, candidate):
+                duplicate = True
+                break
+        if not duplicate:
+            kept.append(candidate)
+    return kept
+
+
+def _reading_order(lines: list[_Line]) -> list[_Line]:
+    placed = sorted(
+        (line for line in lines if line.bbox is not None), key=lambda line: line.bbox[1]
+    )
+    rows: list[list[_Line]] = []
+    row_bottom = -1
+    for line in placed:
+        top, bottom = line.bbox[1], line.bbox[3]
+        # A line whose vertical centre falls inside the current row belongs to it.
+        if rows and (top + bottom) / 2 <= row_bottom:
+            rows[-1].append(line)
+            row_bottom = max(row_bottom, bottom)
+        else:
+            rows.append([line])
+            row_bottom = bottom
+    ordered = [line for row in rows for line in sorted(row, key=lambda line: line.bbox[0])]
+    return ordered + [line for line in lines if line.bbox is None]
+
+
+def merge_tile_segments(
+    results: Sequence[tuple[Tile, list[RawOcrSegment]]],
+) -> list[RawOcrSegment]:
+    """Merge per-tile OCR output into deduplicated full-image segments in reading order."""
+    lines = [
+        line
+        for tile_index, (tile, segments) in enumerate(results)
+        for line in _lines_of(tile_index, tile, segments)
+    ]
+    merged: list[RawOcrSegment] = []
+    for line_id, line in enumerate(_reading_order(_deduplicate(lines))):
+        merged.extend(replace(segment, line_id=line_id) for segment in line.segments)
+    return merged
@@ -1,20 +1,27 @@
 """Pinyin generation service.
 
-Transforms a list of OCR segments into a structured PinyinData payload.
+Transforms a list of text segments into pinyin-annotated pipeline segments.
 Wraps provider exceptions in typed PinyinServiceError for clean API contracts.
 """
 
 import asyncio
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 
 from app.adapters.pinyin_provider import (
     PinyinExecutionError,
+    PinyinProvider,
     PinyinProviderUnavailableError,
     get_pinyin_provider,
 )
-from app.schemas.process import OcrSegment, PinyinData, PinyinSegment
+from app.services.segments import AnnotatedSegment, PinyinResult, TextSegment
 
 PINYIN_ERROR_CATEGORY = "pinyin"
 
+# Pinyin is milliseconds of CPU work. Its own pool keeps it from queueing behind the
+# blocking OCR calls that occupy the default executor under image load.
+_PINYIN_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pinyin")
+
 
 class PinyinServiceError(Exception):
     def __init__(
@@ -26,33 +33,23 @@ class PinyinServiceError(Exception):
         self.category = category
 
 
-async def generate_pinyin(segments: list[OcrSegment]) -> PinyinData:
-    """Generate pinyin for each OCR segment, tracking alignment status per segment.
-
-    Aligned segments: provider succeeded; pinyin_text is space-joined tone-marked pinyin.
-    Uncertain segments: PinyinExecutionError on that segment; segment is still returned.
-    Systemic failure: PinyinProviderUnavailableError raises PinyinServiceError (nothing works).
-    """
-    provider = get_pinyin_provider()
-    loop = asyncio.get_running_loop()
-    result_segments: list[PinyinSegment] = []
+def _annotate_segments(
+    provider: PinyinProvider, segments: Sequence[TextSegment]
+) -> list[AnnotatedSegment]:
+    result_segments: list[AnnotatedSegment] = []
 
-    for ocr_segment in segments:
-        text = ocr_segment.text
+    for text_segment in segments:
+        text = text_segment.text
         if not text:
             continue
         try:
-            raw_chars = await loop.run_in_executor(
-                None,
-                lambda t=text: provider.generate(text=t),
-            )
-            pinyin_text = " ".join(seg.pinyin for seg in raw_chars)
+            raw_chars = provider.generate(text=text)
             result_segments.append(
-                PinyinSegment(
+                AnnotatedSegment(
                     source_text=text,
-                    pinyin_text=pinyin_text,
+                    pinyin_text=" ".join(seg.pinyin for seg in raw_chars),
                     alignment_status="aligned",
-                    line_id=ocr_segment.line_id,
+                    line_id=text_segment.line_id,
                 )
             )
         except PinyinProviderUnavailableError as exc:
@@ -62,13 +59,30 @@ async def generate_pinyin(segments: list[OcrSegment]) -> PinyinData:
             ) from exc
         except PinyinExecutionError:
             result_segments.append(
-                PinyinSegment(
+                AnnotatedSegment(
                     source_text=text,
                     pinyin_text="",
                     alignment_status="uncertain",
                     reason_code="pinyin_execution_failed",
-                    line_id=ocr_segment.line_id,
+                    line_id=text_segment.line_id,
                 )
             )
 
-    return PinyinData(segments=result_segments)
+    return result_segments
+
+
+async def generate_pinyin(segments: Sequence[TextSegment]) -> PinyinResult:
+    """Generate pinyin for each text segment, tracking alignment status per segment.
+
+    Aligned segments: provider succeeded; pinyin_text is space-joined tone-marked pinyin.
+    Uncertain segments: PinyinExecutionError on that segment; segment is still returned.
+    Systemic failure: PinyinProviderUnavailableError raises PinyinServiceError (nothing works).
+
+    All segments are converted in a single executor job rather than one hop per segment.
+    """
+    provider = get_pinyin_provider()
+    loop = asyncio.get_running_loop()
+    annotated = await loop.run_in_executor(
+        _PINYIN_EXECUTOR, _annotate_segments, provider, segments
+    )
+    return PinyinResult(segments=annotated)
@@ -1,11 +1,11 @@
-import os
 import re
+from collections.abc import Iterable, Iterator
 
-from app.schemas.process import OcrSegment
+from app.core.settings import Settings, get_settings
+from app.services.segments import TextSegment
 
 TEXT_ERROR_CATEGORY = "validation"
 _CJK_CHAR_RE = re.compile(r"[\u3400-\u9fff\uf900-\ufaff]")
-_DEFAULT_MAX_SOURCE_TEXT_CHARS = 5000
 
 
 class TextValidationError(Exception):
@@ -16,16 +16,43 @@ class TextValidationError(Exception):
         self.category = category
 
 
-def _get_max_source_text_chars() -> int:
-    raw_value = os.getenv("TEXT_INPUT_MAX_CHARS", str(_DEFAULT_MAX_SOURCE_TEXT_CHARS))
-    try:
-        parsed = int(raw_value)
-    except (TypeError, ValueError):
-        return _DEFAULT_MAX_SOURCE_TEXT_CHARS
-    return parsed if parsed > 0 else _DEFAULT_MAX_SOURCE_TEXT_CHARS
+def _line_segment(line: str, line_id: int) -> TextSegment:
+    language = "zh" if _CJK_CHAR_RE.search(line) is not None else "und"
+    return TextSegment(text=line, language=language, confidence=1.0, line_id=line_id)
 
 
-def build_text_segments(source_text: str) -> list[OcrSegment]:
+def contains_chinese_text(text: str) -> bool:
+    return _CJK_CHAR_RE.search(text) is not None
+
+
+def iter_text_chunks(lines: Iterable[str], *, max_chars: int) -> Iterator[list[TextSegment]]:
+    """Group the non-blank ``lines`` of a long document into chunks of segments.
+
+    Line ids run on across chunks, as for a single text. A chunk holds whole lines of at
+    most ``max_chars`` characters in total (a single longer line makes up a chunk on
+    its own), so it can be processed like a pasted text.
+    """
+    chunk: list[TextSegment] = []
+    chunk_chars = 0
+    line_id = 0
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line:
+            continue
+        if chunk and chunk_chars + len(line) > max_chars:
+            yield chunk
+            chunk = []
+            chunk_chars = 0
+        chunk.append(_line_segment(line, line_id))
+        chunk_chars += len(line)
+        line_id += 1
+    if chunk:
+        yield chunk
+
+
+def build_text_segments(
+    source_text: str, *, settings: Settings | None = None
+) -> list[TextSegment]:
     normalized_text = source_text.replace("\r\n", "\n").replace("\r", "\n").strip()
     if not normalized_text:
         raise TextValidationError(
@@ -33,25 +60,17 @@ def build_text_segments(source_text: str) -> list[OcrSegment]:
             message="Paste some Chinese text to continue.",
         )
 
-    if len(normalized_text) > _get_max_source_text_chars():
+    if len(normalized_text) > (settings or get_settings()).text_input_max_chars:
         raise TextValidationError(
             code="text_too_long",
             message="Text is too long. Shorten it and try again.",
         )
 
     candidate_lines = [line.strip() for line in normalized_text.split("\n") if line.strip()]
-    segments: list[OcrSegment] = []
+    segments: list[TextSegment] = []
 
     for line in candidate_lines:
-        language = "zh" if _CJK_CHAR_RE.search(line) is not None else "und"
-        segments.append(
-            OcrSegment(
-                text=line,
-                language=language,
-                confidence=1.0,
-                line_id=len(segments),
-            )
-        )
+        segments.append(_line_segment(line, len(segments)))
 
     if not any(s.language == "zh" for s in segments):
         raise TextValidationError(
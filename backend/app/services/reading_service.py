@@ -3,12 +3,11 @@ from __future__ import annotations
 from collections.abc import Iterable
 
 from app.schemas.process import (
-    PinyinData,
-    PinyinSegment,
     ReadingData,
     ReadingGroup,
     ReadingProviderInfo,
 )
+from app.services.segments import AnnotatedSegment, PinyinResult
 
 _PROVIDER_NAME = "built_in_rules"
 _PROVIDER_VERSION = "v2"
@@ -18,10 +17,10 @@ _TERMINAL_PUNCTUATION = ("。", "！", "？", ".", "!", "?")
 
 
 def _group_segments_by_line(
-    segments: list[PinyinSegment],
-) -> list[tuple[int, list[tuple[int, PinyinSegment]]]]:
-    groups: list[tuple[int, list[tuple[int, PinyinSegment]]]] = []
-    current_group: list[tuple[int, PinyinSegment]] = []
+    segments: list[AnnotatedSegment],
+) -> list[tuple[int, list[tuple[int, AnnotatedSegment]]]]:
+    groups: list[tuple[int, list[tuple[int, AnnotatedSegment]]]] = []
+    current_group: list[tuple[int, AnnotatedSegment]] = []
     current_line_id: int | None = None
 
     for index, segment in enumerate(segments):
@@ -45,7 +44,7 @@ def _group_segments_by_line(
     return groups
 
 
-def _concat_source_text(group: Iterable[tuple[int, PinyinSegment]]) -> str:
+def _concat_source_text(group: Iterable[tuple[int, AnnotatedSegment]]) -> str:
     return "".join(segment.source_text for _, segment in group).strip()
 
 
@@ -74,7 +73,7 @@ def _derive_display_text(raw_text: str) -> str:
     return f"{''.join(chars)}。"
 
 
-def build_reading_projection(pinyin_data: PinyinData) -> ReadingData | None:
+def build_reading_projection(pinyin_data: PinyinResult) -> ReadingData | None:
     groups_by_line = _group_segments_by_line(pinyin_data.segments)
     if not groups_by_line:
         return None
@@ -95,7 +94,7 @@ def build_reading_projection(pinyin_data: PinyinData) -> ReadingData | None:
         confidences.append(confidence)
 
         reading_groups.append(
-            ReadingGroup(
+            ReadingGroup.model_construct(
                 group_id=f"rg_{group_id}",
                 line_id=line_id,
                 raw_text=raw_text,
@@ -110,9 +109,9 @@ def build_reading_projection(pinyin_data: PinyinData) -> ReadingData | None:
         return None
 
     provider_confidence = round(sum(confidences) / len(confidences), 2)
-    return ReadingData(
+    return ReadingData.model_construct(
         mode="derived",
-        provider=ReadingProviderInfo(
+        provider=ReadingProviderInfo.model_construct(
             kind="heuristic",
             name=_PROVIDER_NAME,
             version=_PROVIDER_VERSION,
@@ -0,0 +1,125 @@
+"""Budget-aware retries of transient provider errors.
+
+Adapters mark an execution error ``retryable`` when the provider reported a transient
+condition (see app.adapters.transient_errors); everything else fails on the first
+attempt. A retryable failure is tried again after a full-jitter exponential backoff,
+unless:
+
+- RETRY_MAX_ATTEMPTS calls have been made;
+- the provider's retry budget is spent. Every success earns RETRY_BUDGET_RATIO of a
+  token and every retryable failure costs one; retries pause while fewer than half of
+  the tokens are left. During an outage this caps the extra load at roughly that ratio
+  instead of multiplying it by the attempt count;
+- the backoff would run past the request's deadline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+from app.core.settings import RetrySettings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_MAX_RETRY_TOKENS = 10.0
+
+
+@dataclass(slots=True)
+class RetryStats:
+    # Provider calls made, including the first one.
+    attempts: int = 0
+    retries: int = 0
+
+
+class RetryBudget:
+    def __init__(self, max_tokens: float = _MAX_RETRY_TOKENS) -> None:
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def record_success(self, ratio: float) -> None:
+        with self._lock:
+            self._tokens = min(self._tokens + ratio, self.max_tokens)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._tokens = max(self._tokens - 1.0, 0.0)
+
+    def allows_retry(self) -> bool:
+        return self._tokens > self.max_tokens / 2
+
+
+def is_retryable(exc: BaseException) -> bool:
+    return bool(getattr(exc, "retryable", False))
+
+
+def backoff_s(attempt: int, config: RetrySettings, jitter: Callable[[], float]) -> float:
+    """Full-jitter delay before retry number ``attempt`` (1 for the first retry)."""
+    ceiling_ms = min(config.max_delay_ms, config.base_delay_ms * 2 ** (attempt - 1))
+    return jitter() * ceiling_ms / 1000
+
+
+async def call_with_retry(
+    call: Callable[[], Awaitable[T]],
+    *,
+    config: RetrySettings,
+    budget: RetryBudget,
+    deadline: float | None = None,
+    stats: RetryStats | None = None,
+    sleep: Callable[[float], Awaitable[object]] = asyncio.sleep,
+    jitter: Callable[[], float] = random.random,
+) -> T:
+    """Await ``call()``, retrying retryable errors; ``deadline`` is a time.monotonic() value."""
+    stats = stats if stats is not None else RetryStats()
+    attempt = 0
+    while True:
+        attempt += 1
+        stats.attempts += 1
+        try:
+            result = await call()
+        except Exception as exc:
+            if not is_retryable(exc):
+                raise
+            budget.record_failure()
+            if attempt >= config.max_attempts or not budget.allows_retry():
+                raise
+            delay = backoff_s(attempt, config, jitter)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise
+            logger.info("Retrying after transient error (attempt %d): %s", attempt, exc)
+            stats.retries += 1
+            await sleep(delay)
+            continue
+        budget.record_success(config.budget_ratio)
+        return result
+
+
+_budgets: dict[str, RetryBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def get_retry_budget(name: str) -> RetryBudget:
+    """The shared retry budget for one provider, e.g. ``ocr:google_vision``."""
+    with _budgets_lock:
+        budget = _budgets.get(name)
+        if budget is None:
+            budget = _budgets[name] = RetryBudget()
+        return budget
+
+
+def reset_retry_budgets() -> None:
+    with _budgets_lock:
+        _budgets.clear()
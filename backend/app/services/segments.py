@@ -0,0 +1,72 @@
+"""Internal segment representation carried through the processing pipeline.
+
+OCR / pasted text -> pinyin -> translation -> reading all operate on these slotted
+dataclasses. Translation annotates segments in place instead of copying them, and the
+Pydantic response schemas are only built once, at the API boundary, via the converters
+at the bottom of this module.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Literal
+
+from app.schemas.process import OcrData, OcrSegment, PinyinData, PinyinSegment
+
+
+@dataclass(slots=True)
+class TextSegment:
+    """A normalised line of source text (from OCR or pasted input)."""
+
+    text: str
+    language: str
+    confidence: float
+    line_id: int | None = None
+
+
+@dataclass(slots=True)
+class AnnotatedSegment:
+    """A source segment with its pinyin and, once enriched, its line translation."""
+
+    source_text: str
+    pinyin_text: str
+    alignment_status: Literal["aligned", "uncertain"]
+    reason_code: str | None = None
+    line_id: int | None = None
+    translation_text: str | None = None
+
+
+@dataclass(slots=True)
+class PinyinResult:
+    segments: list[AnnotatedSegment] = field(default_factory=list)
+
+
+def to_ocr_data(segments: Iterable[TextSegment]) -> OcrData:
+    return OcrData.model_construct(
+        segments=[
+            OcrSegment.model_construct(
+                text=segment.text,
+                language=segment.language,
+                confidence=segment.confidence,
+                line_id=segment.line_id,
+            )
+            for segment in segments
+        ]
+    )
+
+
+def to_pinyin_data(result: PinyinResult) -> PinyinData:
+    return PinyinData.model_construct(
+        segments=[
+            PinyinSegment.model_construct(
+                source_text=segment.source_text,
+                pinyin_text=segment.pinyin_text,
+                alignment_status=segment.alignment_status,
+                reason_code=segment.reason_code,
+                line_id=segment.line_id,
+                translation_text=segment.translation_text,
+            )
+            for segment in result.segments
+        ]
+    )
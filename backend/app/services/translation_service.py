@@ -1,44 +1,69 @@
 from __future__ import annotations
 
 import asyncio
+import contextvars
+import functools
 import logging
-import os
-from collections.abc import Iterable
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
 from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
 
+from app.adapters import quota
 from app.adapters.translation_provider import (
     TranslationExecutionError,
     TranslationProviderUnavailableError,
     get_translation_provider,
 )
-from app.schemas.process import PinyinData, PinyinSegment
+from app.core.circuit_breaker import get_breaker, record_call
+from app.core.concurrency_limit import get_limiter, limited
+from app.core.settings import Settings, get_settings
+from app.services.retry import RetryStats, call_with_retry, get_retry_budget
+from app.services.segments import AnnotatedSegment, PinyinResult
 
 logger = logging.getLogger(__name__)
 
-_TRANSLATION_TIMEOUT_SECONDS: float = 5.0
-# Bounded executor: wait_for cancels the await but not the underlying thread. Capping
-# max_workers limits how many stalled threads can accumulate when provider calls hang.
-_TRANSLATION_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="translation")
-
+T = TypeVar("T")
 
-def _translation_enabled() -> bool:
-    return os.environ.get("TRANSLATION_ENABLED", "false").strip().lower() == "true"
+_TRANSLATION_TIMEOUT_SECONDS: float = 5.0
+_executor: ThreadPoolExecutor | None = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _translation_executor(settings: Settings) -> ThreadPoolExecutor:
+    """Bounded executor: wait_for cancels the await but not the underlying thread.
+
+    Capping max_workers limits how many stalled threads can accumulate when provider calls
+    hang. Within that cap, concurrency is set by the adaptive limiter (see
+    app.core.concurrency_limit), so the cap is ADAPTIVE_CONCURRENCY_MAX_LIMIT. The
+    executor is replaced when that setting changes; calls already queued still finish.
+    """
+    global _executor, _executor_workers
+    max_workers = settings.concurrency_limits.max_limit
+    with _executor_lock:
+        if _executor is None or _executor_workers != max_workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="translation"
+            )
+            _executor_workers = max_workers
+        return _executor
 
 
-def _clone_with_translation(
-    segments: Iterable[PinyinSegment], translation_text: str | None
-) -> list[PinyinSegment]:
-    return [
-        segment.model_copy(update={"translation_text": translation_text}) for segment in segments
-    ]
+def _set_translation(segments: Iterable[AnnotatedSegment], translation_text: str | None) -> None:
+    for segment in segments:
+        segment.translation_text = translation_text
 
 
-def _group_segments_by_line(segments: list[PinyinSegment]) -> list[list[PinyinSegment]]:
+def _group_segments_by_line(segments: Sequence[AnnotatedSegment]) -> list[list[AnnotatedSegment]]:
     if not segments:
         return []
 
-    groups: list[list[PinyinSegment]] = []
-    current_group: list[PinyinSegment] = []
+    groups: list[list[AnnotatedSegment]] = []
+    current_group: list[AnnotatedSegment] = []
     current_line_id = object()
 
     for segment in segments:
@@ -55,9 +80,27 @@ def _group_segments_by_line(segments: list[PinyinSegment]) -> list[list[PinyinSe
     return groups
 
 
-async def enrich_translations(pinyin_data: PinyinData) -> PinyinData:
-    if not _translation_enabled():
-        return PinyinData(segments=_clone_with_translation(pinyin_data.segments, None))
+async def enrich_translations(
+    pinyin_data: PinyinResult,
+    *,
+    settings: Settings | None = None,
+    deadline: float | None = None,
+    stats: RetryStats | None = None,
+    batched: bool = False,
+) -> PinyinResult:
+    """Attach a per-line translation to every segment, annotating the segments in place.
+
+    Transient provider errors are retried within the call's timeout and the request
+    ``deadline`` (a time.monotonic() value); ``stats`` counts the calls and retries.
+    Lines are translated one call each, so one failing line leaves the others translated.
+    With ``batched`` all lines go to the provider's translate_batch in one call instead
+    (a chunk of a long document would otherwise take one round trip per line); if that
+    call fails, none of the lines is translated.
+    """
+    settings = settings or get_settings()
+    if not settings.translation_enabled:
+        _set_translation(pinyin_data.segments, None)
+        return pinyin_data
 
     if not pinyin_data.segments:
         return pinyin_data
@@ -66,45 +109,117 @@ async def enrich_translations(pinyin_data: PinyinData) -> PinyinData:
         provider = get_translation_provider()
     except TranslationProviderUnavailableError:
         logger.warning("Translation provider unavailable during initialization")
-        return PinyinData(segments=_clone_with_translation(pinyin_data.segments, None))
-
-    translated_segments: list[PinyinSegment] = []
-    loop = asyncio.get_running_loop()
+        _set_translation(pinyin_data.segments, None)
+        return pinyin_data
 
+    call = _ProviderCall(settings, deadline=deadline, stats=stats)
+    lines: list[tuple[str, list[AnnotatedSegment]]] = []
     for group in _group_segments_by_line(pinyin_data.segments):
-        if group[0].line_id is None:
-            translated_segments.extend(_clone_with_translation(group, None))
-            continue
-
         source_text = "".join(segment.source_text for segment in group).strip()
-        if not source_text:
-            translated_segments.extend(_clone_with_translation(group, None))
-            continue
+        if group[0].line_id is None or not source_text:
+            _set_translation(group, None)
+        else:
+            lines.append((source_text, group))
+
+    if batched:
+        if not lines:
+            return pinyin_data
+        translations: list[str] | None = None
+        if call.allowed():
+            texts = [source_text for source_text, _ in lines]
+            translations = await call.run(
+                functools.partial(provider.translate_batch, texts=texts, target_language="en"),
+                what=f"a batch of {len(texts)} lines",
+            )
+            if translations is not None and len(translations) != len(texts):
+                logger.warning("Translation batch returned %d results", len(translations))
+                translations = None
+        for index, (_, group) in enumerate(lines):
+            _set_translation(group, translations[index] if translations is not None else None)
+        return pinyin_data
 
+    for source_text, group in lines:
+        translation_text = None
+        if call.allowed():
+            translation_text = await call.run(
+                functools.partial(provider.translate, text=source_text, target_language="en"),
+                what="line",
+            )
+        _set_translation(group, translation_text)
+
+    return pinyin_data
+
+
+class _ProviderCall:
+    """Runs translation provider calls under the breaker, limiter, retries and timeouts."""
+
+    def __init__(
+        self, settings: Settings, *, deadline: float | None, stats: RetryStats | None
+    ) -> None:
+        self._settings = settings
+        self._deadline = deadline
+        self._stats = stats
+        self._breaker = get_breaker("translation", settings.translation_provider, settings)
+        self._retry_budget = get_retry_budget(f"translation:{settings.translation_provider}")
+        self._limiter = get_limiter("translation", settings.translation_provider, settings)
+        self._executor = _translation_executor(settings)
+
+    def allowed(self) -> bool:
+        # While the provider is failing, skip the call instead of waiting out the timeout.
+        return self._breaker is None or self._breaker.allow()
+
+    async def run(self, call: Callable[[], T], *, what: str) -> T | None:
+        """Return ``call()``'s result, or None (logged) when it failed or timed out."""
+        loop = asyncio.get_running_loop()
+        breaker = self._breaker
+        # perf_counter() start of the attempt still waiting on the provider, if any.
+        in_flight: float | None = None
+
+        async def attempt() -> T:
+            nonlocal in_flight
+            async with limited(self._limiter):
+                started = in_flight = time.perf_counter()
+                try:
+                    # The copied context carries the call deadline, bounding quota waits.
+                    result = await loop.run_in_executor(
+                        self._executor,
+                        functools.partial(contextvars.copy_context().run, call),
+                    )
+                except Exception:
+                    in_flight = None
+                    record_call(breaker, started, ok=False)
+                    raise
+                in_flight = None
+                record_call(breaker, started, ok=True)
+                return result
+
+        call_deadline = time.monotonic() + _TRANSLATION_TIMEOUT_SECONDS
+        # Only running out the provider's own timeout counts against the breaker; being
+        # cut off by the request deadline says nothing about the provider.
+        provider_timeout = True
+        if self._deadline is not None and self._deadline <= call_deadline:
+            call_deadline = self._deadline
+            provider_timeout = False
         try:
-            translation_text = await asyncio.wait_for(
-                loop.run_in_executor(
-                    _TRANSLATION_EXECUTOR,
-                    lambda text=source_text: provider.translate(
-                        text=text,
-                        target_language="en",
+            with quota.deadline_scope(call_deadline):
+                return await asyncio.wait_for(
+                    call_with_retry(
+                        attempt,
+                        config=self._settings.retry,
+                        budget=self._retry_budget,
+                        deadline=call_deadline,
+                        stats=self._stats,
                     ),
-                ),
-                timeout=_TRANSLATION_TIMEOUT_SECONDS,
-            )
+                    timeout=max(call_deadline - time.monotonic(), 0.0),
+                )
         except TranslationProviderUnavailableError:
-            logger.warning("Translation provider unavailable while translating line")
-            translation_text = None
+            logger.warning("Translation provider unavailable while translating %s", what)
         except TranslationExecutionError:
-            logger.warning("Translation execution failed for line", exc_info=True)
-            translation_text = None
+            logger.warning("Translation execution failed for %s", what, exc_info=True)
         except asyncio.TimeoutError:
-            logger.warning("Translation timed out for line")
-            translation_text = None
+            logger.warning("Translation timed out for %s", what)
+            if provider_timeout and in_flight is not None:
+                record_call(breaker, in_flight, ok=False)
         except Exception:
-            logger.warning("Unexpected error during translation for line", exc_info=True)
-            translation_text = None
-
-        translated_segments.extend(_clone_with_translation(group, translation_text))
-
-    return PinyinData(segments=translated_segments)
+            logger.warning("Unexpected error during translation for %s", what, exc_info=True)
+        return None
@@ -0,0 +1,43 @@
+"""Deterministic stand-ins for the external providers, for benchmarks only.
+
+They return the same output for the same input on every run and never touch the
+network, so timings measure our code (plus an explicit, fixed fake latency) rather than
+Google Cloud round-trips.
+"""
+
+from __future__ import annotations
+
+import time
+
+from app.adapters.ocr_provider import RawOcrSegment
+
+BENCH_LINE = "老师说我们今天一起读书吧"
+
+
+class FixedOcrProvider:
+    """Returns ``line_count`` copies of BENCH_LINE, one per line, for any image."""
+
+    def __init__(self, *, line_count: int = 20, latency_s: float = 0.0) -> None:
+        self._segments = [
+            RawOcrSegment(text=BENCH_LINE, language="zh", confidence=0.95, line_id=line_id)
+            for line_id in range(line_count)
+        ]
+        self._latency_s = latency_s
+
+    def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
+        _ = (image_bytes, content_type)
+        if self._latency_s:
+            time.sleep(self._latency_s)
+        return list(self._segments)
+
+
+class FixedLatencyTranslationProvider:
+    """Sleeps for a fixed latency per call and echoes a length-derived translation."""
+
+    def __init__(self, *, latency_s: float = 0.001) -> None:
+        self._latency_s = latency_s
+
+    def translate(self, *, text: str, target_language: str) -> str:
+        if self._latency_s:
+            time.sleep(self._latency_s)
+        return f"[{target_language}] {len(text)} chars"
@@ -0,0 +1,280 @@
+"""Load generator for /v1/process and /v1/process-text.
+
+Drives the API closed-loop (``--concurrency`` workers, each sending its next request as
+soon as the previous one finishes) or open-loop (``--rate`` requests per second with
+Poisson arrivals, independent of response times, so queueing shows up in the latency
+tail) and reports throughput, latency percentiles and error rate.
+
+With ``--url`` it targets a running server. Without it, it starts the Vision gRPC and
+Translate HTTP stubs (benchmarks.stub_servers), points the real Google adapters at them
+and serves the app with uvicorn in a background thread, so the whole stack runs with no
+network access. For the most faithful numbers run the stubs and the API as separate
+processes and pass ``--url``; in-process mode shares one interpreter with the load
+generator.
+
+Run from backend/:
+    uv run python -m benchmarks.loadtest --endpoint process --concurrency 16 --duration 20
+    uv run python -m benchmarks.loadtest --endpoint mixed --rate 40 --ocr-error-rate 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import math
+import os
+import random
+import socket
+import statistics
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+from PIL import Image
+
+from benchmarks.fakes import BENCH_LINE
+from benchmarks.stub_servers import add_stub_arguments, start_stubs_from_args
+
+ENDPOINTS = ("process", "process-text", "mixed")
+
+
+@dataclass
+class LoadResult:
+    latencies_s: list[float] = field(default_factory=list)
+    outcomes: Counter[str] = field(default_factory=Counter)
+    elapsed_s: float = 0.0
+
+    def record(self, latency_s: float, outcome: str) -> None:
+        self.latencies_s.append(latency_s)
+        self.outcomes[outcome] += 1
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile; ``fraction`` in [0, 1]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(fraction * len(ordered))))
+    return ordered[rank - 1]
+
+
+def summarize(result: LoadResult) -> dict[str, object]:
+    total = sum(result.outcomes.values())
+    errors = total - result.outcomes["success"] - result.outcomes["partial"]
+    return {
+        "requests": total,
+        "elapsed_s": round(result.elapsed_s, 3),
+        "throughput_rps": round(total / result.elapsed_s, 2) if result.elapsed_s else 0.0,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "latency_ms": {
+            "mean": round(statistics.fmean(result.latencies_s) * 1000, 2)
+            if result.latencies_s
+            else 0.0,
+            "p50": round(percentile(result.latencies_s, 0.50) * 1000, 2),
+            "p90": round(percentile(result.latencies_s, 0.90) * 1000, 2),
+            "p99": round(percentile(result.latencies_s, 0.99) * 1000, 2),
+            "max": round(max(result.latencies_s, default=0.0) * 1000, 2),
+        },
+        "outcomes": dict(result.outcomes),
+    }
+
+
+def _default_image() -> bytes:
+    buffer = io.BytesIO()
+    Image.radial_gradient("L").resize((1280, 960)).convert("RGB").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class _RequestFactory:
+    def __init__(self, endpoint: str, image: bytes, text: str, seed: int | None) -> None:
+        self._endpoint = endpoint
+        self._image = image
+        self._text = text
+        self._rng = random.Random(seed)
+
+    def next(self) -> dict[str, object]:
+        endpoint = self._endpoint
+        if endpoint == "mixed":
+            endpoint = self._rng.choice(("process", "process-text"))
+        if endpoint == "process":
+            return {
+                "url": "/v1/process",
+                "content": self._image,
+                "headers": {"content-type": "image/png"},
+            }
+        return {"url": "/v1/process-text", "json": {"source_text": self._text}}
+
+
+async def _send(client: httpx.AsyncClient, request: dict[str, object], result: LoadResult) -> None:
+    start = time.perf_counter()
+    try:
+        response = await client.post(**request)
+        try:
+            outcome = response.json().get("status", f"http_{response.status_code}")
+        except ValueError:
+            outcome = f"http_{response.status_code}"
+    except httpx.HTTPError as exc:
+        outcome = type(exc).__name__
+    result.record(time.perf_counter() - start, outcome)
+
+
+async def run_closed_loop(
+    client: httpx.AsyncClient, factory: _RequestFactory, *, concurrency: int, duration_s: float
+) -> LoadResult:
+    result = LoadResult()
+    start = time.perf_counter()
+    deadline = start + duration_s
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            await _send(client, factory.next(), result)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed_s = time.perf_counter() - start
+    return result
+
+
+async def run_open_loop(
+    client: httpx.AsyncClient,
+    factory: _RequestFactory,
+    *,
+    rate: float,
+    duration_s: float,
+    max_in_flight: int,
+    seed: int | None,
+) -> LoadResult:
+    result = LoadResult()
+    rng = random.Random(seed)
+    in_flight: set[asyncio.Task[None]] = set()
+    start = time.perf_counter()
+    next_arrival = start
+    while next_arrival < start + duration_s:
+        await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+        if len(in_flight) >= max_in_flight:
+            # Shed instead of queueing in the generator, so arrivals stay open-loop.
+            result.record(0.0, "dropped_by_generator")
+        else:
+            task = asyncio.create_task(_send(client, factory.next(), result))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        next_arrival += rng.expovariate(rate)
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    result.elapsed_s = time.perf_counter() - start
+    return result
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def _in_process_stack(args: argparse.Namespace) -> Iterator[str]:
+    """Start the stubs and the app (pointed at them) and yield the app's base URL."""
+    import uvicorn
+
+    from app.core.settings import reload_settings
+
+    vision_server, translate_server, environment = start_stubs_from_args(args)
+    previous = {name: os.environ.get(name) for name in environment}
+    os.environ.update(environment)
+    reload_settings()
+
+    from app.main import app
+
+    port = _free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+    )
+    thread = threading.Thread(target=server.run, name="api-under-test", daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+        translate_server.shutdown()
+        vision_server.stop(grace=None)
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        reload_settings()
+
+
+async def _run(args: argparse.Namespace, base_url: str) -> LoadResult:
+    image = Path(args.image).read_bytes() if args.image else _default_image()
+    text = "\n".join([BENCH_LINE] * args.text_lines)
+    factory = _RequestFactory(args.endpoint, image, text, args.seed)
+    limits = httpx.Limits(max_connections=max(args.concurrency, args.max_in_flight))
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=args.request_timeout, limits=limits
+    ) as client:
+        for _ in range(args.warmup):
+            await _send(client, factory.next(), LoadResult())
+        if args.rate:
+            return await run_open_loop(
+                client,
+                factory,
+                rate=args.rate,
+                duration_s=args.duration,
+                max_in_flight=args.max_in_flight,
+                seed=args.seed,
+            )
+        return await run_closed_loop(
+            client, factory, concurrency=args.concurrency, duration_s=args.duration
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None, help="Target a running server instead.")
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default="process")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=None, help="Open-loop requests/s.")
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--request-timeout", type=float, default=60.0)
+    parser.add_argument("--image", default=None, help="Image to upload (default: generated).")
+    parser.add_argument("--text-lines", type=int, default=40)
+    parser.add_argument("--json", dest="json_output", type=Path, default=None)
+    add_stub_arguments(parser)
+    args = parser.parse_args(argv)
+    # Per-request INFO logs from httpx and the app would swamp the report.
+    logging.disable(logging.INFO)
+
+    if args.url:
+        result = asyncio.run(_run(args, args.url))
+    else:
+        with _in_process_stack(args) as base_url:
+            result = asyncio.run(_run(args, base_url))
+
+    summary = summarize(result)
+    summary["config"] = {
+        "endpoint": args.endpoint,
+        "mode": "open" if args.rate else "closed",
+        "rate": args.rate,
+        "concurrency": None if args.rate else args.concurrency,
+        "duration_s": args.duration,
+    }
+    print(json.dumps(summary, indent=2))
+    if args.json_output:
+        args.json_output.write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
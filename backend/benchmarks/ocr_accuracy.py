@@ -0,0 +1,178 @@
+"""Compare the local CPU OCR provider with Google Cloud Vision on recorded fixtures.
+
+Each fixture is an image plus the GCV response recorded for it
+(``app/adapters/simulation_fixtures/gcv/<name>.json``, or ``--recordings``). The
+reference text is ``<name>.txt`` next to the image when present (ground truth), otherwise
+the recorded GCV text, in which case the local accuracy reads as agreement with GCV.
+
+Images come from ``--images DIR`` (``<name>.png|jpg|jpeg|webp``, matching recording
+names). Without it, ``--font`` renders each recording's lines into a synthetic image; it
+needs a font with CJK glyphs (e.g. Noto Sans CJK).
+
+Accuracy is the character error rate (CER): edit distance between the recognised and
+reference text (whitespace removed, lines joined in order) divided by the reference
+length. Local latency is the median of ``--repeat`` warm calls through the process pool.
+GCV latency is measured only with ``--gcv-live`` (needs credentials); otherwise the GCV
+column reports the recording's CER against the reference.
+
+Run from backend/ (needs the local-ocr extra):
+    uv run --extra local-ocr python -m benchmarks.ocr_accuracy --images ~/ocr-fixtures
+    uv run --extra local-ocr python -m benchmarks.ocr_accuracy --font NotoSansCJK-Regular.ttc
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import logging
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from google.cloud import vision
+from PIL import Image, ImageDraw, ImageFont
+
+from app.adapters.google_cloud_vision_ocr_provider import (
+    _documents_to_segments,
+    _gcv_response_to_documents,
+)
+from app.adapters.local_ocr_provider import LocalOcrProvider
+from app.adapters.ocr_provider import OcrProvider, RawOcrSegment
+from app.adapters.simulation import fixtures_dir
+from app.core.settings import LocalOcrSettings
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp")
+
+
+@dataclass
+class FixtureResult:
+    name: str
+    reference_chars: int
+    local_ms: float
+    local_cer: float
+    gcv_cer: float
+    gcv_ms: float | None = None
+
+
+def edit_distance(first: str, second: str) -> int:
+    previous = list(range(len(second) + 1))
+    for i, char in enumerate(first, start=1):
+        current = [i]
+        for j, other in enumerate(second, start=1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other))
+            )
+        previous = current
+    return previous[-1]
+
+
+def _joined_text(segments: list[RawOcrSegment]) -> str:
+    return "".join("".join(segment.text.split()) for segment in segments)
+
+
+def character_error_rate(segments: list[RawOcrSegment], reference: str) -> float:
+    reference = "".join(reference.split())
+    if not reference:
+        return 0.0
+    return edit_distance(_joined_text(segments), reference) / len(reference)
+
+
+def _load_recording(path: Path) -> list[RawOcrSegment]:
+    response = vision.AnnotateImageResponse.from_json(
+        path.read_text(encoding="utf-8"), ignore_unknown_fields=True
+    )
+    return _documents_to_segments(_gcv_response_to_documents(response))
+
+
+def _render(segments: list[RawOcrSegment], font_path: str) -> bytes:
+    font = ImageFont.truetype(font_path, size=48)
+    lines = [segment.text for segment in segments]
+    width = max(int(font.getlength(line)) for line in lines) + 80
+    image = Image.new("RGB", (width, 80 * len(lines) + 40), "white")
+    draw = ImageDraw.Draw(image)
+    for index, line in enumerate(lines):
+        draw.text((40, 30 + 80 * index), line, fill="black", font=font)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _image_for(name: str, args: argparse.Namespace, recorded: list[RawOcrSegment]) -> bytes:
+    if args.images:
+        for suffix in IMAGE_SUFFIXES:
+            path = Path(args.images) / f"{name}{suffix}"
+            if path.exists():
+                return path.read_bytes()
+        raise FileNotFoundError(f"no image for fixture {name!r} in {args.images}")
+    return _render(recorded, args.font)
+
+
+def _timed(provider: OcrProvider, image: bytes) -> tuple[float, list[RawOcrSegment]]:
+    start = time.perf_counter()
+    segments = provider.extract(image_bytes=image, content_type="image/png")
+    return (time.perf_counter() - start) * 1000, segments
+
+
+def run(args: argparse.Namespace) -> list[FixtureResult]:
+    recordings = Path(args.recordings or fixtures_dir(None) / "gcv")
+    local = LocalOcrProvider(LocalOcrSettings(workers=1, timeout_s=120.0))
+    gcv = None
+    if args.gcv_live:
+        from app.adapters.google_cloud_vision_ocr_provider import GoogleCloudVisionOcrProvider
+
+        gcv = GoogleCloudVisionOcrProvider()
+    results = []
+    try:
+        for path in sorted(recordings.glob("*.json")):
+            name = path.stem
+            recorded = _load_recording(path)
+            image = _image_for(name, args, recorded)
+            truth = Path(args.images or "", f"{name}.txt")
+            reference = (
+                truth.read_text(encoding="utf-8")
+                if args.images and truth.exists()
+                else _joined_text(recorded)
+            )
+            _timed(local, image)  # Warm the worker on this image size.
+            runs = [_timed(local, image) for _ in range(args.repeat)]
+            result = FixtureResult(
+                name=name,
+                reference_chars=len("".join(reference.split())),
+                local_ms=round(statistics.median(ms for ms, _ in runs), 1),
+                local_cer=round(character_error_rate(runs[0][1], reference), 3),
+                gcv_cer=round(character_error_rate(recorded, reference), 3),
+            )
+            if gcv is not None:
+                gcv_ms, gcv_segments = _timed(gcv, image)
+                result.gcv_ms = round(gcv_ms, 1)
+                result.gcv_cer = round(character_error_rate(gcv_segments, reference), 3)
+            results.append(result)
+    finally:
+        local.shutdown()
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--images", default=None, help="Directory of fixture images.")
+    source.add_argument("--font", default=None, help="CJK font to render fixtures with.")
+    parser.add_argument("--recordings", default=None, help="Directory of GCV recordings.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--gcv-live", action="store_true", help="Also call GCV (billed).")
+    parser.add_argument("--json", dest="json_output", type=Path, default=None)
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    results = [asdict(result) for result in run(args)]
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    if args.json_output:
+        args.json_output.write_text(
+            json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+        )
+
+
+if __name__ == "__main__":
+    main()
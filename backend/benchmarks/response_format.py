@@ -0,0 +1,73 @@
+"""Response size and encode time of the default, columnar and MessagePack formats.
+
+Uses a 5000-char /process-text result with translations on every line, which is where
+the per-segment key repetition of the default envelope costs the most.
+
+Run from backend/:  uv run --extra compact python -m benchmarks.response_format
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import timeit
+
+from starlette.requests import Request
+
+from app.api.response_format import render_model
+from app.schemas.process import ProcessData, ProcessResponse
+from app.services.pinyin_service import generate_pinyin
+from app.services.process_text_service import build_text_segments
+from app.services.reading_service import build_reading_projection
+from app.services.segments import to_pinyin_data
+
+SOURCE_TEXT = "\n".join(["老师说我们今天一起读书吧"] * 400)[:5000]
+
+
+def _format_request(response_format: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "query_string": f"format={response_format}".encode(),
+            "headers": [],
+        }
+    )
+
+
+def _response() -> ProcessResponse:
+    segments = build_text_segments(SOURCE_TEXT)
+    pinyin_result = asyncio.run(generate_pinyin(segments))
+    for segment in pinyin_result.segments:
+        segment.translation_text = "The teacher says let's read together today."
+    return ProcessResponse.model_construct(
+        status="success",
+        request_id="bench",
+        data=ProcessData.model_construct(
+            pinyin=to_pinyin_data(pinyin_result),
+            reading=build_reading_projection(pinyin_result),
+        ),
+    )
+
+
+def main(number: int = 50) -> None:
+    response = _response()
+    print(f"segments: {len(response.data.pinyin.segments)}")
+    print(f"{'format':<10} {'bytes':>9} {'gzip':>9} {'encode ms':>10}")
+    for response_format in ("json", "columnar", "msgpack"):
+        request = _format_request(response_format)
+
+        def encode(request: Request = request) -> bytes:
+            return render_model(response, request=request, exclude_none=True).body
+
+        body = encode()
+        encode_s = min(timeit.repeat(encode, number=number, repeat=5)) / number
+        print(
+            f"{response_format:<10} {len(body):>9} {len(gzip.compress(body)):>9}"
+            f" {encode_s * 1000:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Response construction + serialization at the 5000-char /process-text limit.
+
+Compares the validated path (pydantic validation of every nested model, FastAPI's
+response_model re-validation and dump, then stdlib json) with the trusted path used by
+the routes (model_construct + one model_dump_json pass).
+
+Run from backend/:  uv run python -m benchmarks.response_serialization
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import timeit
+
+from pydantic import TypeAdapter
+
+from app.schemas.diagnostics import (
+    DiagnosticsPayload,
+    TimingInfo,
+    TraceInfo,
+    TraceStep,
+    UploadContext,
+)
+from app.schemas.process import PinyinData, ProcessData, ProcessResponse
+from app.services.pinyin_service import generate_pinyin
+from app.services.process_text_service import build_text_segments
+from app.services.reading_service import build_reading_projection
+from app.services.segments import to_pinyin_data
+
+SOURCE_TEXT = "\n".join(["老师说我们今天一起读书吧"] * 400)[:5000]
+
+
+def _pipeline_payload() -> tuple[PinyinData, object]:
+    segments = build_text_segments(SOURCE_TEXT)
+    pinyin_result = asyncio.run(generate_pinyin(segments))
+    return to_pinyin_data(pinyin_result), build_reading_projection(pinyin_result)
+
+
+def _diagnostics_fields() -> dict[str, object]:
+    return {
+        "upload_context": {"content_type": "text/plain", "file_size_bytes": 15_000},
+        "timing": {"total_ms": 12.0, "ocr_ms": 0.0, "pinyin_ms": 10.0},
+        "trace": {
+            "steps": [{"step": "ocr", "status": "skipped"}, {"step": "pinyin", "status": "ok"}]
+        },
+        "cost_estimate": None,
+    }
+
+
+def main(number: int = 50) -> None:
+    pinyin_data, reading_data = _pipeline_payload()
+    # The validated path receives the same data as plain structures, as it did when every
+    # layer re-validated its inputs.
+    pinyin_dict = pinyin_data.model_dump()
+    reading_dict = reading_data.model_dump() if reading_data is not None else None
+    response_adapter = TypeAdapter(ProcessResponse)
+
+    def validated() -> bytes:
+        response = ProcessResponse(
+            status="success",
+            request_id="bench",
+            data=ProcessData(pinyin=pinyin_dict, reading=reading_dict),
+            diagnostics=DiagnosticsPayload(**_diagnostics_fields()),
+        )
+        # FastAPI: validate against response_model, dump to primitives, json.dumps.
+        checked = response_adapter.validate_python(response)
+        content = response_adapter.dump_python(checked, mode="json", exclude_none=True)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def trusted() -> bytes:
+        response = ProcessResponse.model_construct(
+            status="success",
+            request_id="bench",
+            data=ProcessData.model_construct(pinyin=pinyin_data, reading=reading_data),
+            diagnostics=DiagnosticsPayload.model_construct(
+                upload_context=UploadContext.model_construct(
+                    content_type="text/plain", file_size_bytes=15_000
+                ),
+                timing=TimingInfo.model_construct(total_ms=12.0, ocr_ms=0.0, pinyin_ms=10.0),
+                trace=TraceInfo.model_construct(
+                    steps=[
+                        TraceStep.model_construct(step="ocr", status="skipped"),
+                        TraceStep.model_construct(step="pinyin", status="ok"),
+                    ]
+                ),
+                cost_estimate=None,
+            ),
+        )
+        return response.model_dump_json(exclude_none=True).encode("utf-8")
+
+    assert json.loads(validated()) == json.loads(trusted())
+
+    start = time.perf_counter()
+    validated_s = min(timeit.repeat(validated, number=number, repeat=5)) / number
+    trusted_s = min(timeit.repeat(trusted, number=number, repeat=5)) / number
+    elapsed = time.perf_counter() - start
+
+    print(f"segments: {len(pinyin_data.segments)}  payload: {len(trusted())} bytes")
+    print(f"validated construction + serialization: {validated_s * 1000:8.3f} ms")
+    print(f"trusted construction + serialization:   {trusted_s * 1000:8.3f} ms")
+    print(f"speedup: {validated_s / trusted_s:.1f}x  (bench wall time {elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
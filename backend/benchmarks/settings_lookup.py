@@ -0,0 +1,66 @@
+"""Per-request cost of reading configuration: env parsing vs. the cached Settings object.
+
+Run from backend/:  uv run python -m benchmarks.settings_lookup
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import timeit
+
+from app.core.settings import get_settings
+
+
+def _legacy_per_request_config() -> tuple[object, ...]:
+    """Reproduce the env lookups the request path performed before Settings existed."""
+
+    def positive_int(name: str, default: int) -> int:
+        try:
+            value = int(os.environ.get(name, ""))
+        except (TypeError, ValueError):
+            return default
+        return value if value > 0 else default
+
+    try:
+        budget = float(os.environ.get("DAILY_BUDGET_SGD", "1.0"))
+    except ValueError:
+        budget = 1.0
+    if not math.isfinite(budget) or budget <= 0:
+        budget = 1.0
+    return (
+        positive_int("MAX_UPLOAD_BYTES", 8 * 1024 * 1024),
+        positive_int("MAX_UPLOAD_PIXELS", 25_000_000),
+        positive_int("TEXT_INPUT_MAX_CHARS", 5000),
+        os.environ.get("TRANSLATION_ENABLED", "false").strip().lower() == "true",
+        os.environ.get("BUDGET_ENFORCE_MODE", "warn").strip().lower(),
+        os.environ.get("OCR_PROVIDER", "").strip().lower(),
+        budget,
+    )
+
+
+def _settings_per_request_config() -> tuple[object, ...]:
+    settings = get_settings()
+    return (
+        settings.max_upload_bytes,
+        settings.max_image_pixels,
+        settings.text_input_max_chars,
+        settings.translation_enabled,
+        settings.budget_enforce_mode,
+        settings.ocr_provider,
+        settings.daily_budget_sgd,
+    )
+
+
+def main(number: int = 100_000) -> None:
+    legacy = min(timeit.repeat(_legacy_per_request_config, number=number, repeat=5))
+    cached = min(timeit.repeat(_settings_per_request_config, number=number, repeat=5))
+    legacy_us = legacy / number * 1e6
+    cached_us = cached / number * 1e6
+    print(f"env parsing per request:     {legacy_us:8.3f} us")
+    print(f"settings lookup per request: {cached_us:8.3f} us")
+    print(f"saving per request:          {legacy_us - cached_us:8.3f} us ({legacy / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Cold-start benchmark: time to bind, time to ready and first-request latency.
+
+Starts ``uvicorn app.main:app`` in a fresh subprocess (so imports are genuinely cold)
+against the Vision/Translate stubs from benchmarks.stub_servers, then measures:
+
+* ``bind_ms``: process spawn until the port accepts TCP connections;
+* ``ready_ms``: process spawn until GET /v1/health/ready returns 200;
+* ``first_ms`` / ``steady_ms``: latency of the first request to each endpoint, sent once
+  the server reports ready, and the median of the following ``--steady`` requests.
+
+Each scenario runs with background warmup on and off (WARMUP_ENABLED), so the output
+shows how much of the first-request penalty warmup moves off the request path.
+
+Run from backend/:
+    uv run python -m benchmarks.startup --runs 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.fakes import BENCH_LINE
+from benchmarks.loadtest import _default_image, _free_port
+from benchmarks.stub_servers import add_stub_arguments, start_stubs_from_args
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def _wait_for_bind(port: int, deadline: float) -> None:
+    while time.perf_counter() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.05):
+                return
+        except OSError:
+            time.sleep(0.002)
+    raise TimeoutError(f"server did not bind port {port}")
+
+
+def _wait_for_ready(client: httpx.Client, deadline: float) -> None:
+    while time.perf_counter() < deadline:
+        if client.get("/v1/health/ready").status_code == 200:
+            return
+        time.sleep(0.005)
+    raise TimeoutError("server did not report ready")
+
+
+def _timed_post(client: httpx.Client, **request: object) -> float:
+    start = time.perf_counter()
+    response = client.post(**request)  # type: ignore[arg-type]
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if response.status_code != 200:
+        raise RuntimeError(f"{request['url']} returned {response.status_code}")
+    return elapsed_ms
+
+
+def measure_startup(
+    environment: dict[str, str], *, warmup: bool, steady: int, timeout_s: float
+) -> dict[str, float]:
+    port = _free_port()
+    env = {**os.environ, **environment, "WARMUP_ENABLED": "true" if warmup else "false"}
+    requests = {
+        "process-text": {"url": "/v1/process-text", "json": {"source_text": BENCH_LINE}},
+        "process": {
+            "url": "/v1/process",
+            "content": _default_image(),
+            "headers": {"content-type": "image/png"},
+        },
+    }
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+        # The app logs every request at INFO; keep the report readable.
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = start + timeout_s
+        _wait_for_bind(port, deadline)
+        result = {"bind_ms": (time.perf_counter() - start) * 1000}
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=timeout_s) as client:
+            _wait_for_ready(client, deadline)
+            result["ready_ms"] = (time.perf_counter() - start) * 1000
+            # The first request to each endpoint pays whatever warmup did not.
+            for name, request in requests.items():
+                result[f"{name}_first_ms"] = _timed_post(client, **request)
+            for name, request in requests.items():
+                result[f"{name}_steady_ms"] = statistics.median(
+                    _timed_post(client, **request) for _ in range(steady)
+                )
+        return result
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def _median_of_runs(runs: list[dict[str, float]]) -> dict[str, float]:
+    return {key: round(statistics.median(run[key] for run in runs), 1) for key in runs[0]}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--steady", type=int, default=5)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--json", dest="json_output", type=Path, default=None)
+    add_stub_arguments(parser)
+    parser.set_defaults(ocr_latency="fixed:0", translate_latency="fixed:0")
+    args = parser.parse_args(argv)
+
+    vision_server, translate_server, environment = start_stubs_from_args(args)
+    try:
+        report = {
+            scenario: _median_of_runs(
+                [
+                    measure_startup(
+                        environment,
+                        warmup=scenario == "warmup",
+                        steady=args.steady,
+                        timeout_s=args.startup_timeout,
+                    )
+                    for _ in range(args.runs)
+                ]
+            )
+            for scenario in ("warmup", "no_warmup")
+        }
+    finally:
+        translate_server.shutdown()
+        vision_server.stop(grace=None)
+
+    print(json.dumps(report, indent=2))
+    if args.json_output:
+        args.json_output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
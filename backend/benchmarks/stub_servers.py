@@ -0,0 +1,239 @@
+"""Local stub servers speaking the Google Vision gRPC and Translate v2 HTTP protocols.
+
+Point the real adapters at them with GCV_EMULATOR_HOST and GOOGLE_TRANSLATE_EMULATOR_HOST,
+so GoogleCloudVisionOcrProvider and GoogleCloudTranslateProvider run their full client,
+serialization and channel code paths with no network access. Responses are the recorded
+fixtures used by the simulated providers (app/adapters/simulation_fixtures), and each
+call goes through the same latency / error / timeout injection (app.adapters.simulation).
+
+Run from backend/ to start both stubs and print the environment for the API server:
+    uv run python -m benchmarks.stub_servers --ocr-latency lognormal:250,0.6
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from concurrent import futures
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import grpc
+from google.cloud import vision
+
+from app.adapters.simulation import CallSimulator, fixtures_dir
+from app.core.settings import SimulationSettings
+
+_VISION_SERVICE = "google.cloud.vision.v1.ImageAnnotator"
+
+
+def _load_vision_recordings(directory: Path) -> list[vision.AnnotateImageResponse]:
+    return [
+        vision.AnnotateImageResponse.from_json(
+            path.read_text(encoding="utf-8"), ignore_unknown_fields=True
+        )
+        for path in sorted(directory.glob("*.json"))
+    ]
+
+
+class _VisionStub:
+    def __init__(self, simulator: CallSimulator, directory: Path) -> None:
+        self._simulator = simulator
+        self._recordings = _load_vision_recordings(directory)
+        if not self._recordings:
+            raise ValueError(f"No GCV recordings found in {directory}")
+
+    def batch_annotate_images(
+        self, request: vision.BatchAnnotateImagesRequest, context: grpc.ServicerContext
+    ) -> vision.BatchAnnotateImagesResponse:
+        outcome = self._simulator.call()
+        if outcome == "timeout":
+            context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, "Deadline exceeded (stub)")
+        if outcome == "error":
+            context.abort(grpc.StatusCode.UNAVAILABLE, "Service unavailable (stub)")
+        responses = []
+        for image_request in request.requests:
+            digest = hashlib.blake2b(image_request.image.content, digest_size=8).digest()
+            index = int.from_bytes(digest, "big") % len(self._recordings)
+            responses.append(self._recordings[index])
+        return vision.BatchAnnotateImagesResponse(responses=responses)
+
+
+def start_vision_stub(
+    config: SimulationSettings,
+    *,
+    port: int = 0,
+    seed: int | None = None,
+    fixtures: str | None = None,
+    max_workers: int = 32,
+) -> tuple[grpc.Server, int]:
+    """Start the Vision gRPC stub; returns the server and its bound port."""
+    stub = _VisionStub(CallSimulator(config, seed=seed), fixtures_dir(fixtures) / "gcv")
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    handler = grpc.unary_unary_rpc_method_handler(
+        stub.batch_annotate_images,
+        request_deserializer=vision.BatchAnnotateImagesRequest.deserialize,
+        response_serializer=vision.BatchAnnotateImagesResponse.serialize,
+    )
+    server.add_generic_rpc_handlers(
+        (grpc.method_handlers_generic_handler(_VISION_SERVICE, {"BatchAnnotateImages": handler}),)
+    )
+    bound_port = server.add_insecure_port(f"127.0.0.1:{port}")
+    server.start()
+    return server, bound_port
+
+
+@dataclass
+class _TranslateState:
+    simulator: CallSimulator
+    recordings: dict[str, str]
+
+
+class _TranslateHandler(BaseHTTPRequestHandler):
+    server: _TranslateServer
+
+    def do_POST(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler naming
+        if not self.path.startswith("/language/translate/v2"):
+            self._send_json(404, {"error": {"code": 404, "message": "Not found"}})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("content-length", 0))) or b"{}")
+        outcome = self.server.state.simulator.call()
+        if outcome == "timeout":
+            self._send_json(504, {"error": {"code": 504, "message": "Deadline exceeded (stub)"}})
+            return
+        if outcome == "error":
+            self._send_json(503, {"error": {"code": 503, "message": "Unavailable (stub)"}})
+            return
+
+        target = body.get("target", "en")
+        values = body.get("q") or []
+        recordings = self.server.state.recordings
+        translations = [
+            {
+                "translatedText": recordings.get(value, f"[{target}] {value}"),
+                "detectedSourceLanguage": "zh-CN",
+            }
+            for value in values
+        ]
+        self._send_json(200, {"data": {"translations": translations}})
+
+    def _send_json(self, status: int, payload: dict[str, object]) -> None:
+        content = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json; charset=utf-8")
+        self.send_header("content-length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class _TranslateServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], state: _TranslateState) -> None:
+        super().__init__(address, _TranslateHandler)
+        self.state = state
+
+
+def start_translate_stub(
+    config: SimulationSettings,
+    *,
+    port: int = 0,
+    seed: int | None = None,
+    fixtures: str | None = None,
+) -> tuple[ThreadingHTTPServer, int]:
+    """Start the Translate v2 HTTP stub in a daemon thread; returns the server and port."""
+    path = fixtures_dir(fixtures) / "translate.json"
+    recordings = {
+        item["input"]: item["translatedText"]
+        for item in json.loads(path.read_text(encoding="utf-8"))
+    }
+    server = _TranslateServer(
+        ("127.0.0.1", port), _TranslateState(CallSimulator(config, seed=seed), recordings)
+    )
+    threading.Thread(target=server.serve_forever, name="translate-stub", daemon=True).start()
+    return server, server.server_address[1]
+
+
+def stub_environment(vision_port: int, translate_port: int) -> dict[str, str]:
+    """Environment that points the real Google adapters at the stubs."""
+    return {
+        "OCR_PROVIDER": "google_vision",
+        "GCV_EMULATOR_HOST": f"127.0.0.1:{vision_port}",
+        "TRANSLATION_ENABLED": "true",
+        "TRANSLATION_PROVIDER": "google",
+        "GOOGLE_TRANSLATE_EMULATOR_HOST": f"127.0.0.1:{translate_port}",
+    }
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--ocr-latency", default="lognormal:250,0.6")
+    parser.add_argument("--ocr-error-rate", type=float, default=0.0)
+    parser.add_argument("--ocr-timeout-rate", type=float, default=0.0)
+    parser.add_argument("--translate-latency", default="lognormal:80,0.5")
+    parser.add_argument("--translate-error-rate", type=float, default=0.0)
+    parser.add_argument("--translate-timeout-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-seconds", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--fixtures", default=None)
+
+
+def start_stubs_from_args(
+    args: argparse.Namespace, *, vision_port: int = 0, translate_port: int = 0
+) -> tuple[grpc.Server, ThreadingHTTPServer, dict[str, str]]:
+    vision_server, vision_port = start_vision_stub(
+        SimulationSettings(
+            latency=args.ocr_latency,
+            error_rate=args.ocr_error_rate,
+            timeout_rate=args.ocr_timeout_rate,
+            timeout_s=args.timeout_seconds,
+        ),
+        port=vision_port,
+        seed=args.seed,
+        fixtures=args.fixtures,
+    )
+    translate_server, translate_port = start_translate_stub(
+        SimulationSettings(
+            latency=args.translate_latency,
+            error_rate=args.translate_error_rate,
+            timeout_rate=args.translate_timeout_rate,
+            timeout_s=args.timeout_seconds,
+        ),
+        port=translate_port,
+        seed=args.seed,
+        fixtures=args.fixtures,
+    )
+    return vision_server, translate_server, stub_environment(vision_port, translate_port)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vision-port", type=int, default=50051)
+    parser.add_argument("--translate-port", type=int, default=8081)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    vision_server, translate_server, environment = start_stubs_from_args(
+        args, vision_port=args.vision_port, translate_port=args.translate_port
+    )
+    print("Stubs running. Start the API with:")
+    for name, value in environment.items():
+        print(f"  export {name}={value}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        translate_server.shutdown()
+        vision_server.stop(grace=None)
+
+
+if __name__ == "__main__":
+    main()
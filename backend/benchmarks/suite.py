@@ -0,0 +1,318 @@
+"""Benchmark suite for the request hot path, with a JSON baseline regression gate.
+
+Cases cover image validation (per format and size), pinyin generation throughput,
+translation enrichment with a fixed fake latency, reading projection on long input, and
+full /v1/process and /v1/process-text calls through the ASGI transport. External
+providers are replaced by the deterministic fakes in benchmarks.fakes.
+
+Each run writes its results to ``--output``. When a baseline file exists, every case is
+compared against it and the run exits non-zero if any case's median time regressed by
+more than ``--threshold`` (a fraction; 0.25 means 25 % slower). Baselines are machine
+specific, so record one locally with ``--save-baseline`` before comparing.
+
+Run from backend/:
+    uv run python -m benchmarks.suite --save-baseline     # record a baseline
+    uv run python -m benchmarks.suite                     # compare against it
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest import mock
+
+import httpx
+from fastapi import UploadFile
+from PIL import Image
+from starlette.datastructures import Headers
+
+from app.adapters.pypinyin_provider import PyPinyinProvider
+from app.core.settings import Settings
+from app.services.image_validation import validate_image_upload
+from app.services.pinyin_service import generate_pinyin
+from app.services.process_text_service import build_text_segments
+from app.services.reading_service import build_reading_projection
+from app.services.translation_service import enrich_translations
+from benchmarks.fakes import BENCH_LINE, FixedLatencyTranslationProvider, FixedOcrProvider
+
+RESULTS_DIR = Path(__file__).parent / "results"
+DEFAULT_OUTPUT = RESULTS_DIR / "latest.json"
+DEFAULT_BASELINE = RESULTS_DIR / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+
+LONG_TEXT = "\n".join([BENCH_LINE] * 400)[:5000]
+IMAGE_FORMATS = {"png": "PNG", "jpeg": "JPEG", "webp": "WEBP"}
+IMAGE_SIZES = {"small": (320, 240), "medium": (1280, 960), "large": (2560, 1920)}
+
+
+@dataclass(frozen=True, slots=True)
+class BenchCase:
+    name: str
+    run: Callable[[], object]
+    # Units of work per call (e.g. characters) for throughput reporting.
+    work: int | None = None
+    work_unit: str | None = None
+
+
+def _image_bytes(image_format: str, size: tuple[int, int]) -> bytes:
+    # A gradient compresses realistically for photos of text and is identical every run.
+    image = Image.radial_gradient("L").resize(size).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format=IMAGE_FORMATS[image_format])
+    return buffer.getvalue()
+
+
+def _image_validation_cases() -> list[BenchCase]:
+    settings = Settings()
+    cases = []
+    for image_format in IMAGE_FORMATS:
+        for size_name, size in IMAGE_SIZES.items():
+            data = _image_bytes(image_format, size)
+            headers = Headers({"content-type": f"image/{image_format}"})
+
+            def run(data: bytes = data, headers: Headers = headers) -> object:
+                upload = UploadFile(file=io.BytesIO(data), headers=headers)
+                return validate_image_upload(upload, settings=settings)
+
+            cases.append(
+                BenchCase(
+                    name=f"validate_image_upload[{image_format}-{size_name}]",
+                    run=run,
+                    work=len(data),
+                    work_unit="bytes",
+                )
+            )
+    return cases
+
+
+def _service_cases(loop: asyncio.AbstractEventLoop) -> list[BenchCase]:
+    provider = PyPinyinProvider()
+    translation_settings = Settings(translation_enabled=True)
+    long_segments = build_text_segments(LONG_TEXT)
+    long_result = loop.run_until_complete(generate_pinyin(long_segments))
+    short_text = "\n".join([BENCH_LINE] * 20)
+
+    def translate() -> object:
+        result = loop.run_until_complete(generate_pinyin(build_text_segments(short_text)))
+        return loop.run_until_complete(
+            enrich_translations(result, settings=translation_settings)
+        )
+
+    return [
+        BenchCase(
+            name="pypinyin_generate[5000-chars]",
+            run=lambda: provider.generate(text=LONG_TEXT),
+            work=len(LONG_TEXT),
+            work_unit="chars",
+        ),
+        BenchCase(
+            name="enrich_translations[20-lines-1ms]",
+            run=translate,
+            work=20,
+            work_unit="lines",
+        ),
+        BenchCase(
+            name="build_reading_projection[5000-chars]",
+            run=lambda: build_reading_projection(long_result),
+            work=len(LONG_TEXT),
+            work_unit="chars",
+        ),
+    ]
+
+
+def _route_cases(loop: asyncio.AbstractEventLoop) -> list[BenchCase]:
+    from app.main import app
+
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    )
+    image = _image_bytes("png", IMAGE_SIZES["medium"])
+
+    def process() -> object:
+        response = loop.run_until_complete(
+            client.post(
+                "/v1/process", content=image, headers={"content-type": "image/png"}
+            )
+        )
+        assert response.status_code == 200, response.text
+        return response
+
+    def process_text() -> object:
+        response = loop.run_until_complete(
+            client.post("/v1/process-text", json={"source_text": LONG_TEXT})
+        )
+        assert response.status_code == 200, response.text
+        return response
+
+    return [
+        BenchCase(name="route_process[png-medium-20-lines]", run=process),
+        BenchCase(
+            name="route_process_text[5000-chars]",
+            run=process_text,
+            work=len(LONG_TEXT),
+            work_unit="chars",
+        ),
+    ]
+
+
+@contextmanager
+def _fake_providers() -> Iterator[None]:
+    with (
+        mock.patch("app.services.ocr_service.get_ocr_provider", FixedOcrProvider),
+        mock.patch(
+            "app.services.translation_service.get_translation_provider",
+            FixedLatencyTranslationProvider,
+        ),
+    ):
+        yield
+
+
+def measure(case: BenchCase, *, repeat: int, min_sample_s: float = 0.05) -> dict[str, object]:
+    """Time ``case`` and return its result entry (seconds per call)."""
+    case.run()  # warm caches, lazy imports and pypinyin dictionaries
+
+    # Batch fast calls so each sample is long enough for perf_counter to be meaningful.
+    start = time.perf_counter()
+    case.run()
+    single = max(time.perf_counter() - start, 1e-9)
+    number = max(1, int(min_sample_s / single))
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            case.run()
+        samples.append((time.perf_counter() - start) / number)
+
+    median_s = statistics.median(samples)
+    entry: dict[str, object] = {
+        "median_s": median_s,
+        "min_s": min(samples),
+        "max_s": max(samples),
+        "samples": repeat,
+        "calls_per_sample": number,
+    }
+    if case.work is not None:
+        entry["throughput"] = case.work / median_s
+        entry["throughput_unit"] = f"{case.work_unit}/s"
+    return entry
+
+
+def compare_results(
+    current: dict[str, dict[str, object]],
+    baseline: dict[str, dict[str, object]],
+    *,
+    threshold: float,
+) -> list[tuple[str, float]]:
+    """Return ``(case, ratio)`` for every case slower than baseline by more than threshold."""
+    regressions = []
+    for name, entry in current.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        ratio = float(entry["median_s"]) / float(reference["median_s"])
+        if ratio > 1 + threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def run_suite(*, repeat: int, name_filter: str | None = None) -> dict[str, object]:
+    # Per-request INFO logging would dominate the route cases' output and timings.
+    logging.disable(logging.INFO)
+    loop = asyncio.new_event_loop()
+    try:
+        with _fake_providers():
+            cases = [
+                *_image_validation_cases(),
+                *_service_cases(loop),
+                *_route_cases(loop),
+            ]
+            results = {
+                case.name: measure(case, repeat=repeat)
+                for case in cases
+                if name_filter is None or name_filter in case.name
+            }
+    finally:
+        loop.close()
+        logging.disable(logging.NOTSET)
+    return {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "cases": results,
+    }
+
+
+def _print_report(
+    current: dict[str, dict[str, object]], baseline: dict[str, dict[str, object]] | None
+) -> None:
+    print(f"{'case':<44} {'median ms':>10} {'baseline':>10} {'ratio':>7}  throughput")
+    for name, entry in current.items():
+        median_ms = float(entry["median_s"]) * 1000
+        reference = (baseline or {}).get(name)
+        if reference is not None:
+            reference_ms = float(reference["median_s"]) * 1000
+            compared = f"{reference_ms:>10.3f} {median_ms / reference_ms:>7.2f}"
+        else:
+            compared = f"{'-':>10} {'-':>7}"
+        throughput = ""
+        if "throughput" in entry:
+            throughput = f"{float(entry['throughput']):,.0f} {entry['throughput_unit']}"
+        print(f"{name:<44} {median_ms:>10.3f} {compared}  {throughput}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--filter", dest="name_filter", default=None)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Also write this run's results to the baseline path.",
+    )
+    args = parser.parse_args(argv)
+
+    report = run_suite(repeat=args.repeat, name_filter=args.name_filter)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    baseline = None
+    if not args.save_baseline and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["cases"]
+    _print_report(report["cases"], baseline)
+    print(f"results written to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if baseline is None:
+        return 0
+
+    regressions = compare_results(report["cases"], baseline, threshold=args.threshold)
+    for name, ratio in regressions:
+        print(f"REGRESSION {name}: {ratio:.2f}x baseline (threshold {1 + args.threshold:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
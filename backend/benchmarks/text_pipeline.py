@@ -0,0 +1,56 @@
+"""Time and peak allocations of the pasted-text pipeline on long inputs.
+
+Runs segmentation -> pinyin -> translation (disabled) -> reading -> boundary conversion
+on the internal slotted segments, as /v1/process-text does.
+
+Run from backend/:  uv run python -m benchmarks.text_pipeline
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import tracemalloc
+
+from app.core.settings import Settings
+from app.services.pinyin_service import generate_pinyin
+from app.services.process_text_service import build_text_segments
+from app.services.reading_service import build_reading_projection
+from app.services.segments import to_pinyin_data
+from app.services.translation_service import enrich_translations
+
+SETTINGS = Settings()
+
+
+async def _run_pipeline(source_text: str) -> None:
+    segments = build_text_segments(source_text, settings=SETTINGS)
+    pinyin_result = await generate_pinyin(segments)
+    pinyin_result = await enrich_translations(pinyin_result, settings=SETTINGS)
+    build_reading_projection(pinyin_result)
+    to_pinyin_data(pinyin_result)
+
+
+def main(repeat: int = 20) -> None:
+    for line_count in (50, 200, 400):
+        source_text = "\n".join(["老师说我们今天一起读书吧"] * line_count)[:5000]
+        asyncio.run(_run_pipeline(source_text))  # warm pypinyin dictionaries
+
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            asyncio.run(_run_pipeline(source_text))
+            best = min(best, time.perf_counter() - start)
+
+        tracemalloc.start()
+        asyncio.run(_run_pipeline(source_text))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            f"lines={line_count:4d} chars={len(source_text):5d} "
+            f"time={best * 1000:8.2f} ms peak_alloc={peak / 1024:8.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
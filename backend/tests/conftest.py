@@ -0,0 +1,42 @@
+"""Pytest configuration shared by all test suites.
+
+Application settings are parsed once and cached (see app.core.settings).  Tests
+that configure the app through environment variables use the ``settings_env``
+fixture, which reloads settings after every change and again once the changes
+are undone.
+
+Provider circuit breakers, retry budgets, quotas, concurrency limiters, the request
+scheduler and per-client limits are shared process-wide, so they are reset before
+every test to keep one test's failing stub provider from affecting the next.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from helpers import SettingsEnv
+
+from app.adapters.quota import reset_quotas
+from app.core.circuit_breaker import reset_breakers
+from app.core.concurrency_limit import reset_limiters
+from app.core.scheduling import reset_scheduler
+from app.core.settings import reload_settings
+from app.services.client_limits import reset_client_limiter
+from app.services.retry import reset_retry_budgets
+
+
+@pytest.fixture
+def settings_env(monkeypatch: pytest.MonkeyPatch) -> Iterator[SettingsEnv]:
+    yield SettingsEnv(monkeypatch)
+    monkeypatch.undo()
+    reload_settings()
+
+
+@pytest.fixture(autouse=True)
+def _reset_provider_health() -> None:
+    reset_breakers()
+    reset_retry_budgets()
+    reset_quotas()
+    reset_limiters()
+    reset_scheduler()
+    reset_client_limiter()
@@ -37,6 +37,10 @@ def _minimal_diagnostics() -> DiagnosticsPayload:
 
 
 def assert_process_envelope(envelope: Mapping[str, object]) -> None:
+    # Routes build envelopes with model_construct, so re-run the full model validation
+    # (including validate_status_envelope) on what they produce.
+    ProcessResponse.model_validate(envelope)
+
     assert "status" in envelope
     assert envelope["status"] in {"success", "partial", "error"}
 
@@ -6,11 +6,14 @@ pyproject.toml adds the 'tests' directory to pythonpath.
 """
 from __future__ import annotations
 
+import asyncio
 from uuid import uuid4
 
+import pytest
 from starlette.requests import Request
 
 from app.adapters.ocr_provider import RawOcrSegment
+from app.core.settings import reload_settings
 
 PNG_1X1_BYTES = (
     b"\x89PNG\r\n\x1a\n"
@@ -22,6 +25,25 @@ PNG_1X1_BYTES = (
 )
 
 
+class SettingsEnv:
+    """Sets or removes environment variables and reloads the cached settings.
+
+    Returned by the ``settings_env`` fixture; the variables are restored (and the
+    settings reloaded again) when the test finishes.
+    """
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self._monkeypatch = monkeypatch
+
+    def setenv(self, name: str, value: str) -> None:
+        self._monkeypatch.setenv(name, value)
+        reload_settings()
+
+    def delenv(self, name: str, raising: bool = True) -> None:
+        self._monkeypatch.delenv(name, raising)
+        reload_settings()
+
+
 class StubOcrProvider:
     def __init__(self, segments: list[RawOcrSegment]) -> None:
         self._segments = segments
@@ -31,12 +53,19 @@ class StubOcrProvider:
         return self._segments
 
 
-def _request_with_body(body: bytes, content_type: str) -> Request:
+def _request_with_body(
+    body: bytes, content_type: str, *, disconnected: asyncio.Event | None = None
+) -> Request:
+    """A request whose client stays connected, or disconnects once ``disconnected`` is set.
+
+    Like a real server, receive() blocks after the body until the client goes away.
+    """
     sent = False
 
     async def receive() -> dict[str, object]:
         nonlocal sent
         if sent:
+            await (disconnected or asyncio.Event()).wait()
             return {"type": "http.disconnect"}
         sent = True
         return {"type": "http.request", "body": body, "more_body": False}
@@ -56,3 +85,15 @@ def _request_with_body(body: bytes, content_type: str) -> Request:
         "state": {"request_id": str(uuid4())},
     }
     return Request(scope, receive)
+
+
+def fake_local_ocr_engine(threads: int):
+    """Engine factory for LocalOcrProvider tests; runs inside the spawned worker."""
+    import time
+
+    def engine(image_bytes: bytes):
+        if image_bytes == b"slow":
+            time.sleep(2)
+        return [[[[10, 5], [90, 5], [90, 25], [10, 25]], "你好", 0.93]], [0.01]
+
+    return engine
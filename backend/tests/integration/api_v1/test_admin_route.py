@@ -0,0 +1,37 @@
+from starlette.testclient import TestClient
+
+from app.core.settings import get_settings
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_reload_settings_is_hidden_without_admin_token(settings_env) -> None:
+    settings_env.delenv("ADMIN_TOKEN", raising=False)
+
+    response = client.post("/v1/admin/reload-settings")
+
+    assert response.status_code == 404
+
+
+def test_reload_settings_rejects_wrong_token(settings_env) -> None:
+    settings_env.setenv("ADMIN_TOKEN", "secret")
+
+    response = client.post("/v1/admin/reload-settings", headers={"X-Admin-Token": "nope"})
+
+    assert response.status_code == 403
+
+
+def test_reload_settings_applies_settings_file_changes(settings_env, tmp_path) -> None:
+    settings_file = tmp_path / "settings.env"
+    settings_file.write_text("TEXT_INPUT_MAX_CHARS=5000\n")
+    settings_env.setenv("ADMIN_TOKEN", "secret")
+    settings_env.setenv("SETTINGS_FILE", str(settings_file))
+    settings_file.write_text("TEXT_INPUT_MAX_CHARS=10\n")
+    assert get_settings().text_input_max_chars == 5000
+
+    response = client.post("/v1/admin/reload-settings", headers={"X-Admin-Token": "secret"})
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "reloaded"}
+    assert get_settings().text_input_max_chars == 10
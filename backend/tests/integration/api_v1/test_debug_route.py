@@ -0,0 +1,151 @@
+from unittest.mock import patch
+
+from helpers import PNG_1X1_BYTES, StubOcrProvider
+from starlette.testclient import TestClient
+
+from app.adapters.ocr_provider import RawOcrSegment
+from app.core.profiling import ProfileStore, profile_store
+from app.core.request_log import RequestLog, request_log
+from app.main import app
+
+client = TestClient(app)
+
+
+def _reset_profiles() -> None:
+    profile_store.__dict__.update(ProfileStore().__dict__)
+
+
+def test_x_profile_header_stores_profile_retrievable_by_request_id(settings_env) -> None:
+    _reset_profiles()
+    settings_env.setenv("ADMIN_TOKEN", "secret")
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
+
+    response = client.post(
+        "/v1/process-text", json={"source_text": "你好"}, headers={"X-Profile": "secret"}
+    )
+    request_id = response.headers["x-request-id"]
+
+    listing = client.get("/v1/debug/profiles", headers={"X-Admin-Token": "secret"})
+    assert [item["request_id"] for item in listing.json()["profiles"]] == [request_id]
+    assert listing.json()["profiles"][0]["path"] == "/v1/process-text"
+
+    speedscope = client.get(
+        f"/v1/debug/profiles/{request_id}", headers={"X-Admin-Token": "secret"}
+    )
+    assert speedscope.status_code == 200
+    assert speedscope.json()["profiles"][0]["type"] == "sampled"
+
+    collapsed = client.get(
+        f"/v1/debug/profiles/{request_id}",
+        params={"format": "collapsed"},
+        headers={"X-Admin-Token": "secret"},
+    )
+    assert collapsed.headers["content-type"].startswith("text/plain")
+
+
+def test_requests_without_authorized_header_are_not_profiled(settings_env) -> None:
+    _reset_profiles()
+    settings_env.setenv("ADMIN_TOKEN", "secret")
+
+    client.get("/v1/health")
+    client.get("/v1/health", headers={"X-Profile": "wrong"})
+
+    assert profile_store.recent() == []
+
+
+def test_profile_sample_rate_profiles_requests_without_header(settings_env) -> None:
+    _reset_profiles()
+    settings_env.setenv("PROFILE_SAMPLE_RATE", "1")
+
+    client.get("/v1/health")
+
+    assert [profile.path for profile in profile_store.recent()] == ["/v1/health"]
+
+
+def test_debug_profiles_require_admin_token(settings_env) -> None:
+    settings_env.delenv("ADMIN_TOKEN", raising=False)
+    assert client.get("/v1/debug/profiles").status_code == 404
+
+    settings_env.setenv("ADMIN_TOKEN", "secret")
+    assert client.get("/v1/debug/profiles").status_code == 403
+    missing = client.get("/v1/debug/profiles/unknown", headers={"X-Admin-Token": "secret"})
+    assert missing.status_code == 404
+
+
+def _reset_request_log() -> None:
+    request_log.__dict__.update(RequestLog().__dict__)
+
+
+def test_debug_slow_lists_process_requests_with_details(settings_env) -> None:
+    _reset_request_log()
+    settings_env.setenv("ADMIN_TOKEN", "secret")
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
+
+    response = client.post("/v1/process-text", json={"source_text": "你好\n我们走吧"})
+    client.get("/v1/health")
+
+    body = client.get("/v1/debug/slow", headers={"X-Admin-Token": "secret"}).json()
+    assert [entry["request_id"] for entry in body["recent"]] == [
+        response.headers["x-request-id"]
+    ]
+    entry = body["slowest"][0]
+    assert entry["path"] == "/v1/process-text"
+    assert entry["status"] == "success"
+    assert entry["http_status"] == 200
+    assert entry["request_bytes"] == len("你好\n我们走吧".encode())
+    assert entry["response_bytes"] == len(response.content)
+    assert entry["segment_count"] == 2
+    assert entry["line_count"] == 2
+    assert entry["translated_lines"] == 0
+    assert entry["outcomes"] == {"ocr": "skipped", "pinyin": "ok"}
+    assert "pinyin" in [span["name"] for span in entry["spans"]]
+
+
+def test_debug_slow_reports_speculative_ocr(settings_env) -> None:
+    _reset_request_log()
+    settings_env.setenv("ADMIN_TOKEN", "secret")
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
+    settings_env.setenv("SPECULATIVE_OCR_ENABLED", "true")
+
+    with patch(
+        "app.services.ocr_service.get_ocr_provider",
+        return_value=StubOcrProvider([RawOcrSegment(text="你好", language="zh", confidence=0.9)]),
+    ):
+        client.post("/v1/process", content=PNG_1X1_BYTES, headers={"content-type": "image/png"})
+
+    entry = client.get("/v1/debug/slow", headers={"X-Admin-Token": "secret"}).json()["recent"][0]
+    assert entry["path"] == "/v1/process"
+    assert entry["status"] == "success"
+    assert entry["speculative_ocr"] is True
+
+
+def test_debug_slow_reports_document_chunk_count(settings_env) -> None:
+    _reset_request_log()
+    settings_env.setenv("ADMIN_TOKEN", "secret")
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
+    settings_env.setenv("TEXT_DOCUMENT_CHUNK_CHARS", "6")
+
+    client.post("/v1/process-text/document", content="第一行\n第二行\n第三行".encode())
+
+    entry = client.get("/v1/debug/slow", headers={"X-Admin-Token": "secret"}).json()["recent"][0]
+    assert entry["path"] == "/v1/process-text/document"
+    assert entry["status"] == "success"
+    assert (entry["chunk_count"], entry["line_count"]) == (2, 3)
+
+
+def test_debug_slow_records_validation_errors(settings_env) -> None:
+    _reset_request_log()
+    settings_env.setenv("ADMIN_TOKEN", "secret")
+
+    client.post("/v1/process", content=b"not-an-image", headers={"content-type": "image/png"})
+
+    entry = client.get("/v1/debug/slow", headers={"X-Admin-Token": "secret"}).json()["recent"][0]
+    assert entry["status"] == "error"
+    assert entry["error_code"] == "image_decode_failed"
+    assert entry["image_width"] is None
+
+
+def test_debug_slow_requires_admin_token(settings_env) -> None:
+    settings_env.delenv("ADMIN_TOKEN", raising=False)
+
+    assert client.get("/v1/debug/slow").status_code == 404
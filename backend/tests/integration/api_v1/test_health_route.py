@@ -1,5 +1,8 @@
 from starlette.testclient import TestClient
 
+from app.core.circuit_breaker import get_breaker
+from app.core.settings import get_settings
+from app.core.warmup import Readiness, WarmupStep
 from app.main import app
 
 client = TestClient(app)
@@ -9,7 +12,7 @@ def test_health_returns_healthy() -> None:
     response = client.get("/v1/health")
 
     assert response.status_code == 200
-    assert response.json() == {"status": "healthy"}
+    assert response.json() == {"status": "healthy", "circuit_breakers": {}}
 
 
 def test_health_response_structure() -> None:
@@ -18,3 +21,59 @@ def test_health_response_structure() -> None:
 
     assert "status" in body
     assert body["status"] in ("healthy", "degraded")
+
+
+def test_health_is_degraded_while_a_circuit_breaker_is_open() -> None:
+    breaker = get_breaker("ocr", "google_vision", get_settings())
+    for _ in range(10):
+        breaker.record(ok=False, latency_ms=5.0)
+
+    response = client.get("/v1/health")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "degraded"
+    assert body["circuit_breakers"]["ocr:google_vision"]["state"] == "open"
+    assert body["circuit_breakers"]["ocr:google_vision"]["opened_total"] == 1
+
+
+def test_ready_returns_503_while_warming(monkeypatch) -> None:
+    monkeypatch.setattr("app.api.v1.health.readiness", Readiness(state="warming"))
+
+    response = client.get("/v1/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming"
+
+
+def test_ready_reports_warmup_steps_once_ready(monkeypatch) -> None:
+    state = Readiness(
+        state="ready",
+        started_at=100.0,
+        ready_at=100.25,
+        steps=[WarmupStep(name="pinyin", status="ok", duration_ms=180.0)],
+    )
+    monkeypatch.setattr("app.api.v1.health.readiness", state)
+
+    response = client.get("/v1/health/ready")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "ready",
+        "warmup_ms": 250.0,
+        "steps": [{"name": "pinyin", "status": "ok", "duration_ms": 180.0}],
+    }
+
+
+def test_lifespan_marks_ready_when_warmup_disabled(monkeypatch, settings_env) -> None:
+    settings_env.setenv("WARMUP_ENABLED", "false")
+    state = Readiness()
+    monkeypatch.setattr("app.api.v1.health.readiness", state)
+    monkeypatch.setattr(
+        "app.main.mark_ready_without_warmup", lambda: setattr(state, "state", "ready")
+    )
+
+    with TestClient(app) as lifespan_client:
+        response = lifespan_client.get("/v1/health/ready")
+
+    assert response.status_code == 200
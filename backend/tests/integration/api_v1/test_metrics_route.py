@@ -55,6 +55,18 @@ def test_metrics_response_has_required_fields() -> None:
         "process_requests_success",
         "process_requests_partial",
         "process_requests_error",
+        "process_requests_cancelled",
+        "ocr_calls_total",
+        "ocr_hedges_total",
+        "ocr_hedge_wins_total",
+        "ocr_hedge_rate",
+        "ocr_hedge_win_rate",
+        "quota_waits_total",
+        "quota_wait_ms_total",
+        "quota_timeouts_total",
+        "circuit_breakers",
+        "concurrency_limits",
+        "workload_classes",
         "daily_costs",
     }
 
@@ -71,6 +83,18 @@ def test_metrics_initial_counts_are_zero() -> None:
         "process_requests_success": 0,
         "process_requests_partial": 0,
         "process_requests_error": 0,
+        "process_requests_cancelled": 0,
+        "ocr_calls_total": 0,
+        "ocr_hedges_total": 0,
+        "ocr_hedge_wins_total": 0,
+        "ocr_hedge_rate": 0.0,
+        "ocr_hedge_win_rate": 0.0,
+        "quota_waits_total": 0,
+        "quota_wait_ms_total": 0.0,
+        "quota_timeouts_total": 0,
+        "circuit_breakers": {},
+        "concurrency_limits": {},
+        "workload_classes": {},
         "daily_costs": {},
     }
 
@@ -95,9 +119,10 @@ def test_metrics_returns_recorded_daily_costs() -> None:
     }
 
 
-def test_metrics_increments_after_process_request() -> None:
+def test_metrics_increments_after_process_request(settings_env) -> None:
     _reset_metrics()
     _reset_daily_costs()
+    settings_env.setenv("OCR_PROVIDER", "google_vision")
 
     with patch(
         "app.services.ocr_service.get_ocr_provider",
@@ -113,7 +138,7 @@ def test_metrics_increments_after_process_request() -> None:
     ), patch(
         "app.services.pinyin_service.get_pinyin_provider",
         return_value=StubPinyinProvider(),
-    ), patch.dict("os.environ", {"OCR_PROVIDER": "google_vision"}):
+    ):
         process_response = client.post(
             "/v1/process",
             content=PNG_1X1_BYTES,
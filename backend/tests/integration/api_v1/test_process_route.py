@@ -1,11 +1,19 @@
 import asyncio
+import datetime
 import logging
+import threading
+import time
 from unittest.mock import patch
 
 import pytest
-from helpers import PNG_1X1_BYTES, StubOcrProvider, _request_with_body
+from helpers import PNG_1X1_BYTES, SettingsEnv, StubOcrProvider, _request_with_body
+from starlette.requests import Request
 
-from app.adapters.ocr_provider import ProviderUnavailableError, RawOcrSegment
+from app.adapters.ocr_provider import (
+    OcrExecutionError,
+    ProviderUnavailableError,
+    RawOcrSegment,
+)
 from app.adapters.pinyin_provider import (
     PinyinExecutionError,
     PinyinProviderUnavailableError,
@@ -13,9 +21,10 @@ from app.adapters.pinyin_provider import (
 )
 from app.adapters.translation_provider import TranslationExecutionError
 from app.api.v1.process import process_image
+from app.core.metrics import metrics_store
 from app.schemas.diagnostics import CostEstimate
 from app.services import budget_service
-from app.services.image_validation import MAX_FILE_SIZE_BYTES
+from app.services.image_validation import MAX_FILE_SIZE_BYTES, verify_image_integrity
 
 
 class StubPinyinProvider:
@@ -92,10 +101,10 @@ def test_process_route_invalid_upload_returns_validation_error() -> None:
 
 
 def test_process_route_valid_upload_returns_success_with_ocr_and_pinyin(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.delenv("OCR_PROVIDER", raising=False)
-    monkeypatch.setenv("TRANSLATION_ENABLED", "false")
+    settings_env.delenv("OCR_PROVIDER", raising=False)
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
     pinyin_segments = [
         RawPinyinSegment(hanzi="你", pinyin="nǐ"),
         RawPinyinSegment(hanzi="好", pinyin="hǎo"),
@@ -132,6 +141,15 @@ def test_process_route_valid_upload_returns_success_with_ocr_and_pinyin(
     assert response.diagnostics.timing.total_ms >= 0.0
     assert response.diagnostics.timing.ocr_ms >= 0.0
     assert response.diagnostics.timing.pinyin_ms >= 0.0
+    assert [span.name for span in response.diagnostics.timing.spans] == [
+        "body_read",
+        "validation",
+        "budget_check",
+        "ocr",
+        "pinyin",
+        "translation",
+        "reading",
+    ]
     assert len(response.diagnostics.trace.steps) >= 2
     assert response.diagnostics.cost_estimate is not None
     assert response.diagnostics.cost_estimate.confidence == "unavailable"
@@ -139,9 +157,9 @@ def test_process_route_valid_upload_returns_success_with_ocr_and_pinyin(
 
 
 def test_process_route_success_adds_line_level_translations_when_enabled(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
 
     with patch(
         "app.services.ocr_service.get_ocr_provider",
@@ -173,9 +191,9 @@ def test_process_route_success_adds_line_level_translations_when_enabled(
 
 
 def test_process_route_translation_disabled_returns_success_with_null_translations(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("TRANSLATION_ENABLED", "false")
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
 
     with patch(
         "app.services.ocr_service.get_ocr_provider",
@@ -201,9 +219,9 @@ def test_process_route_translation_disabled_returns_success_with_null_translatio
 
 
 def test_process_route_translation_failure_still_returns_success_with_null_translations(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
 
     with patch(
         "app.services.ocr_service.get_ocr_provider",
@@ -232,9 +250,9 @@ def test_process_route_translation_failure_still_returns_success_with_null_trans
 
 
 def test_process_route_success_adds_reading_projection_without_mutating_raw_payloads(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("TRANSLATION_ENABLED", "false")
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
 
     raw_segments = [
         RawOcrSegment(text="老师", language="zh", confidence=0.98, line_id=0),
@@ -276,9 +294,9 @@ def test_process_route_success_adds_reading_projection_without_mutating_raw_payl
 
 
 def test_process_route_reading_projection_exception_falls_back_to_success_without_reading(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("TRANSLATION_ENABLED", "false")
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
 
     with patch(
         "app.services.ocr_service.get_ocr_provider",
@@ -301,10 +319,10 @@ def test_process_route_reading_projection_exception_falls_back_to_success_withou
 
 
 def test_process_route_low_confidence_partial_omits_reading(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.delenv("OCR_PROVIDER", raising=False)
-    monkeypatch.setenv("TRANSLATION_ENABLED", "false")
+    settings_env.delenv("OCR_PROVIDER", raising=False)
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
 
     with patch(
         "app.services.ocr_service.get_ocr_provider",
@@ -358,9 +376,9 @@ def test_process_route_non_chinese_only_returns_ocr_no_chinese_text_error() -> N
 
 
 def test_process_route_pinyin_failure_returns_typed_pinyin_error(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.delenv("OCR_PROVIDER", raising=False)
+    settings_env.delenv("OCR_PROVIDER", raising=False)
     with patch(
         "app.services.ocr_service.get_ocr_provider",
         return_value=StubOcrProvider(
@@ -440,10 +458,10 @@ def test_process_route_enforces_size_limit_without_content_length_header() -> No
 
 
 def test_upload_within_limits_emits_guardrail_log(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
     caplog: pytest.LogCaptureFixture,
 ) -> None:
-    monkeypatch.delenv("OCR_PROVIDER", raising=False)
+    settings_env.delenv("OCR_PROVIDER", raising=False)
 
     with patch(
         "app.services.ocr_service.get_ocr_provider",
@@ -460,10 +478,10 @@ def test_upload_within_limits_emits_guardrail_log(
 
 
 def test_process_route_low_confidence_ocr_returns_partial_with_guidance(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
     """Low-confidence OCR segments with successful pinyin returns partial with guidance warning."""
-    monkeypatch.delenv("OCR_PROVIDER", raising=False)
+    settings_env.delenv("OCR_PROVIDER", raising=False)
     with patch(
         "app.services.ocr_service.get_ocr_provider",
         return_value=StubOcrProvider(
@@ -603,11 +621,11 @@ def test_process_route_mixed_segments_returns_aligned_and_uncertain() -> None:
 
 
 def test_process_route_block_mode_with_exceeded_budget_returns_budget_error(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("OCR_PROVIDER", "google_vision")
-    monkeypatch.setenv("BUDGET_ENFORCE_MODE", "block")
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "1.0")
+    settings_env.setenv("OCR_PROVIDER", "google_vision")
+    settings_env.setenv("BUDGET_ENFORCE_MODE", "block")
+    settings_env.setenv("DAILY_BUDGET_SGD", "1.0")
     _set_today_spend_sgd(1.0)
 
     with patch("app.services.ocr_service.get_ocr_provider") as get_ocr_provider:
@@ -622,11 +640,11 @@ def test_process_route_block_mode_with_exceeded_budget_returns_budget_error(
 
 
 def test_process_route_warn_mode_with_approaching_budget_returns_budget_warning(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("OCR_PROVIDER", "google_vision")
-    monkeypatch.setenv("BUDGET_ENFORCE_MODE", "warn")
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "1.0")
+    settings_env.setenv("OCR_PROVIDER", "google_vision")
+    settings_env.setenv("BUDGET_ENFORCE_MODE", "warn")
+    settings_env.setenv("DAILY_BUDGET_SGD", "1.0")
     _set_today_spend_sgd(0.8)
     pinyin_segments = [
         RawPinyinSegment(hanzi="你", pinyin="nǐ"),
@@ -650,11 +668,11 @@ def test_process_route_warn_mode_with_approaching_budget_returns_budget_warning(
 
 
 def test_process_route_warn_mode_with_exceeded_budget_returns_budget_warning(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("OCR_PROVIDER", "google_vision")
-    monkeypatch.setenv("BUDGET_ENFORCE_MODE", "warn")
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "1.0")
+    settings_env.setenv("OCR_PROVIDER", "google_vision")
+    settings_env.setenv("BUDGET_ENFORCE_MODE", "warn")
+    settings_env.setenv("DAILY_BUDGET_SGD", "1.0")
     _set_today_spend_sgd(1.0)
     pinyin_segments = [
         RawPinyinSegment(hanzi="你", pinyin="nǐ"),
@@ -680,11 +698,11 @@ def test_process_route_warn_mode_with_exceeded_budget_returns_budget_warning(
 
 
 def test_process_route_warn_mode_success_is_downgraded_to_partial_with_budget_warning(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("OCR_PROVIDER", "google_vision")
-    monkeypatch.setenv("BUDGET_ENFORCE_MODE", "warn")
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "1.0")
+    settings_env.setenv("OCR_PROVIDER", "google_vision")
+    settings_env.setenv("BUDGET_ENFORCE_MODE", "warn")
+    settings_env.setenv("DAILY_BUDGET_SGD", "1.0")
     _set_today_spend_sgd(0.8)
     pinyin_segments = [
         RawPinyinSegment(hanzi="你", pinyin="nǐ"),
@@ -712,11 +730,11 @@ def test_process_route_warn_mode_success_is_downgraded_to_partial_with_budget_wa
 
 
 def test_process_route_below_budget_threshold_has_no_budget_warning(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("OCR_PROVIDER", "google_vision")
-    monkeypatch.setenv("BUDGET_ENFORCE_MODE", "warn")
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "1.0")
+    settings_env.setenv("OCR_PROVIDER", "google_vision")
+    settings_env.setenv("BUDGET_ENFORCE_MODE", "warn")
+    settings_env.setenv("DAILY_BUDGET_SGD", "1.0")
     _set_today_spend_sgd(0.79)
     pinyin_segments = [
         RawPinyinSegment(hanzi="你", pinyin="nǐ"),
@@ -740,11 +758,11 @@ def test_process_route_below_budget_threshold_has_no_budget_warning(
 
 
 def test_process_route_non_gcv_provider_never_triggers_budget_enforcement(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.delenv("OCR_PROVIDER", raising=False)
-    monkeypatch.setenv("BUDGET_ENFORCE_MODE", "block")
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "0.01")
+    settings_env.delenv("OCR_PROVIDER", raising=False)
+    settings_env.setenv("BUDGET_ENFORCE_MODE", "block")
+    settings_env.setenv("DAILY_BUDGET_SGD", "0.01")
     pinyin_segments = [
         RawPinyinSegment(hanzi="你", pinyin="nǐ"),
         RawPinyinSegment(hanzi="好", pinyin="hǎo"),
@@ -768,12 +786,12 @@ def test_process_route_non_gcv_provider_never_triggers_budget_enforcement(
 
 
 def test_process_route_ocr_provider_failure_does_not_record_budget_cost(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
     """Cost must not be charged when the OCR provider is unavailable (no billable call made)."""
-    monkeypatch.setenv("OCR_PROVIDER", "google_vision")
-    monkeypatch.setenv("BUDGET_ENFORCE_MODE", "block")
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "1.0")
+    settings_env.setenv("OCR_PROVIDER", "google_vision")
+    settings_env.setenv("BUDGET_ENFORCE_MODE", "block")
+    settings_env.setenv("DAILY_BUDGET_SGD", "1.0")
 
     class FailingOcrProvider:
         def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
@@ -794,3 +812,200 @@ def test_process_route_ocr_provider_failure_does_not_record_budget_cost(
     today = datetime.date.today().isoformat()
     today_usd = budget_service.daily_cost_store.snapshot().get(today, {}).get("total_usd", 0.0)
     assert today_usd == 0.0
+
+
+def test_process_route_charges_the_tiers_run_when_the_last_tier_fails(
+    settings_env: SettingsEnv,
+) -> None:
+    settings_env.setenv("OCR_CASCADE", "google_vision,textract")
+
+    class FailingOcrProvider:
+        def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
+            raise OcrExecutionError("textract rejected the image")
+
+    providers = {
+        "google_vision": StubOcrProvider([RawOcrSegment(text="hello", language="en")]),
+        "textract": FailingOcrProvider(),
+    }
+
+    with patch("app.services.ocr_service.get_ocr_provider", side_effect=providers.__getitem__):
+        request = _request_with_body(PNG_1X1_BYTES, "image/png")
+        response = asyncio.run(process_image(request))
+
+    assert response.status == "error"
+    assert response.error.code == "ocr_execution_failed"
+    # The GCV call was billed even though the request failed; Textract is unpriced.
+    today = budget_service.daily_cost_store.snapshot()[datetime.date.today().isoformat()]
+    assert today["total_usd"] == pytest.approx(0.0015)
+
+
+def test_process_route_tiles_large_image_when_tiling_enabled(
+    settings_env: SettingsEnv,
+) -> None:
+    import io
+
+    from PIL import Image
+
+    settings_env.setenv("OCR_PROVIDER", "google_vision")
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
+    settings_env.setenv("OCR_TILING_ENABLED", "true")
+    settings_env.setenv("OCR_TILE_SIZE", "128")
+    settings_env.setenv("OCR_TILE_OVERLAP", "32")
+    settings_env.setenv("OCR_TILING_MIN_PIXELS", "10000")
+    buffer = io.BytesIO()
+    Image.new("RGB", (300, 200), "white").save(buffer, format="PNG")
+    provider = StubOcrProvider([RawOcrSegment(text="你好", language="zh", confidence=0.98)])
+
+    with patch("app.services.ocr_service.get_ocr_provider", return_value=provider), patch(
+        "app.services.pinyin_service.get_pinyin_provider",
+        return_value=StubPinyinProvider([RawPinyinSegment(hanzi="你好", pinyin="nǐ hǎo")]),
+    ):
+        request = _request_with_body(buffer.getvalue(), "image/png")
+        response = asyncio.run(process_image(request))
+
+    assert response.status == "success"
+    assert request.state.details["ocr_tiles"] == 6
+    # Without boxes, identical lines from different tiles collapse into one.
+    assert [segment.text for segment in response.data.ocr.segments] == ["你好"]
+    assert response.diagnostics.cost_estimate.estimated_usd == pytest.approx(0.009)
+
+
+def test_process_route_reports_cascade_tiers_and_charges_only_tiers_run(
+    settings_env: SettingsEnv,
+) -> None:
+    settings_env.setenv("OCR_CASCADE", "local,google_vision")
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
+    providers = {
+        "local": StubOcrProvider([RawOcrSegment(text="你好", language="zh", confidence=0.4)]),
+        "google_vision": StubOcrProvider(
+            [RawOcrSegment(text="你好", language="zh", confidence=0.97)]
+        ),
+    }
+
+    with patch(
+        "app.services.ocr_service.get_ocr_provider", side_effect=providers.__getitem__
+    ), patch(
+        "app.services.pinyin_service.get_pinyin_provider",
+        return_value=StubPinyinProvider([RawPinyinSegment(hanzi="你好", pinyin="nǐ hǎo")]),
+    ):
+        request = _request_with_body(PNG_1X1_BYTES, "image/png")
+        response = asyncio.run(process_image(request))
+
+    assert response.status == "success"
+    ocr = response.diagnostics.ocr
+    assert ocr.provider == "google_vision"
+    assert [(tier.provider, tier.outcome, tier.reason) for tier in ocr.tiers] == [
+        ("local", "escalated", "low_confidence"),
+        ("google_vision", "served", None),
+    ]
+    # The free local tier adds nothing; only the one GCV call is charged.
+    assert response.diagnostics.cost_estimate.estimated_usd == pytest.approx(0.0015)
+
+
+def test_process_route_stops_the_pipeline_when_the_client_disconnects(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pinyin_calls: list[str] = []
+
+    async def fake_generate_pinyin(segments):
+        pinyin_calls.append("called")
+        raise AssertionError("pinyin must not run for a disconnected client")
+
+    async def run() -> object:
+        disconnected = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        class DisconnectingOcrProvider:
+            def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
+                _ = (image_bytes, content_type)
+                loop.call_soon_threadsafe(disconnected.set)
+                time.sleep(0.05)
+                return [RawOcrSegment(text="你好", language="zh", confidence=0.9)]
+
+        monkeypatch.setattr(
+            "app.services.ocr_service.get_ocr_provider", lambda name: DisconnectingOcrProvider()
+        )
+        monkeypatch.setattr("app.api.v1.process.generate_pinyin", fake_generate_pinyin)
+        request = _request_with_body(PNG_1X1_BYTES, "image/png", disconnected=disconnected)
+        return await process_image(request)
+
+    cancelled_before = metrics_store.process_requests_cancelled
+    response = asyncio.run(run())
+
+    assert response.status == "error"
+    assert response.error.code == "client_disconnected"
+    assert pinyin_calls == []
+    assert metrics_store.process_requests_cancelled == cancelled_before + 1
+    # The OCR stage never completed, so no cost was recorded for it.
+    assert budget_service.daily_cost_store.snapshot() == {}
+
+
+def test_process_route_counts_a_disconnect_during_upload_as_cancelled() -> None:
+    async def receive() -> dict[str, object]:
+        return {"type": "http.disconnect"}
+
+    request = Request(_request_with_body(b"", "image/png").scope, receive)
+    cancelled_before = metrics_store.process_requests_cancelled
+
+    response = asyncio.run(process_image(request))
+
+    assert response.error.code == "client_disconnected"
+    assert metrics_store.process_requests_cancelled == cancelled_before + 1
+
+
+def test_process_route_overlaps_speculative_ocr_with_the_full_decode(
+    settings_env: SettingsEnv,
+) -> None:
+    settings_env.setenv("SPECULATIVE_OCR_ENABLED", "true")
+
+    with patch(
+        "app.services.ocr_service.get_ocr_provider",
+        return_value=StubOcrProvider([RawOcrSegment(text="你好", language="zh", confidence=0.9)]),
+    ):
+        response = asyncio.run(process_image(_request_with_body(PNG_1X1_BYTES, "image/png")))
+
+    assert response.status == "success"
+    spans = {span.name: span for span in response.diagnostics.timing.spans}
+    ocr, integrity_check = spans["ocr"], spans["integrity_check"]
+    # The full decode runs inside the OCR stage rather than before it.
+    assert ocr.start_ms <= integrity_check.start_ms
+    assert integrity_check.start_ms + integrity_check.duration_ms <= (
+        ocr.start_ms + ocr.duration_ms
+    )
+
+
+def test_process_route_discards_speculative_ocr_for_a_corrupt_image(
+    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
+) -> None:
+    settings_env.setenv("SPECULATIVE_OCR_ENABLED", "true")
+    ocr_calls: list[str] = []
+    ocr_started = threading.Event()
+
+    class SlowOcrProvider:
+        def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
+            _ = (image_bytes, content_type)
+            ocr_calls.append("called")
+            ocr_started.set()
+            time.sleep(0.05)
+            return [RawOcrSegment(text="你好", language="zh", confidence=0.9)]
+
+    def verify_once_ocr_started(image_bytes: bytes) -> None:
+        # Fail the full decode only after the speculative OCR call is under way.
+        ocr_started.wait(timeout=1)
+        verify_image_integrity(image_bytes)
+
+    monkeypatch.setattr(
+        "app.services.ocr_service.get_ocr_provider", lambda name: SlowOcrProvider()
+    )
+    monkeypatch.setattr("app.api.v1.process.verify_image_integrity", verify_once_ocr_started)
+    truncated = PNG_1X1_BYTES[:-24]
+
+    response = asyncio.run(process_image(_request_with_body(truncated, "image/png")))
+
+    assert response.status == "error"
+    assert response.error.category == "validation"
+    assert response.error.code == "image_decode_failed"
+    # OCR was started on the header check alone, then cancelled before it was charged.
+    assert ocr_calls == ["called"]
+    assert budget_service.daily_cost_store.snapshot() == {}
@@ -1,13 +1,22 @@
+import asyncio
+import json
 from unittest.mock import patch
 
 import pytest
+from helpers import _request_with_body
 from starlette.testclient import TestClient
 
 from app.adapters.pinyin_provider import RawPinyinSegment
+from app.api.v1.process_text import process_text, process_text_document
+from app.core.scheduling import get_scheduler
+from app.core.settings import get_settings
 from app.main import app
+from app.schemas.columnar import ColumnarProcessResponse
 from app.schemas.diagnostics import CostEstimate
+from app.schemas.process import ProcessResponse, TextProcessRequest
 from app.services import budget_service
 from app.services.pinyin_service import PinyinServiceError
+from app.services.pinyin_service import generate_pinyin as real_generate_pinyin
 
 
 class StubPinyinProvider:
@@ -21,11 +30,17 @@ class StubPinyinProvider:
 class StubTranslationProvider:
     def __init__(self, mapping: dict[str, str]) -> None:
         self._mapping = mapping
+        self.batches: list[list[str]] = []
 
     def translate(self, *, text: str, target_language: str) -> str:
         _ = target_language
         return self._mapping[text]
 
+    def translate_batch(self, *, texts: list[str], target_language: str) -> list[str]:
+        _ = target_language
+        self.batches.append(list(texts))
+        return [self._mapping[text] for text in texts]
+
 
 client = TestClient(app)
 
@@ -50,9 +65,9 @@ def _set_today_spend_sgd(sgd: float) -> None:
 
 
 def test_process_text_route_returns_success_with_shared_result_shape(
-    monkeypatch,
+    settings_env,
 ) -> None:
-    monkeypatch.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
 
     with patch(
         "app.services.pinyin_service.get_pinyin_provider",
@@ -106,9 +121,9 @@ def test_process_text_route_returns_success_with_shared_result_shape(
 
 
 def test_process_text_route_reports_unavailable_cost_when_translation_disabled(
-    monkeypatch,
+    settings_env,
 ) -> None:
-    monkeypatch.setenv("TRANSLATION_ENABLED", "false")
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
 
     with patch(
         "app.services.pinyin_service.get_pinyin_provider",
@@ -141,9 +156,9 @@ def test_process_text_route_reports_unavailable_cost_when_translation_disabled(
 
 
 def test_process_text_route_reports_unavailable_cost_when_translation_enrichment_fails(
-    monkeypatch,
+    settings_env,
 ) -> None:
-    monkeypatch.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
 
     with patch(
         "app.services.pinyin_service.get_pinyin_provider",
@@ -188,8 +203,8 @@ def test_process_text_route_rejects_non_chinese_input() -> None:
     assert body["error"]["code"] == "text_no_chinese_text"
 
 
-def test_process_text_route_rejects_oversized_input(monkeypatch) -> None:
-    monkeypatch.setenv("TEXT_INPUT_MAX_CHARS", "5")
+def test_process_text_route_rejects_oversized_input(settings_env) -> None:
+    settings_env.setenv("TEXT_INPUT_MAX_CHARS", "5")
     response = client.post("/v1/process-text", json={"source_text": "你好世界这是"})
 
     assert response.status_code == 200
@@ -217,10 +232,10 @@ def test_process_text_route_returns_partial_on_pinyin_failure() -> None:
 
 
 def test_process_text_route_warns_when_daily_budget_threshold_is_reached(
-    monkeypatch,
+    settings_env,
 ) -> None:
-    monkeypatch.setenv("TRANSLATION_ENABLED", "true")
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "1.0")
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("DAILY_BUDGET_SGD", "1.0")
     _set_today_spend_sgd(0.85)
 
     with patch(
@@ -247,11 +262,11 @@ def test_process_text_route_warns_when_daily_budget_threshold_is_reached(
 
 
 def test_process_text_route_block_mode_with_exceeded_budget_returns_budget_error(
-    monkeypatch,
+    settings_env,
 ) -> None:
-    monkeypatch.setenv("TRANSLATION_ENABLED", "true")
-    monkeypatch.setenv("BUDGET_ENFORCE_MODE", "block")
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "1.0")
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("BUDGET_ENFORCE_MODE", "block")
+    settings_env.setenv("DAILY_BUDGET_SGD", "1.0")
     _set_today_spend_sgd(1.0)
 
     with patch("app.services.pinyin_service.generate_pinyin") as generate_pinyin:
@@ -263,3 +278,275 @@ def test_process_text_route_block_mode_with_exceeded_budget_returns_budget_error
     assert body["error"]["category"] == "budget"
     assert body["error"]["code"] == "budget_daily_limit_exceeded"
     generate_pinyin.assert_not_called()
+
+
+def test_process_text_route_serializes_valid_envelope_at_length_limit(settings_env) -> None:
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
+    source_text = "\n".join(["我们一起读书吧"] * 625)[:5000]
+
+    response = client.post("/v1/process-text", json={"source_text": source_text})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    envelope = ProcessResponse.model_validate(response.json())
+    assert envelope.status == "success"
+    assert envelope.data is not None and envelope.data.pinyin is not None
+    assert len(envelope.data.pinyin.segments) == 625
+    assert "warnings" not in response.json()
+
+
+def test_process_text_route_keeps_passthrough_lines_in_source_order(settings_env) -> None:
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
+
+    response = client.post(
+        "/v1/process-text",
+        json={"source_text": "Chapter 1\n你好\nPage 2\n再见"},
+    )
+
+    segments = response.json()["data"]["pinyin"]["segments"]
+    assert [(s["source_text"], s["line_id"]) for s in segments] == [
+        ("Chapter 1", 0),
+        ("你好", 1),
+        ("Page 2", 2),
+        ("再见", 3),
+    ]
+    assert segments[0]["pinyin_text"] == "Chapter 1"
+
+
+def test_process_text_route_returns_columnar_format_when_requested(settings_env) -> None:
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
+
+    response = client.post(
+        "/v1/process-text?format=columnar",
+        json={"source_text": "你好\n我们走吧"},
+    )
+
+    assert response.headers["content-type"] == "application/vnd.ocr-pinyin.columnar+json"
+    body = ColumnarProcessResponse.model_validate(response.json())
+    assert body.status == "success"
+    assert body.data is not None and body.data.pinyin is not None
+    assert body.data.pinyin.source_text == ["你好", "我们走吧"]
+
+
+def test_process_text_route_returns_msgpack_when_accepted(settings_env) -> None:
+    msgpack = pytest.importorskip("msgpack")
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
+
+    response = client.post(
+        "/v1/process-text",
+        json={"source_text": "你好"},
+        headers={"accept": "application/msgpack"},
+    )
+
+    assert response.headers["content-type"] == "application/msgpack"
+    body = msgpack.unpackb(response.content)
+    assert body["format"] == "columnar"
+    assert body["data"]["pinyin"]["pinyin_text"] == ["nǐ hǎo"]
+
+
+def test_process_text_route_reports_stage_spans_in_server_timing_header(settings_env) -> None:
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
+
+    response = client.post("/v1/process-text", json={"source_text": "你好"})
+
+    header_metrics = [
+        metric.split(";")[0] for metric in response.headers["server-timing"].split(", ")
+    ]
+    assert header_metrics == [
+        "body_read",
+        "budget_check",
+        "validation",
+        "pinyin",
+        "translation",
+        "reading",
+        "serialize",
+        "total",
+    ]
+    spans = response.json()["diagnostics"]["timing"]["spans"]
+    # Serialization finishes after the body is built, so it is only in the header.
+    assert [span["name"] for span in spans] == header_metrics[:-2]
+
+
+def test_process_text_route_returns_server_busy_when_no_text_slot_frees_up(settings_env) -> None:
+    settings_env.setenv("SCHEDULER_TEXT_MAX_CONCURRENT", "1")
+    settings_env.setenv("REQUEST_DEADLINE_SECONDS", "0.05")
+    scheduler = get_scheduler(get_settings())
+    asyncio.run(scheduler.acquire("text"))
+
+    response = client.post("/v1/process-text", json={"source_text": "你好"})
+
+    body = response.json()
+    assert body["status"] == "error"
+    assert body["error"]["code"] == "server_busy"
+    assert scheduler.snapshot()["text"].rejected_total == 1
+
+
+def test_process_text_route_rate_limits_each_client_with_retry_after(settings_env) -> None:
+    settings_env.setenv("CLIENT_RATE_LIMIT_PER_MINUTE", "6")
+    settings_env.setenv("CLIENT_RATE_LIMIT_BURST", "1")
+    settings_env.setenv("CLIENT_API_KEYS", "partner")
+
+    first = client.post("/v1/process-text", json={"source_text": "你好"})
+    limited = client.post("/v1/process-text", json={"source_text": "你好"})
+    unknown_key = client.post(
+        "/v1/process-text", json={"source_text": "你好"}, headers={"X-API-Key": "made-up"}
+    )
+    other_client = client.post(
+        "/v1/process-text", json={"source_text": "你好"}, headers={"X-API-Key": "partner"}
+    )
+
+    assert first.status_code == 200
+    assert limited.status_code == 429
+    assert limited.headers["Retry-After"] == "10"
+    body = limited.json()
+    assert body["status"] == "error"
+    assert body["error"]["code"] == "client_rate_limited"
+    assert body["error"]["retry_after_seconds"] == 10
+    assert unknown_key.status_code == 429
+    assert other_client.status_code == 200
+
+
+def _document_events(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_process_text_document_streams_chunks_in_document_order(settings_env) -> None:
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("TEXT_DOCUMENT_CHUNK_CHARS", "9")
+    settings_env.setenv("TEXT_DOCUMENT_CONCURRENCY", "2")
+    lines = ["第一行", "第二行", "Chapter 3", "第四行", "第五行"]
+    translator = StubTranslationProvider({line: f"line {line}" for line in lines})
+
+    with patch(
+        "app.services.translation_service.get_translation_provider",
+        return_value=translator,
+    ):
+        response = client.post(
+            "/v1/process-text/document",
+            content="\r\n".join(lines).encode(),
+            headers={"Content-Type": "text/plain; charset=utf-8"},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    *chunks, end = _document_events(response)
+    assert [chunk["index"] for chunk in chunks] == [0, 1, 2]
+    segments = [segment for chunk in chunks for segment in chunk["data"]["pinyin"]["segments"]]
+    assert [segment["line_id"] for segment in segments] == [0, 1, 2, 3, 4]
+    assert segments[0]["pinyin_text"] == "dì yī xíng"
+    assert segments[0]["translation_text"] == "line 第一行"
+    # Lines without Chinese pass through untranslated, as for a pasted text.
+    assert segments[2]["source_text"] == "Chapter 3"
+    assert "translation_text" not in segments[2]
+    assert end["event"] == "end"
+    assert end["status"] == "success"
+    assert (end["chunk_count"], end["line_count"]) == (3, 5)
+    assert end["diagnostics"]["cost_estimate"]["confidence"] == "full"
+    # One translation call per chunk with Chinese text, not one per line.
+    assert sorted(translator.batches) == [["第一行", "第二行"], ["第四行", "第五行"]]
+    # Costs are recorded per chunk; the chunk without Chinese text costs nothing.
+    today = budget_service.datetime.date.today().isoformat()
+    assert budget_service.daily_cost_store.snapshot()[today]["request_count"] == 2
+
+
+def test_process_text_document_reports_pinyin_failures_per_chunk(monkeypatch) -> None:
+    async def failing_generate_pinyin(segments):
+        raise PinyinServiceError(
+            code="pinyin_provider_unavailable", message="Pinyin is unavailable."
+        )
+
+    monkeypatch.setattr("app.api.v1.process_text.generate_pinyin", failing_generate_pinyin)
+
+    response = client.post("/v1/process-text/document", content="你好".encode())
+
+    chunk, end = _document_events(response)
+    assert chunk["warnings"][0]["code"] == "pinyin_provider_unavailable"
+    assert end["status"] == "partial"
+    assert end["warnings"][0]["code"] == "pinyin_provider_unavailable"
+
+
+def test_process_text_document_ends_with_an_error_when_a_chunk_fails(
+    monkeypatch, settings_env
+) -> None:
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
+    settings_env.setenv("TEXT_DOCUMENT_CHUNK_CHARS", "3")
+    settings_env.setenv("TEXT_DOCUMENT_CONCURRENCY", "3")
+    cancelled: list[str] = []
+
+    async def generate_pinyin(segments):
+        text = segments[0].text
+        if text == "第二行":
+            raise RuntimeError("boom")
+        if text == "第三行":
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(text)
+                raise
+        return await real_generate_pinyin(segments)
+
+    monkeypatch.setattr("app.api.v1.process_text.generate_pinyin", generate_pinyin)
+
+    response = client.post("/v1/process-text/document", content="第一行\n第二行\n第三行".encode())
+
+    chunk, end = _document_events(response)
+    assert chunk["index"] == 0
+    assert end["event"] == "end"
+    assert end["status"] == "error"
+    assert end["error"]["code"] == "document_processing_failed"
+    # The chunk still in flight was cancelled and awaited before the end line.
+    assert cancelled == ["第三行"]
+
+
+@pytest.mark.parametrize(
+    ("body", "expected_code"),
+    [
+        (b"   \n ", "text_empty"),
+        (b"hello world", "text_no_chinese_text"),
+        ("你好".encode("gb18030"), "text_invalid_encoding"),
+        # Ends partway through a character.
+        ("你好\n".encode() + "好".encode()[:2], "text_invalid_encoding"),
+        ("你好".encode() * 10, "text_too_long"),
+    ],
+)
+def test_process_text_document_rejects_invalid_bodies_before_streaming(
+    settings_env, body: bytes, expected_code: str
+) -> None:
+    settings_env.setenv("TEXT_DOCUMENT_MAX_BYTES", "32")
+
+    response = client.post("/v1/process-text/document", content=body)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["error"]["code"] == expected_code
+
+
+def test_stalled_document_stream_does_not_block_process_text(settings_env) -> None:
+    # One text slot, and a short deadline so a blocked request would get server_busy.
+    settings_env.setenv("SCHEDULER_MAX_CONCURRENT", "1")
+    settings_env.setenv("SCHEDULER_TEXT_MAX_CONCURRENT", "1")
+    settings_env.setenv("REQUEST_DEADLINE_SECONDS", "0.5")
+    settings_env.setenv("TEXT_DOCUMENT_CHUNK_CHARS", "2")
+    settings_env.setenv("TEXT_DOCUMENT_CONCURRENCY", "1")
+
+    async def run() -> tuple[bytes, ProcessResponse]:
+        stream = await process_text_document(
+            _request_with_body("你好\n再见\n谢谢".encode(), "text/plain")
+        )
+        body = stream.body_iterator
+        first_chunk = await anext(body)
+        # The document's client stops reading here; a pasted text still gets through.
+        try:
+            text_response = await process_text(
+                TextProcessRequest(source_text="你好"),
+                _request_with_body(b"", "application/json"),
+            )
+        finally:
+            await body.aclose()
+        return first_chunk, text_response
+
+    first_chunk, text_response = asyncio.run(run())
+
+    assert json.loads(first_chunk)["index"] == 0
+    assert text_response.status == "success"
+    assert get_scheduler(get_settings()).snapshot()["text"].in_flight == 0
@@ -130,3 +130,24 @@ def test_documents_to_segments_handles_missing_line_id() -> None:
     segments = _documents_to_segments(docs)
 
     assert segments[0].line_id is None
+
+
+def test_gcv_segments_carry_paragraph_bounding_box() -> None:
+    paragraph = _make_paragraph("出口")
+    paragraph.bounding_box = SimpleNamespace(
+        vertices=[
+            SimpleNamespace(x=10, y=22),
+            SimpleNamespace(x=60, y=20),
+            SimpleNamespace(x=61, y=40),
+            SimpleNamespace(x=11, y=42),
+        ]
+    )
+
+    response = _make_response(_make_block(paragraph))
+
+    segments = _documents_to_segments(_gcv_response_to_documents(response))
+
+    assert segments[0].bbox == (10, 20, 61, 42)
+    assert _documents_to_segments(
+        _gcv_response_to_documents(_make_response(_make_block(_make_paragraph("出口"))))
+    )[0].bbox is None
@@ -2,6 +2,7 @@ import json
 from unittest.mock import Mock
 
 import pytest
+from helpers import SettingsEnv
 
 from app.adapters.google_cloud_translate_provider import GoogleCloudTranslateProvider
 from app.adapters.translation_provider import TranslationProviderUnavailableError
@@ -101,3 +102,49 @@ def test_translate_raises_execution_error_when_api_returns_none(
     provider = GoogleCloudTranslateProvider()
     with pytest.raises(TranslationExecutionError):
         provider.translate(text="你好", target_language="en")
+
+
+def test_translate_fails_without_calling_the_api_when_quota_wait_is_too_long(
+    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
+) -> None:
+    client = Mock()
+    client.translate.return_value = {"translatedText": "hello"}
+    translate_module = type("TranslateModule", (), {"Client": Mock(return_value=client)})
+    monkeypatch.setattr("google.cloud.translate_v2", translate_module, raising=False)
+    monkeypatch.delenv("GOOGLE_APPLICATION_CREDENTIALS_JSON", raising=False)
+    monkeypatch.delenv("GOOGLE_TRANSLATE_EMULATOR_HOST", raising=False)
+    settings_env.setenv("TRANSLATE_QUOTA_CHARS_PER_MINUTE", "60")
+    settings_env.setenv("QUOTA_MAX_WAIT_MS", "100")
+
+    from app.adapters.translation_provider import TranslationExecutionError
+
+    provider = GoogleCloudTranslateProvider()
+    assert provider.translate(text="你" * 60, target_language="en") == "hello"
+    with pytest.raises(TranslationExecutionError, match="quota") as exc_info:
+        provider.translate(text="你好", target_language="en")
+
+    assert exc_info.value.retryable is False
+    client.translate.assert_called_once()
+
+
+def test_translate_batch_sends_lists_of_at_most_128_texts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = Mock()
+    client.translate.side_effect = lambda texts, **_: [
+        {"translatedText": f" {text}-en "} for text in texts
+    ]
+    translate_module = type("TranslateModule", (), {"Client": Mock(return_value=client)})
+    monkeypatch.setattr("google.cloud.translate_v2", translate_module, raising=False)
+    monkeypatch.delenv("GOOGLE_APPLICATION_CREDENTIALS_JSON", raising=False)
+    monkeypatch.delenv("GOOGLE_TRANSLATE_EMULATOR_HOST", raising=False)
+    texts = [f"第{index}行" for index in range(130)]
+
+    translations = GoogleCloudTranslateProvider().translate_batch(
+        texts=texts, target_language="en"
+    )
+
+    assert translations == [f"{text}-en" for text in texts]
+    assert [len(call.args[0]) for call in client.translate.call_args_list] == [128, 2]
+    assert client.translate.call_args.kwargs == {"target_language": "en", "format_": "text"}
@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+from helpers import fake_local_ocr_engine
+
+from app.adapters.local_ocr_provider import LocalOcrProvider, _result_to_segments
+from app.adapters.ocr_provider import OcrExecutionError, RawOcrSegment
+from app.core.settings import LocalOcrSettings
+
+
+def test_result_to_segments_numbers_lines_and_boxes() -> None:
+    result = [
+        [[[10.2, 5], [90.6, 6], [90, 25.4], [10, 24]], "出口", 0.91],
+        [[[0, 40], [50, 40], [50, 60], [0, 60]], "  ", 0.99],
+        [[[12, 70], [80, 70], [80, 90], [12, 90]], "EXIT", 0.88],
+    ]
+
+    segments = _result_to_segments(result)
+
+    assert segments == [
+        RawOcrSegment(
+            text="出口", language="zh", confidence=0.91, line_id=0, bbox=(10, 5, 91, 25)
+        ),
+        RawOcrSegment(
+            text="EXIT", language=None, confidence=0.88, line_id=1, bbox=(12, 70, 80, 90)
+        ),
+    ]
+
+
+def test_result_to_segments_handles_no_text() -> None:
+    assert _result_to_segments(None) == []
+
+
+@pytest.fixture(scope="module")
+def provider():
+    provider = LocalOcrProvider(
+        LocalOcrSettings(workers=1, queue_size=0, timeout_s=60),
+        engine_factory=fake_local_ocr_engine,
+    )
+    yield provider
+    provider.shutdown()
+
+
+def test_extract_runs_engine_in_worker_process(provider: LocalOcrProvider) -> None:
+    segments = provider.extract(image_bytes=b"image", content_type="image/png")
+
+    assert segments == [
+        RawOcrSegment(text="你好", language="zh", confidence=0.93, line_id=0, bbox=(10, 5, 90, 25))
+    ]
+
+
+def test_extract_fails_fast_when_queue_is_full(provider: LocalOcrProvider) -> None:
+    worker = threading.Thread(
+        target=provider.extract, kwargs={"image_bytes": b"slow", "content_type": "image/png"}
+    )
+    worker.start()
+    time.sleep(0.2)
+    try:
+        with pytest.raises(OcrExecutionError, match="queue is full"):
+            provider.extract(image_bytes=b"image", content_type="image/png")
+    finally:
+        worker.join()
+
+    assert provider.extract(image_bytes=b"image", content_type="image/png")
@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+from app.adapters import quota
+from app.adapters.quota import ProviderQuota, QuotaExceededError, deadline_scope
+from app.core.metrics import metrics_store
+from app.core.settings import QuotaSettings, Settings
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _quota(clock: FakeClock, **limits: float) -> ProviderQuota:
+    return ProviderQuota(**limits, clock=clock, sleep=clock.sleep)
+
+
+def test_requests_within_the_burst_do_not_wait() -> None:
+    clock = FakeClock()
+    limiter = _quota(clock, requests_per_second=2.0)
+
+    assert limiter.acquire(max_wait_s=1.0) == 0.0
+    assert limiter.acquire(max_wait_s=1.0) == 0.0
+    assert clock.sleeps == []
+
+
+def test_waiting_callers_queue_for_their_tokens() -> None:
+    clock = FakeClock()
+    limiter = _quota(clock, requests_per_second=2.0)
+    limiter.acquire(max_wait_s=1.0)
+    limiter.acquire(max_wait_s=1.0)
+
+    assert limiter.acquire(max_wait_s=1.0) == pytest.approx(0.5)
+    assert limiter.acquire(max_wait_s=1.0) == pytest.approx(0.5)
+    assert clock.sleeps == [pytest.approx(0.5), pytest.approx(0.5)]
+
+
+def test_a_wait_past_the_limit_is_rejected_without_taking_tokens() -> None:
+    clock = FakeClock()
+    limiter = _quota(clock, requests_per_second=1.0)
+    limiter.acquire(max_wait_s=1.0)
+
+    with pytest.raises(QuotaExceededError):
+        limiter.acquire(max_wait_s=0.5)
+
+    clock.now += 1.0
+    assert limiter.acquire(max_wait_s=0.0) == 0.0
+
+
+def test_character_quota_waits_for_long_texts() -> None:
+    clock = FakeClock()
+    limiter = _quota(clock, chars_per_minute=600.0)
+
+    assert limiter.acquire(chars=600, max_wait_s=0.0) == 0.0
+    # 10 characters accrue per second.
+    assert limiter.acquire(chars=20, max_wait_s=5.0) == pytest.approx(2.0)
+    # A text longer than a minute's quota waits for a full bucket rather than forever.
+    clock.now += 60.0
+    assert limiter.acquire(chars=5000, max_wait_s=0.0) == 0.0
+
+
+def test_acquire_is_bounded_by_the_deadline_and_counts_timeouts() -> None:
+    settings = Settings(quotas=QuotaSettings(gcv_requests_per_second=0.5, max_wait_ms=10_000))
+    timeouts = metrics_store.quota_timeouts_total
+    quota.acquire("google_vision", settings=settings)
+
+    with deadline_scope(time.monotonic() + 0.1), pytest.raises(QuotaExceededError):
+        quota.acquire("google_vision", settings=settings)
+
+    assert metrics_store.quota_timeouts_total == timeouts + 1
+
+
+def test_acquire_records_the_time_waited() -> None:
+    settings = Settings(quotas=QuotaSettings(gcv_requests_per_second=20.0))
+    waits = metrics_store.quota_waits_total
+    for _ in range(21):
+        quota.acquire("google_vision", settings=settings)
+
+    assert metrics_store.quota_waits_total == waits + 1
+    assert metrics_store.quota_wait_ms_total > 0
+
+
+def test_quotas_are_off_by_default() -> None:
+    settings = Settings()
+    for _ in range(100):
+        quota.acquire("google_translate", chars=10_000, settings=settings)
+
+    assert quota.get_quota("google_translate", settings) is quota.get_quota(
+        "google_translate", settings
+    )
@@ -0,0 +1,123 @@
+import json
+import random
+
+import pytest
+from helpers import SettingsEnv
+
+from app.adapters.ocr_provider import (
+    OcrExecutionError,
+    ProviderUnavailableError,
+    get_ocr_provider,
+)
+from app.adapters.simulated_ocr_provider import SimulatedOcrProvider
+from app.adapters.simulated_translate_provider import SimulatedTranslateProvider
+from app.adapters.simulation import (
+    CallSimulator,
+    FixedLatency,
+    HistogramLatency,
+    LognormalLatency,
+    parse_latency_model,
+)
+from app.adapters.translation_provider import TranslationExecutionError, get_translation_provider
+from app.core.settings import Settings, SimulationSettings
+
+
+def test_parse_latency_model_supports_each_spec() -> None:
+    assert parse_latency_model("fixed:120") == FixedLatency(120.0)
+    assert parse_latency_model("LogNormal:250,0.5") == LognormalLatency(250.0, 0.5)
+    assert isinstance(
+        parse_latency_model("histogram:example_latency_histogram.json"), HistogramLatency
+    )
+
+
+@pytest.mark.parametrize(
+    "spec", ["fixed:-1", "lognormal:0,1", "lognormal:100", "gamma:1", "histogram:missing.json"]
+)
+def test_parse_latency_model_rejects_invalid_specs(spec: str) -> None:
+    with pytest.raises(ValueError):
+        parse_latency_model(spec)
+
+
+def test_histogram_latency_samples_stay_within_recorded_buckets(tmp_path) -> None:
+    path = tmp_path / "histogram.json"
+    path.write_text(
+        json.dumps({"buckets": [{"le_ms": 200, "count": 0}, {"le_ms": 100, "count": 5}]})
+    )
+    model = HistogramLatency.from_file(path)
+    rng = random.Random(0)
+
+    samples = [model.sample_s(rng) for _ in range(200)]
+
+    assert all(0.0 <= sample <= 0.1 for sample in samples)
+
+
+def test_call_simulator_draws_are_reproducible_with_seed() -> None:
+    config = SimulationSettings(latency="lognormal:200,0.8", error_rate=0.2, timeout_rate=0.1)
+
+    simulator_a = CallSimulator(config, seed=3)
+    simulator_b = CallSimulator(config, seed=3)
+
+    assert [simulator_a.draw() for _ in range(50)] == [simulator_b.draw() for _ in range(50)]
+
+
+def test_call_simulator_timeouts_take_configured_duration() -> None:
+    simulator = CallSimulator(SimulationSettings(timeout_rate=1.0, timeout_s=6.0), seed=1)
+
+    assert simulator.draw() == ("timeout", 6.0)
+
+
+def test_simulated_ocr_replays_same_recording_for_same_image() -> None:
+    provider = SimulatedOcrProvider(Settings())
+
+    first = provider.extract(image_bytes=b"image-a", content_type="image/png")
+    second = provider.extract(image_bytes=b"image-a", content_type="image/png")
+
+    assert first == second
+    assert first
+    assert all(segment.line_id is not None for segment in first)
+
+
+def test_simulated_ocr_raises_execution_error_on_injected_failure() -> None:
+    provider = SimulatedOcrProvider(Settings(simulated_ocr=SimulationSettings(error_rate=1.0)))
+
+    with pytest.raises(OcrExecutionError, match="simulated"):
+        provider.extract(image_bytes=b"image", content_type="image/png")
+
+
+def test_simulated_ocr_without_recordings_is_unavailable(tmp_path) -> None:
+    with pytest.raises(ProviderUnavailableError):
+        SimulatedOcrProvider(Settings(simulation_fixtures_dir=str(tmp_path)))
+
+
+def test_simulated_translate_replays_recordings_and_falls_back(tmp_path) -> None:
+    (tmp_path / "translate.json").write_text(
+        json.dumps([{"input": "你好", "translatedText": "Hello"}]), encoding="utf-8"
+    )
+    provider = SimulatedTranslateProvider(Settings(simulation_fixtures_dir=str(tmp_path)))
+
+    assert provider.translate(text="你好", target_language="en") == "Hello"
+    assert provider.translate(text="再见", target_language="en") == "[en] 再见"
+    assert provider.translate_batch(texts=["你好", "再见"], target_language="en") == [
+        "Hello",
+        "[en] 再见",
+    ]
+
+
+def test_simulated_translate_raises_execution_error_on_injected_failure() -> None:
+    provider = SimulatedTranslateProvider(
+        Settings(simulated_translation=SimulationSettings(error_rate=1.0))
+    )
+
+    with pytest.raises(TranslationExecutionError):
+        provider.translate(text="你好", target_language="en")
+
+
+def test_factories_select_simulated_providers(settings_env: SettingsEnv) -> None:
+    settings_env.setenv("OCR_PROVIDER", "simulated")
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("TRANSLATION_PROVIDER", "simulated")
+
+    assert isinstance(get_ocr_provider(), SimulatedOcrProvider)
+    assert isinstance(get_translation_provider(), SimulatedTranslateProvider)
+    # One shared instance per settings snapshot, so seeded draws continue across requests.
+    assert get_ocr_provider() is get_ocr_provider()
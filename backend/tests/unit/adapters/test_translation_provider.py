@@ -1,4 +1,4 @@
-import pytest
+from helpers import SettingsEnv
 
 from app.adapters.translation_provider import (
     NoOpTranslationProvider,
@@ -7,9 +7,9 @@ from app.adapters.translation_provider import (
 
 
 def test_get_translation_provider_returns_noop_when_translation_disabled(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("TRANSLATION_ENABLED", "false")
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
 
     provider = get_translation_provider()
 
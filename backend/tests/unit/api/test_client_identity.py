@@ -0,0 +1,41 @@
+from starlette.requests import Request
+
+from app.api.client_identity import client_key
+from app.core.settings import Settings
+
+
+def _request(headers: dict[str, str]) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/v1/process",
+            "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+            "client": ("10.0.0.1", 1234),
+        }
+    )
+
+
+def test_known_api_key_is_hashed_and_preferred_over_the_address() -> None:
+    settings = Settings.from_env({"CLIENT_API_KEYS": "secret, other"})
+
+    key = client_key(_request({"X-API-Key": "secret"}), settings)
+
+    assert key.startswith("key:")
+    assert "secret" not in key
+
+
+def test_unknown_api_keys_fall_back_to_the_address() -> None:
+    # A client rotating made-up keys must not get a fresh bucket per key.
+    settings = Settings.from_env({"CLIENT_API_KEYS": "secret"})
+
+    assert client_key(_request({"X-API-Key": "made-up"}), settings) == "ip:10.0.0.1"
+    assert client_key(_request({"X-API-Key": "secret"}), Settings()) == "ip:10.0.0.1"
+
+
+def test_forwarded_for_is_only_used_when_trusted() -> None:
+    request = _request({"X-Forwarded-For": "203.0.113.7, 10.0.0.1"})
+    trusted = Settings.from_env({"CLIENT_LIMIT_TRUST_FORWARDED_FOR": "true"})
+
+    assert client_key(request, Settings()) == "ip:10.0.0.1"
+    assert client_key(request, trusted) == "ip:203.0.113.7"
@@ -0,0 +1,137 @@
+from starlette.requests import Request
+
+from app.api.response_format import negotiate_format, render_model, to_columnar
+from app.core.timing import RequestTimer
+from app.schemas.columnar import ColumnarProcessResponse
+from app.schemas.diagnostics import DiagnosticsPayload, TimingInfo, TraceInfo, UploadContext
+from app.schemas.process import (
+    OcrData,
+    OcrSegment,
+    PinyinData,
+    PinyinSegment,
+    ProcessData,
+    ProcessError,
+    ProcessResponse,
+    ReadingData,
+    ReadingGroup,
+    ReadingProviderInfo,
+)
+
+
+def _request(query: bytes = b"", accept: bytes | None = None) -> Request:
+    headers = [(b"accept", accept)] if accept is not None else []
+    return Request({"type": "http", "query_string": query, "headers": headers})
+
+
+def _segment(text: str, line_id: int, translation: str | None) -> PinyinSegment:
+    return PinyinSegment(
+        source_text=text,
+        pinyin_text="placeholder",
+        alignment_status="aligned",
+        line_id=line_id,
+        translation_text=translation,
+    )
+
+
+def _success_response() -> ProcessResponse:
+    return ProcessResponse(
+        status="success",
+        request_id="req-1",
+        data=ProcessData(
+            ocr=OcrData(segments=[OcrSegment(text="老师", language="zh", confidence=0.9)]),
+            pinyin=PinyinData(
+                segments=[
+                    _segment("老", 0, "teacher"),
+                    _segment("师", 0, "teacher"),
+                    _segment("好", 1, None),
+                ]
+            ),
+            reading=ReadingData(
+                mode="derived",
+                provider=ReadingProviderInfo(
+                    kind="heuristic", name="built_in_rules", version="v2", applied=True
+                ),
+                groups=[
+                    ReadingGroup(
+                        group_id="rg_0",
+                        line_id=0,
+                        raw_text="老师",
+                        display_text="老师。",
+                        playback_text="老师。",
+                        segment_indexes=[0, 1],
+                    )
+                ],
+            ),
+        ),
+        diagnostics=DiagnosticsPayload(
+            upload_context=UploadContext(content_type="text/plain", file_size_bytes=6),
+            timing=TimingInfo(total_ms=1.0, ocr_ms=0.0, pinyin_ms=1.0),
+            trace=TraceInfo(steps=[]),
+        ),
+    )
+
+
+def test_negotiate_format_defaults_to_json() -> None:
+    assert negotiate_format(None) == "json"
+    assert negotiate_format(_request()) == "json"
+    assert negotiate_format(_request(accept=b"application/json")) == "json"
+
+
+def test_negotiate_format_prefers_query_parameter_over_accept() -> None:
+    request = _request(query=b"format=columnar", accept=b"application/msgpack")
+
+    assert negotiate_format(request) == "columnar"
+
+
+def test_negotiate_format_reads_accept_header() -> None:
+    assert negotiate_format(_request(accept=b"application/msgpack")) == "msgpack"
+    assert (
+        negotiate_format(_request(accept=b"application/vnd.ocr-pinyin.columnar+json"))
+        == "columnar"
+    )
+
+
+def test_to_columnar_splits_segments_into_aligned_arrays() -> None:
+    columnar = to_columnar(_success_response())
+    payload = columnar.model_dump(mode="json", exclude_none=True)
+
+    pinyin = payload["data"]["pinyin"]
+    assert pinyin["source_text"] == ["老", "师", "好"]
+    assert pinyin["line_id"] == [0, 0, 1]
+    assert pinyin["translations"] == {"0": "teacher"}
+    groups = payload["data"]["reading"]["groups"]
+    assert groups["segment_indexes"] == [[0, 1]]
+    assert groups["playback_text"] == [None]
+    assert "raw_text" not in groups
+    assert payload["data"]["ocr"]["text"] == ["老师"]
+    ColumnarProcessResponse.model_validate(payload)
+
+
+def test_to_columnar_keeps_error_envelope_shape() -> None:
+    response = ProcessResponse(
+        status="error",
+        request_id="req-2",
+        error=ProcessError(category="validation", code="text_empty", message="Empty."),
+    )
+
+    payload = to_columnar(response).model_dump(mode="json", exclude_none=True)
+
+    assert payload == {
+        "format": "columnar",
+        "status": "error",
+        "request_id": "req-2",
+        "error": {"category": "validation", "code": "text_empty", "message": "Empty."},
+    }
+
+
+def test_render_model_records_serialize_span_only_on_an_installed_timer() -> None:
+    bare = _request(b"format=columnar")
+    timed = _request(b"format=columnar")
+    timed.state.timer = RequestTimer()
+
+    bare_body = render_model(_success_response(), request=bare, exclude_none=True).body
+    timed_body = render_model(_success_response(), request=timed, exclude_none=True).body
+
+    assert bare_body == timed_body
+    assert getattr(bare.state, "timer", None) is None
+    assert [span.name for span in timed.state.timer.spans] == ["serialize"]
@@ -0,0 +1,19 @@
+from fastapi.routing import APIRoute
+
+from app.api.v1.process import process_image
+from app.api.v1.process_text import process_text
+from app.main import app
+
+
+def _endpoint(path: str):
+    return next(
+        route.endpoint
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.path == path
+    )
+
+
+def test_trusted_model_endpoints_are_wrapped_once_through_nested_routers() -> None:
+    # Each include_router() level rebuilds the route from the already wrapped endpoint.
+    assert _endpoint("/v1/process").__wrapped__ is process_image
+    assert _endpoint("/v1/process-text").__wrapped__ is process_text
@@ -0,0 +1,26 @@
+from benchmarks.loadtest import LoadResult, percentile, summarize
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile(values, 1.0) == 100.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_summarize_counts_partial_as_success_and_reports_errors() -> None:
+    result = LoadResult(elapsed_s=2.0)
+    result.record(0.100, "success")
+    result.record(0.200, "partial")
+    result.record(0.300, "error")
+    result.record(0.400, "ReadTimeout")
+
+    summary = summarize(result)
+
+    assert summary["requests"] == 4
+    assert summary["throughput_rps"] == 2.0
+    assert summary["error_rate"] == 0.5
+    assert summary["latency_ms"]["p50"] == 200.0
+    assert summary["outcomes"] == {"success": 1, "partial": 1, "error": 1, "ReadTimeout": 1}
@@ -0,0 +1,47 @@
+"""The real Google adapters against the local stub servers (no network access)."""
+
+import pytest
+
+from app.adapters.google_cloud_translate_provider import GoogleCloudTranslateProvider
+from app.adapters.google_cloud_vision_ocr_provider import GoogleCloudVisionOcrProvider
+from app.adapters.translation_provider import TranslationExecutionError
+from app.core.settings import SimulationSettings
+from benchmarks.stub_servers import start_translate_stub, start_vision_stub
+
+
+def test_vision_adapter_replays_recording_over_grpc(monkeypatch: pytest.MonkeyPatch) -> None:
+    server, port = start_vision_stub(SimulationSettings(), seed=1)
+    try:
+        monkeypatch.setenv("GCV_EMULATOR_HOST", f"127.0.0.1:{port}")
+        provider = GoogleCloudVisionOcrProvider()
+
+        first = provider.extract(image_bytes=b"same-image", content_type="image/png")
+        second = provider.extract(image_bytes=b"same-image", content_type="image/png")
+    finally:
+        server.stop(grace=None)
+
+    assert first == second
+    assert first and all(segment.line_id is not None for segment in first)
+
+
+def test_translate_adapter_uses_stub_over_http(monkeypatch: pytest.MonkeyPatch) -> None:
+    server, port = start_translate_stub(SimulationSettings())
+    try:
+        monkeypatch.setenv("GOOGLE_TRANSLATE_EMULATOR_HOST", f"127.0.0.1:{port}")
+        provider = GoogleCloudTranslateProvider()
+
+        assert provider.translate(text="宫保鸡丁", target_language="en") == "Kung Pao chicken"
+    finally:
+        server.shutdown()
+
+
+def test_translate_adapter_surfaces_stub_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    server, port = start_translate_stub(SimulationSettings(error_rate=1.0))
+    try:
+        monkeypatch.setenv("GOOGLE_TRANSLATE_EMULATOR_HOST", f"127.0.0.1:{port}")
+        provider = GoogleCloudTranslateProvider()
+
+        with pytest.raises(TranslationExecutionError):
+            provider.translate(text="宫保鸡丁", target_language="en")
+    finally:
+        server.shutdown()
@@ -0,0 +1,33 @@
+from benchmarks.suite import BenchCase, compare_results, measure
+
+
+def test_compare_results_flags_only_cases_beyond_threshold() -> None:
+    baseline = {
+        "fast": {"median_s": 0.010},
+        "steady": {"median_s": 0.010},
+        "faster": {"median_s": 0.010},
+    }
+    current = {
+        "fast": {"median_s": 0.014},
+        "steady": {"median_s": 0.012},
+        "faster": {"median_s": 0.005},
+        "new_case": {"median_s": 1.0},
+    }
+
+    regressions = compare_results(current, baseline, threshold=0.25)
+
+    assert [name for name, _ in regressions] == ["fast"]
+    assert round(regressions[0][1], 6) == 1.4
+
+
+def test_measure_reports_throughput_when_work_is_known() -> None:
+    entry = measure(
+        BenchCase(name="noop", run=lambda: None, work=100, work_unit="chars"),
+        repeat=3,
+        min_sample_s=0.001,
+    )
+
+    assert entry["samples"] == 3
+    assert entry["min_s"] <= entry["median_s"] <= entry["max_s"]
+    assert entry["throughput_unit"] == "chars/s"
+    assert entry["throughput"] > 0
@@ -0,0 +1,92 @@
+from app.core.circuit_breaker import (
+    CircuitBreaker,
+    breaker_snapshots,
+    get_breaker,
+    reset_breakers,
+)
+from app.core.settings import CircuitBreakerSettings, Settings
+
+CONFIG = CircuitBreakerSettings(failure_rate=0.5, window=4, min_calls=4, open_seconds=30.0)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker(CONFIG, slow_call_ms=100.0, clock=clock)
+
+
+def _trip(breaker: CircuitBreaker) -> None:
+    for _ in range(CONFIG.min_calls):
+        breaker.record(ok=False, latency_ms=5.0)
+
+
+def test_breaker_opens_once_the_failure_rate_is_reached() -> None:
+    breaker = _breaker(FakeClock())
+    breaker.record(ok=True, latency_ms=5.0)
+    breaker.record(ok=False, latency_ms=5.0)
+    breaker.record(ok=True, latency_ms=5.0)
+
+    assert breaker.state == "closed"
+
+    breaker.record(ok=False, latency_ms=5.0)
+
+    assert breaker.state == "open"
+    assert breaker.allow() is False
+    assert breaker.snapshot().rejected_total == 1
+
+
+def test_slow_calls_count_as_failures() -> None:
+    breaker = _breaker(FakeClock())
+    for _ in range(CONFIG.min_calls):
+        breaker.record(ok=True, latency_ms=250.0)
+
+    assert breaker.state == "open"
+
+
+def test_half_open_breaker_lets_one_probe_through_and_closes_on_success() -> None:
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    _trip(breaker)
+    clock.now += 30.0
+
+    assert breaker.state == "half_open"
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+
+    breaker.record(ok=True, latency_ms=5.0)
+
+    assert breaker.state == "closed"
+    assert breaker.allow() is True
+
+
+def test_failed_probe_reopens_the_breaker() -> None:
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    _trip(breaker)
+    clock.now += 30.0
+    assert breaker.allow() is True
+
+    breaker.record(ok=False, latency_ms=5.0)
+
+    assert breaker.state == "open"
+    assert breaker.snapshot().opened_total == 2
+    clock.now += 29.0
+    assert breaker.allow() is False
+
+
+def test_get_breaker_is_shared_and_disabled_by_setting() -> None:
+    reset_breakers()
+    settings = Settings.from_env({})
+
+    breaker = get_breaker("translation", "google", settings)
+
+    assert get_breaker("translation", "google", settings) is breaker
+    assert breaker.slow_call_ms == settings.circuit_breakers.translation_slow_ms
+    assert list(breaker_snapshots()) == ["translation:google"]
+    assert get_breaker("ocr", "", Settings.from_env({"CIRCUIT_BREAKER_ENABLED": "false"})) is None
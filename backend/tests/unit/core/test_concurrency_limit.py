@@ -0,0 +1,163 @@
+import asyncio
+import time
+
+import pytest
+
+from app.adapters.ocr_provider import OcrExecutionError
+from app.core.concurrency_limit import (
+    AdaptiveLimiter,
+    ConcurrencyLimitTimeoutError,
+    get_limiter,
+    limited,
+    limiter_snapshots,
+)
+from app.core.settings import ConcurrencyLimitSettings, Settings
+
+CONFIG = ConcurrencyLimitSettings(
+    initial_limit=4, min_limit=1, max_limit=6, latency_tolerance=2.0, backoff_ratio=0.5
+)
+
+
+def _finish(limiter: AdaptiveLimiter, latency_ms: float, *, dropped: bool = False) -> None:
+    asyncio.run(limiter.acquire())
+    limiter.release(started=time.monotonic(), latency_ms=latency_ms, dropped=dropped)
+
+
+def _saturate(limiter: AdaptiveLimiter, calls: int) -> None:
+    async def run() -> None:
+        for _ in range(calls):
+            await limiter.acquire()
+
+    asyncio.run(run())
+
+
+def test_limit_grows_while_latency_holds_steady_under_load() -> None:
+    limiter = AdaptiveLimiter(CONFIG)
+    _saturate(limiter, 3)
+    # About one more slot per limit's worth of calls.
+    for _ in range(5):
+        _finish(limiter, 100.0)
+    assert limiter.limit == 5
+
+    for _ in range(10):
+        _finish(limiter, 100.0)
+    # Capped at max_limit.
+    assert limiter.limit == 6
+
+
+def test_limit_does_not_grow_while_mostly_idle() -> None:
+    limiter = AdaptiveLimiter(CONFIG)
+    for _ in range(10):
+        _finish(limiter, 100.0)
+
+    assert limiter.limit == 4
+    assert limiter.snapshot().baseline_latency_ms == pytest.approx(100.0)
+
+
+def test_limit_backs_off_when_latency_climbs() -> None:
+    limiter = AdaptiveLimiter(CONFIG)
+    _finish(limiter, 100.0)
+    _finish(limiter, 250.0)
+
+    assert limiter.limit == 2
+    _finish(limiter, 100.0, dropped=True)
+    _finish(limiter, 100.0, dropped=True)
+    assert limiter.limit == 1
+    assert limiter.snapshot().decreases_total == 3
+
+
+def test_calls_started_before_a_decrease_do_not_decrease_again() -> None:
+    limiter = AdaptiveLimiter(CONFIG)
+    _finish(limiter, 100.0)
+    started = time.monotonic() - 1.0
+    for _ in range(3):
+        asyncio.run(limiter.acquire())
+    limiter.release(started=started, latency_ms=500.0, dropped=False)
+    limiter.release(started=started, latency_ms=500.0, dropped=False)
+
+    assert limiter.limit == 2
+    assert limiter.snapshot().decreases_total == 1
+
+
+def test_calls_over_the_limit_wait_for_a_slot() -> None:
+    limiter = AdaptiveLimiter(ConcurrencyLimitSettings(initial_limit=1, max_limit=1))
+    order: list[str] = []
+
+    async def call(name: str) -> None:
+        async with limited(limiter):
+            order.append(f"{name} start")
+            await asyncio.sleep(0.01)
+            order.append(f"{name} end")
+
+    async def run() -> None:
+        await asyncio.gather(call("a"), call("b"))
+
+    asyncio.run(run())
+
+    assert order == ["a start", "a end", "b start", "b end"]
+    assert limiter.snapshot().in_flight == 0
+
+
+def test_waiting_for_a_slot_times_out() -> None:
+    limiter = AdaptiveLimiter(ConcurrencyLimitSettings(initial_limit=1, max_limit=1))
+
+    async def run() -> None:
+        await limiter.acquire()
+        with pytest.raises(ConcurrencyLimitTimeoutError):
+            await limiter.acquire(timeout=0.01)
+
+    asyncio.run(run())
+
+    snapshot = limiter.snapshot()
+    assert snapshot.in_flight == 1
+    assert snapshot.queued == 0
+
+
+def test_only_transient_errors_count_as_overload() -> None:
+    limiter = AdaptiveLimiter(CONFIG)
+
+    async def fail(exc: Exception) -> None:
+        async with limited(limiter):
+            raise exc
+
+    with pytest.raises(OcrExecutionError):
+        asyncio.run(fail(OcrExecutionError("400 bad image")))
+    assert limiter.limit == 4
+
+    with pytest.raises(OcrExecutionError):
+        asyncio.run(fail(OcrExecutionError("503", retryable=True)))
+    assert limiter.limit == 2
+
+
+def test_get_limiter_is_shared_and_disabled_by_setting() -> None:
+    settings = Settings.from_env({})
+
+    limiter = get_limiter("ocr", "google_vision", settings)
+
+    assert get_limiter("ocr", "google_vision", settings) is limiter
+    assert limiter.limit == settings.concurrency_limits.initial_limit
+    assert list(limiter_snapshots()) == ["ocr:google_vision"]
+    disabled = Settings.from_env({"ADAPTIVE_CONCURRENCY_ENABLED": "false"})
+    assert get_limiter("translation", "google", disabled) is None
+
+
+def test_cancelled_calls_free_their_slot_without_lowering_the_limit() -> None:
+    limiter = AdaptiveLimiter(CONFIG)
+
+    async def run() -> None:
+        async def call() -> None:
+            async with limited(limiter):
+                await asyncio.sleep(10)
+
+        task = asyncio.ensure_future(call())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+
+    snapshot = limiter.snapshot()
+    assert snapshot.in_flight == 0
+    assert snapshot.limit == 4
+    assert snapshot.decreases_total == 0
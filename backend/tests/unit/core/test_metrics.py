@@ -9,6 +9,15 @@ def test_metrics_store_snapshot_starts_at_zero() -> None:
         "process_requests_success": 0,
         "process_requests_partial": 0,
         "process_requests_error": 0,
+        "process_requests_cancelled": 0,
+        "ocr_calls_total": 0,
+        "ocr_hedges_total": 0,
+        "ocr_hedge_wins_total": 0,
+        "ocr_hedge_rate": 0.0,
+        "ocr_hedge_win_rate": 0.0,
+        "quota_waits_total": 0,
+        "quota_wait_ms_total": 0.0,
+        "quota_timeouts_total": 0,
     }
 
 
@@ -24,4 +33,27 @@ def test_metrics_store_increment_tracks_outcomes() -> None:
         "process_requests_success": 1,
         "process_requests_partial": 1,
         "process_requests_error": 1,
+        "process_requests_cancelled": 0,
+        "ocr_calls_total": 0,
+        "ocr_hedges_total": 0,
+        "ocr_hedge_wins_total": 0,
+        "ocr_hedge_rate": 0.0,
+        "ocr_hedge_win_rate": 0.0,
+        "quota_waits_total": 0,
+        "quota_wait_ms_total": 0.0,
+        "quota_timeouts_total": 0,
     }
+
+
+def test_metrics_store_reports_hedge_and_win_rates() -> None:
+    store = MetricsStore()
+
+    for _ in range(6):
+        store.record_ocr_call(hedged=False, hedge_won=False)
+    store.record_ocr_call(hedged=True, hedge_won=True)
+    store.record_ocr_call(hedged=True, hedge_won=False)
+
+    snapshot = store.snapshot()
+    assert snapshot["ocr_calls_total"] == 8
+    assert snapshot["ocr_hedge_rate"] == 0.25
+    assert snapshot["ocr_hedge_win_rate"] == 0.5
@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import Counter
+
+from app.core.profiling import (
+    ProfileStore,
+    RequestProfile,
+    StackSampler,
+    to_collapsed,
+    to_speedscope,
+)
+
+
+def _profile(request_id: str = "req-1") -> RequestProfile:
+    root = ("MainThread", "", 0)
+    handler = ("handle", "/app/routing.py", 10)
+    return RequestProfile(
+        request_id=request_id,
+        method="POST",
+        path="/v1/process",
+        started_at=0.0,
+        duration_ms=12.0,
+        interval_ms=2.0,
+        samples=Counter(
+            {
+                (root, handler, ("generate", "/app/pinyin.py", 5)): 3,
+                (root, handler): 1,
+            }
+        ),
+    )
+
+
+def test_to_collapsed_emits_one_line_per_stack_heaviest_first() -> None:
+    assert to_collapsed(_profile()) == (
+        "MainThread;handle (routing.py:10);generate (pinyin.py:5) 3\n"
+        "MainThread;handle (routing.py:10) 1\n"
+    )
+
+
+def test_to_speedscope_shares_frames_and_weights_by_interval() -> None:
+    document = to_speedscope(_profile())
+
+    frames = document["shared"]["frames"]
+    profile = document["profiles"][0]
+    assert [frame["name"] for frame in frames] == ["MainThread", "handle", "generate"]
+    assert profile["samples"] == [[0, 1, 2], [0, 1]]
+    assert profile["weights"] == [6.0, 2.0]
+    assert profile["endValue"] == 8.0
+
+
+def test_profile_store_evicts_oldest_and_lists_newest_first() -> None:
+    store = ProfileStore(max_profiles=2)
+    for request_id in ("a", "b", "c"):
+        store.add(_profile(request_id))
+
+    assert store.get("a") is None
+    assert [profile.request_id for profile in store.recent()] == ["c", "b"]
+
+
+def test_profile_store_limits_concurrent_samplers() -> None:
+    store = ProfileStore()
+
+    assert store.try_acquire_slot()
+    assert store.try_acquire_slot()
+    assert not store.try_acquire_slot()
+    store.release_slot()
+    assert store.try_acquire_slot()
+
+
+def _busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_stack_sampler_captures_other_threads() -> None:
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_loop, args=(stop,), name="busy-worker")
+    sampler = StackSampler(interval_s=0.001)
+    worker.start()
+    sampler.start()
+    time.sleep(0.05)
+    sampler.stop()
+    stop.set()
+    worker.join()
+
+    busy_stacks = [stack for stack in sampler.samples if stack[0][0] == "busy-worker"]
+    assert busy_stacks
+    assert any(frame[0] == "_busy_loop" for stack in busy_stacks for frame in stack)
@@ -0,0 +1,29 @@
+from app.core.request_log import RequestLog, RequestRecord
+
+
+def _record(request_id: str, total_ms: float) -> RequestRecord:
+    return RequestRecord(
+        request_id=request_id,
+        method="POST",
+        path="/v1/process",
+        started_at=0.0,
+        total_ms=total_ms,
+        http_status=200,
+        response_bytes=0,
+    )
+
+
+def test_request_log_keeps_bounded_recent_newest_first() -> None:
+    log = RequestLog(recent_size=2, slowest_size=5)
+    for index in range(3):
+        log.add(_record(f"r{index}", 1.0))
+
+    assert [record.request_id for record in log.recent()] == ["r2", "r1"]
+
+
+def test_request_log_keeps_slowest_requests_slowest_first() -> None:
+    log = RequestLog(recent_size=10, slowest_size=2)
+    for request_id, total_ms in [("a", 50.0), ("b", 10.0), ("c", 90.0), ("d", 20.0)]:
+        log.add(_record(request_id, total_ms))
+
+    assert [record.request_id for record in log.slowest()] == ["c", "a"]
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from app.core.scheduling import (
+    SchedulerTimeoutError,
+    WorkloadScheduler,
+    admitted,
+    get_scheduler,
+    workload_snapshots,
+)
+from app.core.settings import SchedulerSettings, Settings
+
+
+def test_image_requests_are_capped_while_text_requests_still_get_in() -> None:
+    scheduler = WorkloadScheduler(
+        SchedulerSettings(max_concurrent=3, text_max_concurrent=3, image_max_concurrent=2)
+    )
+
+    async def run() -> None:
+        await scheduler.acquire("image")
+        await scheduler.acquire("image")
+        with pytest.raises(SchedulerTimeoutError):
+            await scheduler.acquire("image", timeout=0.01)
+        await scheduler.acquire("text", timeout=0.01)
+
+    asyncio.run(run())
+
+    snapshot = scheduler.snapshot()
+    assert snapshot["image"].in_flight == 2
+    assert snapshot["image"].rejected_total == 1
+    assert snapshot["text"].in_flight == 1
+
+
+def test_free_slots_are_shared_by_class_weight() -> None:
+    scheduler = WorkloadScheduler(
+        SchedulerSettings(
+            max_concurrent=1,
+            text_max_concurrent=1,
+            image_max_concurrent=1,
+            text_weight=3,
+            image_weight=1,
+        )
+    )
+    order: list[str] = []
+
+    async def request(workload: str) -> None:
+        async with scheduler.admit(workload):
+            order.append(workload)
+            await asyncio.sleep(0)
+
+    async def run() -> None:
+        await scheduler.acquire("image")
+        tasks = [asyncio.ensure_future(request("image")) for _ in range(2)]
+        tasks += [asyncio.ensure_future(request("text")) for _ in range(6)]
+        await asyncio.sleep(0)
+        scheduler.release("image")
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+
+    # Three text requests per image request. The image request that held the slot
+    # counts as the first image turn, and ties go to text.
+    assert order == ["text", "text", "text", "text", "image", "text", "text", "image"]
+
+
+def test_cancelled_waiters_leave_the_queue() -> None:
+    scheduler = WorkloadScheduler(SchedulerSettings(max_concurrent=1, image_max_concurrent=1))
+
+    async def run() -> None:
+        await scheduler.acquire("image")
+        waiter = asyncio.ensure_future(scheduler.acquire("image"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        scheduler.release("image")
+
+    asyncio.run(run())
+
+    snapshot = scheduler.snapshot()
+    assert snapshot["image"].in_flight == 0
+    assert snapshot["image"].queued == 0
+
+
+def test_admitted_is_a_no_op_when_scheduling_is_disabled() -> None:
+    disabled = Settings.from_env({"SCHEDULER_ENABLED": "false"})
+
+    async def run() -> None:
+        async with admitted("text", disabled):
+            pass
+
+    asyncio.run(run())
+
+    assert get_scheduler(disabled) is None
+    assert workload_snapshots() == {}
+
+
+def test_get_scheduler_is_shared() -> None:
+    settings = Settings.from_env({})
+
+    assert get_scheduler(settings) is get_scheduler(settings)
+    assert set(workload_snapshots()) == {"text", "image"}
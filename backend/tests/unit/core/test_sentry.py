@@ -3,7 +3,7 @@ from unittest.mock import patch
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.starlette import StarletteIntegration
 
-from app.core.sentry import init_sentry
+from app.core.sentry import init_sentry, set_tag
 
 
 def test_init_sentry_no_dsn_does_not_raise(monkeypatch) -> None:
@@ -44,3 +44,12 @@ def test_init_sentry_suppresses_init_exception(monkeypatch) -> None:
 
     with patch("sentry_sdk.init", side_effect=RuntimeError("SDK error")):
         init_sentry()
+
+
+def test_set_tag_is_noop_when_sentry_not_initialized(monkeypatch) -> None:
+    monkeypatch.setattr("app.core.sentry._initialized", False)
+
+    with patch("sentry_sdk.set_tag") as mock_set_tag:
+        set_tag("ocr_provider", "google_vision")
+
+    mock_set_tag.assert_not_called()
@@ -0,0 +1,321 @@
+import os
+import signal
+
+import pytest
+from helpers import SettingsEnv
+
+from app.core import settings as settings_module
+from app.core.settings import (
+    DEFAULT_TEXT_DOCUMENT_CONCURRENCY,
+    Settings,
+    SimulationSettings,
+    get_settings,
+    read_env_file,
+    reload_settings,
+)
+
+
+def test_settings_defaults_when_environment_is_empty() -> None:
+    settings = Settings.from_env({})
+
+    assert settings == Settings()
+    assert settings.budget_warn_threshold_sgd == pytest.approx(0.8)
+
+
+def test_settings_parses_typed_values() -> None:
+    settings = Settings.from_env(
+        {
+            "OCR_PROVIDER": " Google_Vision ",
+            "TRANSLATION_ENABLED": "TRUE",
+            "MAX_UPLOAD_BYTES": "1024",
+            "MAX_UPLOAD_PIXELS": "2048",
+            "TEXT_INPUT_MAX_CHARS": "12",
+            "DAILY_BUDGET_SGD": "2.5",
+            "BUDGET_ENFORCE_MODE": "Block",
+            "GOOGLE_TRANSLATE_USD_PER_MILLION_CHARS": "10",
+            "ADMIN_TOKEN": " secret ",
+        }
+    )
+
+    assert settings.ocr_provider == "google_vision"
+    assert settings.translation_enabled is True
+    assert settings.max_upload_bytes == 1024
+    assert settings.max_image_pixels == 2048
+    assert settings.text_input_max_chars == 12
+    assert settings.daily_budget_sgd == pytest.approx(2.5)
+    assert settings.budget_warn_threshold_sgd == pytest.approx(2.0)
+    assert settings.budget_enforce_mode == "block"
+    assert settings.google_translate_usd_per_million_chars == pytest.approx(10.0)
+    assert settings.admin_token == "secret"
+
+
+def test_settings_invalid_translate_price_disables_estimates() -> None:
+    settings = Settings.from_env({"GOOGLE_TRANSLATE_USD_PER_MILLION_CHARS": "nan"})
+
+    assert settings.google_translate_usd_per_million_chars is None
+
+
+def test_settings_parses_simulation_values_per_provider() -> None:
+    settings = Settings.from_env(
+        {
+            "TRANSLATION_PROVIDER": " Simulated ",
+            "SIMULATED_OCR_LATENCY": "lognormal:250,0.6",
+            "SIMULATED_OCR_ERROR_RATE": "0.05",
+            "SIMULATED_OCR_TIMEOUT_RATE": "1.5",
+            "SIMULATED_TRANSLATION_TIMEOUT_SECONDS": "6",
+            "SIMULATION_SEED": "7",
+        }
+    )
+
+    assert settings.translation_provider == "simulated"
+    assert settings.simulated_ocr == SimulationSettings(
+        latency="lognormal:250,0.6", error_rate=0.05, timeout_rate=0.0
+    )
+    assert settings.simulated_translation.timeout_s == pytest.approx(6.0)
+    assert settings.simulation_seed == 7
+
+
+def test_settings_parses_ocr_tiling_and_caps_overlap() -> None:
+    settings = Settings.from_env(
+        {
+            "OCR_TILING_ENABLED": "true",
+            "OCR_TILE_SIZE": "1000",
+            "OCR_TILE_OVERLAP": "900",
+            "OCR_TILING_MAX_PIXELS": "60000000",
+            "MAX_UPLOAD_PIXELS": "25000000",
+        }
+    )
+
+    assert settings.ocr_tiling.enabled is True
+    assert settings.ocr_tiling.overlap == 500
+    assert settings.upload_pixel_limit == 60_000_000
+    assert Settings.from_env({"MAX_UPLOAD_PIXELS": "25000000"}).upload_pixel_limit == 25_000_000
+
+
+def test_settings_parses_ocr_cascade_and_defaults_tiers_to_provider() -> None:
+    settings = Settings.from_env(
+        {"OCR_PROVIDER": "google_vision", "OCR_CASCADE": " Local, google_vision ,"}
+    )
+
+    assert settings.ocr_cascade == ("local", "google_vision")
+    assert settings.ocr_tiers == ("local", "google_vision")
+    assert Settings.from_env({"OCR_PROVIDER": "local"}).ocr_tiers == ("local",)
+
+
+def test_settings_parses_ocr_hedging() -> None:
+    settings = Settings.from_env(
+        {
+            "OCR_HEDGE_ENABLED": "true",
+            "OCR_HEDGE_PERCENTILE": "100",
+            "OCR_HEDGE_BUDGET": "0.2",
+            "OCR_HEDGE_PROVIDER": " Simulated ",
+        }
+    )
+
+    assert settings.ocr_hedging.enabled is True
+    assert settings.ocr_hedging.percentile == pytest.approx(95.0)
+    assert settings.ocr_hedging.budget == pytest.approx(0.2)
+    assert settings.ocr_hedging.provider == "simulated"
+    assert Settings.from_env({}).ocr_hedging.budget == pytest.approx(0.05)
+
+
+def test_settings_parses_circuit_breakers_and_caps_min_calls() -> None:
+    settings = Settings.from_env(
+        {
+            "CIRCUIT_BREAKER_WINDOW": "5",
+            "CIRCUIT_BREAKER_MIN_CALLS": "50",
+            "CIRCUIT_BREAKER_FAILURE_RATE": "0",
+            "CIRCUIT_BREAKER_TRANSLATION_SLOW_MS": "1000",
+        }
+    )
+
+    assert settings.circuit_breakers.enabled is True
+    assert settings.circuit_breakers.min_calls == 5
+    assert settings.circuit_breakers.failure_rate == pytest.approx(0.5)
+    assert settings.circuit_breakers.translation_slow_ms == pytest.approx(1000.0)
+
+
+def test_settings_parses_retry_policy_and_request_deadline() -> None:
+    settings = Settings.from_env(
+        {
+            "RETRY_MAX_ATTEMPTS": "5",
+            "RETRY_BASE_DELAY_MS": "50",
+            "RETRY_BUDGET_RATIO": "2",
+            "REQUEST_DEADLINE_SECONDS": "12.5",
+        }
+    )
+
+    assert settings.retry.max_attempts == 5
+    assert settings.retry.base_delay_ms == pytest.approx(50.0)
+    assert settings.retry.budget_ratio == pytest.approx(0.1)
+    assert settings.request_deadline_s == pytest.approx(12.5)
+
+
+def test_settings_parses_quotas_and_ignores_invalid_limits() -> None:
+    settings = Settings.from_env(
+        {
+            "GCV_QUOTA_QPS": "25",
+            "TRANSLATE_QUOTA_QPS": "-3",
+            "TRANSLATE_QUOTA_CHARS_PER_MINUTE": "not-a-number",
+            "QUOTA_MAX_WAIT_MS": "250",
+        }
+    )
+
+    assert settings.quotas.gcv_requests_per_second == pytest.approx(25.0)
+    assert settings.quotas.translate_requests_per_second == 0.0
+    assert settings.quotas.translate_chars_per_minute == 0.0
+    assert settings.quotas.max_wait_ms == pytest.approx(250.0)
+
+
+def test_settings_parses_concurrency_limits_and_clamps_them() -> None:
+    settings = Settings.from_env(
+        {
+            "ADAPTIVE_CONCURRENCY_INITIAL_LIMIT": "50",
+            "ADAPTIVE_CONCURRENCY_MIN_LIMIT": "2",
+            "ADAPTIVE_CONCURRENCY_MAX_LIMIT": "16",
+            "ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE": "0.5",
+            "ADAPTIVE_CONCURRENCY_BACKOFF_RATIO": "0.75",
+        }
+    )
+
+    limits = settings.concurrency_limits
+    assert limits.initial_limit == 16
+    assert limits.min_limit == 2
+    assert limits.latency_tolerance == pytest.approx(2.0)
+    assert limits.backoff_ratio == pytest.approx(0.75)
+
+
+def test_settings_parses_scheduler_and_caps_class_limits() -> None:
+    settings = Settings.from_env(
+        {
+            "SCHEDULER_MAX_CONCURRENT": "10",
+            "SCHEDULER_IMAGE_MAX_CONCURRENT": "4",
+            "SCHEDULER_TEXT_WEIGHT": "8",
+        }
+    )
+
+    assert settings.scheduler.max_concurrent == 10
+    assert settings.scheduler.text_max_concurrent == 10
+    assert settings.scheduler.image_max_concurrent == 4
+    assert settings.scheduler.text_weight == 8
+    assert settings.scheduler.image_weight == 1
+
+
+def test_settings_parses_text_document_limits() -> None:
+    settings = Settings.from_env(
+        {
+            "TEXT_DOCUMENT_MAX_BYTES": "1048576",
+            "TEXT_DOCUMENT_CHUNK_CHARS": "500",
+            "TEXT_DOCUMENT_CONCURRENCY": "0",
+        }
+    )
+
+    assert settings.text_documents.max_bytes == 1_048_576
+    assert settings.text_documents.chunk_chars == 500
+    assert settings.text_documents.concurrency == DEFAULT_TEXT_DOCUMENT_CONCURRENCY
+
+
+def test_speculative_ocr_is_opt_in() -> None:
+    assert Settings.from_env({}).speculative_ocr is False
+    assert Settings.from_env({"SPECULATIVE_OCR_ENABLED": "true"}).speculative_ocr is True
+
+
+def test_settings_parses_client_limits() -> None:
+    settings = Settings.from_env(
+        {
+            "CLIENT_RATE_LIMIT_PER_MINUTE": "120",
+            "CLIENT_RATE_LIMIT_BURST": "0",
+            "CLIENT_DAILY_BUDGET_SGD": "0.5",
+            "CLIENT_LIMIT_TRUST_FORWARDED_FOR": "true",
+        }
+    )
+
+    limits = settings.client_limits
+    assert limits.requests_per_minute == pytest.approx(120.0)
+    assert limits.burst == 10
+    assert limits.daily_budget_sgd == pytest.approx(0.5)
+    assert limits.trust_forwarded_for is True
+    assert limits.enabled
+    assert not Settings.from_env({}).client_limits.enabled
+
+
+def test_invalid_low_confidence_threshold_falls_back_to_default(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    with caplog.at_level("WARNING"):
+        settings = Settings.from_env({"OCR_LOW_CONFIDENCE_THRESHOLD": "not-a-number"})
+
+    assert settings.ocr_low_confidence_threshold == pytest.approx(0.7)
+    assert "Invalid OCR_LOW_CONFIDENCE_THRESHOLD" in caplog.text
+
+
+def test_settings_are_immutable() -> None:
+    with pytest.raises(AttributeError):
+        get_settings().max_upload_bytes = 1  # type: ignore[misc]
+
+
+def test_reload_settings_swaps_snapshot() -> None:
+    before = get_settings()
+    os.environ["MAX_UPLOAD_BYTES"] = "4096"
+    try:
+        assert get_settings() is before
+        after = reload_settings()
+    finally:
+        del os.environ["MAX_UPLOAD_BYTES"]
+        reload_settings()
+
+    assert after is not before
+    assert after.max_upload_bytes == 4096
+
+
+def test_read_env_file_parses_dotenv_style_lines(tmp_path) -> None:
+    path = tmp_path / "settings.env"
+    path.write_text(
+        "# comment\n\nOCR_PROVIDER=simulated\nexport DAILY_BUDGET_SGD = 2.5\n"
+        "ADMIN_TOKEN='s3cret'\nnot a setting\n"
+    )
+
+    assert read_env_file(str(path)) == {
+        "OCR_PROVIDER": "simulated",
+        "DAILY_BUDGET_SGD": "2.5",
+        "ADMIN_TOKEN": "s3cret",
+    }
+
+
+def test_reload_settings_rereads_settings_file_over_the_environment(
+    settings_env: SettingsEnv, tmp_path
+) -> None:
+    path = tmp_path / "settings.env"
+    path.write_text("TEXT_INPUT_MAX_CHARS=42\n")
+    settings_env.setenv("TEXT_INPUT_MAX_CHARS", "5000")
+    settings_env.setenv("SETTINGS_FILE", str(path))
+    assert get_settings().text_input_max_chars == 42
+
+    path.write_text("TEXT_INPUT_MAX_CHARS=7\n")
+
+    assert reload_settings().text_input_max_chars == 7
+
+
+def test_unreadable_settings_file_falls_back_to_the_environment(
+    settings_env: SettingsEnv, tmp_path
+) -> None:
+    settings_env.setenv("TEXT_INPUT_MAX_CHARS", "5000")
+    settings_env.setenv("SETTINGS_FILE", str(tmp_path / "missing.env"))
+
+    assert get_settings().text_input_max_chars == 5000
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="SIGHUP is POSIX-only")
+def test_sighup_reloads_settings(settings_env: SettingsEnv, tmp_path) -> None:
+    path = tmp_path / "settings.env"
+    path.write_text("")
+    settings_env.setenv("SETTINGS_FILE", str(path))
+    previous_handler = signal.getsignal(signal.SIGHUP)
+    try:
+        assert settings_module.install_reload_signal_handler() is True
+        path.write_text("TEXT_INPUT_MAX_CHARS=42\n")
+        os.kill(os.getpid(), signal.SIGHUP)
+
+        assert get_settings().text_input_max_chars == 42
+    finally:
+        signal.signal(signal.SIGHUP, previous_handler)
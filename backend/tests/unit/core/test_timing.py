@@ -0,0 +1,53 @@
+import time
+
+from starlette.requests import Request
+
+from app.core.timing import RequestTimer, request_timer
+
+
+def test_request_timer_records_spans_in_order_with_offsets() -> None:
+    timer = RequestTimer()
+
+    with timer.span("first"):
+        time.sleep(0.002)
+    with timer.span("second"):
+        pass
+
+    assert [span.name for span in timer.spans] == ["first", "second"]
+    first, second = timer.spans
+    assert first.duration_ms >= 1.0
+    assert second.start_ms >= first.start_ms + first.duration_ms
+    assert timer.elapsed_ms() >= second.start_ms
+
+
+def test_request_timer_records_span_when_block_raises() -> None:
+    timer = RequestTimer()
+
+    try:
+        with timer.span("ocr"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert timer.duration_ms("ocr") >= 0.0
+    assert [span.name for span in timer.spans] == ["ocr"]
+
+
+def test_server_timing_lists_spans_then_total() -> None:
+    timer = RequestTimer()
+    with timer.span("pinyin"):
+        pass
+    timer.record_since_start("body_read")
+
+    metrics = timer.server_timing().split(", ")
+
+    assert [metric.split(";")[0] for metric in metrics] == ["pinyin", "body_read", "total"]
+    assert all(";dur=" in metric for metric in metrics)
+
+
+def test_request_timer_reuses_timer_on_request_state() -> None:
+    request = Request({"type": "http", "state": {}})
+
+    timer = request_timer(request)
+
+    assert request_timer(request) is timer
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+from helpers import SettingsEnv
+
+from app.adapters import google_cloud_translate_provider, google_cloud_vision_ocr_provider
+from app.adapters.ocr_provider import get_ocr_provider
+from app.adapters.translation_provider import get_translation_provider
+from app.core import warmup
+from app.core.settings import get_settings
+from app.core.warmup import Readiness, warm_up, warmup_steps
+
+
+def test_warmup_steps_skip_unconfigured_providers(settings_env: SettingsEnv) -> None:
+    settings_env.delenv("OCR_PROVIDER", raising=False)
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
+
+    steps = dict(warmup_steps(get_settings()))
+
+    assert steps["images"] is not None
+    assert steps["pinyin"] is not None
+    assert steps["ocr"] is None
+    assert steps["translation"] is None
+
+
+def test_warm_up_runs_steps_and_marks_ready(settings_env: SettingsEnv) -> None:
+    settings_env.setenv("OCR_PROVIDER", "simulated")
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
+    state = Readiness()
+
+    asyncio.run(warm_up(get_settings(), state))
+
+    assert state.is_ready
+    assert state.started_at is not None and state.ready_at is not None
+    statuses = {step.name: step.status for step in state.steps}
+    assert statuses == {"images": "ok", "pinyin": "ok", "ocr": "ok", "translation": "skipped"}
+
+
+def test_warm_up_builds_the_clients_later_requests_use(
+    monkeypatch: pytest.MonkeyPatch, settings_env: SettingsEnv
+) -> None:
+    built: list[str] = []
+
+    class VisionProvider:
+        def __init__(self) -> None:
+            built.append("ocr")
+
+    class TranslateProvider:
+        def __init__(self) -> None:
+            built.append("translation")
+
+    monkeypatch.setattr(
+        google_cloud_vision_ocr_provider, "GoogleCloudVisionOcrProvider", VisionProvider
+    )
+    monkeypatch.setattr(
+        google_cloud_translate_provider, "GoogleCloudTranslateProvider", TranslateProvider
+    )
+    google_cloud_vision_ocr_provider.get_google_vision_ocr_provider.cache_clear()
+    google_cloud_translate_provider.get_google_translate_provider.cache_clear()
+    settings_env.setenv("OCR_PROVIDER", "google_vision")
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("TRANSLATION_PROVIDER", "google")
+
+    asyncio.run(warm_up(get_settings(), Readiness()))
+    ocr_provider = get_ocr_provider()
+    translation_provider = get_translation_provider()
+
+    assert built == ["ocr", "translation"]
+    assert isinstance(ocr_provider, VisionProvider)
+    assert isinstance(translation_provider, TranslateProvider)
+
+
+def test_warm_up_failing_step_is_not_fatal(monkeypatch: pytest.MonkeyPatch) -> None:
+    def broken() -> None:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(
+        warmup, "warmup_steps", lambda settings: [("ocr", broken), ("pinyin", lambda: None)]
+    )
+    state = Readiness()
+
+    asyncio.run(warm_up(get_settings(), state))
+
+    assert state.is_ready
+    assert [(step.name, step.status) for step in state.steps] == [
+        ("ocr", "failed"),
+        ("pinyin", "ok"),
+    ]
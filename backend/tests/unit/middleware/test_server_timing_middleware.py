@@ -0,0 +1,35 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from starlette.responses import PlainTextResponse
+
+from app.core.timing import request_timer
+from app.middleware.server_timing import ServerTimingMiddleware
+
+
+def _make_app(**kwargs: object) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware, **kwargs)
+
+    @app.get("/work")
+    async def work(request: Request) -> PlainTextResponse:
+        with request_timer(request).span("ocr"):
+            pass
+        return PlainTextResponse("ok")
+
+    return app
+
+
+def test_server_timing_header_contains_route_spans_and_total() -> None:
+    response = TestClient(_make_app()).get("/work")
+
+    metrics = [metric.split(";")[0] for metric in response.headers["server-timing"].split(", ")]
+    assert metrics == ["ocr", "total"]
+    assert "timing-allow-origin" not in response.headers
+
+
+def test_timing_allow_origin_lists_configured_origins() -> None:
+    app = _make_app(allow_origins=["http://a.example", "http://b.example"])
+
+    response = TestClient(app).get("/work")
+
+    assert response.headers["timing-allow-origin"] == "http://a.example, http://b.example"
@@ -2,20 +2,22 @@ import datetime
 from unittest.mock import patch
 
 import pytest
+from helpers import SettingsEnv
 
 from app.schemas.diagnostics import CostEstimate
 from app.services import budget_service
 from app.services.budget_service import (
     DailyCostStore,
+    estimate_ocr_cost,
     estimate_request_cost,
     estimate_text_processing_cost,
 )
 
 
 def test_google_vision_provider_returns_full_estimate(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("OCR_PROVIDER", "google_vision")
+    settings_env.setenv("OCR_PROVIDER", "google_vision")
 
     result = estimate_request_cost(file_size_bytes=50_000)
 
@@ -24,8 +26,46 @@ def test_google_vision_provider_returns_full_estimate(
     assert result.estimated_sgd == pytest.approx(0.002025)
 
 
-def test_unset_provider_returns_unavailable(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.delenv("OCR_PROVIDER", raising=False)
+def test_google_vision_estimate_scales_with_ocr_calls(
+    settings_env: SettingsEnv,
+) -> None:
+    settings_env.setenv("OCR_PROVIDER", "google_vision")
+
+    result = estimate_request_cost(file_size_bytes=50_000, ocr_calls=6)
+
+    assert result.estimated_usd == pytest.approx(0.009)
+    assert result.estimated_sgd == pytest.approx(0.01215)
+
+
+def test_local_provider_returns_zero_cost_estimate(settings_env: SettingsEnv) -> None:
+    settings_env.setenv("OCR_PROVIDER", "local")
+
+    result = estimate_request_cost(file_size_bytes=50_000)
+
+    assert result.confidence == "full"
+    assert result.estimated_usd == 0.0
+    assert result.estimated_sgd == 0.0
+
+
+def test_ocr_cost_covers_only_the_tiers_that_ran() -> None:
+    assert estimate_ocr_cost(["local"]).estimated_usd == 0.0
+
+    result = estimate_ocr_cost(["local", "google_vision"], ocr_calls=2)
+
+    assert result.confidence == "full"
+    assert result.estimated_usd == pytest.approx(0.003)
+
+
+def test_ocr_cost_with_an_unpriced_tier_is_a_fallback_estimate() -> None:
+    result = estimate_ocr_cost(["textract", "google_vision"])
+
+    assert result.confidence == "fallback"
+    assert result.estimated_usd == pytest.approx(0.0015)
+    assert estimate_ocr_cost(["textract"]).confidence == "unavailable"
+
+
+def test_unset_provider_returns_unavailable(settings_env: SettingsEnv) -> None:
+    settings_env.delenv("OCR_PROVIDER", raising=False)
 
     result = estimate_request_cost(file_size_bytes=50_000)
 
@@ -34,8 +74,8 @@ def test_unset_provider_returns_unavailable(monkeypatch: pytest.MonkeyPatch) ->
     assert result.estimated_sgd is None
 
 
-def test_textract_provider_returns_unavailable(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setenv("OCR_PROVIDER", "textract")
+def test_textract_provider_returns_unavailable(settings_env: SettingsEnv) -> None:
+    settings_env.setenv("OCR_PROVIDER", "textract")
 
     result = estimate_request_cost(file_size_bytes=50_000)
 
@@ -45,9 +85,9 @@ def test_textract_provider_returns_unavailable(monkeypatch: pytest.MonkeyPatch)
 
 
 def test_provider_name_with_surrounding_whitespace_is_normalized(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("OCR_PROVIDER", " google_vision ")
+    settings_env.setenv("OCR_PROVIDER", " google_vision ")
 
     result = estimate_request_cost(file_size_bytes=50_000)
 
@@ -55,10 +95,10 @@ def test_provider_name_with_surrounding_whitespace_is_normalized(
 
 
 def test_estimate_text_processing_cost_returns_full_estimate_when_translation_enabled(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("TRANSLATION_ENABLED", "true")
-    monkeypatch.delenv("GOOGLE_TRANSLATE_USD_PER_MILLION_CHARS", raising=False)
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.delenv("GOOGLE_TRANSLATE_USD_PER_MILLION_CHARS", raising=False)
 
     result = estimate_text_processing_cost(char_count=5_000)
 
@@ -68,10 +108,10 @@ def test_estimate_text_processing_cost_returns_full_estimate_when_translation_en
 
 
 def test_estimate_text_processing_cost_uses_env_override(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("TRANSLATION_ENABLED", "true")
-    monkeypatch.setenv("GOOGLE_TRANSLATE_USD_PER_MILLION_CHARS", "10")
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("GOOGLE_TRANSLATE_USD_PER_MILLION_CHARS", "10")
 
     result = estimate_text_processing_cost(char_count=5_000)
 
@@ -81,9 +121,9 @@ def test_estimate_text_processing_cost_uses_env_override(
 
 
 def test_estimate_text_processing_cost_returns_unavailable_when_translation_disabled(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("TRANSLATION_ENABLED", "false")
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
 
     result = estimate_text_processing_cost(char_count=5_000)
 
@@ -93,10 +133,10 @@ def test_estimate_text_processing_cost_returns_unavailable_when_translation_disa
 
 
 def test_estimate_text_processing_cost_returns_unavailable_for_invalid_pricing(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("TRANSLATION_ENABLED", "true")
-    monkeypatch.setenv("GOOGLE_TRANSLATE_USD_PER_MILLION_CHARS", "nan")
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("GOOGLE_TRANSLATE_USD_PER_MILLION_CHARS", "nan")
 
     result = estimate_text_processing_cost(char_count=5_000)
 
@@ -129,6 +169,16 @@ def test_daily_cost_store_skips_unavailable_estimates() -> None:
     assert store.snapshot() == {}
 
 
+def test_daily_cost_store_records_the_priced_portion_of_a_fallback_estimate() -> None:
+    store = DailyCostStore()
+
+    store.record(estimate_ocr_cost(["textract", "google_vision"]))
+
+    today = store.snapshot()[datetime.date.today().isoformat()]
+    assert today["request_count"] == 1
+    assert today["total_usd"] == pytest.approx(0.0015)
+
+
 def test_daily_cost_store_accumulates_multiple_requests_on_same_day() -> None:
     store = DailyCostStore()
     estimate = _full_estimate()
@@ -204,114 +254,162 @@ def test_check_budget_threshold_returns_ok_when_no_spend_recorded() -> None:
 
 
 def test_check_budget_threshold_returns_warn_when_today_reaches_80_percent(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "1.0")
+    settings_env.setenv("DAILY_BUDGET_SGD", "1.0")
     _record_today_spend_sgd(0.8)
 
     assert budget_service.check_budget_threshold() == "warn"
 
 
 def test_check_budget_threshold_returns_exceeded_when_today_reaches_limit(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "1.0")
+    settings_env.setenv("DAILY_BUDGET_SGD", "1.0")
     _record_today_spend_sgd(1.0)
 
     assert budget_service.check_budget_threshold() == "exceeded"
 
 
 def test_check_budget_threshold_uses_daily_budget_env_var(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "2.0")
+    settings_env.setenv("DAILY_BUDGET_SGD", "2.0")
     _record_today_spend_sgd(1.7)
 
     assert budget_service.check_budget_threshold() == "warn"
 
 
 def test_check_budget_threshold_defaults_to_one_sgd_when_env_var_absent(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.delenv("DAILY_BUDGET_SGD", raising=False)
+    settings_env.delenv("DAILY_BUDGET_SGD", raising=False)
     _record_today_spend_sgd(1.0)
 
     assert budget_service.check_budget_threshold() == "exceeded"
 
 
 def test_check_budget_threshold_defaults_to_one_sgd_when_env_var_invalid(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "not-a-number")
+    settings_env.setenv("DAILY_BUDGET_SGD", "not-a-number")
     _record_today_spend_sgd(1.0)
 
     assert budget_service.check_budget_threshold() == "exceeded"
 
 
 def test_get_budget_enforce_mode_returns_block_when_env_var_set(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("BUDGET_ENFORCE_MODE", "block")
+    settings_env.setenv("BUDGET_ENFORCE_MODE", "block")
 
     assert budget_service.get_budget_enforce_mode() == "block"
 
 
 def test_get_budget_enforce_mode_defaults_to_warn(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.delenv("BUDGET_ENFORCE_MODE", raising=False)
+    settings_env.delenv("BUDGET_ENFORCE_MODE", raising=False)
 
     assert budget_service.get_budget_enforce_mode() == "warn"
 
 
 def test_get_budget_enforce_mode_returns_warn_for_unknown_values(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("BUDGET_ENFORCE_MODE", "surprise")
+    settings_env.setenv("BUDGET_ENFORCE_MODE", "surprise")
 
     assert budget_service.get_budget_enforce_mode() == "warn"
 
 
 def test_check_budget_threshold_returns_ok_when_cost_unavailable(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.delenv("OCR_PROVIDER", raising=False)
+    settings_env.delenv("OCR_PROVIDER", raising=False)
     budget_service.record_request_cost(budget_service.estimate_request_cost(file_size_bytes=50_000))
 
     assert budget_service.check_budget_threshold() == "ok"
 
 
 def test_check_budget_threshold_defaults_to_one_sgd_when_env_var_is_zero(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "0")
+    settings_env.setenv("DAILY_BUDGET_SGD", "0")
     _record_today_spend_sgd(0.5)
 
     assert budget_service.check_budget_threshold() == "ok"
 
 
 def test_check_budget_threshold_defaults_to_one_sgd_when_env_var_is_negative(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "-1.0")
+    settings_env.setenv("DAILY_BUDGET_SGD", "-1.0")
     _record_today_spend_sgd(0.5)
 
     assert budget_service.check_budget_threshold() == "ok"
 
 
 def test_check_budget_threshold_defaults_to_one_sgd_when_env_var_is_nan(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "nan")
+    settings_env.setenv("DAILY_BUDGET_SGD", "nan")
     _record_today_spend_sgd(1.0)
 
     assert budget_service.check_budget_threshold() == "exceeded"
 
 
 def test_check_budget_threshold_defaults_to_one_sgd_when_env_var_is_inf(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("DAILY_BUDGET_SGD", "inf")
+    settings_env.setenv("DAILY_BUDGET_SGD", "inf")
     _record_today_spend_sgd(1.0)
 
     assert budget_service.check_budget_threshold() == "exceeded"
+
+
+def test_daily_cost_store_prunes_entries_older_than_retention() -> None:
+    store = DailyCostStore(retention_days=2)
+
+    with patch("app.services.budget_service.datetime") as mock_datetime:
+        for day in (27, 28, 29):
+            mock_datetime.date.today.return_value = datetime.date(2026, 3, day)
+            store.record(_full_estimate())
+
+    assert set(store.snapshot()) == {"2026-03-28", "2026-03-29"}
+
+
+def test_daily_cost_store_today_total_resets_on_rollover() -> None:
+    store = DailyCostStore()
+
+    with patch("app.services.budget_service.datetime") as mock_datetime:
+        mock_datetime.date.today.return_value = datetime.date(2026, 3, 28)
+        store.record(_full_estimate())
+        assert store.today_total_sgd() == pytest.approx(0.002025)
+
+        mock_datetime.date.today.return_value = datetime.date(2026, 3, 29)
+        assert store.today_total_sgd() == 0.0
+
+    assert "2026-03-28" in store.snapshot()
+
+
+def test_check_budget_threshold_does_not_copy_history() -> None:
+    budget_service.record_request_cost(_full_estimate())
+
+    with patch.object(DailyCostStore, "snapshot") as snapshot:
+        assert budget_service.check_budget_threshold() == "ok"
+
+    snapshot.assert_not_called()
+
+
+def test_daily_cost_store_uses_retention_setting_by_default(
+    settings_env: SettingsEnv,
+) -> None:
+    settings_env.setenv("BUDGET_HISTORY_RETENTION_DAYS", "1")
+    store = DailyCostStore()
+
+    with patch("app.services.budget_service.datetime") as mock_datetime:
+        for day in (28, 29):
+            mock_datetime.date.today.return_value = datetime.date(2026, 3, day)
+            store.record(_full_estimate())
+
+    assert set(store.snapshot()) == {"2026-03-29"}
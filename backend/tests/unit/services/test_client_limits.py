@@ -0,0 +1,73 @@
+import datetime
+
+from app.core.settings import ClientLimitSettings, Settings
+from app.services.client_limits import ClientLimiter, get_client_limiter
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.clock = 1000.0
+        self.now = datetime.datetime(2026, 3, 1, 23, 59, 0)
+
+    def advance(self, seconds: float) -> None:
+        self.clock += seconds
+        self.now += datetime.timedelta(seconds=seconds)
+
+
+def _limiter(fake: FakeTime, **limits: float) -> ClientLimiter:
+    return ClientLimiter(
+        ClientLimitSettings(**limits), clock=lambda: fake.clock, now=lambda: fake.now
+    )
+
+
+def test_rate_limit_allows_a_burst_then_asks_the_client_to_wait() -> None:
+    fake = FakeTime()
+    limiter = _limiter(fake, requests_per_minute=30, burst=2)
+
+    assert limiter.check("ip:1.2.3.4") is None
+    assert limiter.check("ip:1.2.3.4") is None
+    rejection = limiter.check("ip:1.2.3.4")
+
+    assert rejection is not None
+    assert rejection.code == "client_rate_limited"
+    assert rejection.retry_after_s == 2
+    # Other clients have their own bucket.
+    assert limiter.check("ip:5.6.7.8") is None
+    fake.advance(2)
+    assert limiter.check("ip:1.2.3.4") is None
+
+
+def test_daily_quota_rejects_until_midnight_and_resets_the_next_day() -> None:
+    fake = FakeTime()
+    limiter = _limiter(fake, daily_budget_sgd=0.01)
+    limiter.record_cost("key:abc", 0.006)
+    assert limiter.check("key:abc") is None
+    limiter.record_cost("key:abc", 0.006)
+
+    rejection = limiter.check("key:abc")
+
+    assert rejection is not None
+    assert rejection.code == "client_daily_quota_exceeded"
+    assert rejection.retry_after_s == 60
+    fake.advance(60)
+    assert limiter.check("key:abc") is None
+
+
+def test_least_recently_seen_clients_are_evicted() -> None:
+    fake = FakeTime()
+    limiter = _limiter(fake, requests_per_minute=1, burst=1, max_clients=2)
+    limiter.check("ip:a")
+    limiter.check("ip:b")
+    limiter.check("ip:a")
+    limiter.check("ip:c")
+
+    assert len(limiter) == 2
+    # "a" is still limited; "b" was forgotten and starts with a full bucket.
+    assert limiter.check("ip:a") is not None
+    assert limiter.check("ip:b") is None
+
+
+def test_client_limiter_is_off_until_a_limit_is_set() -> None:
+    assert get_client_limiter(Settings.from_env({})) is None
+    settings = Settings.from_env({"CLIENT_RATE_LIMIT_PER_MINUTE": "60"})
+    assert get_client_limiter(settings) is get_client_limiter(settings)
@@ -2,8 +2,9 @@ from io import BytesIO
 
 import pytest
 from fastapi import UploadFile
+from helpers import SettingsEnv
 
-from app.services import image_validation
+from app.core.settings import Settings, TilingSettings
 from app.services.image_validation import (
     MAX_FILE_SIZE_BYTES,
     MAX_IMAGE_PIXELS,
@@ -11,7 +12,9 @@ from app.services.image_validation import (
     ValidatedImage,
     get_configured_max_image_pixels,
     get_configured_max_upload_bytes,
+    inspect_image_upload,
     validate_image_upload,
+    verify_image_integrity,
 )
 
 PNG_1X1_BYTES = (
@@ -35,6 +38,12 @@ def _upload_file(name: str, content_type: str, content: bytes) -> UploadFile:
     return UploadFile(filename=name, file=BytesIO(content), headers={"content-type": content_type})
 
 
+def test_rejects_missing_file() -> None:
+    with pytest.raises(ImageValidationError) as exc:
+        validate_image_upload(None)
+    assert exc.value.code == "missing_file"
+
+
 def test_rejects_unsupported_mime_type() -> None:
     file = _upload_file("notes.txt", "text/plain", b"not-an-image")
     with pytest.raises(ImageValidationError) as exc:
@@ -42,11 +51,10 @@ def test_rejects_unsupported_mime_type() -> None:
     assert exc.value.code == "invalid_mime_type"
 
 
-def test_rejects_oversized_file(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr(image_validation, "MAX_FILE_SIZE_BYTES", 4)
+def test_rejects_oversized_file() -> None:
     file = _upload_file("photo.png", "image/png", PNG_1X1_BYTES)
     with pytest.raises(ImageValidationError) as exc:
-        validate_image_upload(file)
+        validate_image_upload(file, settings=Settings(max_upload_bytes=4))
     assert exc.value.code == "file_too_large"
 
 
@@ -57,11 +65,10 @@ def test_rejects_unreadable_image_bytes() -> None:
     assert exc.value.code == "image_decode_failed"
 
 
-def test_rejects_excessive_pixel_count(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr(image_validation, "MAX_IMAGE_PIXELS", 0)
+def test_rejects_excessive_pixel_count() -> None:
     file = _upload_file("photo.png", "image/png", PNG_1X1_BYTES)
     with pytest.raises(ImageValidationError) as exc:
-        validate_image_upload(file)
+        validate_image_upload(file, settings=Settings(max_image_pixels=0))
     assert exc.value.code == "image_too_large_pixels"
 
 
@@ -75,89 +82,89 @@ def test_accepts_valid_image_sample() -> None:
 
 
 def test_get_configured_max_upload_bytes_returns_default(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.delenv("MAX_UPLOAD_BYTES", raising=False)
+    settings_env.delenv("MAX_UPLOAD_BYTES", raising=False)
 
     assert get_configured_max_upload_bytes() == MAX_FILE_SIZE_BYTES
 
 
 def test_get_configured_max_upload_bytes_reads_env_var(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("MAX_UPLOAD_BYTES", "4194304")
+    settings_env.setenv("MAX_UPLOAD_BYTES", "4194304")
 
     assert get_configured_max_upload_bytes() == 4_194_304
 
 
 def test_get_configured_max_upload_bytes_invalid_env_var_uses_default(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("MAX_UPLOAD_BYTES", "bad")
+    settings_env.setenv("MAX_UPLOAD_BYTES", "bad")
 
     assert get_configured_max_upload_bytes() == MAX_FILE_SIZE_BYTES
 
 
 def test_get_configured_max_image_pixels_returns_default(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.delenv("MAX_UPLOAD_PIXELS", raising=False)
+    settings_env.delenv("MAX_UPLOAD_PIXELS", raising=False)
 
     assert get_configured_max_image_pixels() == MAX_IMAGE_PIXELS
 
 
 def test_get_configured_max_image_pixels_reads_env_var(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("MAX_UPLOAD_PIXELS", "1000000")
+    settings_env.setenv("MAX_UPLOAD_PIXELS", "1000000")
 
     assert get_configured_max_image_pixels() == 1_000_000
 
 
 def test_get_configured_max_image_pixels_invalid_env_var_uses_default(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("MAX_UPLOAD_PIXELS", "bad")
+    settings_env.setenv("MAX_UPLOAD_PIXELS", "bad")
 
     assert get_configured_max_image_pixels() == MAX_IMAGE_PIXELS
 
 
 def test_get_configured_max_upload_bytes_zero_uses_default(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("MAX_UPLOAD_BYTES", "0")
+    settings_env.setenv("MAX_UPLOAD_BYTES", "0")
 
     assert get_configured_max_upload_bytes() == MAX_FILE_SIZE_BYTES
 
 
 def test_get_configured_max_upload_bytes_negative_uses_default(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("MAX_UPLOAD_BYTES", "-1")
+    settings_env.setenv("MAX_UPLOAD_BYTES", "-1")
 
     assert get_configured_max_upload_bytes() == MAX_FILE_SIZE_BYTES
 
 
 def test_get_configured_max_image_pixels_zero_uses_default(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("MAX_UPLOAD_PIXELS", "0")
+    settings_env.setenv("MAX_UPLOAD_PIXELS", "0")
 
     assert get_configured_max_image_pixels() == MAX_IMAGE_PIXELS
 
 
 def test_get_configured_max_image_pixels_negative_uses_default(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("MAX_UPLOAD_PIXELS", "-1")
+    settings_env.setenv("MAX_UPLOAD_PIXELS", "-1")
 
     assert get_configured_max_image_pixels() == MAX_IMAGE_PIXELS
 
 
 def test_validate_image_upload_respects_env_var_size_limit(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("MAX_UPLOAD_BYTES", "4")
+    settings_env.setenv("MAX_UPLOAD_BYTES", "4")
     file = _upload_file("photo.png", "image/png", PNG_1X1_BYTES)
 
     with pytest.raises(ImageValidationError) as exc:
@@ -167,12 +174,37 @@ def test_validate_image_upload_respects_env_var_size_limit(
 
 
 def test_validate_image_upload_respects_env_var_pixel_limit(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("MAX_UPLOAD_PIXELS", "1")  # 2x2 image has 4 pixels, exceeds limit
+    settings_env.setenv("MAX_UPLOAD_PIXELS", "1")  # 2x2 image has 4 pixels, exceeds limit
     file = _upload_file("photo.png", "image/png", PNG_2X2_BYTES)
 
     with pytest.raises(ImageValidationError) as exc:
         validate_image_upload(file)
 
     assert exc.value.code == "image_too_large_pixels"
+
+
+def test_accepts_image_above_max_pixels_when_tiling_enabled() -> None:
+    file = _upload_file("photo.png", "image/png", PNG_2X2_BYTES)
+    settings = Settings(
+        max_image_pixels=1, ocr_tiling=TilingSettings(enabled=True, max_pixels=100)
+    )
+
+    result = validate_image_upload(file, settings=settings)
+
+    assert (result.width, result.height) == (2, 2)
+
+
+def test_header_inspection_accepts_a_truncated_image_that_the_full_decode_rejects() -> None:
+    truncated = PNG_1X1_BYTES[:-24]
+    file = _upload_file("photo.png", "image/png", truncated)
+
+    validated = inspect_image_upload(file)
+
+    assert (validated.width, validated.height) == (1, 1)
+    with pytest.raises(ImageValidationError) as exc:
+        verify_image_integrity(truncated)
+    assert exc.value.code == "image_decode_failed"
+    with pytest.raises(ImageValidationError):
+        validate_image_upload(file)
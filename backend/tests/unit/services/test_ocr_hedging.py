@@ -0,0 +1,225 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.adapters.ocr_provider import OcrExecutionError, ProviderUnavailableError, RawOcrSegment
+from app.core.metrics import MetricsStore, metrics_store
+from app.core.settings import HedgingSettings
+from app.services.ocr_hedging import HedgeOutcome, OcrHedger
+
+CONFIG = HedgingSettings(enabled=True, min_delay_ms=1, budget=1.0, min_samples=3)
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> None:
+    metrics_store.__dict__.update(MetricsStore().__dict__)
+
+
+def _segments(text: str) -> list[RawOcrSegment]:
+    return [RawOcrSegment(text=text, language="zh", confidence=0.9)]
+
+
+def _warm(hedger: OcrHedger, provider: str = "google_vision") -> None:
+    for latency_ms in (5.0, 10.0, 20.0):
+        hedger.record_latency(provider, latency_ms)
+
+
+def _stalled(release: threading.Event, text: str = "慢"):
+    def call() -> list[RawOcrSegment]:
+        release.wait(timeout=5)
+        return _segments(text)
+
+    return call
+
+
+def _sent(hedge):
+    """A hedge_call that runs the blocking ``hedge`` in a worker thread."""
+    return lambda: asyncio.to_thread(hedge)
+
+
+def _extract(hedger: OcrHedger, call, hedge_call, config: HedgingSettings = CONFIG):
+    outcome = HedgeOutcome()
+    segments = asyncio.run(
+        hedger.extract(
+            "google_vision",
+            call,
+            config=config,
+            hedge_provider="google_vision",
+            hedge_call=hedge_call,
+            outcome=outcome,
+        )
+    )
+    return segments, outcome
+
+
+def test_hedge_delay_waits_for_samples_then_uses_the_percentile() -> None:
+    hedger = OcrHedger()
+    hedger.record_latency("google_vision", 30.0)
+
+    assert hedger.hedge_delay_ms("google_vision", CONFIG) is None
+
+    _warm(hedger)
+    assert hedger.hedge_delay_ms("google_vision", CONFIG) == 30.0
+    assert hedger.hedge_delay_ms(
+        "google_vision", HedgingSettings(percentile=50, min_delay_ms=1, min_samples=3)
+    ) == 10.0
+    assert hedger.hedge_delay_ms(
+        "google_vision", HedgingSettings(min_delay_ms=500, min_samples=3)
+    ) == 500.0
+
+
+def test_slow_call_is_hedged_and_the_first_result_wins() -> None:
+    hedger = OcrHedger()
+    _warm(hedger)
+    release = threading.Event()
+
+    def hedge() -> list[RawOcrSegment]:
+        # Let the stalled primary finish only after the hedge has won.
+        threading.Timer(0.1, release.set).start()
+        return _segments("快")
+
+    segments, outcome = _extract(hedger, _stalled(release), _sent(hedge))
+
+    assert [segment.text for segment in segments] == ["快"]
+    assert outcome == HedgeOutcome(provider="google_vision", won=True, hedges=1)
+    snapshot = metrics_store.snapshot()
+    assert snapshot["ocr_hedges_total"] == 1
+    assert snapshot["ocr_hedge_win_rate"] == 1.0
+
+
+def test_fast_call_is_not_hedged() -> None:
+    hedger = OcrHedger()
+    _warm(hedger)
+
+    segments, outcome = _extract(
+        hedger, lambda: _segments("快"), lambda: pytest.fail("hedge should not run")
+    )
+
+    assert [segment.text for segment in segments] == ["快"]
+    assert outcome == HedgeOutcome()
+    assert metrics_store.snapshot()["ocr_calls_total"] == 1
+    assert metrics_store.snapshot()["ocr_hedges_total"] == 0
+
+
+def test_exhausted_hedge_budget_waits_for_the_primary() -> None:
+    hedger = OcrHedger()
+    _warm(hedger)
+    release = threading.Event()
+    threading.Timer(0.05, release.set).start()
+
+    segments, outcome = _extract(
+        hedger,
+        _stalled(release),
+        lambda: pytest.fail("hedge should not run"),
+        HedgingSettings(enabled=True, min_delay_ms=1, budget=0.5, min_samples=3),
+    )
+
+    assert [segment.text for segment in segments] == ["慢"]
+    assert outcome.provider is None
+
+
+def test_hedge_that_cannot_be_sent_waits_for_the_primary() -> None:
+    hedger = OcrHedger()
+    _warm(hedger)
+    release = threading.Event()
+    threading.Timer(0.05, release.set).start()
+
+    def unavailable():
+        raise ProviderUnavailableError("circuit breaker is open")
+
+    segments, outcome = _extract(hedger, _stalled(release), unavailable)
+
+    assert [segment.text for segment in segments] == ["慢"]
+    assert outcome == HedgeOutcome()
+    assert metrics_store.snapshot()["ocr_hedges_total"] == 0
+    # The token was not spent, so the next slow call can still be hedged.
+    assert hedger._spend() is True
+
+
+def test_failed_primary_is_rescued_by_the_hedge() -> None:
+    hedger = OcrHedger()
+    _warm(hedger)
+    release = threading.Event()
+
+    def slow_failure() -> list[RawOcrSegment]:
+        release.wait(timeout=5)
+        raise OcrExecutionError("boom")
+
+    def hedge() -> list[RawOcrSegment]:
+        release.set()
+        return _segments("快")
+
+    segments, outcome = _extract(hedger, slow_failure, _sent(hedge))
+
+    assert [segment.text for segment in segments] == ["快"]
+    assert outcome.won is True
+
+
+def test_primary_error_is_raised_when_both_calls_fail() -> None:
+    hedger = OcrHedger()
+    _warm(hedger)
+    release = threading.Event()
+
+    def slow_failure() -> list[RawOcrSegment]:
+        release.wait(timeout=5)
+        raise OcrExecutionError("primary")
+
+    def hedge() -> list[RawOcrSegment]:
+        release.set()
+        raise OcrExecutionError("hedge")
+
+    outcome = HedgeOutcome()
+    with pytest.raises(OcrExecutionError, match="primary"):
+        asyncio.run(
+            hedger.extract(
+                "google_vision",
+                slow_failure,
+                config=CONFIG,
+                hedge_provider="google_vision",
+                hedge_call=_sent(hedge),
+                outcome=outcome,
+            )
+        )
+    # The hedge was sent, so it is still charged.
+    assert outcome.provider == "google_vision"
+
+
+def test_outcome_counts_the_hedges_of_every_retry() -> None:
+    hedger = OcrHedger()
+    _warm(hedger)
+    outcome = HedgeOutcome()
+
+    async def retried_call() -> list[RawOcrSegment]:
+        # Both calls of the first attempt fail; the retry is hedged again and the hedge wins.
+        for failing in (True, False):
+            release = threading.Event()
+
+            def primary(release: threading.Event = release) -> list[RawOcrSegment]:
+                release.wait(timeout=5)
+                raise OcrExecutionError("primary")
+
+            def hedge(release: threading.Event = release, failing: bool = failing):
+                if failing:
+                    release.set()
+                    raise OcrExecutionError("hedge")
+                threading.Timer(0.1, release.set).start()
+                return _segments("快")
+
+            try:
+                return await hedger.extract(
+                    "google_vision",
+                    primary,
+                    config=CONFIG,
+                    hedge_provider="google_vision",
+                    hedge_call=_sent(hedge),
+                    outcome=outcome,
+                )
+            except OcrExecutionError:
+                continue
+        raise AssertionError("unreachable")
+
+    segments = asyncio.run(retried_call())
+
+    assert [segment.text for segment in segments] == ["快"]
+    assert outcome == HedgeOutcome(provider="google_vision", won=True, hedges=2)
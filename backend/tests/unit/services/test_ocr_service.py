@@ -1,9 +1,22 @@
 import asyncio
+import threading
+import time
 
 import pytest
-
-from app.adapters.ocr_provider import RawOcrSegment
-from app.services.ocr_service import OcrServiceError, extract_chinese_segments
+from helpers import SettingsEnv
+
+from app.adapters.ocr_provider import OcrExecutionError, RawOcrSegment
+from app.core.circuit_breaker import get_breaker
+from app.core.concurrency_limit import get_limiter, limiter_snapshots
+from app.core.settings import get_settings
+from app.services.ocr_hedging import OcrHedger
+from app.services.ocr_service import (
+    OcrResult,
+    OcrServiceError,
+    OcrTierAttempt,
+    extract_chinese_segments,
+    run_ocr,
+)
 
 PNG_1X1_BYTES = (
     b"\x89PNG\r\n\x1a\n"
@@ -27,7 +40,7 @@ class StubProvider:
 def test_extract_chinese_segments_normalizes_fields(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(
         "app.services.ocr_service.get_ocr_provider",
-        lambda: StubProvider(
+        lambda name: StubProvider(
             [
                 RawOcrSegment(text=" 你好 ", language="ZH-HANS", confidence=92, line_id=7),
                 RawOcrSegment(text="hello", language="en", confidence=0.6),
@@ -47,7 +60,7 @@ def test_extract_chinese_segments_normalizes_fields(monkeypatch: pytest.MonkeyPa
 def test_extract_chinese_segments_preserves_none_line_id(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(
         "app.services.ocr_service.get_ocr_provider",
-        lambda: StubProvider(
+        lambda name: StubProvider(
             [RawOcrSegment(text="你好", language="zh", confidence=0.9)]
         ),
     )
@@ -62,7 +75,7 @@ def test_extract_chinese_segments_raises_when_no_usable_text(
 ) -> None:
     monkeypatch.setattr(
         "app.services.ocr_service.get_ocr_provider",
-        lambda: StubProvider([]),
+        lambda name: StubProvider([]),
     )
 
     with pytest.raises(OcrServiceError) as exc:
@@ -77,7 +90,7 @@ def test_extract_chinese_segments_non_chinese_only_raises_specific_error(
 ) -> None:
     monkeypatch.setattr(
         "app.services.ocr_service.get_ocr_provider",
-        lambda: StubProvider(
+        lambda name: StubProvider(
             [
                 RawOcrSegment(text="Hello World", language="en", confidence=0.95),
                 RawOcrSegment(text="Page 12", language="en", confidence=0.90),
@@ -97,7 +110,7 @@ def test_extract_chinese_segments_mixed_returns_only_chinese(
 ) -> None:
     monkeypatch.setattr(
         "app.services.ocr_service.get_ocr_provider",
-        lambda: StubProvider(
+        lambda name: StubProvider(
             [
                 RawOcrSegment(text="你好世界", language="zh-hans", confidence=0.95),
                 RawOcrSegment(text="Page 1", language="en", confidence=0.90),
@@ -116,7 +129,7 @@ def test_extract_chinese_segments_empty_raw_raises_no_text_detected(
 ) -> None:
     monkeypatch.setattr(
         "app.services.ocr_service.get_ocr_provider",
-        lambda: StubProvider([]),
+        lambda name: StubProvider([]),
     )
 
     with pytest.raises(OcrServiceError) as exc:
@@ -135,7 +148,9 @@ def test_extract_raises_provider_unavailable_on_provider_unavailable_error(
         def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
             raise ProviderUnavailableError("not configured")
 
-    monkeypatch.setattr("app.services.ocr_service.get_ocr_provider", UnavailableProvider)
+    monkeypatch.setattr(
+        "app.services.ocr_service.get_ocr_provider", lambda name: UnavailableProvider()
+    )
 
     with pytest.raises(OcrServiceError) as exc:
         asyncio.run(extract_chinese_segments(PNG_1X1_BYTES, "image/png"))
@@ -153,7 +168,9 @@ def test_extract_raises_execution_failed_on_ocr_execution_error(
         def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
             raise AdapterError("api call failed")
 
-    monkeypatch.setattr("app.services.ocr_service.get_ocr_provider", FailingProvider)
+    monkeypatch.setattr(
+        "app.services.ocr_service.get_ocr_provider", lambda name: FailingProvider()
+    )
 
     with pytest.raises(OcrServiceError) as exc:
         asyncio.run(extract_chinese_segments(PNG_1X1_BYTES, "image/png"))
@@ -182,16 +199,252 @@ def test_normalize_language_handles_none_and_empty() -> None:
     assert _normalize_language("ZH-HANS") == "zh-hans"
 
 
-def test_invalid_low_confidence_threshold_falls_back_to_default(
+
+class FailingProvider:
+    def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
+        _ = (image_bytes, content_type)
+        raise OcrExecutionError("boom")
+
+
+def _cascade(
+    monkeypatch: pytest.MonkeyPatch, settings_env: SettingsEnv, providers: dict[str, object]
+) -> list[str]:
+    called: list[str] = []
+
+    def factory(name: str | None = None) -> object:
+        called.append(name)
+        return providers[name]
+
+    settings_env.setenv("OCR_CASCADE", ",".join(providers))
+    monkeypatch.setattr("app.services.ocr_service.get_ocr_provider", factory)
+    return called
+
+
+def test_run_ocr_stops_at_the_first_confident_tier(
+    monkeypatch: pytest.MonkeyPatch, settings_env: SettingsEnv
+) -> None:
+    called = _cascade(
+        monkeypatch,
+        settings_env,
+        {
+            "local": StubProvider([RawOcrSegment(text="你好", language="zh", confidence=0.95)]),
+            "google_vision": FailingProvider(),
+        },
+    )
+
+    result = asyncio.run(run_ocr(PNG_1X1_BYTES, "image/png"))
+
+    assert called == ["local"]
+    assert result.provider == "local"
+    assert result.providers_run == ["local"]
+    assert result.attempts[0].outcome == "served"
+    assert result.attempts[0].average_confidence == pytest.approx(0.95)
+
+
+def test_run_ocr_escalates_on_low_confidence_and_no_chinese_text(
+    monkeypatch: pytest.MonkeyPatch, settings_env: SettingsEnv
+) -> None:
+    _cascade(
+        monkeypatch,
+        settings_env,
+        {
+            "local": StubProvider([RawOcrSegment(text="你好", language="zh", confidence=0.3)]),
+            "textract": StubProvider([RawOcrSegment(text="hello", language="en", confidence=1)]),
+            "google_vision": StubProvider(
+                [RawOcrSegment(text="你好吗", language="zh", confidence=0.9)]
+            ),
+        },
+    )
+
+    result = asyncio.run(run_ocr(PNG_1X1_BYTES, "image/png"))
+
+    assert result.provider == "google_vision"
+    assert [segment.text for segment in result.segments] == ["你好吗"]
+    assert [(a.provider, a.outcome, a.reason) for a in result.attempts] == [
+        ("local", "escalated", "low_confidence"),
+        ("textract", "escalated", "no_chinese_text"),
+        ("google_vision", "served", None),
+    ]
+
+
+def test_run_ocr_falls_back_to_low_confidence_result_when_last_tier_fails(
+    monkeypatch: pytest.MonkeyPatch, settings_env: SettingsEnv
+) -> None:
+    _cascade(
+        monkeypatch,
+        settings_env,
+        {
+            "local": StubProvider([RawOcrSegment(text="你好", language="zh", confidence=0.3)]),
+            "google_vision": FailingProvider(),
+        },
+    )
+
+    result = asyncio.run(run_ocr(PNG_1X1_BYTES, "image/png"))
+
+    assert result.provider == "local"
+    assert [segment.text for segment in result.segments] == ["你好"]
+    assert [(a.outcome, a.reason) for a in result.attempts] == [
+        ("served", "low_confidence"),
+        ("failed", "provider_error"),
+    ]
+
+
+def test_run_ocr_raises_last_error_with_attempts_when_every_tier_fails(
+    monkeypatch: pytest.MonkeyPatch, settings_env: SettingsEnv
+) -> None:
+    _cascade(
+        monkeypatch,
+        settings_env,
+        {"local": FailingProvider(), "google_vision": FailingProvider()},
+    )
+
+    with pytest.raises(OcrServiceError) as exc_info:
+        asyncio.run(run_ocr(PNG_1X1_BYTES, "image/png"))
+
+    assert exc_info.value.code == "ocr_execution_failed"
+    assert [a.outcome for a in exc_info.value.attempts] == ["escalated", "failed"]
+
+
+def test_ocr_result_charges_hedges_that_were_sent() -> None:
+    result = OcrResult(
+        segments=[],
+        provider="google_vision",
+        attempts=[
+            OcrTierAttempt(provider="local", outcome="escalated", reason="low_confidence"),
+            OcrTierAttempt(
+                provider="google_vision",
+                outcome="served",
+                hedge_provider="google_vision",
+                hedges=2,
+                attempts=2,
+            ),
+        ],
+    )
+
+    # Both retries were hedged, so both hedges are charged.
+    assert result.providers_run == ["local", "google_vision", "google_vision", "google_vision"]
+
+
+def test_hedge_is_recorded_on_the_hedge_providers_breaker(
+    monkeypatch: pytest.MonkeyPatch, settings_env: SettingsEnv
+) -> None:
+    release = threading.Event()
+
+    class StalledProvider:
+        def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
+            release.wait(timeout=5)
+            return [RawOcrSegment(text="慢", language="zh", confidence=0.9)]
+
+    class FastProvider:
+        def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
+            threading.Timer(0.1, release.set).start()
+            return [RawOcrSegment(text="快", language="zh", confidence=0.9)]
+
+    providers = {"google_vision": StalledProvider(), "textract": FastProvider()}
+    settings_env.setenv("OCR_PROVIDER", "google_vision")
+    settings_env.setenv("OCR_HEDGE_ENABLED", "true")
+    settings_env.setenv("OCR_HEDGE_PROVIDER", "textract")
+    settings_env.setenv("OCR_HEDGE_BUDGET", "1")
+    settings_env.setenv("OCR_HEDGE_MIN_DELAY_MS", "1")
+    settings_env.setenv("OCR_HEDGE_MIN_SAMPLES", "1")
+    hedger = OcrHedger()
+    hedger.record_latency("google_vision", 1.0)
+    monkeypatch.setattr("app.services.ocr_service.ocr_hedger", hedger)
+    monkeypatch.setattr("app.services.ocr_service.get_ocr_provider", providers.__getitem__)
+
+    result = asyncio.run(run_ocr(PNG_1X1_BYTES, "image/png"))
+
+    assert [segment.text for segment in result.segments] == ["快"]
+    assert result.attempts[0].hedge_won is True
+    settings = get_settings()
+    assert get_breaker("ocr", "textract", settings).snapshot().calls == 1
+    assert get_breaker("ocr", "google_vision", settings).snapshot().calls == 1
+
+
+def test_open_circuit_breaker_fails_fast_without_calling_the_provider(
+    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
+) -> None:
+    calls: list[bytes] = []
+
+    class CountingFailingProvider:
+        def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
+            calls.append(image_bytes)
+            raise OcrExecutionError("boom")
+
+    settings_env.setenv("CIRCUIT_BREAKER_MIN_CALLS", "2")
+    monkeypatch.setattr(
+        "app.services.ocr_service.get_ocr_provider", lambda name: CountingFailingProvider()
+    )
+
+    codes = []
+    for _ in range(4):
+        with pytest.raises(OcrServiceError) as exc_info:
+            asyncio.run(extract_chinese_segments(PNG_1X1_BYTES, "image/png"))
+        codes.append(exc_info.value.code)
+
+    assert len(calls) == 2
+    assert codes == [
+        "ocr_execution_failed",
+        "ocr_execution_failed",
+        "ocr_provider_unavailable",
+        "ocr_provider_unavailable",
+    ]
+
+
+def test_run_ocr_retries_transient_provider_errors(
+    monkeypatch: pytest.MonkeyPatch, settings_env: SettingsEnv
+) -> None:
+    class FlakyProvider:
+        calls = 0
+
+        def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
+            FlakyProvider.calls += 1
+            if FlakyProvider.calls == 1:
+                raise OcrExecutionError("503 Service Unavailable", retryable=True)
+            return [RawOcrSegment(text="你好", language="zh", confidence=0.9)]
+
+    settings_env.setenv("RETRY_BASE_DELAY_MS", "1")
+    monkeypatch.setattr(
+        "app.services.ocr_service.get_ocr_provider", lambda name: FlakyProvider()
+    )
+
+    result = asyncio.run(run_ocr(PNG_1X1_BYTES, "image/png"))
+
+    assert [segment.text for segment in result.segments] == ["你好"]
+    assert result.attempts[0].attempts == 2
+
+
+def test_run_ocr_fails_as_unavailable_when_no_call_slot_frees_up_before_the_deadline(
     monkeypatch: pytest.MonkeyPatch,
-    caplog: pytest.LogCaptureFixture,
+    settings_env: SettingsEnv,
 ) -> None:
-    from app.services.ocr_service import _resolve_low_confidence_threshold
+    settings_env.setenv("ADAPTIVE_CONCURRENCY_INITIAL_LIMIT", "1")
+    settings_env.setenv("ADAPTIVE_CONCURRENCY_MAX_LIMIT", "1")
+    monkeypatch.setattr(
+        "app.services.ocr_service.get_ocr_provider",
+        lambda name: StubProvider([RawOcrSegment(text="你好", language="zh", confidence=0.9)]),
+    )
+    limiter = get_limiter("ocr", get_settings().ocr_provider, get_settings())
+
+    async def run_while_the_slot_is_taken() -> None:
+        await limiter.acquire()
+        await run_ocr(PNG_1X1_BYTES, "image/png", deadline=time.monotonic() + 0.01)
+
+    with pytest.raises(OcrServiceError) as exc_info:
+        asyncio.run(run_while_the_slot_is_taken())
+
+    assert exc_info.value.code == "ocr_provider_unavailable"
 
-    monkeypatch.setenv("OCR_LOW_CONFIDENCE_THRESHOLD", "not-a-number")
 
-    with caplog.at_level("WARNING"):
-        threshold = _resolve_low_confidence_threshold()
+def test_run_ocr_calls_go_through_the_provider_limiter(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        "app.services.ocr_service.get_ocr_provider",
+        lambda name: StubProvider([RawOcrSegment(text="你好", language="zh", confidence=0.9)]),
+    )
+
+    asyncio.run(run_ocr(PNG_1X1_BYTES, "image/png"))
 
-    assert threshold == pytest.approx(0.7)
-    assert "Invalid OCR_LOW_CONFIDENCE_THRESHOLD" in caplog.text
+    snapshot = limiter_snapshots()[f"ocr:{get_settings().ocr_provider or 'none'}"]
+    assert snapshot.in_flight == 0
+    assert snapshot.baseline_latency_ms >= 0
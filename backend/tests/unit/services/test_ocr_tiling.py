@@ -0,0 +1,187 @@
+import asyncio
+import io
+import time
+
+import pytest
+from fastapi import UploadFile
+from PIL import ExifTags, Image
+
+from app.adapters.ocr_provider import RawOcrSegment
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.settings import CircuitBreakerSettings, Settings, TilingSettings
+from app.services.image_validation import inspect_image_upload
+from app.services.ocr_tiling import (
+    Tile,
+    extract_tiled,
+    merge_tile_segments,
+    plan_tiles,
+    should_tile,
+)
+
+TILING = TilingSettings(enabled=True, tile_size=100, overlap=20, min_pixels=10_000)
+
+
+def _png(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_plan_tiles_covers_image_with_at_least_the_configured_overlap() -> None:
+    tiles = plan_tiles(250, 90, TILING)
+
+    assert [(tile.left, tile.right) for tile in tiles] == [(0, 100), (75, 175), (150, 250)]
+    assert {(tile.top, tile.bottom) for tile in tiles} == {(0, 90)}
+
+
+def test_plan_tiles_returns_single_tile_for_small_image() -> None:
+    assert plan_tiles(80, 60, TILING) == [Tile(0, 0, 80, 60)]
+
+
+def test_should_tile_requires_tiling_enabled_and_a_large_image() -> None:
+    settings = Settings(ocr_tiling=TILING)
+
+    assert should_tile(300, 300, settings)
+    assert not should_tile(100, 100, settings)  # fits in one tile
+    assert not should_tile(300, 300, Settings(ocr_tiling=TilingSettings(tile_size=100)))
+
+
+def test_should_tile_images_above_max_pixels_even_below_tiling_threshold() -> None:
+    settings = Settings(
+        max_image_pixels=20_000,
+        ocr_tiling=TilingSettings(enabled=True, tile_size=100, min_pixels=1_000_000),
+    )
+
+    assert should_tile(200, 150, settings)
+    assert not should_tile(120, 150, settings)
+
+
+def test_merge_drops_line_seen_by_both_tiles_in_overlap() -> None:
+    left, right = Tile(0, 0, 100, 100), Tile(80, 0, 180, 100)
+    merged = merge_tile_segments(
+        [
+            (left, [RawOcrSegment(text="你好", confidence=0.9, line_id=0, bbox=(82, 10, 98, 20))]),
+            (right, [RawOcrSegment(text="你好", confidence=0.8, line_id=0, bbox=(2, 10, 18, 20))]),
+        ]
+    )
+
+    assert [(segment.text, segment.line_id) for segment in merged] == [("你好", 0)]
+
+
+def test_merge_stitches_line_cut_by_tile_edge() -> None:
+    left, right = Tile(0, 0, 100, 100), Tile(80, 0, 180, 100)
+    merged = merge_tile_segments(
+        [
+            (left, [RawOcrSegment(text="今天天气", line_id=0, bbox=(40, 10, 100, 20))]),
+            (right, [RawOcrSegment(text="天气很好", line_id=0, bbox=(0, 10, 60, 20))]),
+        ]
+    )
+
+    assert len(merged) == 1
+    assert merged[0].text == "今天天气很好"
+    assert merged[0].bbox == (40, 10, 140, 20)
+
+
+def test_merge_renumbers_lines_in_reading_order() -> None:
+    top_left, top_right = Tile(0, 0, 100, 100), Tile(80, 0, 180, 100)
+    bottom_left = Tile(0, 80, 100, 180)
+    merged = merge_tile_segments(
+        [
+            (top_left, [RawOcrSegment(text="第一", line_id=0, bbox=(10, 10, 50, 20))]),
+            (top_right, [RawOcrSegment(text="第二", line_id=0, bbox=(40, 12, 90, 22))]),
+            (bottom_left, [RawOcrSegment(text="第三", line_id=0, bbox=(10, 40, 50, 50))]),
+        ]
+    )
+
+    assert [(segment.text, segment.line_id) for segment in merged] == [
+        ("第一", 0),
+        ("第二", 1),
+        ("第三", 2),
+    ]
+
+
+def test_merge_keeps_distinct_lines_that_overlap_different_regions() -> None:
+    left, right = Tile(0, 0, 100, 100), Tile(80, 0, 180, 100)
+    merged = merge_tile_segments(
+        [
+            (left, [RawOcrSegment(text="出口", line_id=0, bbox=(10, 10, 30, 20))]),
+            (right, [RawOcrSegment(text="出口", line_id=0, bbox=(70, 10, 90, 20))]),
+        ]
+    )
+
+    assert [segment.text for segment in merged] == ["出口", "出口"]
+
+
+class _RecordingProvider:
+    def __init__(self) -> None:
+        self.sizes: list[tuple[int, int]] = []
+
+    def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
+        assert content_type == "image/png"
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            self.sizes.append(image.size)
+        return [RawOcrSegment(text="字", confidence=0.9, line_id=0, bbox=(30, 30, 50, 50))]
+
+
+def test_extract_tiled_sends_each_tile_and_merges_results() -> None:
+    provider = _RecordingProvider()
+
+    segments = asyncio.run(extract_tiled(provider, _png(250, 90), "image/png", TILING))
+
+    assert provider.sizes == [(100, 90)] * 3
+    assert [segment.line_id for segment in segments] == [0, 1, 2]
+    assert [segment.bbox for segment in segments] == [
+        (30, 30, 50, 50),
+        (105, 30, 125, 50),
+        (180, 30, 200, 50),
+    ]
+
+
+def test_tile_plan_from_inspected_size_matches_the_tiles_sent_for_rotated_photo() -> None:
+    # Stored landscape, displayed portrait: a phone photo taken upright.
+    exif = Image.Exif()
+    exif[ExifTags.Base.Orientation] = 6
+    buffer = io.BytesIO()
+    Image.new("RGB", (250, 90), "white").save(buffer, format="PNG", exif=exif)
+    image_bytes = buffer.getvalue()
+    upload = UploadFile(
+        filename="photo.png", file=io.BytesIO(image_bytes), headers={"content-type": "image/png"}
+    )
+    provider = _RecordingProvider()
+
+    validated = inspect_image_upload(upload)
+    asyncio.run(extract_tiled(provider, image_bytes, "image/png", TILING))
+
+    assert (validated.width, validated.height) == (90, 250)
+    planned = plan_tiles(validated.width, validated.height, TILING)
+    assert provider.sizes == [(tile.right - tile.left, tile.bottom - tile.top) for tile in planned]
+
+
+def test_extract_tiled_propagates_tile_failure() -> None:
+    class FailingProvider:
+        def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
+            raise RuntimeError("tile failed")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(extract_tiled(FailingProvider(), _png(250, 90), "image/png", TILING))
+
+
+def test_extract_tiled_records_each_tile_on_the_breaker() -> None:
+    class SlowTileProvider:
+        def extract(self, *, image_bytes: bytes, content_type: str) -> list[RawOcrSegment]:
+            time.sleep(0.04)
+            return []
+
+    breaker = CircuitBreaker(CircuitBreakerSettings(), slow_call_ms=100.0)
+    tiling = TilingSettings(
+        enabled=True, tile_size=100, overlap=20, min_pixels=10_000, concurrency=1
+    )
+
+    # Three sequential tiles take well over slow_call_ms, but none of them is slow.
+    asyncio.run(
+        extract_tiled(SlowTileProvider(), _png(250, 90), "image/png", tiling, breaker=breaker)
+    )
+
+    snapshot = breaker.snapshot()
+    assert snapshot.calls == 3
+    assert snapshot.failure_rate == 0.0
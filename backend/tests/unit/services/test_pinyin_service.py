@@ -5,8 +5,8 @@ import asyncio
 import pytest
 
 from app.adapters.pinyin_provider import RawPinyinSegment
-from app.schemas.process import OcrSegment
 from app.services.pinyin_service import PinyinServiceError, generate_pinyin
+from app.services.segments import TextSegment
 
 
 class StubPinyinProvider:
@@ -23,8 +23,8 @@ def _make_ocr_segment(
     language: str = "zh",
     confidence: float = 0.9,
     line_id: int | None = None,
-) -> OcrSegment:
-    return OcrSegment(text=text, language=language, confidence=confidence, line_id=line_id)
+) -> TextSegment:
+    return TextSegment(text=text, language=language, confidence=confidence, line_id=line_id)
 
 
 def test_generate_pinyin_returns_segment_level_output(monkeypatch: pytest.MonkeyPatch) -> None:
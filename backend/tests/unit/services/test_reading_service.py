@@ -1,5 +1,5 @@
-from app.schemas.process import PinyinData, PinyinSegment
 from app.services.reading_service import build_reading_projection
+from app.services.segments import AnnotatedSegment, PinyinResult
 
 
 def _make_segment(
@@ -7,8 +7,8 @@ def _make_segment(
     *,
     line_id: int | None,
     translation_text: str | None = None,
-) -> PinyinSegment:
-    return PinyinSegment(
+) -> AnnotatedSegment:
+    return AnnotatedSegment(
         source_text=source_text,
         pinyin_text="placeholder",
         alignment_status="aligned",
@@ -19,7 +19,7 @@ def _make_segment(
 
 def test_build_reading_projection_groups_adjacent_segments_by_line_and_preserves_indexes() -> None:
     result = build_reading_projection(
-        PinyinData(
+        PinyinResult(
             segments=[
                 _make_segment("老师", line_id=0, translation_text="teacher"),
                 _make_segment("好", line_id=0, translation_text="teacher"),
@@ -45,7 +45,7 @@ def test_build_reading_projection_groups_adjacent_segments_by_line_and_preserves
 
 def test_build_reading_projection_never_crosses_line_boundaries() -> None:
     result = build_reading_projection(
-        PinyinData(
+        PinyinResult(
             segments=[
                 _make_segment("老师", line_id=0),
                 _make_segment("同学们", line_id=1),
@@ -60,7 +60,7 @@ def test_build_reading_projection_never_crosses_line_boundaries() -> None:
 
 def test_build_reading_projection_returns_none_when_no_safe_improvement_exists() -> None:
     result = build_reading_projection(
-        PinyinData(
+        PinyinResult(
             segments=[
                 _make_segment("老师。", line_id=0),
                 _make_segment("同学们好！", line_id=1),
@@ -74,7 +74,7 @@ def test_build_reading_projection_returns_none_when_no_safe_improvement_exists()
 
 def test_build_reading_projection_inserts_comma_after_mid_line_particle() -> None:
     result = build_reading_projection(
-        PinyinData(
+        PinyinResult(
             segments=[
                 _make_segment("太阳公公起床了公鸡", line_id=0),
             ]
@@ -88,7 +88,7 @@ def test_build_reading_projection_inserts_comma_after_mid_line_particle() -> Non
 
 def test_build_reading_projection_skips_comma_for_terminal_particle() -> None:
     result = build_reading_projection(
-        PinyinData(
+        PinyinResult(
             segments=[
                 _make_segment("你好了", line_id=0),
             ]
@@ -101,7 +101,7 @@ def test_build_reading_projection_skips_comma_for_terminal_particle() -> None:
 
 def test_build_reading_projection_skips_comma_when_particle_is_too_close_to_clause_start() -> None:
     result = build_reading_projection(
-        PinyinData(
+        PinyinResult(
             segments=[
                 _make_segment("了解后续", line_id=0),
             ]
@@ -114,7 +114,7 @@ def test_build_reading_projection_skips_comma_when_particle_is_too_close_to_clau
 
 def test_build_reading_projection_skips_comma_when_particle_has_only_one_preceding_char() -> None:
     result = build_reading_projection(
-        PinyinData(
+        PinyinResult(
             segments=[
                 _make_segment("不了解", line_id=0),
             ]
@@ -127,7 +127,7 @@ def test_build_reading_projection_skips_comma_when_particle_has_only_one_precedi
 
 def test_build_reading_projection_inserts_multiple_particle_commas() -> None:
     result = build_reading_projection(
-        PinyinData(
+        PinyinResult(
             segments=[
                 _make_segment("起床了吃饭吧出门啊", line_id=0),
             ]
@@ -140,7 +140,7 @@ def test_build_reading_projection_inserts_multiple_particle_commas() -> None:
 
 def test_build_reading_projection_with_existing_terminal_punctuation_still_returns_none() -> None:
     result = build_reading_projection(
-        PinyinData(
+        PinyinResult(
             segments=[
                 _make_segment("起床了。", line_id=0),
                 _make_segment("吃饭吧！", line_id=1),
@@ -154,7 +154,7 @@ def test_build_reading_projection_with_existing_terminal_punctuation_still_retur
 def test_build_reading_projection_still_appends_terminal_punctuation_when_no_particles_exist(
 ) -> None:
     result = build_reading_projection(
-        PinyinData(
+        PinyinResult(
             segments=[
                 _make_segment("今天我们上课", line_id=0),
             ]
@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import google.api_core.exceptions
+import pytest
+
+from app.adapters.ocr_provider import OcrExecutionError
+from app.adapters.transient_errors import is_transient_google_error
+from app.core.settings import RetrySettings
+from app.services.retry import RetryBudget, RetryStats, backoff_s, call_with_retry
+
+CONFIG = RetrySettings(max_attempts=3, base_delay_ms=100, max_delay_ms=250)
+
+
+class FlakyCall:
+    def __init__(self, failures: list[Exception]) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return "ok"
+
+
+def _transient() -> OcrExecutionError:
+    return OcrExecutionError("503", retryable=True)
+
+
+def _run(call: FlakyCall, *, budget: RetryBudget | None = None, deadline: float | None = None):
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    stats = RetryStats()
+    result = asyncio.run(
+        call_with_retry(
+            call,
+            config=CONFIG,
+            budget=budget or RetryBudget(),
+            deadline=deadline,
+            stats=stats,
+            sleep=fake_sleep,
+            jitter=lambda: 1.0,
+        )
+    )
+    return result, stats, sleeps
+
+
+def test_transient_errors_are_retried_with_exponential_backoff() -> None:
+    call = FlakyCall([_transient(), _transient()])
+
+    result, stats, sleeps = _run(call)
+
+    assert result == "ok"
+    assert stats == RetryStats(attempts=3, retries=2)
+    assert sleeps == [pytest.approx(0.1), pytest.approx(0.2)]
+
+
+def test_permanent_errors_are_not_retried() -> None:
+    call = FlakyCall([OcrExecutionError("400 bad image")])
+
+    with pytest.raises(OcrExecutionError, match="bad image"):
+        _run(call)
+
+    assert call.calls == 1
+
+
+def test_retries_stop_after_max_attempts() -> None:
+    call = FlakyCall([_transient(), _transient(), _transient()])
+
+    with pytest.raises(OcrExecutionError):
+        _run(call)
+
+    assert call.calls == 3
+
+
+def test_spent_retry_budget_stops_retries() -> None:
+    budget = RetryBudget(max_tokens=10)
+    for _ in range(5):
+        budget.record_failure()
+    call = FlakyCall([_transient()])
+
+    with pytest.raises(OcrExecutionError):
+        _run(call, budget=budget)
+
+    assert call.calls == 1
+
+
+def test_retry_budget_refills_on_success() -> None:
+    budget = RetryBudget(max_tokens=10)
+    for _ in range(5):
+        budget.record_failure()
+    for _ in range(10):
+        budget.record_success(0.1)
+
+    assert budget.allows_retry() is True
+
+
+def test_retry_is_skipped_when_backoff_would_pass_the_deadline() -> None:
+    call = FlakyCall([_transient()])
+
+    with pytest.raises(OcrExecutionError):
+        _run(call, deadline=time.monotonic() + 0.05)
+
+    assert call.calls == 1
+
+
+def test_backoff_is_capped_and_jittered() -> None:
+    assert backoff_s(5, CONFIG, lambda: 1.0) == pytest.approx(0.25)
+    assert backoff_s(1, CONFIG, lambda: 0.5) == pytest.approx(0.05)
+
+
+def test_google_errors_are_classified_as_transient_or_permanent() -> None:
+    assert is_transient_google_error(google.api_core.exceptions.ServiceUnavailable("down"))
+    assert is_transient_google_error(google.api_core.exceptions.DeadlineExceeded("slow"))
+    assert not is_transient_google_error(google.api_core.exceptions.InvalidArgument("bad"))
+    assert not is_transient_google_error(google.api_core.exceptions.PermissionDenied("no"))
@@ -0,0 +1,51 @@
+from app.schemas.process import OcrData, PinyinData
+from app.services.segments import (
+    AnnotatedSegment,
+    PinyinResult,
+    TextSegment,
+    to_ocr_data,
+    to_pinyin_data,
+)
+
+
+def test_to_ocr_data_builds_schema_segments() -> None:
+    result = to_ocr_data([TextSegment(text="你好", language="zh", confidence=0.9, line_id=2)])
+
+    assert isinstance(result, OcrData)
+    assert result.model_dump() == {
+        "segments": [{"text": "你好", "language": "zh", "confidence": 0.9, "line_id": 2}]
+    }
+
+
+def test_to_pinyin_data_preserves_all_segment_fields() -> None:
+    result = to_pinyin_data(
+        PinyinResult(
+            segments=[
+                AnnotatedSegment(
+                    source_text="你好",
+                    pinyin_text="nǐ hǎo",
+                    alignment_status="aligned",
+                    line_id=0,
+                    translation_text="hello",
+                ),
+                AnnotatedSegment(
+                    source_text="？",
+                    pinyin_text="",
+                    alignment_status="uncertain",
+                    reason_code="pinyin_execution_failed",
+                ),
+            ]
+        )
+    )
+
+    assert isinstance(result, PinyinData)
+    # Round-trips through full validation unchanged.
+    assert PinyinData.model_validate(result.model_dump()) == result
+    assert result.segments[0].translation_text == "hello"
+    assert result.segments[1].reason_code == "pinyin_execution_failed"
+
+
+def test_pipeline_segments_use_slots() -> None:
+    segment = TextSegment(text="你", language="zh", confidence=1.0)
+
+    assert not hasattr(segment, "__dict__")
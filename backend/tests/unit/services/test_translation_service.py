@@ -2,13 +2,17 @@ import asyncio
 import time
 
 import pytest
+from helpers import SettingsEnv
 
 from app.adapters.translation_provider import (
     TranslationExecutionError,
     TranslationProviderUnavailableError,
 )
-from app.schemas.process import PinyinData, PinyinSegment
-from app.services.translation_service import enrich_translations
+from app.core.circuit_breaker import get_breaker
+from app.core.settings import get_settings
+from app.services.retry import RetryStats
+from app.services.segments import AnnotatedSegment, PinyinResult
+from app.services.translation_service import _translation_executor, enrich_translations
 
 
 def _make_segment(
@@ -16,8 +20,8 @@ def _make_segment(
     *,
     line_id: int | None = None,
     translation_text: str | None = None,
-) -> PinyinSegment:
-    return PinyinSegment(
+) -> AnnotatedSegment:
+    return AnnotatedSegment(
         source_text=source_text,
         pinyin_text="placeholder",
         alignment_status="aligned",
@@ -38,6 +42,7 @@ class RecordingTranslationProvider:
 
 def test_enrich_translations_applies_same_line_translation_to_each_segment(
     monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
     provider = RecordingTranslationProvider(
         {
@@ -45,7 +50,7 @@ def test_enrich_translations_applies_same_line_translation_to_each_segment(
             "你好": "hello",
         }
     )
-    monkeypatch.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
     monkeypatch.setattr(
         "app.services.translation_service.get_translation_provider",
         lambda: provider,
@@ -53,7 +58,7 @@ def test_enrich_translations_applies_same_line_translation_to_each_segment(
 
     result = asyncio.run(
         enrich_translations(
-            PinyinData(
+            PinyinResult(
                 segments=[
                     _make_segment("老", line_id=0),
                     _make_segment("师", line_id=0),
@@ -72,13 +77,13 @@ def test_enrich_translations_applies_same_line_translation_to_each_segment(
 
 
 def test_enrich_translations_returns_nulls_when_disabled(
-    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
-    monkeypatch.setenv("TRANSLATION_ENABLED", "false")
+    settings_env.setenv("TRANSLATION_ENABLED", "false")
 
     result = asyncio.run(
         enrich_translations(
-            PinyinData(segments=[_make_segment("你好", line_id=0, translation_text="stale")])
+            PinyinResult(segments=[_make_segment("你好", line_id=0, translation_text="stale")])
         )
     )
 
@@ -87,13 +92,14 @@ def test_enrich_translations_returns_nulls_when_disabled(
 
 def test_enrich_translations_returns_nulls_when_provider_unavailable(
     monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
     caplog: pytest.LogCaptureFixture,
 ) -> None:
     class UnavailableProvider:
         def translate(self, *, text: str, target_language: str) -> str:
             raise TranslationProviderUnavailableError("not configured")
 
-    monkeypatch.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
     monkeypatch.setattr(
         "app.services.translation_service.get_translation_provider",
         UnavailableProvider,
@@ -101,7 +107,7 @@ def test_enrich_translations_returns_nulls_when_provider_unavailable(
 
     with caplog.at_level("WARNING"):
         result = asyncio.run(
-            enrich_translations(PinyinData(segments=[_make_segment("你好", line_id=0)]))
+            enrich_translations(PinyinResult(segments=[_make_segment("你好", line_id=0)]))
         )
 
     assert result.segments[0].translation_text is None
@@ -110,13 +116,14 @@ def test_enrich_translations_returns_nulls_when_provider_unavailable(
 
 def test_enrich_translations_returns_nulls_when_translation_execution_fails(
     monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
     caplog: pytest.LogCaptureFixture,
 ) -> None:
     class FailingProvider:
         def translate(self, *, text: str, target_language: str) -> str:
             raise TranslationExecutionError("boom")
 
-    monkeypatch.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
     monkeypatch.setattr(
         "app.services.translation_service.get_translation_provider",
         FailingProvider,
@@ -124,7 +131,7 @@ def test_enrich_translations_returns_nulls_when_translation_execution_fails(
 
     with caplog.at_level("WARNING"):
         result = asyncio.run(
-            enrich_translations(PinyinData(segments=[_make_segment("你好", line_id=0)]))
+            enrich_translations(PinyinResult(segments=[_make_segment("你好", line_id=0)]))
         )
 
     assert result.segments[0].translation_text is None
@@ -133,6 +140,7 @@ def test_enrich_translations_returns_nulls_when_translation_execution_fails(
 
 def test_enrich_translations_skips_translation_for_segments_with_null_line_id(
     monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
 ) -> None:
     """P-6/P-7: segments with line_id=None should never trigger a provider call."""
 
@@ -140,7 +148,7 @@ def test_enrich_translations_skips_translation_for_segments_with_null_line_id(
         def translate(self, *, text: str, target_language: str) -> str:
             raise AssertionError("translate must not be called for null line_id segments")
 
-    monkeypatch.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
     monkeypatch.setattr(
         "app.services.translation_service.get_translation_provider",
         lambda: AssertNotCalledProvider(),
@@ -148,7 +156,7 @@ def test_enrich_translations_skips_translation_for_segments_with_null_line_id(
 
     result = asyncio.run(
         enrich_translations(
-            PinyinData(
+            PinyinResult(
                 segments=[
                     _make_segment("老师叫", line_id=None),
                     _make_segment("同学们好", line_id=None),
@@ -162,6 +170,7 @@ def test_enrich_translations_skips_translation_for_segments_with_null_line_id(
 
 def test_enrich_translations_returns_null_translation_when_translate_times_out(
     monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
     caplog: pytest.LogCaptureFixture,
 ) -> None:
     """P-3: a hanging translate call should time out and return null, not block forever."""
@@ -171,7 +180,7 @@ def test_enrich_translations_returns_null_translation_when_translate_times_out(
             time.sleep(0.05)  # longer than the patched timeout
             return "hello"
 
-    monkeypatch.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
     monkeypatch.setattr(
         "app.services.translation_service.get_translation_provider",
         lambda: SlowProvider(),
@@ -184,15 +193,48 @@ def test_enrich_translations_returns_null_translation_when_translate_times_out(
     with caplog.at_level("WARNING"):
         result = asyncio.run(
             enrich_translations(
-                PinyinData(segments=[_make_segment("你好", line_id=0)])
+                PinyinResult(segments=[_make_segment("你好", line_id=0)])
             )
         )
 
     assert result.segments[0].translation_text is None
+    settings = get_settings()
+    breaker = get_breaker("translation", settings.translation_provider, settings)
+    assert breaker is not None
+    assert breaker.snapshot().failure_rate == 1.0
+
+
+def test_request_deadline_cutting_off_a_translation_is_not_a_provider_failure(
+    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
+) -> None:
+    class SlowProvider:
+        def translate(self, *, text: str, target_language: str) -> str:
+            time.sleep(0.05)
+            return "hello"
+
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
+    monkeypatch.setattr(
+        "app.services.translation_service.get_translation_provider", SlowProvider
+    )
+
+    result = asyncio.run(
+        enrich_translations(
+            PinyinResult(segments=[_make_segment("你好", line_id=0)]),
+            deadline=time.monotonic() + 0.01,
+        )
+    )
+
+    assert result.segments[0].translation_text is None
+    settings = get_settings()
+    breaker = get_breaker("translation", settings.translation_provider, settings)
+    assert breaker is not None
+    assert breaker.snapshot().calls == 0
 
 
 def test_enrich_translations_returns_null_translation_on_unexpected_exception(
     monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
     caplog: pytest.LogCaptureFixture,
 ) -> None:
     """P-4: any unexpected exception from translate should be caught and return null."""
@@ -201,7 +243,7 @@ def test_enrich_translations_returns_null_translation_on_unexpected_exception(
         def translate(self, *, text: str, target_language: str) -> str:
             raise RuntimeError("unexpected internal error")
 
-    monkeypatch.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
     monkeypatch.setattr(
         "app.services.translation_service.get_translation_provider",
         lambda: BuggyProvider(),
@@ -210,8 +252,126 @@ def test_enrich_translations_returns_null_translation_on_unexpected_exception(
     with caplog.at_level("WARNING"):
         result = asyncio.run(
             enrich_translations(
-                PinyinData(segments=[_make_segment("你好", line_id=0)])
+                PinyinResult(segments=[_make_segment("你好", line_id=0)])
             )
         )
 
     assert result.segments[0].translation_text is None
+
+
+def test_enrich_translations_skips_remaining_lines_once_the_breaker_opens(
+    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
+) -> None:
+    calls: list[str] = []
+
+    class FailingProvider:
+        def translate(self, *, text: str, target_language: str) -> str:
+            calls.append(text)
+            raise TranslationExecutionError("boom")
+
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("CIRCUIT_BREAKER_MIN_CALLS", "2")
+    monkeypatch.setattr(
+        "app.services.translation_service.get_translation_provider", FailingProvider
+    )
+    segments = [_make_segment(f"第{index}行", line_id=index) for index in range(5)]
+
+    result = asyncio.run(enrich_translations(PinyinResult(segments=segments)))
+
+    assert len(calls) == 2
+    assert all(segment.translation_text is None for segment in result.segments)
+
+
+def test_enrich_translations_retries_transient_errors_and_counts_attempts(
+    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
+) -> None:
+    failures = [TranslationExecutionError("503", retryable=True)]
+
+    class FlakyProvider:
+        def translate(self, *, text: str, target_language: str) -> str:
+            if failures:
+                raise failures.pop()
+            return "hello"
+
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
+    settings_env.setenv("RETRY_BASE_DELAY_MS", "1")
+    monkeypatch.setattr(
+        "app.services.translation_service.get_translation_provider", FlakyProvider
+    )
+    stats = RetryStats()
+
+    result = asyncio.run(
+        enrich_translations(
+            PinyinResult(segments=[_make_segment("你好", line_id=0)]), stats=stats
+        )
+    )
+
+    assert result.segments[0].translation_text == "hello"
+    assert stats == RetryStats(attempts=2, retries=1)
+
+
+def test_batched_enrichment_translates_all_lines_in_one_call(
+    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
+) -> None:
+    batches: list[list[str]] = []
+
+    class BatchProvider:
+        def translate_batch(self, *, texts: list[str], target_language: str) -> list[str]:
+            batches.append(list(texts))
+            return [f"{target_language}:{text}" for text in texts]
+
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
+    monkeypatch.setattr(
+        "app.services.translation_service.get_translation_provider", BatchProvider
+    )
+    segments = [
+        _make_segment("老", line_id=0),
+        _make_segment("师", line_id=0),
+        _make_segment("注", line_id=None),
+        _make_segment("你好", line_id=1),
+    ]
+
+    result = asyncio.run(enrich_translations(PinyinResult(segments=segments), batched=True))
+
+    assert batches == [["老师", "你好"]]
+    assert [segment.translation_text for segment in result.segments] == [
+        "en:老师",
+        "en:老师",
+        None,
+        "en:你好",
+    ]
+
+
+def test_batched_enrichment_leaves_lines_untranslated_when_the_batch_fails(
+    monkeypatch: pytest.MonkeyPatch,
+    settings_env: SettingsEnv,
+) -> None:
+    class FailingBatchProvider:
+        def translate_batch(self, *, texts: list[str], target_language: str) -> list[str]:
+            raise TranslationExecutionError("400 bad request")
+
+    settings_env.setenv("TRANSLATION_ENABLED", "true")
+    monkeypatch.setattr(
+        "app.services.translation_service.get_translation_provider", FailingBatchProvider
+    )
+    segments = [_make_segment(f"第{index}行", line_id=index) for index in range(3)]
+
+    result = asyncio.run(enrich_translations(PinyinResult(segments=segments), batched=True))
+
+    assert all(segment.translation_text is None for segment in result.segments)
+
+
+def test_translation_executor_is_sized_to_the_concurrency_max_limit(
+    settings_env: SettingsEnv,
+) -> None:
+    settings_env.setenv("ADAPTIVE_CONCURRENCY_MAX_LIMIT", "3")
+    executor = _translation_executor(get_settings())
+
+    assert executor._max_workers == 3
+    assert _translation_executor(get_settings()) is executor
+
+    settings_env.setenv("ADAPTIVE_CONCURRENCY_MAX_LIMIT", "5")
+    assert _translation_executor(get_settings())._max_workers == 5
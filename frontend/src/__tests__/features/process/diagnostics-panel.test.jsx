@@ -58,6 +58,27 @@ describe('DiagnosticsPanel', () => {
     expect(screen.getByText(/98\.7ms/i)).toBeInTheDocument()
   })
 
+  it('lists stage spans when timing includes them', async () => {
+    const user = userEvent.setup()
+    const diagnostics = {
+      ...MOCK_DIAGNOSTICS,
+      timing: {
+        ...MOCK_DIAGNOSTICS.timing,
+        spans: [
+          { name: 'body_read', start_ms: 0, duration_ms: 4.2 },
+          { name: 'translation', start_ms: 720.5, duration_ms: 101.3 },
+        ]
+      }
+    }
+    render(<DiagnosticsPanel diagnostics={diagnostics} ocrSegments={[]} />)
+
+    await user.click(screen.getByText('Show Details'))
+
+    const stages = screen.getByLabelText('timing-stages')
+    expect(within(stages).getByText('body_read: 4.2ms')).toBeInTheDocument()
+    expect(within(stages).getByText('translation: 101.3ms')).toBeInTheDocument()
+  })
+
   it('shows trace steps when diagnostics is provided', async () => {
     const user = userEvent.setup()
     render(<DiagnosticsPanel diagnostics={MOCK_DIAGNOSTICS} ocrSegments={MOCK_OCR_SEGMENTS} />)
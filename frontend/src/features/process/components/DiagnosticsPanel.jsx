@@ -38,6 +38,15 @@ export default function DiagnosticsPanel({ diagnostics, ocrSegments = [] }) {
               <li>OCR: {formatMilliseconds(diagnostics.timing.ocr_ms)}</li>
               <li>Pinyin: {formatMilliseconds(diagnostics.timing.pinyin_ms)}</li>
             </ul>
+            {diagnostics.timing.spans?.length > 0 && (
+              <ul aria-label="timing-stages">
+                {diagnostics.timing.spans.map((span, index) => (
+                  <li key={`${span.name}-${index}`}>
+                    {span.name}: {formatMilliseconds(span.duration_ms)}
+                  </li>
+                ))}
+              </ul>
+            )}
           </div>
 
           <div>